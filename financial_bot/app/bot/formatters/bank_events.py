@@ -1,3 +1,5 @@
+from collections.abc import Sequence
+
 from financial_bot.app.bot.formatters.context_hints import (
     AUTOSAVE_ACTION_HINT,
     INCOME_REPORT_HINT,
@@ -39,9 +41,11 @@ STATUS_LABELS = {
 SUGGESTION_SOURCE_LABELS = {
     BankEventSuggestionSource.PARSER_HINT: "по SMS-подсказке",
     BankEventSuggestionSource.LEARNED_RULE: "по прошлым подтверждениям",
+    BankEventSuggestionSource.SIMILAR_RULE: "по похожему продавцу",
     BankEventSuggestionSource.MANUAL: "выбрана вручную",
     BankEventSuggestionSource.NONE: "",
 }
+BATCH_SUMMARY_MAX_LINES = 20
 AUTOSAVE_AFTER_NEXT_CONFIRMATION_TEXT = (
     "Если подтвердите похожее SMS ещё раз, начну записывать такие расходы автоматически."
 )
@@ -114,6 +118,27 @@ def format_bank_import_result(result: BankImportResult) -> str:
     return "\n".join(lines)
 
 
+def format_bank_import_batch_summary(
+    results: Sequence[BankImportResult],
+    *,
+    max_lines: int = BATCH_SUMMARY_MAX_LINES,
+) -> str:
+    lines = [f"🏦 Пришло банковских SMS, ждут подтверждения: {len(results)}"]
+    for result in results[:max_lines]:
+        line = f"#{result.event_id} " + _money_category_line(
+            amount=result.amount,
+            currency=result.currency,
+            category_title=result.suggested_category_title,
+        )
+        if result.merchant:
+            line += f" ({result.merchant})"
+        lines.append(line)
+    if len(results) > max_lines:
+        lines.append(f"…и ещё {len(results) - max_lines}")
+    lines.extend(["", "Пока не записываю в расходы. Карточки с кнопками: /bank_pending"])
+    return "\n".join(lines)
+
+
 def format_bank_event_confirmed(result: BankEventConfirmationResult) -> str:
     if result.already_confirmed:
         return "✅ Этот расход уже был учтён."
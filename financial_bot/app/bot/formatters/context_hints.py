@@ -46,6 +46,11 @@ def bank_suggestion_hint(source: BankEventSuggestionSource) -> str | None:
                 "Почему так: похожего продавца уже подтверждали в этой категории. "
                 "Если сейчас это не так, измените категорию или отключите правило."
             )
+        case BankEventSuggestionSource.SIMILAR_RULE:
+            return (
+                "Почему так: продавец похож на того, которого уже подтверждали в этой "
+                "категории. Такие SMS не записываются автоматически, проверьте категорию."
+            )
         case BankEventSuggestionSource.MANUAL:
             return "Почему так: категорию выбрали вручную."
         case BankEventSuggestionSource.NONE:
@@ -0,0 +1,211 @@
+import asyncio
+import logging
+from collections.abc import Mapping
+from dataclasses import dataclass, field
+from datetime import UTC, datetime
+from time import time
+from typing import Any
+
+from aiogram.exceptions import DataNotDictLikeError
+from aiogram.fsm.state import State
+from aiogram.fsm.storage.base import BaseStorage, StateType, StorageKey
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from financial_bot.app.storage.db import session_scope
+from financial_bot.app.storage.repositories.fsm_state_repository import (
+    FsmStateRepository,
+    FsmStateRow,
+)
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_FSM_STATE_TTL_SECONDS = 2 * 24 * 60 * 60
+DEFAULT_FSM_FLUSH_INTERVAL_SECONDS = 1.0
+DEFAULT_FSM_PURGE_INTERVAL_SECONDS = 5 * 60
+
+
+@dataclass(slots=True)
+class _FsmRecord:
+    state: str | None = None
+    data: dict[str, Any] = field(default_factory=dict)
+    touched_at: float = 0.0
+
+    @property
+    def is_empty(self) -> bool:
+        return self.state is None and not self.data
+
+
+class DatabaseFsmStorage(BaseStorage):
+    """aiogram FSM storage kept in the bot database behind a write-behind cache.
+
+    Reads and writes go to in-memory records; a key is read from `fsm_states` only the
+    first time it is used after a restart. Changed keys are written in one transaction
+    every `flush_interval_seconds` by `run_forever` and on `close`, so a state change never
+    waits for the database. Records untouched for `ttl_seconds` are dropped; expired rows
+    are purged from the table at most every `purge_interval_seconds`, so an idle bot does
+    not write at all.
+    """
+
+    def __init__(
+        self,
+        session_factory: async_sessionmaker[AsyncSession],
+        *,
+        ttl_seconds: float = DEFAULT_FSM_STATE_TTL_SECONDS,
+        flush_interval_seconds: float = DEFAULT_FSM_FLUSH_INTERVAL_SECONDS,
+        purge_interval_seconds: float = DEFAULT_FSM_PURGE_INTERVAL_SECONDS,
+    ) -> None:
+        self._session_factory = session_factory
+        self._ttl_seconds = ttl_seconds
+        self._flush_interval_seconds = flush_interval_seconds
+        self._purge_interval_seconds = purge_interval_seconds
+        self._purged_at: float | None = None
+        self._records: dict[str, _FsmRecord] = {}
+        self._dirty: set[str] = set()
+        self._flush_lock = asyncio.Lock()
+
+    @property
+    def pending_writes(self) -> int:
+        return len(self._dirty)
+
+    async def set_state(self, key: StorageKey, state: StateType = None) -> None:
+        storage_key = _storage_key(key)
+        record = await self._record(storage_key)
+        record.state = state.state if isinstance(state, State) else state
+        self._touch(storage_key, record)
+
+    async def get_state(self, key: StorageKey) -> str | None:
+        return (await self._record(_storage_key(key))).state
+
+    async def set_data(self, key: StorageKey, data: Mapping[str, Any]) -> None:
+        if not isinstance(data, dict):
+            msg = f"Data must be a dict or dict-like object, got {type(data).__name__}"
+            raise DataNotDictLikeError(msg)
+        storage_key = _storage_key(key)
+        record = await self._record(storage_key)
+        record.data = data.copy()
+        self._touch(storage_key, record)
+
+    async def get_data(self, key: StorageKey) -> dict[str, Any]:
+        return (await self._record(_storage_key(key))).data.copy()
+
+    async def close(self) -> None:
+        await self.flush()
+
+    async def run_forever(self) -> None:
+        while True:
+            await asyncio.sleep(self._flush_interval_seconds)
+            try:
+                await self.flush()
+            except Exception:
+                logger.exception("FSM storage flush failed")
+
+    async def flush(self) -> None:
+        async with self._flush_lock:
+            now = time()
+            self._forget_expired(now)
+            purge = self._purged_at is None or now - self._purged_at >= self._purge_interval_seconds
+            if not self._dirty and not purge:
+                return
+            dirty, self._dirty = self._dirty, set()
+            saved: list[FsmStateRow] = []
+            deleted: list[str] = []
+            for storage_key in sorted(dirty):
+                record = self._records.get(storage_key)
+                if record is None or record.is_empty:
+                    deleted.append(storage_key)
+                    continue
+                saved.append(
+                    FsmStateRow(
+                        storage_key=storage_key,
+                        state=record.state,
+                        data=record.data,
+                        updated_at=_to_datetime(record.touched_at),
+                    )
+                )
+
+            try:
+                async with session_scope(self._session_factory) as session:
+                    repository = FsmStateRepository(session)
+                    await repository.save_many(saved)
+                    await repository.delete_many(deleted)
+                    if purge:
+                        await repository.delete_updated_before(
+                            _to_datetime(now - self._ttl_seconds)
+                        )
+            except Exception:
+                # Keys changed again meanwhile are already dirty; the rest are retried.
+                self._dirty |= dirty
+                raise
+            if purge:
+                self._purged_at = now
+
+    async def _record(self, storage_key: str) -> _FsmRecord:
+        now = time()
+        record = self._records.get(storage_key)
+        if record is None:
+            record = await self._load(storage_key, now)
+        if self._is_expired(record, now):
+            if not record.is_empty:
+                self._dirty.add(storage_key)
+            record = _FsmRecord(touched_at=now)
+            self._records[storage_key] = record
+        return record
+
+    async def _load(self, storage_key: str, now: float) -> _FsmRecord:
+        async with self._session_factory() as session:
+            row = await FsmStateRepository(session).get(storage_key)
+        # A concurrent update may have created the record while the row was loading.
+        record = self._records.get(storage_key)
+        if record is not None:
+            return record
+
+        if row is None:
+            record = _FsmRecord(touched_at=now)
+        else:
+            record = _FsmRecord(
+                state=row.state,
+                data=row.data,
+                touched_at=_to_timestamp(row.updated_at),
+            )
+        self._records[storage_key] = record
+        return record
+
+    def _touch(self, storage_key: str, record: _FsmRecord) -> None:
+        record.touched_at = time()
+        self._dirty.add(storage_key)
+
+    def _forget_expired(self, now: float) -> None:
+        expired = [
+            storage_key
+            for storage_key, record in self._records.items()
+            if storage_key not in self._dirty and self._is_expired(record, now)
+        ]
+        for storage_key in expired:
+            del self._records[storage_key]
+
+    def _is_expired(self, record: _FsmRecord, now: float) -> bool:
+        return now - record.touched_at > self._ttl_seconds
+
+
+def _storage_key(key: StorageKey) -> str:
+    return ":".join(
+        (
+            str(key.bot_id),
+            str(key.chat_id),
+            str(key.user_id),
+            str(key.thread_id or ""),
+            key.business_connection_id or "",
+            key.destiny,
+        )
+    )
+
+
+def _to_datetime(timestamp: float) -> datetime:
+    return datetime.fromtimestamp(timestamp, UTC)
+
+
+def _to_timestamp(value: datetime) -> float:
+    # SQLite returns the stored UTC wall clock without an offset.
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=UTC)
+    return value.timestamp()
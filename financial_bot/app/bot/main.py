@@ -5,8 +5,8 @@ import logging
 from contextlib import suppress
 
 from aiogram import Bot, Dispatcher
-from aiogram.fsm.storage.memory import MemoryStorage
 
+from financial_bot.app.bot.fsm_storage import DatabaseFsmStorage
 from financial_bot.app.bot.middlewares.auth import AuthMiddleware
 from financial_bot.app.bot.middlewares.context import SettingsMiddleware
 from financial_bot.app.bot.middlewares.db import DbSessionMiddleware
@@ -14,8 +14,13 @@ from financial_bot.app.bot.routers import get_routers
 from financial_bot.app.bot.telegram_client import create_telegram_bot
 from financial_bot.app.config import Settings, load_settings
 from financial_bot.app.services.auth_service import TelegramAuthPolicy
+from financial_bot.app.services.chart_cache import ChartCache
+from financial_bot.app.services.chart_render_pool import ChartRenderPool
+from financial_bot.app.services.chart_service import DEFAULT_CHART_TEMP_DIR
+from financial_bot.app.services.event_loop_monitor import EventLoopStallMonitor
 from financial_bot.app.services.reminder_scheduler import ReminderScheduler
 from financial_bot.app.storage.db import create_engine, create_session_factory
+from financial_bot.app.storage.reference_data import preload_reference_data
 
 logger = logging.getLogger(__name__)
 
@@ -25,12 +30,17 @@ def create_bot(settings: Settings) -> Bot:
 
 
 def create_dispatcher(settings: Settings) -> Dispatcher:
-    dispatcher = Dispatcher(storage=MemoryStorage())
+    engine = create_engine(settings.database_url)
+    session_factory = create_session_factory(engine)
+    fsm_storage = DatabaseFsmStorage(
+        session_factory,
+        ttl_seconds=settings.fsm_state_ttl_seconds,
+        flush_interval_seconds=settings.fsm_flush_interval_seconds,
+    )
+    dispatcher = Dispatcher(storage=fsm_storage)
     auth_policy = TelegramAuthPolicy(settings.allowed_telegram_ids)
     auth_middleware = AuthMiddleware(auth_policy, denial_message="Доступ запрещён.")
     settings_middleware = SettingsMiddleware(settings)
-    engine = create_engine(settings.database_url)
-    session_factory = create_session_factory(engine)
     db_middleware = DbSessionMiddleware(session_factory)
 
     for observer in (dispatcher.message, dispatcher.callback_query):
@@ -43,15 +53,40 @@ def create_dispatcher(settings: Settings) -> Dispatcher:
 
     dispatcher.workflow_data["db_engine"] = engine
     dispatcher.workflow_data["db_session_factory"] = session_factory
+    dispatcher.workflow_data["fsm_storage"] = fsm_storage
+    dispatcher.workflow_data["chart_renderer"] = create_chart_renderer(settings)
+    dispatcher.workflow_data["chart_cache"] = create_chart_cache(settings)
     return dispatcher
 
 
+def create_chart_renderer(settings: Settings) -> ChartRenderPool | None:
+    if settings.chart_render_workers == 0:
+        return None
+    return ChartRenderPool(
+        workers=settings.chart_render_workers,
+        timeout_seconds=settings.chart_render_timeout_seconds,
+    )
+
+
+def create_chart_cache(settings: Settings) -> ChartCache | None:
+    if settings.chart_cache_max_bytes == 0:
+        return None
+    return ChartCache(
+        max_bytes=settings.chart_cache_max_bytes,
+        persist_dir=DEFAULT_CHART_TEMP_DIR / "cache" if settings.chart_cache_persist else None,
+    )
+
+
 async def run_polling(settings: Settings | None = None) -> None:
     loaded_settings = settings or load_settings()
     bot = create_bot(loaded_settings)
     dispatcher = create_dispatcher(loaded_settings)
     engine = dispatcher.workflow_data["db_engine"]
     session_factory = dispatcher.workflow_data["db_session_factory"]
+    chart_renderer = dispatcher.workflow_data["chart_renderer"]
+    chart_cache = dispatcher.workflow_data["chart_cache"]
+    fsm_storage = dispatcher.workflow_data["fsm_storage"]
+    await preload_reference_data(session_factory)
     reminder_scheduler = ReminderScheduler(
         bot=bot,
         session_factory=session_factory,
@@ -61,14 +96,45 @@ async def run_polling(settings: Settings | None = None) -> None:
         reminder_scheduler.run_forever(),
         name="money-bot-reminder-scheduler",
     )
+    fsm_storage_task = asyncio.create_task(
+        fsm_storage.run_forever(),
+        name="money-bot-fsm-storage-flush",
+    )
+    loop_monitor = EventLoopStallMonitor()
+    loop_monitor_task = asyncio.create_task(
+        loop_monitor.run_forever(),
+        name="money-bot-event-loop-monitor",
+    )
+    if chart_renderer is not None:
+        await chart_renderer.start()
 
     logger.info("Starting Family Finance Telegram Bot polling.")
     try:
         await dispatcher.start_polling(bot)
     finally:
-        reminder_task.cancel()
-        with suppress(asyncio.CancelledError):
-            await reminder_task
+        for task in (reminder_task, fsm_storage_task, loop_monitor_task):
+            task.cancel()
+            with suppress(asyncio.CancelledError):
+                await task
+        if chart_renderer is not None:
+            await chart_renderer.close()
+        stats = loop_monitor.snapshot()
+        logger.info(
+            "Event loop stalls: %s of %s samples, max %.0f ms, total %.0f ms.",
+            stats.stalled_samples,
+            stats.samples,
+            stats.max_stall_seconds * 1000,
+            stats.total_stall_seconds * 1000,
+        )
+        if chart_cache is not None:
+            cache_stats = chart_cache.snapshot()
+            logger.info(
+                "Chart cache: %s hits, %s misses, %s entries, %s bytes.",
+                cache_stats.hits,
+                cache_stats.misses,
+                cache_stats.entries,
+                cache_stats.size_bytes,
+            )
         await engine.dispose()
 
 
@@ -11,6 +11,8 @@ from financial_bot.app.domain.accounting_scope import extract_scope_filter
 from financial_bot.app.domain.periods import PeriodKind, parse_period_kind
 from financial_bot.app.domain.types import TransactionScope
 from financial_bot.app.services.cashflow_service import CashflowService
+from financial_bot.app.services.chart_cache import ChartCache
+from financial_bot.app.services.chart_render_pool import ChartRenderPool
 from financial_bot.app.services.chart_service import ChartService
 
 router = Router(name=__name__)
@@ -31,12 +33,16 @@ async def cashflow_command(
     message: Message,
     session: AsyncSession,
     settings: Settings,
+    chart_renderer: ChartRenderPool | None,
+    chart_cache: ChartCache | None,
 ) -> None:
     kind, scope = _period_payload_from_command(message)
     if kind is None:
         await message.answer("Период: week/month/quarter/halfyear/year или неделя/месяц/год.")
         return
-    await _answer_cashflow_report(message, session, settings, kind, scope)
+    await _answer_cashflow_report(
+        message, session, settings, chart_renderer, chart_cache, kind, scope
+    )
 
 
 @router.message(F.text.func(lambda text: _cashflow_payload_from_text_alias(text) is not None))
@@ -44,23 +50,35 @@ async def cashflow_text_alias(
     message: Message,
     session: AsyncSession,
     settings: Settings,
+    chart_renderer: ChartRenderPool | None,
+    chart_cache: ChartCache | None,
 ) -> None:
     payload = _cashflow_payload_from_text_alias(message.text or "")
     if payload is None:
         await message.answer("Период: week/month/quarter/halfyear/year или неделя/месяц/год.")
         return
     kind, scope = payload
-    await _answer_cashflow_report(message, session, settings, kind, scope)
+    await _answer_cashflow_report(
+        message, session, settings, chart_renderer, chart_cache, kind, scope
+    )
 
 
 async def _answer_cashflow_report(
     message: Message,
     session: AsyncSession,
     settings: Settings,
+    chart_renderer: ChartRenderPool | None,
+    chart_cache: ChartCache | None,
     kind: PeriodKind,
     scope: TransactionScope | None,
 ) -> None:
-    result = await ChartService(session, settings).create_cashflow_dashboard_chart(
+    service = ChartService(
+        session,
+        settings,
+        renderer=chart_renderer,
+        cache=chart_cache,
+    )
+    result = await service.create_cashflow_dashboard_chart(
         kind,
         scope=scope,
     )
@@ -11,6 +11,8 @@ from financial_bot.app.config import Settings
 from financial_bot.app.domain.accounting_scope import extract_scope_filter, scope_filter_label
 from financial_bot.app.domain.periods import PeriodKind, parse_period_kind
 from financial_bot.app.domain.types import TransactionScope
+from financial_bot.app.services.chart_cache import ChartCache
+from financial_bot.app.services.chart_render_pool import ChartRenderPool
 from financial_bot.app.services.chart_service import ChartResult, ChartService
 
 router = Router(name=__name__)
@@ -44,10 +46,17 @@ async def chart_command(
     message: Message,
     session: AsyncSession,
     settings: Settings,
+    chart_renderer: ChartRenderPool | None,
+    chart_cache: ChartCache | None,
 ) -> None:
     tokens, scope = _command_args_without_scope(message)
     chart_type = tokens[0].lower() if tokens else "categories"
-    service = ChartService(session, settings)
+    service = ChartService(
+        session,
+        settings,
+        renderer=chart_renderer,
+        cache=chart_cache,
+    )
 
     try:
         if chart_type == "dashboard":
@@ -92,10 +101,18 @@ async def dashboard_command(
     message: Message,
     session: AsyncSession,
     settings: Settings,
+    chart_renderer: ChartRenderPool | None,
+    chart_cache: ChartCache | None,
 ) -> None:
     tokens, scope = _command_args_without_scope(message)
     try:
-        result = await ChartService(session, settings).create_period_dashboard_chart(
+        service = ChartService(
+            session,
+            settings,
+            renderer=chart_renderer,
+            cache=chart_cache,
+        )
+        result = await service.create_period_dashboard_chart(
             _dashboard_period_from_tokens(tokens),
             scope=scope,
         )
@@ -114,6 +131,8 @@ async def categories_command(
     message: Message,
     session: AsyncSession,
     settings: Settings,
+    chart_renderer: ChartRenderPool | None,
+    chart_cache: ChartCache | None,
 ) -> None:
     tokens, scope = _command_args_without_scope(message)
     period_kind = parse_period_kind(tokens[0]) if tokens else PeriodKind.MONTH
@@ -121,7 +140,13 @@ async def categories_command(
         await message.answer("Период графика категорий: week, month, quarter, halfyear или year")
         return
 
-    result = await ChartService(session, settings).create_categories_chart(
+    service = ChartService(
+        session,
+        settings,
+        renderer=chart_renderer,
+        cache=chart_cache,
+    )
+    result = await service.create_categories_chart(
         period_kind,
         scope=scope,
     )
@@ -139,9 +164,17 @@ async def dashboard_text_alias(
     message: Message,
     session: AsyncSession,
     settings: Settings,
+    chart_renderer: ChartRenderPool | None,
+    chart_cache: ChartCache | None,
 ) -> None:
     scope = _scope_or_none(_dashboard_scope_from_menu_text(message.text or ""))
-    result = await ChartService(session, settings).create_month_dashboard_chart(scope=scope)
+    service = ChartService(
+        session,
+        settings,
+        renderer=chart_renderer,
+        cache=chart_cache,
+    )
+    result = await service.create_month_dashboard_chart(scope=scope)
     await _send_chart_or_empty(
         message,
         result,
@@ -154,13 +187,21 @@ async def categories_chart_text_alias(
     message: Message,
     session: AsyncSession,
     settings: Settings,
+    chart_renderer: ChartRenderPool | None,
+    chart_cache: ChartCache | None,
 ) -> None:
     payload = _category_chart_menu_payload(message.text or "")
     if payload is None:
         await message.answer("Не понял период графика категорий.")
         return
     period_kind, scope = payload
-    result = await ChartService(session, settings).create_categories_chart(
+    service = ChartService(
+        session,
+        settings,
+        renderer=chart_renderer,
+        cache=chart_cache,
+    )
+    result = await service.create_categories_chart(
         period_kind,
         scope=scope,
     )
@@ -178,9 +219,17 @@ async def cumulative_chart_text_alias(
     message: Message,
     session: AsyncSession,
     settings: Settings,
+    chart_renderer: ChartRenderPool | None,
+    chart_cache: ChartCache | None,
 ) -> None:
     scope = _scope_or_none(_cumulative_scope_from_menu_text(message.text or ""))
-    result = await ChartService(session, settings).create_cumulative_chart(scope=scope)
+    service = ChartService(
+        session,
+        settings,
+        renderer=chart_renderer,
+        cache=chart_cache,
+    )
+    result = await service.create_cumulative_chart(scope=scope)
     await _send_chart_or_empty(
         message,
         result,
@@ -193,6 +242,8 @@ async def compare_command(
     message: Message,
     session: AsyncSession,
     settings: Settings,
+    chart_renderer: ChartRenderPool | None,
+    chart_cache: ChartCache | None,
 ) -> None:
     tokens, scope = _command_args_without_scope(message)
     if not tokens:
@@ -200,7 +251,13 @@ async def compare_command(
         return
 
     try:
-        result = await ChartService(session, settings).create_compare_months_chart(
+        service = ChartService(
+            session,
+            settings,
+            renderer=chart_renderer,
+            cache=chart_cache,
+        )
+        result = await service.create_compare_months_chart(
             tokens,
             scope=scope,
         )
@@ -222,11 +279,19 @@ async def compare_menu_alias(
     message: Message,
     session: AsyncSession,
     settings: Settings,
+    chart_renderer: ChartRenderPool | None,
+    chart_cache: ChartCache | None,
 ) -> None:
     scope = _scope_or_none(_compare_scope_from_menu_text(message.text or ""))
     tokens = _default_compare_month_tokens(settings)
     try:
-        result = await ChartService(session, settings).create_compare_months_chart(
+        service = ChartService(
+            session,
+            settings,
+            renderer=chart_renderer,
+            cache=chart_cache,
+        )
+        result = await service.create_compare_months_chart(
             tokens,
             scope=scope,
         )
@@ -246,11 +311,19 @@ async def trend_command(
     message: Message,
     session: AsyncSession,
     settings: Settings,
+    chart_renderer: ChartRenderPool | None,
+    chart_cache: ChartCache | None,
 ) -> None:
     tokens, scope = _command_args_without_scope(message)
     try:
         month_count = _parse_month_count(tokens[0]) if tokens else 6
-        result = await ChartService(session, settings).create_trend_chart(
+        service = ChartService(
+            session,
+            settings,
+            renderer=chart_renderer,
+            cache=chart_cache,
+        )
+        result = await service.create_trend_chart(
             month_count,
             scope=scope,
         )
@@ -270,9 +343,17 @@ async def trend_menu_alias(
     message: Message,
     session: AsyncSession,
     settings: Settings,
+    chart_renderer: ChartRenderPool | None,
+    chart_cache: ChartCache | None,
 ) -> None:
     scope = _scope_or_none(_trend_scope_from_menu_text(message.text or ""))
-    result = await ChartService(session, settings).create_trend_chart(6, scope=scope)
+    service = ChartService(
+        session,
+        settings,
+        renderer=chart_renderer,
+        cache=chart_cache,
+    )
+    result = await service.create_trend_chart(6, scope=scope)
     await _send_chart_or_empty(
         message,
         result,
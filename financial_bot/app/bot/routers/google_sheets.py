@@ -1,7 +1,10 @@
+import logging
+import time
 from datetime import datetime
 from zoneinfo import ZoneInfo
 
 from aiogram import Router
+from aiogram.exceptions import TelegramAPIError, TelegramBadRequest
 from aiogram.filters import Command
 from aiogram.types import Message
 from sqlalchemy.ext.asyncio import AsyncSession
@@ -16,11 +19,14 @@ from financial_bot.app.domain.periods import (
 )
 from financial_bot.app.services.google_sheets_service import (
     GoogleSheetsExportError,
+    GoogleSheetsExportProgress,
+    GoogleSheetsExportStage,
     GoogleSheetsNotConfigured,
     GoogleSheetsService,
 )
 
 router = Router(name=__name__)
+logger = logging.getLogger(__name__)
 
 
 @router.message(Command("sheets"))
@@ -30,25 +36,98 @@ async def sheets_command(
     settings: Settings,
 ) -> None:
     tokens = _command_args(message)
-    if not tokens or tokens[0].lower() != "export":
-        await message.answer("Используйте: /sheets export may")
+    if not tokens or tokens[0].lower() not in {"export", "resync"}:
+        await message.answer("Используйте: /sheets export may или /sheets resync may")
         return
 
-    try:
-        period = _parse_period(tokens[1:], settings)
-        summary = await GoogleSheetsService(session, settings).export_period(period)
-    except GoogleSheetsNotConfigured:
+    service = GoogleSheetsService(session, settings)
+    if not service.is_configured():
         await message.answer("Google Sheets export не настроен.")
         return
-    except (GoogleSheetsExportError, ValueError) as exc:
+    try:
+        period = _parse_period(tokens[1:], settings)
+    except ValueError as exc:
         await message.answer(f"Google Sheets export не выполнен: {exc}")
         return
 
+    progress = _ProgressMessage(
+        await message.answer(f"Выгружаю в Google Sheets за {period.label}…")
+    )
+    try:
+        summary = await service.export_period(
+            period,
+            resync=tokens[0].lower() == "resync",
+            on_progress=progress.update,
+        )
+    except (GoogleSheetsExportError, GoogleSheetsNotConfigured, ValueError) as exc:
+        await progress.finish(f"Google Sheets export не выполнен: {exc}")
+        return
+
     if summary is None:
-        await message.answer("За период нет операций для выгрузки в Google Sheets.")
+        await progress.finish("За период нет операций для выгрузки в Google Sheets.")
+        return
+    if not summary.has_changes:
+        await progress.finish(f"Google Sheets уже актуальна за {period.label}.")
         return
 
-    await message.answer(f"Выгрузил в Google Sheets: {summary.total_rows} строк за {period.label}.")
+    text = f"Выгрузил в Google Sheets: {summary.total_rows} строк за {period.label}."
+    if summary.blanked_rows:
+        text += f" Очистил строк удалённых операций: {summary.blanked_rows}."
+    await progress.finish(text)
+
+
+class _ProgressMessage:
+    """Edits one status message while an export runs, at most once per interval."""
+
+    def __init__(self, message: Message, *, min_interval_seconds: float = 1.0) -> None:
+        self._message = message
+        self._min_interval_seconds = min_interval_seconds
+        self._text = message.text
+        self._edited_at = time.monotonic()
+
+    async def update(self, progress: GoogleSheetsExportProgress) -> None:
+        text = _progress_text(progress)
+        # Row counts change often; stage changes are always shown.
+        throttled = progress.stage is GoogleSheetsExportStage.PREPARING
+        if throttled and time.monotonic() - self._edited_at < self._min_interval_seconds:
+            return
+        await self._edit(text)
+
+    async def finish(self, text: str) -> None:
+        if not await self._edit(text):
+            await self._message.answer(text)
+
+    async def _edit(self, text: str) -> bool:
+        if text == self._text:
+            return True
+        try:
+            await self._message.edit_text(text)
+        except TelegramBadRequest:
+            return False
+        except TelegramAPIError:
+            # A status edit hitting flood control or the network must not abort the export.
+            logger.warning("Google Sheets progress message edit failed", exc_info=True)
+            return False
+        self._text = text
+        self._edited_at = time.monotonic()
+        return True
+
+
+def _progress_text(progress: GoogleSheetsExportProgress) -> str:
+    match progress.stage:
+        case GoogleSheetsExportStage.READING:
+            return "Читаю листы Google Sheets…"
+        case GoogleSheetsExportStage.PREPARING:
+            return f"Готовлю строки для Google Sheets: {progress.rows}…"
+        case GoogleSheetsExportStage.CLEARING:
+            return "Готовлю листы Google Sheets…"
+        case GoogleSheetsExportStage.WRITING:
+            return f"Отправляю в Google Sheets {progress.rows} строк…"
+        case GoogleSheetsExportStage.RETRYING:
+            return (
+                "Google Sheets просит подождать, "
+                f"повтор через {progress.retry_in_seconds or 0:.0f} с…"
+            )
 
 
 def _parse_period(tokens: list[str], settings: Settings) -> Period:
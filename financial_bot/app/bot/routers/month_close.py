@@ -16,6 +16,8 @@ from financial_bot.app.bot.routers.bank_events import answer_pending_bank_events
 from financial_bot.app.config import Settings
 from financial_bot.app.domain.accounting_scope import scope_filter_label
 from financial_bot.app.domain.periods import PeriodKind
+from financial_bot.app.services.chart_cache import ChartCache
+from financial_bot.app.services.chart_render_pool import ChartRenderPool
 from financial_bot.app.services.chart_service import ChartResult, ChartService
 from financial_bot.app.services.month_close_service import MonthCloseService
 from financial_bot.app.services.smart_month_summary_service import SmartMonthSummaryService
@@ -58,6 +60,8 @@ async def month_close_action_selected(
     callback_data: MonthCloseActionCallback,
     session: AsyncSession,
     settings: Settings,
+    chart_renderer: ChartRenderPool | None,
+    chart_cache: ChartCache | None,
     telegram_user_id: int,
 ) -> None:
     if callback.message is None:
@@ -66,7 +70,13 @@ async def month_close_action_selected(
 
     if callback_data.action == MonthCloseAction.DASHBOARD:
         await callback.answer("Открываю дашборд")
-        result = await ChartService(session, settings).create_period_dashboard_chart(
+        service = ChartService(
+            session,
+            settings,
+            renderer=chart_renderer,
+            cache=chart_cache,
+        )
+        result = await service.create_period_dashboard_chart(
             PeriodKind.MONTH,
         )
         await _send_chart_or_empty(callback.message, result)
@@ -11,6 +11,8 @@ from financial_bot.app.config import Settings
 from financial_bot.app.domain.accounting_scope import extract_scope_filter, scope_filter_label
 from financial_bot.app.domain.periods import PeriodKind, parse_period_kind
 from financial_bot.app.domain.types import TransactionScope
+from financial_bot.app.services.chart_cache import ChartCache
+from financial_bot.app.services.chart_render_pool import ChartRenderPool
 from financial_bot.app.services.chart_service import ChartResult, ChartService
 from financial_bot.app.services.report_service import ReportService
 from financial_bot.app.services.smart_month_summary_service import SmartMonthSummaryService
@@ -65,9 +67,11 @@ async def payer_report_command(
     message: Message,
     session: AsyncSession,
     settings: Settings,
+    chart_renderer: ChartRenderPool | None,
+    chart_cache: ChartCache | None,
 ) -> None:
     _, scope = _command_args_without_scope(message)
-    await _answer_payer_report(message, session, settings, scope)
+    await _answer_payer_report(message, session, settings, chart_renderer, chart_cache, scope)
 
 
 @router.message(Command("summary", "month_summary"))
@@ -94,9 +98,11 @@ async def payer_report_text_alias(
     message: Message,
     session: AsyncSession,
     settings: Settings,
+    chart_renderer: ChartRenderPool | None,
+    chart_cache: ChartCache | None,
 ) -> None:
     scope = _scope_or_none(_payer_scope_from_text_alias(message.text or ""))
-    await _answer_payer_report(message, session, settings, scope)
+    await _answer_payer_report(message, session, settings, chart_renderer, chart_cache, scope)
 
 
 @router.message(
@@ -130,6 +136,8 @@ async def explicit_report_command(
     message: Message,
     session: AsyncSession,
     settings: Settings,
+    chart_renderer: ChartRenderPool | None,
+    chart_cache: ChartCache | None,
 ) -> None:
     tokens, scope = _command_args_without_scope(message)
     if not tokens:
@@ -155,7 +163,9 @@ async def explicit_report_command(
     if kind is None:
         await message.answer("Период отчёта: week, month, quarter, halfyear или year")
         return
-    await _answer_period_report(message, session, settings, kind, scope)
+    await _answer_period_report(
+        message, session, settings, chart_renderer, chart_cache, kind, scope
+    )
 
 
 @router.message(Command(*PERIOD_COMMANDS))
@@ -163,6 +173,8 @@ async def period_report_command(
     message: Message,
     session: AsyncSession,
     settings: Settings,
+    chart_renderer: ChartRenderPool | None,
+    chart_cache: ChartCache | None,
 ) -> None:
     kind = _period_kind_from_message(message)
     if kind is None:
@@ -170,7 +182,9 @@ async def period_report_command(
         return
 
     _, scope = _command_args_without_scope(message)
-    await _answer_period_report(message, session, settings, kind, scope)
+    await _answer_period_report(
+        message, session, settings, chart_renderer, chart_cache, kind, scope
+    )
 
 
 @router.message(F.text.func(lambda text: _period_text_payload(text) is not None))
@@ -178,6 +192,8 @@ async def period_report_text_alias(
     message: Message,
     session: AsyncSession,
     settings: Settings,
+    chart_renderer: ChartRenderPool | None,
+    chart_cache: ChartCache | None,
 ) -> None:
     payload = _period_text_payload(message.text or "")
     if payload is None:
@@ -185,17 +201,27 @@ async def period_report_text_alias(
         return
     kind, scope = payload
 
-    await _answer_period_report(message, session, settings, kind, scope)
+    await _answer_period_report(
+        message, session, settings, chart_renderer, chart_cache, kind, scope
+    )
 
 
 async def _answer_period_report(
     message: Message,
     session: AsyncSession,
     settings: Settings,
+    chart_renderer: ChartRenderPool | None,
+    chart_cache: ChartCache | None,
     kind: PeriodKind,
     scope: TransactionScope | None,
 ) -> None:
-    result = await ChartService(session, settings).create_period_dashboard_chart(
+    service = ChartService(
+        session,
+        settings,
+        renderer=chart_renderer,
+        cache=chart_cache,
+    )
+    result = await service.create_period_dashboard_chart(
         kind,
         scope=scope,
     )
@@ -231,9 +257,17 @@ async def _answer_payer_report(
     message: Message,
     session: AsyncSession,
     settings: Settings,
+    chart_renderer: ChartRenderPool | None,
+    chart_cache: ChartCache | None,
     scope: TransactionScope | None,
 ) -> None:
-    result = await ChartService(session, settings).create_payer_report_chart(
+    service = ChartService(
+        session,
+        settings,
+        renderer=chart_renderer,
+        cache=chart_cache,
+    )
+    result = await service.create_payer_report_chart(
         PeriodKind.MONTH,
         scope=scope,
     )
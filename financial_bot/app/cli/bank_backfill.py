@@ -0,0 +1,116 @@
+import argparse
+import asyncio
+import os
+import sys
+from collections.abc import Sequence
+from pathlib import Path
+
+from financial_bot.app.config import SettingsLoadError, load_settings
+from financial_bot.app.services.bank_backfill_service import (
+    DEFAULT_BANK_BACKFILL_CHUNK_SIZE,
+    BankBackfillProgress,
+    BankBackfillService,
+    BankSmsDumpFormat,
+    read_bank_sms_dump,
+)
+from financial_bot.app.storage.db import create_engine, create_session_factory
+
+
+def main(argv: Sequence[str] | None = None) -> None:
+    args = _parse_args(argv)
+    asyncio.run(_async_main(args))
+
+
+async def _async_main(args: argparse.Namespace) -> None:
+    try:
+        settings = load_settings(args.env_file)
+    except SettingsLoadError as exc:
+        raise SystemExit(str(exc)) from exc
+
+    dump_format = BankSmsDumpFormat(args.format or _format_from_suffix(args.dump))
+    engine = create_engine(settings.database_url)
+    service = BankBackfillService(
+        create_session_factory(engine),
+        settings,
+        workers=args.workers,
+        chunk_size=args.chunk_size,
+    )
+    try:
+        with args.dump.open(encoding="utf-8") as dump:
+            result = await service.import_records(
+                read_bank_sms_dump(dump, dump_format=dump_format, timezone=settings.timezone),
+                source_code=args.source_code,
+                on_progress=_print_progress,
+            )
+    except (OSError, ValueError) as exc:
+        raise SystemExit(str(exc)) from exc
+    finally:
+        await engine.dispose()
+
+    print(_format_result(result))
+
+
+def _parse_args(argv: Sequence[str] | None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description=(
+            "Import exported bank SMS as bank events of an existing source, without Telegram "
+            "notifications. Already stored SMS are skipped, so an import can be re-run."
+        ),
+    )
+    parser.add_argument("--env-file", default=".env", help="Path to env file. Default: .env")
+    parser.add_argument("--source-code", required=True, help="Existing bank event source code.")
+    parser.add_argument(
+        "--format",
+        choices=[item.value for item in BankSmsDumpFormat],
+        default=None,
+        help=(
+            "jsonl: {text, received_at, sender?} objects; text: <received_at><TAB><text> lines. "
+            "Default: jsonl for .jsonl files, text otherwise."
+        ),
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=(os.cpu_count() or 1) - 1,
+        help=(
+            "Parser processes; 0 parses in the importing process, which also writes to the "
+            "database. Default: CPU count - 1"
+        ),
+    )
+    parser.add_argument(
+        "--chunk-size",
+        type=int,
+        default=DEFAULT_BANK_BACKFILL_CHUNK_SIZE,
+        help=f"SMS per transaction. Default: {DEFAULT_BANK_BACKFILL_CHUNK_SIZE}",
+    )
+    parser.add_argument("dump", type=Path, help="Exported SMS file.")
+    args = parser.parse_args(argv)
+    if args.workers < 0 or args.chunk_size < 1:
+        parser.error("--workers must be >= 0 and --chunk-size >= 1")
+    return args
+
+
+def _format_from_suffix(path: Path) -> str:
+    if path.suffix.lower() == ".jsonl":
+        return BankSmsDumpFormat.JSONL.value
+    return BankSmsDumpFormat.TEXT.value
+
+
+def _print_progress(progress: BankBackfillProgress) -> None:
+    print(
+        f"Processed {progress.processed}: {progress.created} new, "
+        f"{progress.duplicates} duplicates, {progress.messages_per_second:,.0f} SMS/s",
+        file=sys.stderr,
+    )
+
+
+def _format_result(result: BankBackfillProgress) -> str:
+    return "\n".join(
+        [
+            "Bank SMS backfill finished.",
+            f"Processed: {result.processed}",
+            f"New events: {result.created}",
+            f"Duplicates: {result.duplicates}",
+            f"Elapsed: {result.elapsed_seconds:.1f}s ({result.messages_per_second:,.0f} SMS/s)",
+        ]
+    )
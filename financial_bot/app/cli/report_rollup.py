@@ -0,0 +1,88 @@
+import argparse
+import asyncio
+from collections.abc import Sequence
+
+from financial_bot.app.config import SettingsLoadError, load_settings
+from financial_bot.app.services.report_rollup_service import (
+    ReportRollupCheckResult,
+    ReportRollupRebuildResult,
+    ReportRollupService,
+)
+from financial_bot.app.storage.db import create_engine, create_session_factory, session_scope
+
+MAX_PRINTED_MISMATCHES = 20
+
+
+def main(argv: Sequence[str] | None = None) -> None:
+    args = _parse_args(argv)
+    asyncio.run(_async_main(args))
+
+
+async def _async_main(args: argparse.Namespace) -> None:
+    try:
+        settings = load_settings(args.env_file)
+    except SettingsLoadError as exc:
+        raise SystemExit(str(exc)) from exc
+
+    engine = create_engine(settings.database_url)
+    session_factory = create_session_factory(engine)
+    try:
+        async with session_scope(session_factory) as session:
+            service = ReportRollupService(session, settings)
+            if args.command == "rebuild":
+                rebuild_result = await service.rebuild()
+            else:
+                check_result = await service.check()
+    finally:
+        await engine.dispose()
+
+    if args.command == "rebuild":
+        print(_format_rebuild_result(rebuild_result))
+        return
+
+    print(_format_check_result(check_result))
+    if not check_result.is_consistent:
+        raise SystemExit(1)
+
+
+def _parse_args(argv: Sequence[str] | None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description="Rebuild or verify the daily report totals rollup.",
+    )
+    parser.add_argument("--env-file", default=".env", help="Path to env file. Default: .env")
+    parser.add_argument(
+        "command",
+        choices=["rebuild", "check"],
+        help="rebuild: recompute the rollup from transactions; check: compare without writing.",
+    )
+    return parser.parse_args(argv)
+
+
+def _format_rebuild_result(result: ReportRollupRebuildResult) -> str:
+    return "\n".join(
+        [
+            "Report rollup rebuilt.",
+            f"Rows: {result.row_count}",
+            f"Transactions: {result.transaction_count}",
+        ]
+    )
+
+
+def _format_check_result(result: ReportRollupCheckResult) -> str:
+    if result.is_consistent:
+        return f"Report rollup is consistent. Rows checked: {result.checked_rows}"
+
+    lines = [
+        "Report rollup is inconsistent.",
+        f"Rows checked: {result.checked_rows}",
+        f"Mismatches: {len(result.mismatches)}",
+    ]
+    for mismatch in result.mismatches[:MAX_PRINTED_MISMATCHES]:
+        lines.append(
+            f"{mismatch.local_date.isoformat()} category={mismatch.category_id} "
+            f"payer={mismatch.payer_user_id} scope={mismatch.scope}: "
+            f"expected {mismatch.expected_amount}/{mismatch.expected_count}, "
+            f"stored {mismatch.actual_amount}/{mismatch.actual_count}"
+        )
+    lines.append("Run `family-finance-report-rollup rebuild` to repair it.")
+    return "\n".join(lines)
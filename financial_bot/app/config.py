@@ -31,10 +31,28 @@ class Settings(BaseSettings):
 
     google_credentials_path: str | None = None
     google_spreadsheet_id: str | None = None
+    google_sheets_max_attempts: int = Field(default=5, ge=1)
+    google_sheets_retry_base_seconds: float = Field(default=1.0, gt=0)
+    google_sheets_retry_max_seconds: float = Field(default=32.0, gt=0)
     bank_self_counterparty_aliases: Annotated[frozenset[str], NoDecode] = frozenset()
     bank_ingest_host: str = "127.0.0.1"
     bank_ingest_port: int = Field(default=8000, ge=1, le=65535)
+    bank_source_cache_ttl_seconds: float = Field(default=30.0, ge=0)
+    bank_source_heartbeat_flush_seconds: float = Field(default=10.0, gt=0)
+    bank_source_heartbeat_granularity_seconds: float = Field(default=60.0, ge=0)
+    bank_sms_parse_budget_seconds: float = Field(default=0.1, gt=0)
+    bank_rule_usage_flush_seconds: float = Field(default=10.0, gt=0)
+    bank_notification_concurrency: int = Field(default=4, ge=1, le=32)
+    bank_notification_max_attempts: int = Field(default=8, ge=1)
+    bank_notification_retry_base_seconds: float = Field(default=2.0, gt=0)
+    bank_notification_retry_max_seconds: float = Field(default=600.0, gt=0)
     telegram_route_url: str | None = None
+    chart_render_workers: int = Field(default=2, ge=0, le=8)
+    chart_render_timeout_seconds: float = Field(default=30.0, gt=0)
+    chart_cache_max_bytes: int = Field(default=32 * 1024 * 1024, ge=0)
+    chart_cache_persist: bool = False
+    fsm_state_ttl_seconds: int = Field(default=2 * 24 * 60 * 60, gt=0)
+    fsm_flush_interval_seconds: float = Field(default=1.0, gt=0)
 
     @field_validator("bot_token")
     @classmethod
@@ -1,6 +1,10 @@
 import re
+from collections import Counter, defaultdict
+from collections.abc import Iterable
+from dataclasses import dataclass
 
 MIN_BANK_MERCHANT_KEY_LENGTH = 3
+SIMILAR_BANK_MERCHANT_MIN_SCORE = 0.6
 
 
 def normalize_bank_merchant_key(value: str | None) -> str:
@@ -9,3 +13,79 @@ def normalize_bank_merchant_key(value: str | None) -> str:
     if len(normalized) < MIN_BANK_MERCHANT_KEY_LENGTH:
         return ""
     return normalized
+
+
+def bank_merchant_trigrams(merchant_key: str) -> frozenset[str]:
+    """Trigrams of the words of a merchant key, padded like PostgreSQL `pg_trgm`.
+
+    Digits are dropped first, so store numbers and terminal ids do not make two outlets
+    of one merchant look different.
+    """
+
+    return frozenset(
+        padded[index : index + 3]
+        for word in re.sub(r"\d+", " ", merchant_key).split()
+        for padded in (f"  {word} ",)
+        for index in range(len(padded) - 2)
+    )
+
+
+@dataclass(frozen=True, slots=True)
+class SimilarBankMerchant:
+    merchant_key: str
+    score: float
+
+
+class BankMerchantTrigramIndex:
+    """Finds the merchant key most similar to a new one by trigram similarity.
+
+    The score is shared trigrams divided by all trigrams of both keys. Keys are scored
+    through an inverted trigram index, so a lookup only touches keys sharing a trigram
+    with the searched one. Ties go to the key added first.
+    """
+
+    def __init__(self, merchant_keys: Iterable[str]) -> None:
+        self._keys: list[str] = []
+        self._trigram_counts: list[int] = []
+        self._postings: defaultdict[str, list[int]] = defaultdict(list)
+        for merchant_key in merchant_keys:
+            trigrams = bank_merchant_trigrams(merchant_key)
+            if not trigrams:
+                continue
+            position = len(self._keys)
+            self._keys.append(merchant_key)
+            self._trigram_counts.append(len(trigrams))
+            for trigram in trigrams:
+                self._postings[trigram].append(position)
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def best_match(
+        self,
+        merchant_key: str,
+        *,
+        min_score: float = SIMILAR_BANK_MERCHANT_MIN_SCORE,
+    ) -> SimilarBankMerchant | None:
+        """Return the most similar other key scoring at least `min_score`."""
+
+        trigrams = bank_merchant_trigrams(merchant_key)
+        if not trigrams:
+            return None
+
+        shared: Counter[int] = Counter()
+        for trigram in trigrams:
+            shared.update(self._postings.get(trigram, ()))
+
+        best: tuple[float, int] | None = None
+        for position, count in shared.items():
+            if self._keys[position] == merchant_key:
+                continue
+            score = count / (len(trigrams) + self._trigram_counts[position] - count)
+            if score < min_score:
+                continue
+            if best is None or score > best[0] or (score == best[0] and position < best[1]):
+                best = (score, position)
+        if best is None:
+            return None
+        return SimilarBankMerchant(merchant_key=self._keys[best[1]], score=best[0])
@@ -1,6 +1,10 @@
 import re
-from dataclasses import dataclass
+from collections.abc import Callable
+from dataclasses import dataclass, replace
 from datetime import time
+from functools import cached_property
+from hashlib import sha256
+from time import perf_counter
 
 from financial_bot.app.domain.bank_sms_profiles import (
     COMMON_OPERATION_MARKERS,
@@ -37,12 +41,21 @@ class ParsedBankSms:
     ignore_reason: str = ""
     is_adjusted_amount: bool = False
     operation_time: time | None = None
+    # Set when `redacted_text` is a placeholder that does not tell SMS apart.
+    normalized_text_hash: str = ""
 
     @property
     def creates_expense_candidate(self) -> bool:
         return self.operation_kind == BankSmsOperationKind.EXPENSE_CANDIDATE
 
 
+BANK_SHAPE_SENDERS = {
+    BankSmsBank.SBER.value: "900",
+    BankSmsBank.VTB.value: "VTB",
+    BankSmsBank.TBANK.value: "T-Bank",
+}
+
+
 @dataclass(frozen=True, slots=True)
 class BankSmsShape:
     bank: BankSmsBank
@@ -71,6 +84,72 @@ class BankSmsShape:
         )
 
 
+@dataclass(frozen=True)
+class NormalizedBankSms:
+    """One SMS after whitespace normalization; derived views are computed on first use."""
+
+    text: str
+    sender: str = ""
+
+    @cached_property
+    def bank(self) -> BankSmsBank:
+        return detect_bank_from_profiles(self.text, self.sender)
+
+    @cached_property
+    def ignore_reason(self) -> str:
+        return _ignore_reason(self.text)
+
+    @cached_property
+    def redacted_text(self) -> str:
+        return _redact_normalized_text(self.text)
+
+    @cached_property
+    def redacted_text_hash(self) -> str:
+        return hash_redacted_bank_sms(self.redacted_text)
+
+    @cached_property
+    def shape(self) -> BankSmsShape:
+        return BankSmsShape(
+            bank=self.bank,
+            operation_markers=tuple(
+                marker.code
+                for marker in COMMON_OPERATION_MARKERS
+                if marker.pattern.search(self.text)
+            ),
+            amount_count=len(SHAPE_AMOUNT_RE.findall(self.text)),
+            has_balance_marker=bool(SHAPE_BALANCE_MARKER_RE.search(self.text)),
+            has_instrument_marker=bool(SHAPE_INSTRUMENT_MARKER_RE.search(self.text)),
+            ignored_reason=self.ignore_reason,
+            has_security_marker=bool(SECURITY_MARKER_RE.search(self.text)),
+        )
+
+
+class _ParseBudgetExceededError(Exception):
+    pass
+
+
+@dataclass(frozen=True, slots=True)
+class _ParseDeadline:
+    """Cooperative parse deadline: a running regex cannot be interrupted, so parsing checks it
+    between pattern matches."""
+
+    expires_at: float | None
+
+    def check(self) -> None:
+        if self.expires_at is not None and perf_counter() >= self.expires_at:
+            raise _ParseBudgetExceededError
+
+
+type _BankSmsRuleParser = Callable[[re.Match[str], str, set[str]], ParsedBankSms]
+
+
+@dataclass(frozen=True, slots=True)
+class _BankSmsRule:
+    keywords: tuple[str, ...]
+    pattern: re.Pattern[str]
+    parse: _BankSmsRuleParser
+
+
 MONEY_RE = rf"(?P<amount>{AMOUNT_VALUE_PATTERN})\s*(?:₽|руб\.?|р\.?|RUB)"
 FEE_RE = rf"(?P<fee>{AMOUNT_VALUE_PATTERN})\s*(?:₽|руб\.?|р\.?|RUB)"
 TIME_RE = r"(?P<time>\d{2}:\d{2})"
@@ -89,17 +168,19 @@ COUNTERPARTY_RE = r"(?P<counterparty>.+?)"
 VTB_PAYMENT_INSTRUMENT_RE = r"(?P<instrument>Карта|Сч[её]т)\s*\*\d+"
 VTB_ACCOUNT_MASK_RE = r"Сч[её]т\s*\*\d+"
 
+# "A ... B" patterns commit to the first A (atomic group) so that text repeating A without a
+# following B is scanned once instead of once per A.
 IGNORE_PATTERNS = (
-    re.compile(r"никому\s+не\s+сообщайте.*\bкод\b", re.IGNORECASE),
-    re.compile(r"никому\s+не\s+говорите.*\bкод\b", re.IGNORECASE),
-    re.compile(r"\b3d-?s\b.*\bкод\b|\b3ds\b.*\bкод\b", re.IGNORECASE),
-    re.compile(r"для\s+оплаты\b.*\bкод\b", re.IGNORECASE),
+    re.compile(r"^(?>.*?никому\s+не\s+сообщайте).*\bкод\b", re.IGNORECASE),
+    re.compile(r"^(?>.*?никому\s+не\s+говорите).*\bкод\b", re.IGNORECASE),
+    re.compile(r"^(?>.*?\b3d-?s\b).*\bкод\b", re.IGNORECASE),
+    re.compile(r"^(?>.*?для\s+оплаты\b).*\bкод\b", re.IGNORECASE),
     re.compile(r"подтвердите\s+электронные\s+документы", re.IGNORECASE),
     re.compile(r"подключены\s+уведомления", re.IGNORECASE),
     re.compile(r"возвращайтесь\s+в\s+втб", re.IGNORECASE),
     re.compile(r"\bкод\s+подтверждения\b", re.IGNORECASE),
-    re.compile(r"\bодобрили\b.*\bлимит", re.IGNORECASE),
-    re.compile(r"\bоткройте\s+счет\b.*\bподар", re.IGNORECASE),
+    re.compile(r"^(?>.*?\bодобрили\b).*\bлимит", re.IGNORECASE),
+    re.compile(r"^(?>.*?\bоткройте\s+счет\b).*\bподар", re.IGNORECASE),
     re.compile(r"\bвстреча\s+с\s+представителем\b", re.IGNORECASE),
 )
 
@@ -256,6 +337,55 @@ TBANK_SAFE_PAYMENT_FALLBACK_RE = re.compile(
     re.IGNORECASE,
 )
 
+REDACTION_RULES: tuple[tuple[re.Pattern[str], str], ...] = tuple(
+    (re.compile(pattern, re.IGNORECASE), replacement)
+    for pattern, replacement in (
+        (
+            rf"Баланс:?\s+{AMOUNT_VALUE_PATTERN}\s*(?:₽|руб\.?|р\.?|RUB)",
+            "Баланс: <redacted>",
+        ),
+        (rf"Доступно\s+{AMOUNT_VALUE_PATTERN}\s*RUB", "Доступно <redacted>"),
+        (r"Карта\s*\*\d+", "Карта*<redacted>"),
+        (r"Сч[её]т\s*\*\d+", "Счет*<redacted>"),
+        (r"Сч[её]т\s+карты\s+MIR-\d+", "Счёт карты MIR-<redacted>"),
+        (r"СЧ[ЕЁ]Т\d+", "СЧЁТ<redacted>"),
+        (
+            rf"(Списание\s+{AMOUNT_VALUE_PATTERN}\s*(?:₽|руб\.?|р\.?)\s+"
+            r"Счет\*<redacted>\s+).+?(\s+Баланс:?\s+<redacted>)",
+            r"\1<counterparty>\2",
+        ),
+        (r"(\sот\s+).+?(\s+Баланс:?\s+<redacted>)", r"\1<counterparty>\2"),
+        (
+            rf"(СЧЁТ<redacted>(?:\s+\d{{2}}\.\d{{2}}\.\d{{2,4}})?"
+            rf"\s+\d{{2}}:\d{{2}}\s+перевод\s+{AMOUNT_VALUE_PATTERN}"
+            r"\s*(?:₽|руб\.?|р\.?)?\s+).+?(\s+Баланс:?\s+<redacted>)",
+            r"\1<counterparty>\2",
+        ),
+        (
+            rf"(Пополнение[,]?\s+сч[её]т\s+RUB\.?\s+{AMOUNT_VALUE_PATTERN}\s*RUB\.?\s+)"
+            r".+?(\s+Доступно\s+<redacted>)",
+            r"\1<counterparty>\2",
+        ),
+        (
+            rf"(Перевод\.?\s+Карта\*<redacted>\.?\s+{AMOUNT_VALUE_PATTERN}\s*RUB\.?\s+)"
+            r".+?(\s+Баланс:?\s+<redacted>)",
+            r"\1<counterparty>\2",
+        ),
+    )
+)
+SECRET_CODE_MARKER_RE = re.compile(r"\bкод\b|\bпароль\b", re.IGNORECASE)
+SECRET_CODE_RE = re.compile(r"\b\d{4,8}\b")
+WHITESPACE_RE = re.compile(r"\s+")
+# Operation keyword that selects the candidate patterns: the first word, or for Sber the
+# word after the account and time prefix.
+LEADING_KEYWORD_RE = re.compile(r"(?P<keyword>\w+)")
+SBER_OPERATION_KEYWORD_RE = re.compile(
+    rf"(?:Сч[её]т\s+карты\s+MIR-\d+|СЧ[ЕЁ]Т\d+){SBER_OPTIONAL_OPERATION_DATE_RE}"
+    r"\s+\d{2}:\d{2}\s+(?P<keyword>\w+)",
+    re.IGNORECASE,
+)
+COUNTERPARTY_NOISE_RE = re.compile(r"[^0-9a-zа-яё]+")
+
 CATEGORY_HINTS: tuple[tuple[tuple[str, ...], str], ...] = (
     (("GAZPROMNEFT", "АЗС", " AZS", "BENZIN", "ТОПЛИВО"), "auto"),
     (("BEELINE", "БИЛАЙН", "MTS", "МТС", "MEGAFON", "МЕГАФОН"), "subscriptions_communications"),
@@ -267,34 +397,76 @@ CATEGORY_HINTS: tuple[tuple[tuple[str, ...], str], ...] = (
 )
 
 
+def normalize_bank_sms(text: str, *, sender: str = "") -> NormalizedBankSms:
+    return NormalizedBankSms(text=_normalize_text(text), sender=sender)
+
+
 def parse_bank_sms(
     text: str,
     *,
     sender: str = "",
     self_counterparty_aliases: tuple[str, ...] | set[str] | frozenset[str] = (),
+    budget_seconds: float | None = None,
 ) -> ParsedBankSms:
-    normalized_text = _normalize_text(text)
-    redacted_text = redact_bank_sms_text(normalized_text)
-    bank = _detect_bank(normalized_text, sender)
+    return parse_normalized_bank_sms(
+        normalize_bank_sms(text, sender=sender),
+        self_counterparty_aliases=self_counterparty_aliases,
+        budget_seconds=budget_seconds,
+    )
+
+
+def parse_normalized_bank_sms(
+    sms: NormalizedBankSms,
+    *,
+    self_counterparty_aliases: tuple[str, ...] | set[str] | frozenset[str] = (),
+    budget_seconds: float | None = None,
+) -> ParsedBankSms:
+    """Parse `sms`; past `budget_seconds` the result is `unknown_format` without the text."""
+
+    deadline = _ParseDeadline(
+        expires_at=None if budget_seconds is None else perf_counter() + budget_seconds
+    )
+    try:
+        return _parse_normalized_bank_sms(sms, self_counterparty_aliases, deadline)
+    except _ParseBudgetExceededError:
+        # Redaction may not have finished, so the text is not kept, only its hash: the
+        # placeholder is the same for every such SMS and must not make them duplicates.
+        return ParsedBankSms(
+            bank=sms.bank,
+            operation_kind=BankSmsOperationKind.UNKNOWN,
+            redacted_text=_ignored_redacted_text(sms.bank, "unknown_format"),
+            ignore_reason="unknown_format",
+            normalized_text_hash=hash_redacted_bank_sms(sms.text),
+        )
+
 
-    ignore_reason = _ignore_reason(normalized_text)
-    if ignore_reason:
+def _parse_normalized_bank_sms(
+    sms: NormalizedBankSms,
+    self_counterparty_aliases: tuple[str, ...] | set[str] | frozenset[str],
+    deadline: _ParseDeadline,
+) -> ParsedBankSms:
+    bank = sms.bank
+    deadline.check()
+    if sms.ignore_reason:
         return ParsedBankSms(
             bank=bank,
             operation_kind=BankSmsOperationKind.IGNORED,
             requires_confirmation=False,
-            redacted_text=_ignored_redacted_text(bank, ignore_reason),
-            ignore_reason=ignore_reason,
+            redacted_text=_ignored_redacted_text(bank, sms.ignore_reason),
+            ignore_reason=sms.ignore_reason,
         )
 
     self_aliases = {_normalize_counterparty(alias) for alias in self_counterparty_aliases}
+    deadline.check()
+    redacted_text = sms.redacted_text
+    deadline.check()
 
     if bank == BankSmsBank.VTB:
-        return _parse_vtb(normalized_text, redacted_text, self_aliases)
+        return _parse_vtb(sms.text, redacted_text, self_aliases, deadline)
     if bank == BankSmsBank.SBER:
-        return _parse_sber(normalized_text, redacted_text, self_aliases)
+        return _parse_sber(sms.text, redacted_text, self_aliases, deadline)
     if bank == BankSmsBank.TBANK:
-        return _parse_tbank(normalized_text, redacted_text, self_aliases)
+        return _parse_tbank(sms.text, redacted_text, self_aliases, deadline)
 
     return ParsedBankSms(
         bank=BankSmsBank.UNKNOWN,
@@ -305,593 +477,499 @@ def parse_bank_sms(
 
 
 def classify_bank_sms_shape(text: str, *, sender: str = "") -> BankSmsShape:
-    normalized_text = _normalize_text(text)
-    ignored_reason = _ignore_reason(normalized_text)
-    return BankSmsShape(
-        bank=_detect_bank(normalized_text, sender),
-        operation_markers=tuple(
-            marker.code
-            for marker in COMMON_OPERATION_MARKERS
-            if marker.pattern.search(normalized_text)
-        ),
-        amount_count=len(SHAPE_AMOUNT_RE.findall(normalized_text)),
-        has_balance_marker=bool(SHAPE_BALANCE_MARKER_RE.search(normalized_text)),
-        has_instrument_marker=bool(SHAPE_INSTRUMENT_MARKER_RE.search(normalized_text)),
-        ignored_reason=ignored_reason,
-        has_security_marker=bool(SECURITY_MARKER_RE.search(normalized_text)),
+    return normalize_bank_sms(text, sender=sender).shape
+
+
+def classify_redacted_bank_sms_shape(redacted_text: str, *, bank: str) -> BankSmsShape:
+    """Shape of a stored event's `redacted_text`, read as an SMS from `bank`'s sender."""
+
+    return classify_bank_sms_shape(redacted_text, sender=BANK_SHAPE_SENDERS.get(bank, ""))
+
+
+def hash_bank_sms_shape(shape: BankSmsShape) -> str:
+    """Stable hash of the shape fields unknown SMS are grouped by; the bank is not part of it."""
+
+    fingerprint = "|".join(
+        (
+            ",".join(shape.operation_markers),
+            str(shape.amount_count),
+            str(int(shape.has_balance_marker)),
+            str(int(shape.has_instrument_marker)),
+            shape.ignored_reason,
+            str(int(shape.has_security_marker)),
+        )
     )
+    return sha256(fingerprint.encode("utf-8")).hexdigest()
 
 
 def redact_bank_sms_text(text: str) -> str:
-    redacted = _normalize_text(text)
-    redacted = re.sub(
-        rf"Баланс:?\s+{AMOUNT_VALUE_PATTERN}\s*(?:₽|руб\.?|р\.?|RUB)",
-        "Баланс: <redacted>",
-        redacted,
-        flags=re.IGNORECASE,
-    )
-    redacted = re.sub(
-        rf"Доступно\s+{AMOUNT_VALUE_PATTERN}\s*RUB",
-        "Доступно <redacted>",
-        redacted,
-        flags=re.IGNORECASE,
-    )
-    redacted = re.sub(r"Карта\s*\*\d+", "Карта*<redacted>", redacted, flags=re.IGNORECASE)
-    redacted = re.sub(r"Сч[её]т\s*\*\d+", "Счет*<redacted>", redacted, flags=re.IGNORECASE)
-    redacted = re.sub(
-        r"Сч[её]т\s+карты\s+MIR-\d+",
-        "Счёт карты MIR-<redacted>",
-        redacted,
-        flags=re.IGNORECASE,
-    )
-    redacted = re.sub(r"СЧ[ЕЁ]Т\d+", "СЧЁТ<redacted>", redacted, flags=re.IGNORECASE)
-    redacted = re.sub(
-        rf"(Списание\s+{AMOUNT_VALUE_PATTERN}\s*(?:₽|руб\.?|р\.?)\s+"
-        r"Счет\*<redacted>\s+).+?(\s+Баланс:?\s+<redacted>)",
-        r"\1<counterparty>\2",
-        redacted,
-        flags=re.IGNORECASE,
-    )
-    redacted = re.sub(
-        r"(\sот\s+).+?(\s+Баланс:?\s+<redacted>)",
-        r"\1<counterparty>\2",
-        redacted,
-        flags=re.IGNORECASE,
-    )
-    redacted = re.sub(
-        rf"(СЧЁТ<redacted>(?:\s+\d{{2}}\.\d{{2}}\.\d{{2,4}})?"
-        rf"\s+\d{{2}}:\d{{2}}\s+перевод\s+{AMOUNT_VALUE_PATTERN}"
-        r"\s*(?:₽|руб\.?|р\.?)?\s+).+?(\s+Баланс:?\s+<redacted>)",
-        r"\1<counterparty>\2",
-        redacted,
-        flags=re.IGNORECASE,
+    return _redact_normalized_text(_normalize_text(text))
+
+
+def hash_redacted_bank_sms(redacted_text: str) -> str:
+    """Hash stored with bank events to spot repeated SMS; `redacted_text` is already normalized."""
+
+    return sha256(redacted_text.lower().encode("utf-8")).hexdigest()
+
+
+def _redact_normalized_text(text: str) -> str:
+    redacted = text
+    for pattern, replacement in REDACTION_RULES:
+        redacted = pattern.sub(replacement, redacted)
+    if SECRET_CODE_MARKER_RE.search(redacted):
+        redacted = SECRET_CODE_RE.sub("<code>", redacted)
+    return redacted
+
+
+def _parse_vtb(
+    text: str,
+    redacted_text: str,
+    self_aliases: set[str],
+    deadline: _ParseDeadline,
+) -> ParsedBankSms:
+    return _parse_with_rules(
+        VTB_RULES_BY_KEYWORD,
+        _leading_keyword(text),
+        text,
+        redacted_text,
+        self_aliases,
+        deadline,
+    ) or ParsedBankSms(
+        bank=BankSmsBank.VTB,
+        operation_kind=BankSmsOperationKind.UNKNOWN,
+        redacted_text=redacted_text,
+        ignore_reason="unsupported_vtb_format",
     )
-    redacted = re.sub(
-        rf"(Пополнение[,]?\s+сч[её]т\s+RUB\.?\s+{AMOUNT_VALUE_PATTERN}\s*RUB\.?\s+)"
-        r".+?(\s+Доступно\s+<redacted>)",
-        r"\1<counterparty>\2",
-        redacted,
-        flags=re.IGNORECASE,
+
+
+def _parse_sber(
+    text: str,
+    redacted_text: str,
+    self_aliases: set[str],
+    deadline: _ParseDeadline,
+) -> ParsedBankSms:
+    return _parse_with_rules(
+        SBER_RULES_BY_KEYWORD,
+        _sber_operation_keyword(text),
+        text,
+        redacted_text,
+        self_aliases,
+        deadline,
+    ) or ParsedBankSms(
+        bank=BankSmsBank.SBER,
+        operation_kind=BankSmsOperationKind.UNKNOWN,
+        redacted_text=redacted_text,
+        ignore_reason="unsupported_sber_format",
     )
-    redacted = re.sub(
-        rf"(Перевод\.?\s+Карта\*<redacted>\.?\s+{AMOUNT_VALUE_PATTERN}\s*RUB\.?\s+)"
-        r".+?(\s+Баланс:?\s+<redacted>)",
-        r"\1<counterparty>\2",
-        redacted,
-        flags=re.IGNORECASE,
+
+
+def _parse_tbank(
+    text: str,
+    redacted_text: str,
+    self_aliases: set[str],
+    deadline: _ParseDeadline,
+) -> ParsedBankSms:
+    return _parse_with_rules(
+        TBANK_RULES_BY_KEYWORD,
+        _leading_keyword(text),
+        text,
+        redacted_text,
+        self_aliases,
+        deadline,
+    ) or ParsedBankSms(
+        bank=BankSmsBank.TBANK,
+        operation_kind=BankSmsOperationKind.UNKNOWN,
+        redacted_text=redacted_text,
+        ignore_reason="unsupported_tbank_format",
     )
-    if re.search(r"\bкод\b|\bпароль\b", redacted, re.IGNORECASE):
-        redacted = re.sub(r"\b\d{4,8}\b", "<code>", redacted)
-    return redacted
 
 
-def _parse_vtb(text: str, redacted_text: str, self_aliases: set[str]) -> ParsedBankSms:
-    if match := VTB_ADJUSTED_PAYMENT_RE.fullmatch(text):
-        return _expense_candidate(
-            bank=BankSmsBank.VTB,
-            amount_raw=match.group("amount"),
-            merchant=_clean_party(match.group("merchant")),
-            source=_vtb_payment_source(match.group("instrument")),
-            redacted_text=redacted_text,
-            is_adjusted_amount=True,
-            operation_time=_parse_operation_time(match.group("time")),
-        )
+def _parse_with_rules(
+    rules_by_keyword: dict[str, tuple[_BankSmsRule, ...]],
+    keyword: str,
+    text: str,
+    redacted_text: str,
+    self_aliases: set[str],
+    deadline: _ParseDeadline,
+) -> ParsedBankSms | None:
+    for rule in rules_by_keyword.get(keyword, ()):
+        deadline.check()
+        if match := rule.pattern.fullmatch(text):
+            return rule.parse(match, redacted_text, self_aliases)
+    return None
 
-    if match := VTB_CARD_PAYMENT_RE.fullmatch(text):
-        return _expense_candidate(
-            bank=BankSmsBank.VTB,
-            amount_raw=match.group("amount"),
-            merchant=_clean_party(match.group("merchant")),
-            source=_vtb_payment_source(match.group("instrument")),
-            redacted_text=redacted_text,
-            operation_time=_parse_operation_time(match.group("time")),
-        )
 
-    if match := VTB_OUTGOING_DEBIT_RE.fullmatch(text):
-        counterparty = _clean_party(match.group("counterparty"))
-        amount = _parse_amount(match.group("amount"))
-        if _is_self_counterparty(counterparty, self_aliases):
-            return ParsedBankSms(
-                bank=BankSmsBank.VTB,
-                operation_kind=BankSmsOperationKind.INTERNAL_TRANSFER,
-                amount=amount,
-                counterparty=counterparty,
-                source=TransactionSource.TRANSFER,
-                suggested_category_code="internal_transfer",
-                requires_confirmation=False,
-                redacted_text=redacted_text,
-                operation_time=_parse_operation_time(match.group("time")),
-            )
-        return ParsedBankSms(
-            bank=BankSmsBank.VTB,
-            operation_kind=BankSmsOperationKind.EXPENSE_CANDIDATE,
-            amount=amount,
-            counterparty=counterparty,
-            source=TransactionSource.TRANSFER,
-            suggested_category_code="help_reserve",
-            redacted_text=redacted_text,
-            operation_time=_parse_operation_time(match.group("time")),
-        )
+def _leading_keyword(text: str) -> str:
+    match = LEADING_KEYWORD_RE.match(text)
+    return match.group("keyword").casefold() if match else ""
 
-    if match := VTB_INCOMING_CREDIT_RE.fullmatch(text):
-        counterparty = _clean_party(match.group("counterparty"))
-        amount = _parse_amount(match.group("amount"))
-        if _is_self_counterparty(counterparty, self_aliases):
-            operation_kind = BankSmsOperationKind.INTERNAL_TRANSFER
-            category_code = "internal_transfer"
-            requires_confirmation = False
-        else:
-            operation_kind = BankSmsOperationKind.INCOME
-            category_code = None
-            requires_confirmation = False
-        return ParsedBankSms(
-            bank=BankSmsBank.VTB,
-            operation_kind=operation_kind,
-            amount=amount,
-            counterparty=counterparty,
-            source=TransactionSource.TRANSFER,
-            suggested_category_code=category_code,
-            requires_confirmation=requires_confirmation,
-            redacted_text=redacted_text,
-            operation_time=_parse_operation_time(match.group("time")),
-        )
 
-    if match := VTB_SAFE_OUTGOING_DEBIT_FALLBACK_RE.fullmatch(text):
-        counterparty = _clean_party(match.group("counterparty"))
-        amount = _parse_amount(match.group("amount"))
-        if _is_self_counterparty(counterparty, self_aliases):
-            return ParsedBankSms(
-                bank=BankSmsBank.VTB,
-                operation_kind=BankSmsOperationKind.INTERNAL_TRANSFER,
-                amount=amount,
-                counterparty=counterparty,
-                source=TransactionSource.TRANSFER,
-                suggested_category_code="internal_transfer",
-                requires_confirmation=False,
-                redacted_text=redacted_text,
-                operation_time=_parse_operation_time(match.group("time")),
-            )
-        return ParsedBankSms(
-            bank=BankSmsBank.VTB,
-            operation_kind=BankSmsOperationKind.EXPENSE_CANDIDATE,
-            amount=amount,
-            counterparty=counterparty,
-            source=TransactionSource.TRANSFER,
-            suggested_category_code="help_reserve",
-            redacted_text=redacted_text,
-            operation_time=_parse_operation_time(match.group("time")),
-        )
+def _sber_operation_keyword(text: str) -> str:
+    match = SBER_OPERATION_KEYWORD_RE.match(text)
+    return match.group("keyword").casefold() if match else ""
+
 
-    if match := VTB_SAFE_INCOMING_CREDIT_FALLBACK_RE.fullmatch(text):
-        counterparty = _clean_party(match.group("counterparty"))
-        amount = _parse_amount(match.group("amount"))
-        if _is_self_counterparty(counterparty, self_aliases):
-            operation_kind = BankSmsOperationKind.INTERNAL_TRANSFER
-            category_code = "internal_transfer"
-            requires_confirmation = False
-        else:
-            operation_kind = BankSmsOperationKind.INCOME
-            category_code = None
-            requires_confirmation = False
+def _vtb_payment(match: re.Match[str], redacted_text: str, _: set[str]) -> ParsedBankSms:
+    return _expense_candidate(
+        bank=BankSmsBank.VTB,
+        amount_raw=match.group("amount"),
+        merchant=_clean_party(match.group("merchant")),
+        source=_vtb_payment_source(match.group("instrument")),
+        redacted_text=redacted_text,
+        is_adjusted_amount=bool(match.groupdict().get("adjusted")),
+        operation_time=_parse_operation_time(match.group("time")),
+    )
+
+
+def _vtb_adjusted_payment(
+    match: re.Match[str],
+    redacted_text: str,
+    self_aliases: set[str],
+) -> ParsedBankSms:
+    return replace(_vtb_payment(match, redacted_text, self_aliases), is_adjusted_amount=True)
+
+
+def _vtb_outgoing_debit(
+    match: re.Match[str],
+    redacted_text: str,
+    self_aliases: set[str],
+) -> ParsedBankSms:
+    counterparty = _clean_party(match.group("counterparty"))
+    amount = _parse_amount(match.group("amount"))
+    if _is_self_counterparty(counterparty, self_aliases):
         return ParsedBankSms(
             bank=BankSmsBank.VTB,
-            operation_kind=operation_kind,
+            operation_kind=BankSmsOperationKind.INTERNAL_TRANSFER,
             amount=amount,
             counterparty=counterparty,
             source=TransactionSource.TRANSFER,
-            suggested_category_code=category_code,
-            requires_confirmation=requires_confirmation,
+            suggested_category_code="internal_transfer",
+            requires_confirmation=False,
             redacted_text=redacted_text,
             operation_time=_parse_operation_time(match.group("time")),
         )
+    return ParsedBankSms(
+        bank=BankSmsBank.VTB,
+        operation_kind=BankSmsOperationKind.EXPENSE_CANDIDATE,
+        amount=amount,
+        counterparty=counterparty,
+        source=TransactionSource.TRANSFER,
+        suggested_category_code="help_reserve",
+        redacted_text=redacted_text,
+        operation_time=_parse_operation_time(match.group("time")),
+    )
 
-    if match := VTB_SAFE_PAYMENT_FALLBACK_RE.fullmatch(text):
-        return _expense_candidate(
-            bank=BankSmsBank.VTB,
-            amount_raw=match.group("amount"),
-            merchant=_clean_party(match.group("merchant")),
-            source=_vtb_payment_source(match.group("instrument")),
-            redacted_text=redacted_text,
-            is_adjusted_amount=bool(match.group("adjusted")),
-            operation_time=_parse_operation_time(match.group("time")),
-        )
 
+def _vtb_incoming_credit(
+    match: re.Match[str],
+    redacted_text: str,
+    self_aliases: set[str],
+) -> ParsedBankSms:
+    counterparty = _clean_party(match.group("counterparty"))
+    amount = _parse_amount(match.group("amount"))
+    if _is_self_counterparty(counterparty, self_aliases):
+        operation_kind = BankSmsOperationKind.INTERNAL_TRANSFER
+        category_code = "internal_transfer"
+    else:
+        operation_kind = BankSmsOperationKind.INCOME
+        category_code = None
     return ParsedBankSms(
         bank=BankSmsBank.VTB,
-        operation_kind=BankSmsOperationKind.UNKNOWN,
+        operation_kind=operation_kind,
+        amount=amount,
+        counterparty=counterparty,
+        source=TransactionSource.TRANSFER,
+        suggested_category_code=category_code,
+        requires_confirmation=False,
         redacted_text=redacted_text,
-        ignore_reason="unsupported_vtb_format",
+        operation_time=_parse_operation_time(match.group("time")),
     )
 
 
-def _parse_sber(text: str, redacted_text: str, self_aliases: set[str]) -> ParsedBankSms:
-    if match := SBER_CARD_REFUND_RE.fullmatch(text):
-        merchant = _clean_party(match.group("merchant"))
-        return ParsedBankSms(
-            bank=BankSmsBank.SBER,
-            operation_kind=BankSmsOperationKind.REFUND,
-            amount=_parse_amount(match.group("amount")),
-            merchant=merchant,
-            source=TransactionSource.CARD,
-            suggested_category_code=_suggest_category_code(merchant),
-            redacted_text=redacted_text,
-            operation_time=_parse_operation_time(match.group("time")),
-        )
+def _sber_card_refund(match: re.Match[str], redacted_text: str, _: set[str]) -> ParsedBankSms:
+    merchant = _clean_party(match.group("merchant"))
+    return ParsedBankSms(
+        bank=BankSmsBank.SBER,
+        operation_kind=BankSmsOperationKind.REFUND,
+        amount=_parse_amount(match.group("amount")),
+        merchant=merchant,
+        source=TransactionSource.CARD,
+        suggested_category_code=_suggest_category_code(merchant),
+        redacted_text=redacted_text,
+        operation_time=_parse_operation_time(match.group("time")),
+    )
 
-    if match := SBER_SAFE_REFUND_FALLBACK_RE.fullmatch(text):
-        merchant = _clean_party(match.group("merchant"))
-        return ParsedBankSms(
-            bank=BankSmsBank.SBER,
-            operation_kind=BankSmsOperationKind.REFUND,
-            amount=_parse_amount(match.group("amount")),
-            merchant=merchant,
-            source=_sber_purchase_source(
-                instrument=match.group("instrument"),
-                is_sbp=bool(match.group("sbp")),
-            ),
-            suggested_category_code=_suggest_category_code(merchant),
-            redacted_text=redacted_text,
-            operation_time=_parse_operation_time(match.group("time")),
-        )
 
-    if match := SBER_PURCHASE_RE.fullmatch(text):
-        return _expense_candidate(
-            bank=BankSmsBank.SBER,
-            amount_raw=match.group("amount"),
-            merchant=_clean_party(match.group("merchant")),
-            source=_sber_purchase_source(
-                instrument=match.group("instrument"),
-                is_sbp=bool(match.group("sbp")),
-            ),
-            redacted_text=redacted_text,
-            operation_time=_parse_operation_time(match.group("time")),
-        )
+def _sber_refund(match: re.Match[str], redacted_text: str, _: set[str]) -> ParsedBankSms:
+    merchant = _clean_party(match.group("merchant"))
+    return ParsedBankSms(
+        bank=BankSmsBank.SBER,
+        operation_kind=BankSmsOperationKind.REFUND,
+        amount=_parse_amount(match.group("amount")),
+        merchant=merchant,
+        source=_sber_purchase_source(
+            instrument=match.group("instrument"),
+            is_sbp=bool(match.group("sbp")),
+        ),
+        suggested_category_code=_suggest_category_code(merchant),
+        redacted_text=redacted_text,
+        operation_time=_parse_operation_time(match.group("time")),
+    )
 
-    if match := SBER_CARD_SBP_PURCHASE_RE.fullmatch(text):
-        return _expense_candidate(
-            bank=BankSmsBank.SBER,
-            amount_raw=match.group("amount"),
-            merchant=_clean_party(match.group("merchant")),
-            source=TransactionSource.TRANSFER,
-            redacted_text=redacted_text,
-            operation_time=_parse_operation_time(match.group("time")),
-        )
 
-    if match := SBER_CARD_PURCHASE_RE.fullmatch(text):
-        return _expense_candidate(
-            bank=BankSmsBank.SBER,
-            amount_raw=match.group("amount"),
-            merchant=_clean_party(match.group("merchant")),
-            source=TransactionSource.CARD,
-            redacted_text=redacted_text,
-            operation_time=_parse_operation_time(match.group("time")),
-        )
+def _sber_purchase(match: re.Match[str], redacted_text: str, _: set[str]) -> ParsedBankSms:
+    return _expense_candidate(
+        bank=BankSmsBank.SBER,
+        amount_raw=match.group("amount"),
+        merchant=_clean_party(match.group("merchant") or ""),
+        source=_sber_purchase_source(
+            instrument=match.group("instrument"),
+            is_sbp=bool(match.group("sbp")),
+        ),
+        redacted_text=redacted_text,
+        operation_time=_parse_operation_time(match.group("time")),
+    )
+
 
-    if match := SBER_CARD_PAYMENT_RE.fullmatch(text):
-        merchant = _clean_party(match.group("merchant") or "")
+def _sber_expense(source: TransactionSource) -> _BankSmsRuleParser:
+    def parse(match: re.Match[str], redacted_text: str, _: set[str]) -> ParsedBankSms:
+        fee = match.groupdict().get("fee")
         return _expense_candidate(
             bank=BankSmsBank.SBER,
             amount_raw=match.group("amount"),
-            merchant=merchant,
-            source=TransactionSource.CARD,
-            redacted_text=redacted_text,
-            fee_amount=_parse_amount(match.group("fee")) if match.group("fee") else None,
-            operation_time=_parse_operation_time(match.group("time")),
-        )
-
-    if match := SBER_INCOMING_SBP_RE.fullmatch(text):
-        counterparty = _clean_party(match.group("counterparty"))
-        amount = _parse_amount(match.group("amount"))
-        if _is_self_counterparty(counterparty, self_aliases):
-            return ParsedBankSms(
-                bank=BankSmsBank.SBER,
-                operation_kind=BankSmsOperationKind.INTERNAL_TRANSFER,
-                amount=amount,
-                counterparty=counterparty,
-                source=TransactionSource.TRANSFER,
-                suggested_category_code="internal_transfer",
-                requires_confirmation=False,
-                redacted_text=redacted_text,
-                operation_time=_parse_operation_time(match.group("time")),
-            )
-        return ParsedBankSms(
-            bank=BankSmsBank.SBER,
-            operation_kind=BankSmsOperationKind.INCOME,
-            amount=amount,
-            counterparty=counterparty,
-            source=TransactionSource.TRANSFER,
-            requires_confirmation=False,
+            merchant=_clean_party(match.group("merchant") or ""),
+            source=source,
             redacted_text=redacted_text,
+            fee_amount=_parse_amount(fee) if fee else None,
             operation_time=_parse_operation_time(match.group("time")),
         )
 
-    if match := SBER_SAFE_INCOMING_SBP_FALLBACK_RE.fullmatch(text):
-        counterparty = _clean_party(match.group("counterparty"))
-        amount = _parse_amount(match.group("amount"))
-        if _is_self_counterparty(counterparty, self_aliases):
-            return ParsedBankSms(
-                bank=BankSmsBank.SBER,
-                operation_kind=BankSmsOperationKind.INTERNAL_TRANSFER,
-                amount=amount,
-                counterparty=counterparty,
-                source=TransactionSource.TRANSFER,
-                suggested_category_code="internal_transfer",
-                requires_confirmation=False,
-                redacted_text=redacted_text,
-                operation_time=_parse_operation_time(match.group("time")),
-            )
-        return ParsedBankSms(
-            bank=BankSmsBank.SBER,
-            operation_kind=BankSmsOperationKind.INCOME,
-            amount=amount,
-            counterparty=counterparty,
-            source=TransactionSource.TRANSFER,
-            requires_confirmation=False,
-            redacted_text=redacted_text,
-            operation_time=_parse_operation_time(match.group("time")),
-        )
+    return parse
 
-    if match := SBER_OUTGOING_TRANSFER_RE.fullmatch(text):
-        counterparty = _clean_party(match.group("counterparty") or "")
-        amount = _parse_amount(match.group("amount"))
-        if counterparty and _is_self_counterparty(counterparty, self_aliases):
-            operation_kind = BankSmsOperationKind.INTERNAL_TRANSFER
-            category_code = "internal_transfer"
-            requires_confirmation = False
-        else:
-            operation_kind = BankSmsOperationKind.EXPENSE_CANDIDATE
-            category_code = "help_reserve"
-            requires_confirmation = True
-        return ParsedBankSms(
-            bank=BankSmsBank.SBER,
-            operation_kind=operation_kind,
-            amount=amount,
-            counterparty=counterparty,
-            source=TransactionSource.TRANSFER,
-            suggested_category_code=category_code,
-            requires_confirmation=requires_confirmation,
-            redacted_text=redacted_text,
-            operation_time=_parse_operation_time(match.group("time")),
-        )
 
-    if match := SBER_SAFE_OUTGOING_TRANSFER_FALLBACK_RE.fullmatch(text):
-        counterparty = _clean_party(match.group("counterparty") or "")
-        amount = _parse_amount(match.group("amount"))
-        if counterparty and _is_self_counterparty(counterparty, self_aliases):
-            operation_kind = BankSmsOperationKind.INTERNAL_TRANSFER
-            category_code = "internal_transfer"
-            requires_confirmation = False
-        else:
-            operation_kind = BankSmsOperationKind.EXPENSE_CANDIDATE
-            category_code = "help_reserve"
-            requires_confirmation = True
+def _sber_incoming_sbp(
+    match: re.Match[str],
+    redacted_text: str,
+    self_aliases: set[str],
+) -> ParsedBankSms:
+    counterparty = _clean_party(match.group("counterparty"))
+    amount = _parse_amount(match.group("amount"))
+    if _is_self_counterparty(counterparty, self_aliases):
         return ParsedBankSms(
             bank=BankSmsBank.SBER,
-            operation_kind=operation_kind,
+            operation_kind=BankSmsOperationKind.INTERNAL_TRANSFER,
             amount=amount,
             counterparty=counterparty,
             source=TransactionSource.TRANSFER,
-            suggested_category_code=category_code,
-            requires_confirmation=requires_confirmation,
-            redacted_text=redacted_text,
-            operation_time=_parse_operation_time(match.group("time")),
-        )
-
-    if match := SBER_SALARY_RE.fullmatch(text):
-        return ParsedBankSms(
-            bank=BankSmsBank.SBER,
-            operation_kind=BankSmsOperationKind.INCOME,
-            amount=_parse_amount(match.group("amount")),
-            source=TransactionSource.TRANSFER,
-            requires_confirmation=False,
-            redacted_text=redacted_text,
-            operation_time=_parse_operation_time(match.group("time")),
-        )
-
-    if match := SBER_GENERIC_CREDIT_RE.fullmatch(text):
-        return ParsedBankSms(
-            bank=BankSmsBank.SBER,
-            operation_kind=BankSmsOperationKind.INCOME,
-            amount=_parse_amount(match.group("amount")),
-            source=TransactionSource.TRANSFER,
+            suggested_category_code="internal_transfer",
             requires_confirmation=False,
             redacted_text=redacted_text,
             operation_time=_parse_operation_time(match.group("time")),
         )
+    return ParsedBankSms(
+        bank=BankSmsBank.SBER,
+        operation_kind=BankSmsOperationKind.INCOME,
+        amount=amount,
+        counterparty=counterparty,
+        source=TransactionSource.TRANSFER,
+        requires_confirmation=False,
+        redacted_text=redacted_text,
+        operation_time=_parse_operation_time(match.group("time")),
+    )
 
-    if match := SBER_SAFE_CREDIT_FALLBACK_RE.fullmatch(text):
-        counterparty = _clean_party(match.group("counterparty") or "")
-        amount = _parse_amount(match.group("amount"))
-        if counterparty and _is_self_counterparty(counterparty, self_aliases):
-            operation_kind = BankSmsOperationKind.INTERNAL_TRANSFER
-            category_code = "internal_transfer"
-        else:
-            operation_kind = BankSmsOperationKind.INCOME
-            category_code = None
-        return ParsedBankSms(
-            bank=BankSmsBank.SBER,
-            operation_kind=operation_kind,
-            amount=amount,
-            counterparty=counterparty,
-            source=TransactionSource.TRANSFER,
-            suggested_category_code=category_code,
-            requires_confirmation=False,
-            redacted_text=redacted_text,
-            operation_time=_parse_operation_time(match.group("time")),
-        )
 
-    if match := SBER_ACCOUNT_PAYMENT_RE.fullmatch(text):
-        return _expense_candidate(
-            bank=BankSmsBank.SBER,
-            amount_raw=match.group("amount"),
-            merchant=_clean_party(match.group("merchant") or ""),
-            source=TransactionSource.TRANSFER,
-            redacted_text=redacted_text,
-            operation_time=_parse_operation_time(match.group("time")),
-        )
-
-    if match := SBER_ACCOUNT_PURCHASE_RE.fullmatch(text):
-        return _expense_candidate(
-            bank=BankSmsBank.SBER,
-            amount_raw=match.group("amount"),
-            merchant=_clean_party(match.group("merchant")),
-            source=TransactionSource.TRANSFER,
-            redacted_text=redacted_text,
-            operation_time=_parse_operation_time(match.group("time")),
-        )
+def _sber_outgoing_transfer(
+    match: re.Match[str],
+    redacted_text: str,
+    self_aliases: set[str],
+) -> ParsedBankSms:
+    counterparty = _clean_party(match.group("counterparty") or "")
+    amount = _parse_amount(match.group("amount"))
+    if counterparty and _is_self_counterparty(counterparty, self_aliases):
+        operation_kind = BankSmsOperationKind.INTERNAL_TRANSFER
+        category_code = "internal_transfer"
+        requires_confirmation = False
+    else:
+        operation_kind = BankSmsOperationKind.EXPENSE_CANDIDATE
+        category_code = "help_reserve"
+        requires_confirmation = True
+    return ParsedBankSms(
+        bank=BankSmsBank.SBER,
+        operation_kind=operation_kind,
+        amount=amount,
+        counterparty=counterparty,
+        source=TransactionSource.TRANSFER,
+        suggested_category_code=category_code,
+        requires_confirmation=requires_confirmation,
+        redacted_text=redacted_text,
+        operation_time=_parse_operation_time(match.group("time")),
+    )
 
-    if match := SBER_SAFE_EXPENSE_FALLBACK_RE.fullmatch(text):
-        return _expense_candidate(
-            bank=BankSmsBank.SBER,
-            amount_raw=match.group("amount"),
-            merchant=_clean_party(match.group("merchant") or ""),
-            source=_sber_purchase_source(
-                instrument=match.group("instrument"),
-                is_sbp=bool(match.group("sbp")),
-            ),
-            redacted_text=redacted_text,
-            operation_time=_parse_operation_time(match.group("time")),
-        )
 
+def _sber_credit(match: re.Match[str], redacted_text: str, _: set[str]) -> ParsedBankSms:
     return ParsedBankSms(
         bank=BankSmsBank.SBER,
-        operation_kind=BankSmsOperationKind.UNKNOWN,
+        operation_kind=BankSmsOperationKind.INCOME,
+        amount=_parse_amount(match.group("amount")),
+        source=TransactionSource.TRANSFER,
+        requires_confirmation=False,
         redacted_text=redacted_text,
-        ignore_reason="unsupported_sber_format",
+        operation_time=_parse_operation_time(match.group("time")),
     )
 
 
-def _parse_tbank(text: str, redacted_text: str, self_aliases: set[str]) -> ParsedBankSms:
-    if match := TBANK_SBP_PAYMENT_RE.fullmatch(text):
-        return _expense_candidate(
-            bank=BankSmsBank.TBANK,
-            amount_raw=match.group("amount"),
-            merchant=_clean_party(match.group("merchant")),
-            source=TransactionSource.TRANSFER,
-            redacted_text=redacted_text,
-        )
+def _sber_credit_fallback(
+    match: re.Match[str],
+    redacted_text: str,
+    self_aliases: set[str],
+) -> ParsedBankSms:
+    counterparty = _clean_party(match.group("counterparty") or "")
+    amount = _parse_amount(match.group("amount"))
+    if counterparty and _is_self_counterparty(counterparty, self_aliases):
+        operation_kind = BankSmsOperationKind.INTERNAL_TRANSFER
+        category_code = "internal_transfer"
+    else:
+        operation_kind = BankSmsOperationKind.INCOME
+        category_code = None
+    return ParsedBankSms(
+        bank=BankSmsBank.SBER,
+        operation_kind=operation_kind,
+        amount=amount,
+        counterparty=counterparty,
+        source=TransactionSource.TRANSFER,
+        suggested_category_code=category_code,
+        requires_confirmation=False,
+        redacted_text=redacted_text,
+        operation_time=_parse_operation_time(match.group("time")),
+    )
 
-    if match := TBANK_TOPUP_RE.fullmatch(text):
-        counterparty = _clean_party(match.group("counterparty"))
-        amount = _parse_amount(match.group("amount"))
-        if _is_self_counterparty(counterparty, self_aliases):
-            operation_kind = BankSmsOperationKind.INTERNAL_TRANSFER
-            category_code = "internal_transfer"
-        else:
-            operation_kind = BankSmsOperationKind.INCOME
-            category_code = None
-        return ParsedBankSms(
-            bank=BankSmsBank.TBANK,
-            operation_kind=operation_kind,
-            amount=amount,
-            counterparty=counterparty,
-            source=TransactionSource.TRANSFER,
-            suggested_category_code=category_code,
-            requires_confirmation=False,
-            redacted_text=redacted_text,
-        )
 
-    if match := TBANK_SAFE_TOPUP_FALLBACK_RE.fullmatch(text):
-        counterparty = _clean_party(match.group("counterparty"))
-        amount = _parse_amount(match.group("amount"))
-        if _is_self_counterparty(counterparty, self_aliases):
-            operation_kind = BankSmsOperationKind.INTERNAL_TRANSFER
-            category_code = "internal_transfer"
-        else:
-            operation_kind = BankSmsOperationKind.INCOME
-            category_code = None
-        return ParsedBankSms(
-            bank=BankSmsBank.TBANK,
-            operation_kind=operation_kind,
-            amount=amount,
-            counterparty=counterparty,
-            source=TransactionSource.TRANSFER,
-            suggested_category_code=category_code,
-            requires_confirmation=False,
-            redacted_text=redacted_text,
-        )
+def _tbank_payment(match: re.Match[str], redacted_text: str, _: set[str]) -> ParsedBankSms:
+    return _expense_candidate(
+        bank=BankSmsBank.TBANK,
+        amount_raw=match.group("amount"),
+        merchant=_clean_party(match.group("merchant")),
+        source=TransactionSource.TRANSFER,
+        redacted_text=redacted_text,
+    )
 
-    if match := TBANK_CARD_TRANSFER_RE.fullmatch(text):
-        counterparty = _clean_party(match.group("counterparty"))
-        amount = _parse_amount(match.group("amount"))
-        if _is_self_counterparty(counterparty, self_aliases):
-            operation_kind = BankSmsOperationKind.INTERNAL_TRANSFER
-            category_code = "internal_transfer"
-            requires_confirmation = False
-        else:
-            operation_kind = BankSmsOperationKind.EXPENSE_CANDIDATE
-            category_code = "help_reserve"
-            requires_confirmation = True
-        return ParsedBankSms(
-            bank=BankSmsBank.TBANK,
-            operation_kind=operation_kind,
-            amount=amount,
-            counterparty=counterparty,
-            source=TransactionSource.TRANSFER,
-            suggested_category_code=category_code,
-            requires_confirmation=requires_confirmation,
-            redacted_text=redacted_text,
-        )
 
-    if match := TBANK_SAFE_CARD_TRANSFER_FALLBACK_RE.fullmatch(text):
-        counterparty = _clean_party(match.group("counterparty"))
-        amount = _parse_amount(match.group("amount"))
-        if _is_self_counterparty(counterparty, self_aliases):
-            operation_kind = BankSmsOperationKind.INTERNAL_TRANSFER
-            category_code = "internal_transfer"
-            requires_confirmation = False
-        else:
-            operation_kind = BankSmsOperationKind.EXPENSE_CANDIDATE
-            category_code = "help_reserve"
-            requires_confirmation = True
-        return ParsedBankSms(
-            bank=BankSmsBank.TBANK,
-            operation_kind=operation_kind,
-            amount=amount,
-            counterparty=counterparty,
-            source=TransactionSource.TRANSFER,
-            suggested_category_code=category_code,
-            requires_confirmation=requires_confirmation,
-            redacted_text=redacted_text,
-        )
+def _tbank_topup(
+    match: re.Match[str],
+    redacted_text: str,
+    self_aliases: set[str],
+) -> ParsedBankSms:
+    counterparty = _clean_party(match.group("counterparty"))
+    amount = _parse_amount(match.group("amount"))
+    if _is_self_counterparty(counterparty, self_aliases):
+        operation_kind = BankSmsOperationKind.INTERNAL_TRANSFER
+        category_code = "internal_transfer"
+    else:
+        operation_kind = BankSmsOperationKind.INCOME
+        category_code = None
+    return ParsedBankSms(
+        bank=BankSmsBank.TBANK,
+        operation_kind=operation_kind,
+        amount=amount,
+        counterparty=counterparty,
+        source=TransactionSource.TRANSFER,
+        suggested_category_code=category_code,
+        requires_confirmation=False,
+        redacted_text=redacted_text,
+    )
 
-    if match := TBANK_SAFE_PAYMENT_FALLBACK_RE.fullmatch(text):
-        return _expense_candidate(
-            bank=BankSmsBank.TBANK,
-            amount_raw=match.group("amount"),
-            merchant=_clean_party(match.group("merchant")),
-            source=TransactionSource.TRANSFER,
-            redacted_text=redacted_text,
-        )
 
+def _tbank_card_transfer(
+    match: re.Match[str],
+    redacted_text: str,
+    self_aliases: set[str],
+) -> ParsedBankSms:
+    counterparty = _clean_party(match.group("counterparty"))
+    amount = _parse_amount(match.group("amount"))
+    if _is_self_counterparty(counterparty, self_aliases):
+        operation_kind = BankSmsOperationKind.INTERNAL_TRANSFER
+        category_code = "internal_transfer"
+        requires_confirmation = False
+    else:
+        operation_kind = BankSmsOperationKind.EXPENSE_CANDIDATE
+        category_code = "help_reserve"
+        requires_confirmation = True
     return ParsedBankSms(
         bank=BankSmsBank.TBANK,
-        operation_kind=BankSmsOperationKind.UNKNOWN,
+        operation_kind=operation_kind,
+        amount=amount,
+        counterparty=counterparty,
+        source=TransactionSource.TRANSFER,
+        suggested_category_code=category_code,
+        requires_confirmation=requires_confirmation,
         redacted_text=redacted_text,
-        ignore_reason="unsupported_tbank_format",
     )
 
 
+def _rules_by_keyword(rules: tuple[_BankSmsRule, ...]) -> dict[str, tuple[_BankSmsRule, ...]]:
+    # Rules keep their declared order within a keyword, so earlier specific formats still win.
+    keywords = dict.fromkeys(keyword for rule in rules for keyword in rule.keywords)
+    return {
+        keyword: tuple(rule for rule in rules if keyword in rule.keywords) for keyword in keywords
+    }
+
+
+VTB_RULES: tuple[_BankSmsRule, ...] = (
+    _BankSmsRule(("оплата",), VTB_ADJUSTED_PAYMENT_RE, _vtb_adjusted_payment),
+    _BankSmsRule(("оплата",), VTB_CARD_PAYMENT_RE, _vtb_payment),
+    _BankSmsRule(("списание",), VTB_OUTGOING_DEBIT_RE, _vtb_outgoing_debit),
+    _BankSmsRule(("поступление",), VTB_INCOMING_CREDIT_RE, _vtb_incoming_credit),
+    _BankSmsRule(("списание",), VTB_SAFE_OUTGOING_DEBIT_FALLBACK_RE, _vtb_outgoing_debit),
+    _BankSmsRule(("поступление",), VTB_SAFE_INCOMING_CREDIT_FALLBACK_RE, _vtb_incoming_credit),
+    _BankSmsRule(("оплата",), VTB_SAFE_PAYMENT_FALLBACK_RE, _vtb_payment),
+)
+SBER_RULES: tuple[_BankSmsRule, ...] = (
+    _BankSmsRule(("возврат",), SBER_CARD_REFUND_RE, _sber_card_refund),
+    _BankSmsRule(("возврат",), SBER_SAFE_REFUND_FALLBACK_RE, _sber_refund),
+    _BankSmsRule(("покупка",), SBER_PURCHASE_RE, _sber_purchase),
+    _BankSmsRule(
+        ("покупка",),
+        SBER_CARD_SBP_PURCHASE_RE,
+        _sber_expense(TransactionSource.TRANSFER),
+    ),
+    _BankSmsRule(("покупка",), SBER_CARD_PURCHASE_RE, _sber_expense(TransactionSource.CARD)),
+    _BankSmsRule(("оплата",), SBER_CARD_PAYMENT_RE, _sber_expense(TransactionSource.CARD)),
+    _BankSmsRule(("перевод",), SBER_INCOMING_SBP_RE, _sber_incoming_sbp),
+    _BankSmsRule(("перевод",), SBER_SAFE_INCOMING_SBP_FALLBACK_RE, _sber_incoming_sbp),
+    _BankSmsRule(("перевод",), SBER_OUTGOING_TRANSFER_RE, _sber_outgoing_transfer),
+    _BankSmsRule(("перевод",), SBER_SAFE_OUTGOING_TRANSFER_FALLBACK_RE, _sber_outgoing_transfer),
+    _BankSmsRule(("зачисление",), SBER_SALARY_RE, _sber_credit),
+    _BankSmsRule(("зачисление",), SBER_GENERIC_CREDIT_RE, _sber_credit),
+    _BankSmsRule(
+        ("поступление", "пополнение", "зачисление"),
+        SBER_SAFE_CREDIT_FALLBACK_RE,
+        _sber_credit_fallback,
+    ),
+    _BankSmsRule(
+        ("оплата",),
+        SBER_ACCOUNT_PAYMENT_RE,
+        _sber_expense(TransactionSource.TRANSFER),
+    ),
+    _BankSmsRule(
+        ("покупка",),
+        SBER_ACCOUNT_PURCHASE_RE,
+        _sber_expense(TransactionSource.TRANSFER),
+    ),
+    _BankSmsRule(("покупка", "оплата"), SBER_SAFE_EXPENSE_FALLBACK_RE, _sber_purchase),
+)
+TBANK_RULES: tuple[_BankSmsRule, ...] = (
+    _BankSmsRule(("оплата",), TBANK_SBP_PAYMENT_RE, _tbank_payment),
+    _BankSmsRule(("пополнение",), TBANK_TOPUP_RE, _tbank_topup),
+    _BankSmsRule(("пополнение",), TBANK_SAFE_TOPUP_FALLBACK_RE, _tbank_topup),
+    _BankSmsRule(("перевод",), TBANK_CARD_TRANSFER_RE, _tbank_card_transfer),
+    _BankSmsRule(("перевод",), TBANK_SAFE_CARD_TRANSFER_FALLBACK_RE, _tbank_card_transfer),
+    _BankSmsRule(("оплата",), TBANK_SAFE_PAYMENT_FALLBACK_RE, _tbank_payment),
+)
+VTB_RULES_BY_KEYWORD = _rules_by_keyword(VTB_RULES)
+SBER_RULES_BY_KEYWORD = _rules_by_keyword(SBER_RULES)
+TBANK_RULES_BY_KEYWORD = _rules_by_keyword(TBANK_RULES)
+
+
 def _expense_candidate(
     *,
     bank: BankSmsBank,
@@ -918,10 +996,6 @@ def _expense_candidate(
     )
 
 
-def _detect_bank(text: str, sender: str) -> BankSmsBank:
-    return detect_bank_from_profiles(text, sender)
-
-
 def _ignored_redacted_text(bank: BankSmsBank, ignore_reason: str) -> str:
     return f"<{ignore_reason}:{bank.value}>"
 
@@ -962,11 +1036,11 @@ def _is_self_counterparty(counterparty: str, self_aliases: set[str]) -> bool:
 
 
 def _normalize_counterparty(value: str) -> str:
-    return re.sub(r"[^0-9a-zа-яё]+", "", value.lower())
+    return COUNTERPARTY_NOISE_RE.sub("", value.lower())
 
 
 def _normalize_text(text: str) -> str:
-    return re.sub(r"\s+", " ", text).strip()
+    return WHITESPACE_RE.sub(" ", text).strip()
 
 
 def _clean_party(value: str) -> str:
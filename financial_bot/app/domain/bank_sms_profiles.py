@@ -25,8 +25,9 @@ SECURITY_MARKER_RE = re.compile(
     r"\bкод\b|\bпароль\b|\b3d-?s\b|\b3ds\b|подтвердите\s+электронные\s+документы",
     re.IGNORECASE,
 )
+# Amounts start at the first digit of a run; retrying inside long digit runs is quadratic.
 SHAPE_AMOUNT_RE = re.compile(
-    rf"{AMOUNT_VALUE_PATTERN}\s*(?:₽|руб\.?|р\.?|RUB)",
+    rf"(?<!\d){AMOUNT_VALUE_PATTERN}\s*(?:₽|руб\.?|р\.?|RUB)",
     re.IGNORECASE,
 )
 SHAPE_BALANCE_MARKER_RE = re.compile(r"\b(?:Баланс|Доступно)\b", re.IGNORECASE)
@@ -84,12 +85,14 @@ TBANK_PROFILE = BankSmsProfile(
 )
 
 BANK_SMS_PROFILES: tuple[BankSmsProfile, ...] = (SBER_PROFILE, VTB_PROFILE, TBANK_PROFILE)
+TBANK_TEXT_PREFIXES = tuple(prefix.casefold() for prefix in TBANK_PROFILE.text_prefixes)
+SBER_ACCOUNT_PREFIX_RE = re.compile(r"^сч[её]т\d+", re.IGNORECASE)
 
 
 def detect_bank_from_profiles(text: str, sender: str) -> BankEventBank:
     sender_normalized = sender.strip().lower()
     text_normalized = text.strip().casefold()
-    if text_normalized.startswith(_casefold_prefixes(TBANK_PROFILE.text_prefixes)):
+    if text_normalized.startswith(TBANK_TEXT_PREFIXES):
         return BankEventBank.TBANK
     if _starts_with_sber_prefix(text_normalized):
         return BankEventBank.SBER
@@ -104,11 +107,5 @@ def detect_bank_from_profiles(text: str, sender: str) -> BankEventBank:
     return BankEventBank.UNKNOWN
 
 
-def _casefold_prefixes(prefixes: tuple[str, ...]) -> tuple[str, ...]:
-    return tuple(prefix.casefold() for prefix in prefixes)
-
-
 def _starts_with_sber_prefix(text: str) -> bool:
-    return text.startswith(("счёт карты", "счет карты")) or bool(
-        re.match(r"^сч[её]т\d+", text, flags=re.IGNORECASE)
-    )
+    return text.startswith(("счёт карты", "счет карты")) or bool(SBER_ACCOUNT_PREFIX_RE.match(text))
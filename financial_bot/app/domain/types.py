@@ -66,10 +66,17 @@ class BankEventParseStatus(StrEnum):
 class BankEventSuggestionSource(StrEnum):
     PARSER_HINT = "parser_hint"
     LEARNED_RULE = "learned_rule"
+    SIMILAR_RULE = "similar_rule"
     MANUAL = "manual"
     NONE = "none"
 
 
+class BankNotificationStatus(StrEnum):
+    PENDING = "pending"
+    SENT = "sent"
+    FAILED = "failed"
+
+
 class BankCategoryRuleMode(StrEnum):
     SUGGEST = "suggest"
     AUTOSAVE = "autosave"
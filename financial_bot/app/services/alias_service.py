@@ -1,9 +1,14 @@
 import re
-from dataclasses import dataclass
+from collections.abc import Iterable
+from dataclasses import dataclass, field
+from typing import Any
+from weakref import WeakKeyDictionary
 
+from sqlalchemy import Engine, event
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from financial_bot.app.storage.models import CategoryModel
+from financial_bot.app.storage.reference_data import attach_reference_row, snapshot_row
 from financial_bot.app.storage.repositories.category_repository import CategoryRepository
 
 
@@ -14,7 +19,15 @@ class AliasMatch:
 
 
 class AliasService:
+    """Resolves free-text categories through a process-wide compiled alias index.
+
+    The index is built once per database engine and reused by every session, so a resolve
+    normally costs no database round trips. Writers that change aliases or categories must
+    call `invalidate_alias_index`.
+    """
+
     def __init__(self, session: AsyncSession) -> None:
+        self._session = session
         self._categories = CategoryRepository(session)
 
     async def resolve_category(self, text: str) -> AliasMatch | None:
@@ -22,17 +35,126 @@ class AliasService:
         if not text_tokens:
             return None
 
+        index = await self._get_index()
+        entry = index.match(text_tokens)
+        if entry is None:
+            return None
+        category = await attach_reference_row(self._session, entry.category)
+        return AliasMatch(alias=entry.alias, category=category)
+
+    async def _get_index(self) -> "CompiledAliasIndex":
+        engine = self._session.get_bind()
+        index = _ALIAS_INDEX_CACHE.get(engine)
+        if index is not None:
+            return index
+
+        version = _ALIAS_INDEX_CACHE.version
+        index = await self._build_index()
+        _ALIAS_INDEX_CACHE.store(engine, index, version=version)
+        return index
+
+    async def _build_index(self) -> "CompiledAliasIndex":
         aliases = await self._categories.list_aliases()
-        for alias in sorted(aliases, key=lambda item: len(item.alias), reverse=True):
-            alias_tokens = _tokenize_alias_text(alias.alias)
+        categories = {category.id: category for category in await self._categories.list_all()}
+        return CompiledAliasIndex(
+            (alias.alias, snapshot_category(category))
+            for alias in aliases
+            if (category := categories.get(alias.category_id)) is not None
+        )
+
+
+@dataclass(frozen=True, slots=True)
+class CompiledAlias:
+    rank: int
+    alias: str
+    category: CategoryModel
+
+
+@dataclass(slots=True)
+class _TrieNode:
+    children: dict[str, "_TrieNode"] = field(default_factory=dict)
+    entry: CompiledAlias | None = None
+
+
+class CompiledAliasIndex:
+    """Token trie over normalized alias phrases.
+
+    Aliases keep the historical priority: the longest alias text wins, ties are broken by
+    alias order. Matching walks the trie from every text token, so the cost depends on the
+    text length and the deepest alias, not on the number of aliases.
+    """
+
+    def __init__(self, aliases: Iterable[tuple[str, CategoryModel]]) -> None:
+        self._root = _TrieNode()
+        for rank, (alias, category) in enumerate(
+            sorted(aliases, key=lambda item: len(item[0]), reverse=True)
+        ):
+            alias_tokens = _tokenize_alias_text(alias)
             if not _is_safe_alias_tokens(alias_tokens):
                 continue
-            if _contains_token_phrase(text_tokens, alias_tokens):
-                category = await self._categories.get(alias.category_id)
-                if category is None:
-                    continue
-                return AliasMatch(alias=alias.alias, category=category)
-        return None
+            node = self._root
+            for token in alias_tokens:
+                node = node.children.setdefault(token, _TrieNode())
+            if node.entry is None or rank < node.entry.rank:
+                node.entry = CompiledAlias(rank=rank, alias=alias, category=category)
+
+    def match(self, text_tokens: tuple[str, ...]) -> CompiledAlias | None:
+        best: CompiledAlias | None = None
+        for start in range(len(text_tokens)):
+            node = self._root
+            for token in text_tokens[start:]:
+                child = node.children.get(token)
+                if child is None:
+                    break
+                node = child
+                if node.entry is not None and (best is None or node.entry.rank < best.rank):
+                    best = node.entry
+        return best
+
+
+class _AliasIndexCache:
+    def __init__(self) -> None:
+        self._indexes: WeakKeyDictionary[Engine, CompiledAliasIndex] = WeakKeyDictionary()
+        self.version = 0
+
+    def get(self, engine: Engine) -> CompiledAliasIndex | None:
+        return self._indexes.get(engine)
+
+    def store(self, engine: Engine, index: CompiledAliasIndex, *, version: int) -> None:
+        # An invalidation that raced with the build means the index may already be stale.
+        if version == self.version:
+            self._indexes[engine] = index
+
+    def clear(self) -> None:
+        self._indexes.clear()
+        self.version += 1
+
+
+_ALIAS_INDEX_CACHE = _AliasIndexCache()
+
+
+def invalidate_alias_index(session: AsyncSession | None = None) -> None:
+    """Drop compiled alias indexes.
+
+    With a session, the indexes are dropped again when that session commits or rolls back,
+    so an index rebuilt from its uncommitted state or by a concurrent session is not kept.
+    """
+
+    _ALIAS_INDEX_CACHE.clear()
+    if session is None:
+        return
+
+    def _clear(*_: Any) -> None:
+        _ALIAS_INDEX_CACHE.clear()
+
+    event.listen(session.sync_session, "after_commit", _clear, once=True)
+    event.listen(session.sync_session, "after_soft_rollback", _clear, once=True)
+
+
+def snapshot_category(category: CategoryModel) -> CategoryModel:
+    """Detached copy of `category` that sessions attach with `attach_reference_row`."""
+
+    return snapshot_row(category)
 
 
 TOKEN_RE = re.compile(r"[0-9a-zа-яё]+", re.IGNORECASE)
@@ -48,13 +170,3 @@ def _is_safe_alias_tokens(tokens: tuple[str, ...]) -> bool:
     if not tokens:
         return False
     return len("".join(tokens)) >= MIN_ALIAS_TOKEN_CHARS
-
-
-def _contains_token_phrase(text_tokens: tuple[str, ...], alias_tokens: tuple[str, ...]) -> bool:
-    if not alias_tokens or len(alias_tokens) > len(text_tokens):
-        return False
-    alias_length = len(alias_tokens)
-    return any(
-        text_tokens[index : index + alias_length] == alias_tokens
-        for index in range(len(text_tokens) - alias_length + 1)
-    )
@@ -3,7 +3,6 @@ from datetime import UTC, datetime, timedelta
 
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from financial_bot.app.domain.bank_sms import classify_bank_sms_shape
 from financial_bot.app.domain.types import BankCategoryRuleMode
 from financial_bot.app.storage.repositories.bank_category_rule_repository import (
     BankCategoryRuleRepository,
@@ -217,64 +216,27 @@ class AutoAccountingHealthService:
         sources_by_id: dict[int, AutoAccountingSourceHealth],
         since: datetime,
     ) -> tuple[AutoAccountingUnknownShapeHealth, ...]:
-        grouped: dict[
-            tuple[int, tuple[str, ...], int, bool, bool, str, bool],
-            AutoAccountingUnknownShapeHealth,
-        ] = {}
-        for event in await self._bank_events.list_unknown_unlinked_events(since=since, limit=100):
-            source = sources_by_id.get(event.source_id)
-            if source is None:
-                continue
-
-            shape = classify_bank_sms_shape(
-                event.redacted_text, sender=_sender_for_bank(event.bank)
-            )
-            key = (
-                event.source_id,
-                shape.operation_markers,
-                shape.amount_count,
-                shape.has_balance_marker,
-                shape.has_instrument_marker,
-                shape.ignored_reason,
-                shape.has_security_marker,
-            )
-            previous = grouped.get(key)
-            if previous is None:
-                grouped[key] = AutoAccountingUnknownShapeHealth(
-                    source_code=source.code,
-                    bank=source.bank,
-                    owner_role=source.owner_role,
-                    count=1,
-                    last_received_at=event.received_at,
-                    operation_markers=shape.operation_markers,
-                    amount_count=shape.amount_count,
-                    has_balance_marker=shape.has_balance_marker,
-                    has_instrument_marker=shape.has_instrument_marker,
-                    ignored_reason=shape.ignored_reason,
-                    has_security_marker=shape.has_security_marker,
-                )
-                continue
-
-            grouped[key] = AutoAccountingUnknownShapeHealth(
-                source_code=previous.source_code,
-                bank=previous.bank,
-                owner_role=previous.owner_role,
-                count=previous.count + 1,
-                last_received_at=max(previous.last_received_at, event.received_at),
-                operation_markers=previous.operation_markers,
-                amount_count=previous.amount_count,
-                has_balance_marker=previous.has_balance_marker,
-                has_instrument_marker=previous.has_instrument_marker,
-                ignored_reason=previous.ignored_reason,
-                has_security_marker=previous.has_security_marker,
-            )
-
+        groups = await self._bank_events.list_unknown_shape_groups(
+            source_ids=tuple(sources_by_id),
+            since=since,
+            limit=5,
+        )
         return tuple(
-            sorted(
-                grouped.values(),
-                key=lambda shape: (shape.count, shape.last_received_at),
-                reverse=True,
-            )[:5]
+            AutoAccountingUnknownShapeHealth(
+                source_code=source.code,
+                bank=source.bank,
+                owner_role=source.owner_role,
+                count=group.count,
+                last_received_at=group.last_received_at,
+                operation_markers=group.operation_markers,
+                amount_count=group.amount_count,
+                has_balance_marker=group.has_balance_marker,
+                has_instrument_marker=group.has_instrument_marker,
+                ignored_reason=group.ignored_reason,
+                has_security_marker=group.has_security_marker,
+            )
+            for group in groups
+            if (source := sources_by_id.get(group.source_id)) is not None
         )
 
 
@@ -303,13 +265,3 @@ def _rule_mode(value: str, *, is_active: bool) -> BankCategoryRuleMode:
         return BankCategoryRuleMode(value)
     except ValueError:
         return BankCategoryRuleMode.SUGGEST if is_active else BankCategoryRuleMode.DISABLED
-
-
-def _sender_for_bank(bank: str) -> str:
-    if bank == "sber":
-        return "900"
-    if bank == "vtb":
-        return "VTB"
-    if bank == "tbank":
-        return "T-Bank"
-    return ""
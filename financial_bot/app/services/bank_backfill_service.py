@@ -0,0 +1,265 @@
+import asyncio
+import json
+import time
+from collections import deque
+from collections.abc import Awaitable, Callable, Iterable, Iterator
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from datetime import datetime
+from enum import StrEnum
+from functools import partial
+from itertools import batched
+from multiprocessing import get_context
+from zoneinfo import ZoneInfo
+
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from financial_bot.app.config import Settings
+from financial_bot.app.domain.types import (
+    BankEventBank,
+    BankEventChannel,
+    BankEventSuggestionSource,
+)
+from financial_bot.app.services.bank_ingestion_service import (
+    PreparedBankEvent,
+    bank_event_values,
+    parse_source_bank_sms,
+    prepare_bank_event,
+)
+from financial_bot.app.storage.db import session_scope
+from financial_bot.app.storage.repositories.bank_event_repository import BankEventRepository
+from financial_bot.app.storage.repositories.category_repository import CategoryRepository
+
+DEFAULT_BANK_BACKFILL_CHUNK_SIZE = 5000
+
+
+class BankSmsDumpFormat(StrEnum):
+    JSONL = "jsonl"
+    TEXT = "text"
+
+
+@dataclass(frozen=True, slots=True)
+class BankBackfillRecord:
+    text: str
+    received_at: datetime
+    sender: str = ""
+
+
+@dataclass(frozen=True, slots=True)
+class BankBackfillProgress:
+    processed: int
+    created: int
+    duplicates: int
+    elapsed_seconds: float
+
+    @property
+    def messages_per_second(self) -> float:
+        if self.elapsed_seconds <= 0:
+            return 0.0
+        return self.processed / self.elapsed_seconds
+
+
+@dataclass(frozen=True, slots=True)
+class _BankBackfillSource:
+    id: int
+    code: str
+    bank: BankEventBank
+    channel: BankEventChannel
+
+
+def read_bank_sms_dump(
+    lines: Iterable[str],
+    *,
+    dump_format: BankSmsDumpFormat,
+    timezone: str,
+) -> Iterator[BankBackfillRecord]:
+    """Yield SMS from an exported dump, one message per non-blank line.
+
+    JSONL lines are objects with `text`, `received_at` and an optional `sender`; text lines
+    are `<received_at><TAB><text>`. `received_at` is ISO 8601; a time without an offset is
+    local time in `timezone`.
+    """
+
+    zone = ZoneInfo(timezone)
+    for line_number, line in enumerate(lines, start=1):
+        if not line.strip():
+            continue
+        try:
+            if dump_format == BankSmsDumpFormat.JSONL:
+                item = json.loads(line)
+                text, received_at, sender = item["text"], item["received_at"], item.get("sender")
+            else:
+                received_at, text = line.rstrip("\r\n").split("\t", 1)
+                sender = None
+            received = datetime.fromisoformat(received_at)
+        except (KeyError, TypeError, ValueError) as exc:
+            msg = f"Line {line_number}: not a {dump_format.value} bank SMS record"
+            raise ValueError(msg) from exc
+        if not isinstance(text, str) or not text.strip():
+            msg = f"Line {line_number}: bank SMS text must not be empty"
+            raise ValueError(msg)
+        yield BankBackfillRecord(
+            text=text.strip(),
+            received_at=received if received.tzinfo is not None else received.replace(tzinfo=zone),
+            sender=sender if isinstance(sender, str) else "",
+        )
+
+
+class BankBackfillService:
+    """Imports historical bank SMS for one source as bank events.
+
+    Chunks of `chunk_size` messages are parsed in a pool of `workers` processes (in this
+    process when `workers` is 0) and each chunk is stored in one transaction. Events get
+    parser-hint categories only: learned rules, autosave and Telegram notifications are
+    left to live ingestion, so a backfill never creates transactions.
+    """
+
+    def __init__(
+        self,
+        session_factory: async_sessionmaker[AsyncSession],
+        settings: Settings,
+        *,
+        workers: int = 0,
+        chunk_size: int = DEFAULT_BANK_BACKFILL_CHUNK_SIZE,
+    ) -> None:
+        self._session_factory = session_factory
+        self._settings = settings
+        self._workers = workers
+        self._chunk_size = chunk_size
+
+    async def import_records(
+        self,
+        records: Iterable[BankBackfillRecord],
+        *,
+        source_code: str,
+        on_progress: Callable[[BankBackfillProgress], None] | None = None,
+    ) -> BankBackfillProgress:
+        source = await self._get_source(source_code)
+        category_ids = await self._category_ids_by_code()
+        prepare_chunk = partial(
+            _prepare_chunk,
+            source_code=source.code,
+            source_bank=source.bank,
+            self_counterparty_aliases=self._settings.bank_self_counterparty_aliases,
+            timezone_name=self._settings.timezone,
+        )
+
+        started = time.perf_counter()
+        progress = BankBackfillProgress(processed=0, created=0, duplicates=0, elapsed_seconds=0)
+        # aiosqlite runs a thread, so workers are spawned rather than forked.
+        pool = (
+            ProcessPoolExecutor(max_workers=self._workers, mp_context=get_context("spawn"))
+            if self._workers
+            else None
+        )
+        try:
+            # Parsing runs ahead of storage by at most one chunk per worker.
+            pending: deque[Awaitable[list[PreparedBankEvent]]] = deque()
+            chunks = batched(records, self._chunk_size)
+            while True:
+                while len(pending) <= self._workers and (chunk := next(chunks, None)):
+                    pending.append(_run_chunk(pool, prepare_chunk, chunk))
+                if not pending:
+                    break
+                prepared = await pending.popleft()
+                created = await self._store_chunk(source, prepared, category_ids)
+                progress = BankBackfillProgress(
+                    processed=progress.processed + len(prepared),
+                    created=progress.created + created,
+                    duplicates=progress.duplicates + len(prepared) - created,
+                    elapsed_seconds=time.perf_counter() - started,
+                )
+                if on_progress is not None:
+                    on_progress(progress)
+        finally:
+            if pool is not None:
+                pool.shutdown(cancel_futures=True)
+        return progress
+
+    async def _get_source(self, source_code: str) -> _BankBackfillSource:
+        async with self._session_factory() as session:
+            source = await BankEventRepository(session).get_source_by_code(source_code)
+        if source is None or not source.is_active:
+            msg = f"Active bank event source not found: {source_code}"
+            raise ValueError(msg)
+        return _BankBackfillSource(
+            id=source.id,
+            code=source.code,
+            bank=BankEventBank(source.bank),
+            channel=BankEventChannel(source.channel),
+        )
+
+    async def _category_ids_by_code(self) -> dict[str, int]:
+        async with self._session_factory() as session:
+            categories = await CategoryRepository(session).list_all()
+        return {category.code: category.id for category in categories}
+
+    async def _store_chunk(
+        self,
+        source: _BankBackfillSource,
+        prepared: list[PreparedBankEvent],
+        category_ids: dict[str, int],
+    ) -> int:
+        async with session_scope(self._session_factory) as session:
+            bank_events = BankEventRepository(session)
+            seen = await bank_events.get_existing_dedupe_keys(
+                {item.dedupe_key for item in prepared}
+            )
+            rows = []
+            for item in prepared:
+                if item.dedupe_key in seen:
+                    continue
+                seen.add(item.dedupe_key)
+                category_id = category_ids.get(item.parsed.suggested_category_code or "")
+                rows.append(
+                    bank_event_values(
+                        item,
+                        source_id=source.id,
+                        channel=source.channel,
+                        suggested_category_id=category_id,
+                        suggestion_source=(
+                            BankEventSuggestionSource.PARSER_HINT
+                            if category_id is not None
+                            else BankEventSuggestionSource.NONE
+                        ),
+                    )
+                )
+            return await bank_events.insert_event_rows_if_new(rows)
+
+
+def _run_chunk(
+    pool: ProcessPoolExecutor | None,
+    prepare_chunk: Callable[[tuple[BankBackfillRecord, ...]], list[PreparedBankEvent]],
+    chunk: tuple[BankBackfillRecord, ...],
+) -> Awaitable[list[PreparedBankEvent]]:
+    if pool is None:
+        future: asyncio.Future[list[PreparedBankEvent]] = asyncio.Future()
+        future.set_result(prepare_chunk(chunk))
+        return future
+    return asyncio.get_running_loop().run_in_executor(pool, prepare_chunk, chunk)
+
+
+def _prepare_chunk(
+    chunk: tuple[BankBackfillRecord, ...],
+    *,
+    source_code: str,
+    source_bank: BankEventBank,
+    self_counterparty_aliases: frozenset[str],
+    timezone_name: str,
+) -> list[PreparedBankEvent]:
+    # No parse budget: backfill has no latency requirement, and a loaded worker would
+    # otherwise turn legitimate historical SMS into `unknown_format` events.
+    return [
+        prepare_bank_event(
+            parse_source_bank_sms(
+                record.text,
+                sender=record.sender,
+                source_bank=source_bank,
+                self_counterparty_aliases=self_counterparty_aliases,
+            ),
+            source_code=source_code,
+            received_at=record.received_at,
+            timezone_name=timezone_name,
+        )
+        for record in chunk
+    ]
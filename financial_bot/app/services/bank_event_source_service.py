@@ -4,6 +4,7 @@ from secrets import token_urlsafe
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from financial_bot.app.domain.types import BankEventBank, BankEventChannel, UserRole
+from financial_bot.app.services.bank_source_cache import invalidate_bank_event_source_cache
 from financial_bot.app.storage.models import BankEventSourceModel, UserModel
 from financial_bot.app.storage.repositories.bank_event_repository import (
     BankEventRepository,
@@ -67,6 +68,7 @@ class BankEventSourceService:
                 token_hash=hash_bank_event_source_token(generated_token),
             )
         )
+        invalidate_bank_event_source_cache(self._session)
         return _result_from_source(
             source,
             owner=owner,
@@ -111,6 +113,7 @@ class BankEventSourceService:
         source.token_hash = hash_bank_event_source_token(generated_token)
         source.is_active = True
         await self._session.flush()
+        invalidate_bank_event_source_cache(self._session)
         return _result_from_source(
             source,
             owner=owner,
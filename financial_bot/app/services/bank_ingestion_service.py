@@ -1,3 +1,4 @@
+from collections.abc import Sequence
 from dataclasses import dataclass, replace
 from datetime import datetime, time, timedelta
 from hashlib import sha256
@@ -7,7 +8,14 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from financial_bot.app.config import Settings
 from financial_bot.app.domain.bank_learning import normalize_bank_merchant_key
-from financial_bot.app.domain.bank_sms import ParsedBankSms, parse_bank_sms
+from financial_bot.app.domain.bank_sms import (
+    BankSmsShape,
+    ParsedBankSms,
+    classify_redacted_bank_sms_shape,
+    hash_redacted_bank_sms,
+    normalize_bank_sms,
+    parse_normalized_bank_sms,
+)
 from financial_bot.app.domain.types import (
     BankCategoryRuleMode,
     BankEventBank,
@@ -23,6 +31,14 @@ from financial_bot.app.services.bank_learning_service import (
     BankLearningService,
     BankLearningSuggestion,
 )
+from financial_bot.app.services.bank_rule_index import invalidate_bank_rule_index
+from financial_bot.app.services.bank_rule_usage import BankRuleUsageRecorder
+from financial_bot.app.services.bank_source_cache import (
+    BankEventSourceSnapshot,
+    resolve_bank_event_source,
+    snapshot_bank_event_source,
+)
+from financial_bot.app.services.bank_source_heartbeat import BankSourceHeartbeat
 from financial_bot.app.services.transaction_service import (
     CreatedTransactionSummary,
     TransactionService,
@@ -32,13 +48,13 @@ from financial_bot.app.storage.models import (
     BankEventSourceModel,
     CategoryModel,
     TransactionModel,
-    UserModel,
 )
 from financial_bot.app.storage.repositories.bank_category_rule_repository import (
     BankCategoryRuleRepository,
 )
 from financial_bot.app.storage.repositories.bank_event_repository import (
     BankEventRepository,
+    bank_event_shape_values,
     hash_bank_event_source_token,
 )
 from financial_bot.app.storage.repositories.category_repository import CategoryRepository
@@ -98,14 +114,50 @@ class BankEventConfirmationResult:
     already_confirmed: bool = False
 
 
+@dataclass(frozen=True, slots=True)
+class BankSmsImportItem:
+    text: str
+    sender: str = ""
+    received_at: datetime | None = None
+
+
+@dataclass(frozen=True, slots=True)
+class PreparedBankEvent:
+    """A parsed SMS with the values that identify its bank event."""
+
+    parsed: ParsedBankSms
+    received_at: datetime
+    occurred_at: datetime | None
+    status: BankEventParseStatus
+    normalized_text_hash: str
+    dedupe_key: str
+    shape: BankSmsShape | None = None
+
+
+type _CategorySuggestion = tuple[
+    CategoryModel | None,
+    BankEventSuggestionSource,
+    BankLearningSuggestion | None,
+]
+
+
 class BankIngestionAuthError(PermissionError):
     """Raised when a bank ingestion source token is missing or invalid."""
 
 
 class BankIngestionService:
-    def __init__(self, session: AsyncSession, settings: Settings) -> None:
+    def __init__(
+        self,
+        session: AsyncSession,
+        settings: Settings,
+        *,
+        heartbeat: BankSourceHeartbeat | None = None,
+        rule_usage: BankRuleUsageRecorder | None = None,
+    ) -> None:
         self._session = session
         self._settings = settings
+        self._heartbeat = heartbeat
+        self._rule_usage = rule_usage
         self._users = UserRepository(session)
         self._categories = CategoryRepository(session)
         self._bank_events = BankEventRepository(session)
@@ -128,14 +180,15 @@ class BankIngestionService:
             msg = f"Telegram user is not seeded: {telegram_user_id}"
             raise ValueError(msg)
 
-        parsed = parse_bank_sms(
-            normalized_text,
+        parsed = parse_normalized_bank_sms(
+            normalize_bank_sms(normalized_text),
             self_counterparty_aliases=self._settings.bank_self_counterparty_aliases,
+            budget_seconds=self._settings.bank_sms_parse_budget_seconds,
         )
         received_at = received_at or datetime.now(ZoneInfo(self._settings.timezone))
-        source = await self._get_or_create_manual_source(
-            user_id=user.id,
-            bank=parsed.bank,
+        source = snapshot_bank_event_source(
+            await self._get_or_create_manual_source(user_id=user.id, bank=parsed.bank),
+            user,
         )
         return await self._store_parsed_event(
             source=source,
@@ -157,26 +210,51 @@ class BankIngestionService:
             msg = "Bank SMS text must not be empty"
             raise ValueError(msg)
 
-        source = await self._bank_events.get_active_source_by_token(source_token)
-        if source is None:
-            msg = "Bank ingestion source token is invalid"
-            raise BankIngestionAuthError(msg)
-
-        source_bank = BankEventBank(source.bank)
-        parsed = parse_bank_sms(
-            normalized_text,
-            sender=sender or _sender_from_source_bank(source_bank),
-            self_counterparty_aliases=self._settings.bank_self_counterparty_aliases,
-        )
-        parsed = _ignore_bank_source_mismatch(parsed, expected_bank=source_bank)
+        source = await self._active_source_for_token(source_token)
         received_at = received_at or datetime.now(ZoneInfo(self._settings.timezone))
         return await self._store_parsed_event(
             source=source,
             channel=BankEventChannel(source.channel),
-            parsed=parsed,
+            parsed=self._parse_source_sms(source, text=normalized_text, sender=sender),
             received_at=received_at,
         )
 
+    async def import_sms_batch_from_source_token(
+        self,
+        *,
+        items: Sequence[BankSmsImportItem],
+        source_token: str,
+    ) -> list[BankImportResult]:
+        """Store SMS from one source in a single pass; results keep the order of `items`.
+
+        The token is checked once, existing events are looked up with one query and new
+        events are inserted with one flush. Repeated SMS within the batch resolve to the
+        event stored for their first copy.
+        """
+        texts = [item.text.strip() for item in items]
+        if not all(texts):
+            msg = "Bank SMS text must not be empty"
+            raise ValueError(msg)
+
+        source = await self._active_source_for_token(source_token)
+        now = datetime.now(ZoneInfo(self._settings.timezone))
+        parsed_items = [
+            (
+                self._parse_source_sms(source, text=text, sender=item.sender),
+                item.received_at or now,
+            )
+            for text, item in zip(texts, items, strict=True)
+        ]
+        if not parsed_items:
+            return []
+
+        await self._touch_source(source, seen_at=now)
+        return await self._store_parsed_events(
+            source=source,
+            channel=BankEventChannel(source.channel),
+            items=parsed_items,
+        )
+
     async def confirm_event(
         self,
         *,
@@ -541,7 +619,7 @@ class BankIngestionService:
 
         rule.mode = BankCategoryRuleMode.DISABLED.value
         rule.is_active = False
-        await self._session.flush()
+        await invalidate_bank_rule_index(self._session)
         return await self._event_update_result(event)
 
     async def list_expense_categories(self) -> list:
@@ -795,101 +873,181 @@ class BankIngestionService:
             return None
         return await self._categories.get_by_code(category_code)
 
+    async def _active_source_for_token(self, source_token: str) -> BankEventSourceSnapshot:
+        source = await resolve_bank_event_source(
+            self._session,
+            source_token,
+            ttl_seconds=self._settings.bank_source_cache_ttl_seconds,
+        )
+        if source is None:
+            msg = "Bank ingestion source token is invalid"
+            raise BankIngestionAuthError(msg)
+        return source
+
+    def _parse_source_sms(
+        self,
+        source: BankEventSourceSnapshot,
+        *,
+        text: str,
+        sender: str,
+    ) -> ParsedBankSms:
+        return parse_source_bank_sms(
+            text,
+            sender=sender,
+            source_bank=BankEventBank(source.bank),
+            self_counterparty_aliases=self._settings.bank_self_counterparty_aliases,
+            budget_seconds=self._settings.bank_sms_parse_budget_seconds,
+        )
+
     async def _store_parsed_event(
         self,
         *,
-        source: BankEventSourceModel,
+        source: BankEventSourceSnapshot,
         channel: BankEventChannel,
         parsed: ParsedBankSms,
         received_at: datetime,
     ) -> BankImportResult:
-        await self._bank_events.touch_source(source, seen_at=received_at)
+        await self._touch_source(source, seen_at=received_at)
+        [result] = await self._store_parsed_events(
+            source=source,
+            channel=channel,
+            items=[(parsed, received_at)],
+        )
+        return result
 
-        status = _initial_parse_status(parsed)
-        normalized_text_hash = _hash_normalized_text(parsed.redacted_text)
-        occurred_at = _infer_occurred_at(
-            operation_time=parsed.operation_time,
-            received_at=received_at,
-            timezone_name=self._settings.timezone,
+    async def _touch_source(self, source: BankEventSourceSnapshot, *, seen_at: datetime) -> None:
+        if self._heartbeat is not None:
+            self._heartbeat.record(source.id, seen_at=seen_at)
+            return
+        await self._bank_events.touch_source(source.id, seen_at=seen_at)
+
+    async def _store_parsed_events(
+        self,
+        *,
+        source: BankEventSourceSnapshot,
+        channel: BankEventChannel,
+        items: Sequence[tuple[ParsedBankSms, datetime]],
+    ) -> list[BankImportResult]:
+        prepared = [
+            self._prepare_event(source=source, parsed=parsed, received_at=received_at)
+            for parsed, received_at in items
+        ]
+        existing = await self._bank_events.get_events_by_dedupe_keys(
+            {item.dedupe_key for item in prepared}
         )
-        dedupe_key = _build_dedupe_key(
+
+        candidates: dict[str, tuple[BankEventModel, _CategorySuggestion]] = {}
+        for item in prepared:
+            if item.dedupe_key in existing or item.dedupe_key in candidates:
+                continue
+            suggestion = await self._resolve_category_suggestion(
+                source=source,
+                parsed=item.parsed,
+                received_at=item.received_at,
+            )
+            candidates[item.dedupe_key] = (
+                self._build_event(source=source, channel=channel, item=item, suggestion=suggestion),
+                suggestion,
+            )
+
+        stored = await self._bank_events.add_events_if_new(
+            [event for event, _ in candidates.values()]
+        )
+        created_keys: set[str] = set()
+        for event, is_created in stored:
+            if is_created:
+                created_keys.add(event.dedupe_key)
+            else:
+                existing[event.dedupe_key] = event
+
+        results: list[BankImportResult] = []
+        for item in prepared:
+            if item.dedupe_key in created_keys:
+                # Later copies of the same SMS in one batch are duplicates of this event.
+                created_keys.discard(item.dedupe_key)
+                event, suggestion = candidates[item.dedupe_key]
+                existing[item.dedupe_key] = event
+                results.append(await self._created_event_result(source, event, item, suggestion))
+                continue
+
+            event = existing[item.dedupe_key]
+            existing_category = (
+                await self._categories.get(event.suggested_category_id)
+                if event.suggested_category_id is not None
+                else None
+            )
+            results.append(_result_from_event(event, existing_category, is_duplicate=True))
+        return results
+
+    def _prepare_event(
+        self,
+        *,
+        source: BankEventSourceSnapshot,
+        parsed: ParsedBankSms,
+        received_at: datetime,
+    ) -> PreparedBankEvent:
+        return prepare_bank_event(
+            parsed,
             source_code=source.code,
-            bank=parsed.bank,
-            operation_kind=parsed.operation_kind,
-            amount=parsed.amount,
-            fee_amount=parsed.fee_amount,
-            occurred_at=occurred_at,
             received_at=received_at,
             timezone_name=self._settings.timezone,
-            merchant=parsed.merchant,
-            counterparty=parsed.counterparty,
-            normalized_text_hash=normalized_text_hash,
-        )
-        category, suggestion_source, learning_suggestion = await self._resolve_category_suggestion(
-            source=source,
-            parsed=parsed,
-            received_at=received_at,
-        )
-        suggestion_conflict = (
-            learning_suggestion.has_parser_conflict if learning_suggestion is not None else False
         )
 
-        event, is_created = await self._bank_events.add_event_if_new(
-            BankEventModel(
+    def _build_event(
+        self,
+        *,
+        source: BankEventSourceSnapshot,
+        channel: BankEventChannel,
+        item: PreparedBankEvent,
+        suggestion: _CategorySuggestion,
+    ) -> BankEventModel:
+        category, suggestion_source, learning_suggestion = suggestion
+        return BankEventModel(
+            **bank_event_values(
+                item,
                 source_id=source.id,
-                bank=parsed.bank.value,
-                channel=channel.value,
-                received_at=received_at,
-                occurred_at=occurred_at,
-                operation_kind=parsed.operation_kind.value,
-                parse_status=status.value,
-                amount=parsed.amount,
-                fee_amount=parsed.fee_amount,
-                source=parsed.source.value,
-                scope=TransactionScope.HOUSEHOLD.value,
-                currency=parsed.currency,
-                merchant=_stored_merchant(parsed),
-                counterparty=_stored_counterparty(parsed),
-                redacted_text=parsed.redacted_text,
-                normalized_text_hash=normalized_text_hash,
-                dedupe_key=dedupe_key,
-                suggestion_conflict=suggestion_conflict,
+                channel=channel,
                 suggested_category_id=category.id if category is not None else None,
-                suggested_category_source=suggestion_source.value,
-            )
-        )
-
-        if is_created:
-            autosaved_transaction = await self._autosave_event_if_eligible(
-                event=event,
-                source=source,
-                category=category,
                 suggestion_source=suggestion_source,
-                learning_suggestion=learning_suggestion,
-            )
-            return _result_from_parsed(
-                event=event,
-                parsed=parsed,
-                status=(
-                    BankEventParseStatus.AUTOSAVED if autosaved_transaction is not None else status
+                suggestion_conflict=(
+                    learning_suggestion.has_parser_conflict
+                    if learning_suggestion is not None
+                    else False
                 ),
-                category=category,
-                suggestion_conflict=event.suggestion_conflict,
-                is_duplicate=False,
             )
+        )
 
-        existing_category = (
-            await self._categories.get(event.suggested_category_id)
-            if event.suggested_category_id is not None
-            else None
+    async def _created_event_result(
+        self,
+        source: BankEventSourceSnapshot,
+        event: BankEventModel,
+        item: PreparedBankEvent,
+        suggestion: _CategorySuggestion,
+    ) -> BankImportResult:
+        category, suggestion_source, learning_suggestion = suggestion
+        autosaved_transaction = await self._autosave_event_if_eligible(
+            event=event,
+            source=source,
+            category=category,
+            suggestion_source=suggestion_source,
+            learning_suggestion=learning_suggestion,
+        )
+        return _result_from_parsed(
+            event=event,
+            parsed=item.parsed,
+            status=(
+                BankEventParseStatus.AUTOSAVED if autosaved_transaction is not None else item.status
+            ),
+            category=category,
+            suggestion_conflict=event.suggestion_conflict,
+            is_duplicate=False,
         )
-        return _result_from_event(event, existing_category, is_duplicate=True)
 
     async def _autosave_event_if_eligible(
         self,
         *,
         event: BankEventModel,
-        source: BankEventSourceModel,
+        source: BankEventSourceSnapshot,
         category: CategoryModel | None,
         suggestion_source: BankEventSuggestionSource,
         learning_suggestion: BankLearningSuggestion | None,
@@ -909,14 +1067,13 @@ class BankIngestionService:
         if learning_suggestion.has_parser_conflict:
             return None
 
-        owner = await self._session.get(UserModel, source.owner_user_id)
-        if owner is None or not owner.is_active:
+        if not source.owner_is_active:
             return None
 
         summary = await self._transactions.create_from_category_selection(
             amount=event.amount,
             category_id=category.id,
-            payer_telegram_id=owner.telegram_id,
+            payer_telegram_id=source.owner_telegram_id,
             raw_text=f"bank_event_autosaved:{event.id}",
             comment=_event_comment(event),
             source=_event_transaction_source(event),
@@ -936,7 +1093,7 @@ class BankIngestionService:
 
         await self._transactions.delete_transaction(
             transaction_id=summary.id,
-            changed_by_telegram_id=owner.telegram_id,
+            changed_by_telegram_id=source.owner_telegram_id,
         )
         return None
 
@@ -980,30 +1137,38 @@ class BankIngestionService:
     async def _resolve_category_suggestion(
         self,
         *,
-        source: BankEventSourceModel,
+        source: BankEventSourceSnapshot,
         parsed: ParsedBankSms,
         received_at: datetime,
-    ) -> tuple[CategoryModel | None, BankEventSuggestionSource, BankLearningSuggestion | None]:
+    ) -> _CategorySuggestion:
         if parsed.operation_kind == BankEventOperationKind.EXPENSE_CANDIDATE and parsed.merchant:
-            learned = await BankLearningService(self._session).find_suggestion(
+            learning = BankLearningService(self._session, usage=self._rule_usage)
+            learned = await learning.find_suggestion(
                 owner_user_id=source.owner_user_id,
                 bank=parsed.bank.value,
                 merchant=parsed.merchant,
                 used_at=received_at,
             )
+            suggestion_source = BankEventSuggestionSource.LEARNED_RULE
+            if learned is None:
+                # Only exact rules autosave, see _autosave_event_if_eligible.
+                learned = await learning.find_similar_suggestion(
+                    owner_user_id=source.owner_user_id,
+                    bank=parsed.bank.value,
+                    merchant=parsed.merchant,
+                )
+                suggestion_source = BankEventSuggestionSource.SIMILAR_RULE
             if learned is not None:
-                category = await self._categories.get(learned.category_id)
-                if category is not None:
-                    parser_category = await self._resolve_suggested_category(
-                        parsed.suggested_category_code
-                    )
-                    learned = replace(
-                        learned,
-                        has_parser_conflict=(
-                            parser_category is not None and parser_category.id != category.id
-                        ),
-                    )
-                    return category, BankEventSuggestionSource.LEARNED_RULE, learned
+                parser_category = await self._resolve_suggested_category(
+                    parsed.suggested_category_code
+                )
+                learned = replace(
+                    learned,
+                    has_parser_conflict=(
+                        parser_category is not None and parser_category.id != learned.category_id
+                    ),
+                )
+                return learned.category, suggestion_source, learned
 
         category = await self._resolve_suggested_category(parsed.suggested_category_code)
         if category is not None:
@@ -1023,6 +1188,103 @@ def _initial_parse_status(parsed: ParsedBankSms) -> BankEventParseStatus:
     return BankEventParseStatus.NEEDS_CONFIRMATION
 
 
+def parse_source_bank_sms(
+    text: str,
+    *,
+    sender: str,
+    source_bank: BankEventBank,
+    self_counterparty_aliases: frozenset[str],
+    budget_seconds: float | None = None,
+) -> ParsedBankSms:
+    """Parse an SMS delivered by a source of `source_bank`; other banks' SMS are ignored."""
+
+    parsed = parse_normalized_bank_sms(
+        normalize_bank_sms(text, sender=sender or _sender_from_source_bank(source_bank)),
+        self_counterparty_aliases=self_counterparty_aliases,
+        budget_seconds=budget_seconds,
+    )
+    return _ignore_bank_source_mismatch(parsed, expected_bank=source_bank)
+
+
+def prepare_bank_event(
+    parsed: ParsedBankSms,
+    *,
+    source_code: str,
+    received_at: datetime,
+    timezone_name: str,
+) -> PreparedBankEvent:
+    normalized_text_hash = parsed.normalized_text_hash or hash_redacted_bank_sms(
+        parsed.redacted_text
+    )
+    occurred_at = _infer_occurred_at(
+        operation_time=parsed.operation_time,
+        received_at=received_at,
+        timezone_name=timezone_name,
+    )
+    return PreparedBankEvent(
+        parsed=parsed,
+        received_at=received_at,
+        occurred_at=occurred_at,
+        status=_initial_parse_status(parsed),
+        normalized_text_hash=normalized_text_hash,
+        dedupe_key=_build_dedupe_key(
+            source_code=source_code,
+            bank=parsed.bank,
+            operation_kind=parsed.operation_kind,
+            amount=parsed.amount,
+            fee_amount=parsed.fee_amount,
+            occurred_at=occurred_at,
+            received_at=received_at,
+            timezone_name=timezone_name,
+            merchant=parsed.merchant,
+            counterparty=parsed.counterparty,
+            normalized_text_hash=normalized_text_hash,
+        ),
+        shape=(
+            classify_redacted_bank_sms_shape(parsed.redacted_text, bank=parsed.bank.value)
+            if parsed.operation_kind == BankEventOperationKind.UNKNOWN
+            else None
+        ),
+    )
+
+
+def bank_event_values(
+    item: PreparedBankEvent,
+    *,
+    source_id: int,
+    channel: BankEventChannel,
+    suggested_category_id: int | None,
+    suggestion_source: BankEventSuggestionSource,
+    suggestion_conflict: bool = False,
+) -> dict[str, object]:
+    """Column values of the `bank_events` row stored for `item`."""
+
+    parsed = item.parsed
+    return {
+        "source_id": source_id,
+        "bank": parsed.bank.value,
+        "channel": channel.value,
+        "received_at": item.received_at,
+        "occurred_at": item.occurred_at,
+        "operation_kind": parsed.operation_kind.value,
+        "parse_status": item.status.value,
+        "amount": parsed.amount,
+        "fee_amount": parsed.fee_amount,
+        "source": parsed.source.value,
+        "scope": TransactionScope.HOUSEHOLD.value,
+        "currency": parsed.currency,
+        "merchant": _stored_merchant(parsed),
+        "counterparty": _stored_counterparty(parsed),
+        "redacted_text": parsed.redacted_text,
+        "normalized_text_hash": item.normalized_text_hash,
+        "dedupe_key": item.dedupe_key,
+        "suggestion_conflict": suggestion_conflict,
+        "suggested_category_id": suggested_category_id,
+        "suggested_category_source": suggestion_source.value,
+        **bank_event_shape_values(item.shape),
+    }
+
+
 def _ignore_bank_source_mismatch(
     parsed: ParsedBankSms,
     *,
@@ -1048,11 +1310,6 @@ def _ignore_bank_source_mismatch(
     )
 
 
-def _hash_normalized_text(text: str) -> str:
-    normalized = " ".join(text.lower().split())
-    return sha256(normalized.encode("utf-8")).hexdigest()
-
-
 def _build_dedupe_key(
     *,
     source_code: str,
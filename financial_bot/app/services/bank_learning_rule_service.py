@@ -5,6 +5,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from financial_bot.app.domain.categories import VISIBLE_EXPENSE_SORT_ORDER_MAX
 from financial_bot.app.domain.types import BankCategoryRuleMode
+from financial_bot.app.services.bank_rule_index import invalidate_bank_rule_index
 from financial_bot.app.services.transaction_service import CategoryOption
 from financial_bot.app.storage.models import BankCategoryRuleModel, CategoryModel
 from financial_bot.app.storage.repositories.bank_category_rule_repository import (
@@ -67,6 +68,7 @@ class BankLearningRuleStatusResult:
 
 class BankLearningRuleService:
     def __init__(self, session: AsyncSession) -> None:
+        self._session = session
         self._users = UserRepository(session)
         self._categories = CategoryRepository(session)
         self._rules = BankCategoryRuleRepository(session)
@@ -126,6 +128,7 @@ class BankLearningRuleService:
         if _rule_mode(rule) == BankCategoryRuleMode.DISABLED:
             rule.mode = BankCategoryRuleMode.SUGGEST.value
         rule.is_active = True
+        await invalidate_bank_rule_index(self._session)
         return BankLearningRuleUpdateResult(
             rule_id=rule.id,
             bank=rule.bank,
@@ -155,6 +158,7 @@ class BankLearningRuleService:
         else:
             rule.mode = BankCategoryRuleMode.DISABLED.value
             rule.is_active = False
+        await invalidate_bank_rule_index(self._session)
         return BankLearningRuleStatusResult(
             rule_id=rule.id,
             bank=rule.bank,
@@ -176,6 +180,7 @@ class BankLearningRuleService:
         category = await self._categories.get(rule.category_id)
         rule.mode = mode.value
         rule.is_active = mode != BankCategoryRuleMode.DISABLED
+        await invalidate_bank_rule_index(self._session)
         return BankLearningRuleStatusResult(
             rule_id=rule.id,
             bank=rule.bank,
@@ -5,7 +5,13 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from financial_bot.app.domain.bank_learning import normalize_bank_merchant_key
 from financial_bot.app.domain.types import BankCategoryRuleMode, BankEventOperationKind
-from financial_bot.app.storage.models import BankEventModel, BankEventSourceModel
+from financial_bot.app.services.bank_rule_index import (
+    invalidate_bank_rule_index,
+    load_bank_rule_index,
+)
+from financial_bot.app.services.bank_rule_usage import BankRuleUsageRecorder
+from financial_bot.app.storage.models import BankEventModel, BankEventSourceModel, CategoryModel
+from financial_bot.app.storage.reference_data import attach_reference_row
 from financial_bot.app.storage.repositories.bank_category_rule_repository import (
     BankCategoryRuleRepository,
 )
@@ -21,6 +27,7 @@ class BankLearningSuggestion:
     merchant_key: str
     hit_count: int
     mode: BankCategoryRuleMode
+    category: CategoryModel
     has_parser_conflict: bool = False
 
 
@@ -35,7 +42,20 @@ class BankLearningRuleFeedback:
 
 
 class BankLearningService:
-    def __init__(self, session: AsyncSession) -> None:
+    """Suggests categories from learned merchant rules and learns from confirmations.
+
+    Lookups go through the process-wide learned rule index. With a `usage` recorder the
+    rule's `last_used_at` is written in its next batch instead of by the lookup.
+    """
+
+    def __init__(
+        self,
+        session: AsyncSession,
+        *,
+        usage: BankRuleUsageRecorder | None = None,
+    ) -> None:
+        self._session = session
+        self._usage = usage
         self._categories = CategoryRepository(session)
         self._rules = BankCategoryRuleRepository(session)
 
@@ -51,27 +71,60 @@ class BankLearningService:
         if not merchant_key:
             return None
 
-        rule = await self._rules.get_active_rule(
-            owner_user_id=owner_user_id,
-            bank=bank,
-            merchant_key=merchant_key,
-        )
+        index = await load_bank_rule_index(self._session)
+        rule = index.get((owner_user_id, bank, merchant_key))
         if rule is None:
             return None
 
-        category = await self._categories.get(rule.category_id)
-        if category is None or not category.is_active or not category.is_expense:
+        category = await attach_reference_row(self._session, rule.category)
+        if self._usage is not None:
+            self._usage.record(rule.rule_id, used_at=used_at)
+        else:
+            await self._rules.mark_rules_used({rule.rule_id: used_at})
+        return BankLearningSuggestion(
+            rule_id=rule.rule_id,
+            category_id=category.id,
+            category_code=category.code,
+            category_title=category.title,
+            merchant_key=rule.merchant_key,
+            hit_count=rule.hit_count,
+            mode=rule.mode,
+            category=category,
+        )
+
+    async def find_similar_suggestion(
+        self,
+        *,
+        owner_user_id: int,
+        bank: str,
+        merchant: str,
+    ) -> BankLearningSuggestion | None:
+        """Suggest the category of the rule whose merchant is most similar to `merchant`.
+
+        Meant for merchants without a rule of their own, such as another outlet of a known
+        chain. The rule's `last_used_at` is not touched.
+        """
+
+        merchant_key = normalize_bank_merchant_key(merchant)
+        if not merchant_key:
             return None
 
-        await self._rules.mark_used(rule, used_at=used_at)
+        index = await load_bank_rule_index(self._session)
+        similar = index.find_similar((owner_user_id, bank, merchant_key))
+        if similar is None:
+            return None
+
+        rule = similar.rule
+        category = await attach_reference_row(self._session, rule.category)
         return BankLearningSuggestion(
-            rule_id=rule.id,
+            rule_id=rule.rule_id,
             category_id=category.id,
             category_code=category.code,
             category_title=category.title,
             merchant_key=rule.merchant_key,
             hit_count=rule.hit_count,
-            mode=BankCategoryRuleMode(rule.mode),
+            mode=rule.mode,
+            category=category,
         )
 
     async def learn_from_confirmed_event(
@@ -114,6 +167,7 @@ class BankLearningService:
             category_id=category.id,
             confirmed_at=confirmed_at,
         )
+        await invalidate_bank_rule_index(self._session)
         return BankLearningRuleFeedback(
             rule_id=rule.id,
             action=action,
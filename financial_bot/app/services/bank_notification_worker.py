@@ -0,0 +1,253 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Any, Protocol
+from zoneinfo import ZoneInfo
+
+from aiogram.exceptions import (
+    TelegramBadRequest,
+    TelegramForbiddenError,
+    TelegramRetryAfter,
+)
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from financial_bot.app.config import Settings
+from financial_bot.app.storage.db import session_scope
+from financial_bot.app.storage.repositories.bank_event_notification_repository import (
+    BankEventNotificationRepository,
+)
+from financial_bot.app.storage.repositories.bank_event_repository import BankEventRepository
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_BANK_NOTIFICATION_POLL_INTERVAL_SECONDS = 5.0
+DEFAULT_BANK_NOTIFICATION_BATCH_SIZE = 50
+
+
+@dataclass(frozen=True, slots=True)
+class PendingBankEventNotification:
+    id: int
+    bank_event_id: int
+    bank_event_ids: tuple[int, ...]
+    chat_id: int
+    text: str
+    reply_markup: dict[str, Any] | None
+    attempts: int
+
+
+class BankEventNotifier(Protocol):
+    async def send(self, notification: PendingBankEventNotification) -> None: ...
+
+    async def close(self) -> None: ...
+
+
+@dataclass(frozen=True, slots=True)
+class BankNotificationWorkerRunResult:
+    attempted: int = 0
+    sent: int = 0
+    retried: int = 0
+    failed: int = 0
+
+
+@dataclass(frozen=True, slots=True)
+class BankNotificationWorkerStats:
+    sent: int
+    retried: int
+    failed: int
+    last_error: str | None
+
+
+@dataclass(frozen=True, slots=True)
+class _DeliveryOutcome:
+    notification_id: int
+    error: str | None = None
+    retry_after_seconds: float | None = None
+    permanent: bool = False
+
+
+class BankEventNotificationWorker:
+    """Delivers queued bank event notifications from the `bank_event_notifications` outbox.
+
+    The ingestion endpoint only enqueues a row in the event's transaction and calls `wake`.
+    At most `concurrency` messages are in flight; a failed send is retried with exponential
+    backoff (or Telegram's `retry_after`) until `max_attempts`, while errors Telegram will
+    keep returning fail the row at once.
+    """
+
+    def __init__(
+        self,
+        *,
+        notifier: BankEventNotifier,
+        session_factory: async_sessionmaker[AsyncSession],
+        settings: Settings,
+        poll_interval_seconds: float = DEFAULT_BANK_NOTIFICATION_POLL_INTERVAL_SECONDS,
+        batch_size: int = DEFAULT_BANK_NOTIFICATION_BATCH_SIZE,
+    ) -> None:
+        self._notifier = notifier
+        self._session_factory = session_factory
+        self._settings = settings
+        self._poll_interval_seconds = poll_interval_seconds
+        self._batch_size = batch_size
+        self._semaphore = asyncio.Semaphore(settings.bank_notification_concurrency)
+        self._wake = asyncio.Event()
+        self._lock = asyncio.Lock()
+        self._sent = 0
+        self._retried = 0
+        self._failed = 0
+        self._last_error: str | None = None
+
+    def wake(self) -> None:
+        self._wake.set()
+
+    def snapshot(self) -> BankNotificationWorkerStats:
+        return BankNotificationWorkerStats(
+            sent=self._sent,
+            retried=self._retried,
+            failed=self._failed,
+            last_error=self._last_error,
+        )
+
+    async def run_forever(self) -> None:
+        try:
+            while True:
+                try:
+                    # A cancelled worker still records the batch it has already sent.
+                    result = await asyncio.shield(self.run_once())
+                except Exception:
+                    logger.exception("Bank notification worker tick failed")
+                    result = BankNotificationWorkerRunResult()
+                if result.attempted < self._batch_size:
+                    await self._wait_for_work()
+        except asyncio.CancelledError:
+            logger.info("Bank notification worker stopped.")
+            raise
+
+    async def run_once(self, now: datetime | None = None) -> BankNotificationWorkerRunResult:
+        async with self._lock:
+            now = now or self._now()
+            async with session_scope(self._session_factory) as session:
+                due = [
+                    PendingBankEventNotification(
+                        id=row.id,
+                        bank_event_id=row.bank_event_id,
+                        bank_event_ids=tuple(row.bank_event_ids or (row.bank_event_id,)),
+                        chat_id=row.chat_id,
+                        text=row.text,
+                        reply_markup=row.reply_markup,
+                        attempts=row.attempts,
+                    )
+                    for row in await BankEventNotificationRepository(session).list_due(
+                        now=now,
+                        limit=self._batch_size,
+                    )
+                ]
+            if not due:
+                return BankNotificationWorkerRunResult()
+
+            outcomes = await asyncio.gather(*(self._deliver(item) for item in due))
+            return await self._record(due, outcomes, now=now)
+
+    async def wait_idle(self) -> None:
+        async with self._lock:
+            return
+
+    async def _wait_for_work(self) -> None:
+        try:
+            async with asyncio.timeout(self._poll_interval_seconds):
+                await self._wake.wait()
+        except TimeoutError:
+            pass
+        self._wake.clear()
+
+    async def _deliver(self, notification: PendingBankEventNotification) -> _DeliveryOutcome:
+        async with self._semaphore:
+            try:
+                await self._notifier.send(notification)
+            except TelegramRetryAfter as exc:
+                return _DeliveryOutcome(
+                    notification.id,
+                    error=str(exc),
+                    retry_after_seconds=exc.retry_after,
+                )
+            except (TelegramForbiddenError, TelegramBadRequest) as exc:
+                return _DeliveryOutcome(notification.id, error=str(exc), permanent=True)
+            except Exception as exc:
+                logger.warning(
+                    "Telegram notification for bank event %s failed",
+                    notification.bank_event_id,
+                    exc_info=True,
+                )
+                return _DeliveryOutcome(notification.id, error=str(exc) or type(exc).__name__)
+        return _DeliveryOutcome(notification.id)
+
+    async def _record(
+        self,
+        due: list[PendingBankEventNotification],
+        outcomes: list[_DeliveryOutcome],
+        *,
+        now: datetime,
+    ) -> BankNotificationWorkerRunResult:
+        attempts = {item.id: item.attempts + 1 for item in due}
+        event_ids = {item.id: item.bank_event_ids for item in due}
+        sent = retried = failed = 0
+        async with session_scope(self._session_factory) as session:
+            notifications = BankEventNotificationRepository(session)
+            bank_events = BankEventRepository(session)
+            rows = {row.id: row for row in await notifications.get_many(list(attempts))}
+            for outcome in outcomes:
+                row = rows.get(outcome.notification_id)
+                if row is None:
+                    continue
+                events = await bank_events.get_events(event_ids[row.id])
+                if outcome.error is None:
+                    await notifications.mark_sent(row, sent_at=now)
+                    for event in events:
+                        await bank_events.mark_telegram_notification_sent(event, sent_at=now)
+                    sent += 1
+                    continue
+
+                self._last_error = outcome.error
+                for event in events:
+                    await bank_events.mark_telegram_notification_failed(event, failed_at=now)
+                if outcome.permanent or attempts[row.id] >= self._max_attempts:
+                    await notifications.mark_failed(row, error=outcome.error)
+                    logger.warning(
+                        "Gave up on Telegram notification for bank event %s after %s attempts",
+                        row.bank_event_id,
+                        attempts[row.id],
+                    )
+                    failed += 1
+                else:
+                    delay = outcome.retry_after_seconds or self._backoff_seconds(attempts[row.id])
+                    await notifications.mark_retry(
+                        row,
+                        next_attempt_at=now + timedelta(seconds=delay),
+                        error=outcome.error,
+                    )
+                    retried += 1
+
+        self._sent += sent
+        self._retried += retried
+        self._failed += failed
+        return BankNotificationWorkerRunResult(
+            attempted=len(due),
+            sent=sent,
+            retried=retried,
+            failed=failed,
+        )
+
+    @property
+    def _max_attempts(self) -> int:
+        return self._settings.bank_notification_max_attempts
+
+    def _backoff_seconds(self, attempts: int) -> float:
+        return min(
+            self._settings.bank_notification_retry_base_seconds * 2 ** (attempts - 1),
+            self._settings.bank_notification_retry_max_seconds,
+        )
+
+    def _now(self) -> datetime:
+        return datetime.now(ZoneInfo(self._settings.timezone))
@@ -0,0 +1,174 @@
+from collections import defaultdict
+from collections.abc import Iterable
+from dataclasses import dataclass
+from typing import Any
+from weakref import WeakKeyDictionary
+
+from sqlalchemy import Engine, event
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from financial_bot.app.domain.bank_learning import BankMerchantTrigramIndex
+from financial_bot.app.domain.types import BankCategoryRuleMode
+from financial_bot.app.services.alias_service import snapshot_category
+from financial_bot.app.storage.models import CategoryModel
+from financial_bot.app.storage.repositories.bank_category_rule_repository import (
+    BankCategoryRuleRepository,
+)
+from financial_bot.app.storage.repositories.category_repository import CategoryRepository
+from financial_bot.app.storage.repositories.data_version_repository import (
+    BANK_CATEGORY_RULES_DATA_VERSION_KEY,
+    DataVersionRepository,
+)
+
+type BankRuleKey = tuple[int, str, str]
+
+_SESSION_INDEX_KEY = "bank_rule_index"
+
+
+@dataclass(frozen=True, slots=True)
+class BankRuleIndexEntry:
+    rule_id: int
+    merchant_key: str
+    hit_count: int
+    mode: BankCategoryRuleMode
+    category: CategoryModel
+
+
+@dataclass(frozen=True, slots=True)
+class SimilarBankRule:
+    rule: BankRuleIndexEntry
+    score: float
+
+
+class BankRuleIndex:
+    """Learned rules keyed by `(owner_user_id, bank, merchant_key)`.
+
+    Each owner and bank also gets a trigram index over its merchant keys for rules of
+    similar merchants; among equally similar keys the most confirmed rule wins.
+    """
+
+    def __init__(self, rules: Iterable[tuple[BankRuleKey, BankRuleIndexEntry]]) -> None:
+        self._rules = dict(rules)
+        merchant_keys: defaultdict[tuple[int, str], list[str]] = defaultdict(list)
+        for (owner_user_id, bank, merchant_key), _rule in sorted(
+            self._rules.items(),
+            key=lambda item: (-item[1].hit_count, item[1].rule_id),
+        ):
+            merchant_keys[owner_user_id, bank].append(merchant_key)
+        self._similar = {
+            owner_bank: BankMerchantTrigramIndex(keys) for owner_bank, keys in merchant_keys.items()
+        }
+
+    def __len__(self) -> int:
+        return len(self._rules)
+
+    def get(self, key: BankRuleKey) -> BankRuleIndexEntry | None:
+        return self._rules.get(key)
+
+    def find_similar(self, key: BankRuleKey) -> SimilarBankRule | None:
+        owner_user_id, bank, merchant_key = key
+        similar = self._similar.get((owner_user_id, bank))
+        match = similar.best_match(merchant_key) if similar is not None else None
+        if match is None:
+            return None
+        return SimilarBankRule(
+            rule=self._rules[owner_user_id, bank, match.merchant_key],
+            score=match.score,
+        )
+
+
+async def load_bank_rule_index(session: AsyncSession) -> BankRuleIndex:
+    """Return usable learned rules.
+
+    Only active, non-disabled rules of an active expense category are indexed; `category`
+    is a detached snapshot. The index is built once per engine and checked against the
+    `bank_category_rules` data version once per session transaction, so a rule changed by
+    another process is seen by the next transaction. Writers must call
+    `invalidate_bank_rule_index`.
+    """
+
+    transaction = session.sync_session.get_transaction()
+    checked = session.info.get(_SESSION_INDEX_KEY)
+    if checked is not None and transaction is not None and checked[0] is transaction:
+        return checked[1]
+
+    engine = session.get_bind()
+    version = _BANK_RULE_INDEX_CACHE.version
+    data_version = await DataVersionRepository(session).get_in_transaction(
+        BANK_CATEGORY_RULES_DATA_VERSION_KEY
+    )
+    cached = _BANK_RULE_INDEX_CACHE.get(engine)
+    if cached is None or cached.data_version != data_version:
+        cached = _CachedBankRuleIndex(data_version=data_version, rules=await _build_index(session))
+        _BANK_RULE_INDEX_CACHE.store(engine, cached, version=version)
+    session.info[_SESSION_INDEX_KEY] = (session.sync_session.get_transaction(), cached.rules)
+    return cached.rules
+
+
+async def invalidate_bank_rule_index(session: AsyncSession) -> None:
+    """Publish a learned rule change made in `session`.
+
+    Bumps the `bank_category_rules` data version in the session's transaction, so other
+    processes rebuild their index once it commits, and drops this process's indexes now
+    and again when the session commits or rolls back.
+    """
+
+    await DataVersionRepository(session).bump(BANK_CATEGORY_RULES_DATA_VERSION_KEY)
+    session.info.pop(_SESSION_INDEX_KEY, None)
+    _BANK_RULE_INDEX_CACHE.clear()
+
+    def _clear(*_: Any) -> None:
+        _BANK_RULE_INDEX_CACHE.clear()
+
+    event.listen(session.sync_session, "after_commit", _clear, once=True)
+    event.listen(session.sync_session, "after_soft_rollback", _clear, once=True)
+
+
+async def _build_index(session: AsyncSession) -> BankRuleIndex:
+    rules = await BankCategoryRuleRepository(session).list_active_rules()
+    categories = {
+        category.id: snapshot_category(category)
+        for category in await CategoryRepository(session).list_all()
+        if category.is_active and category.is_expense
+    }
+    return BankRuleIndex(
+        (
+            (rule.owner_user_id, rule.bank, rule.merchant_key),
+            BankRuleIndexEntry(
+                rule_id=rule.id,
+                merchant_key=rule.merchant_key,
+                hit_count=rule.hit_count,
+                mode=BankCategoryRuleMode(rule.mode),
+                category=category,
+            ),
+        )
+        for rule in rules
+        if (category := categories.get(rule.category_id)) is not None
+    )
+
+
+@dataclass(frozen=True, slots=True)
+class _CachedBankRuleIndex:
+    data_version: int
+    rules: BankRuleIndex
+
+
+class _BankRuleIndexCache:
+    def __init__(self) -> None:
+        self._indexes: WeakKeyDictionary[Engine, _CachedBankRuleIndex] = WeakKeyDictionary()
+        self.version = 0
+
+    def get(self, engine: Engine) -> _CachedBankRuleIndex | None:
+        return self._indexes.get(engine)
+
+    def store(self, engine: Engine, index: _CachedBankRuleIndex, *, version: int) -> None:
+        # An invalidation that raced with the build means the index may already be stale.
+        if version == self.version:
+            self._indexes[engine] = index
+
+    def clear(self) -> None:
+        self._indexes.clear()
+        self.version += 1
+
+
+_BANK_RULE_INDEX_CACHE = _BankRuleIndexCache()
@@ -0,0 +1,79 @@
+import asyncio
+import logging
+from datetime import datetime
+from zoneinfo import ZoneInfo
+
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from financial_bot.app.storage.db import session_scope
+from financial_bot.app.storage.repositories.bank_category_rule_repository import (
+    BankCategoryRuleRepository,
+)
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_BANK_RULE_USAGE_FLUSH_SECONDS = 10.0
+
+
+class BankRuleUsageRecorder:
+    """Batches `bank_category_rules.last_used_at` updates of the ingestion app.
+
+    `record` only keeps the latest use per rule in memory; `run_forever` writes the
+    collected times in one UPDATE every `flush_interval_seconds` and `close` writes the rest.
+    """
+
+    def __init__(
+        self,
+        session_factory: async_sessionmaker[AsyncSession],
+        *,
+        timezone: str,
+        flush_interval_seconds: float = DEFAULT_BANK_RULE_USAGE_FLUSH_SECONDS,
+    ) -> None:
+        self._session_factory = session_factory
+        self._timezone = ZoneInfo(timezone)
+        self._flush_interval_seconds = flush_interval_seconds
+        self._pending: dict[int, datetime] = {}
+        self._flush_lock = asyncio.Lock()
+
+    @property
+    def pending_rules(self) -> int:
+        return len(self._pending)
+
+    def record(self, rule_id: int, *, used_at: datetime) -> None:
+        # SQLite keeps naive wall-clock values, so compare and store local time.
+        if used_at.tzinfo is not None:
+            used_at = used_at.astimezone(self._timezone).replace(tzinfo=None)
+        self._remember(rule_id, used_at)
+
+    async def close(self) -> None:
+        await self.flush()
+
+    async def run_forever(self) -> None:
+        while True:
+            await asyncio.sleep(self._flush_interval_seconds)
+            try:
+                await self.flush()
+            except Exception:
+                logger.exception("Bank rule usage flush failed")
+
+    async def flush(self) -> int:
+        """Write pending uses and return the number of rules written."""
+
+        async with self._flush_lock:
+            pending, self._pending = self._pending, {}
+            if not pending:
+                return 0
+
+            try:
+                async with session_scope(self._session_factory) as session:
+                    await BankCategoryRuleRepository(session).mark_rules_used(pending)
+            except Exception:
+                for rule_id, used_at in pending.items():
+                    self._remember(rule_id, used_at)
+                raise
+            return len(pending)
+
+    def _remember(self, rule_id: int, used_at: datetime) -> None:
+        current = self._pending.get(rule_id)
+        if current is None or used_at > current:
+            self._pending[rule_id] = used_at
@@ -0,0 +1,134 @@
+from dataclasses import dataclass
+from time import monotonic
+from typing import Any
+from weakref import WeakKeyDictionary
+
+from sqlalchemy import Engine, event
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from financial_bot.app.storage.models import BankEventSourceModel, UserModel
+from financial_bot.app.storage.repositories.bank_event_repository import (
+    BankEventRepository,
+    hash_bank_event_source_token,
+)
+
+DEFAULT_BANK_SOURCE_CACHE_TTL_SECONDS = 30.0
+
+
+@dataclass(frozen=True, slots=True)
+class BankEventSourceSnapshot:
+    id: int
+    code: str
+    bank: str
+    channel: str
+    owner_user_id: int
+    owner_telegram_id: int
+    owner_is_active: bool
+
+
+def snapshot_bank_event_source(
+    source: BankEventSourceModel,
+    owner: UserModel,
+) -> BankEventSourceSnapshot:
+    return BankEventSourceSnapshot(
+        id=source.id,
+        code=source.code,
+        bank=source.bank,
+        channel=source.channel,
+        owner_user_id=owner.id,
+        owner_telegram_id=owner.telegram_id,
+        owner_is_active=owner.is_active,
+    )
+
+
+async def resolve_bank_event_source(
+    session: AsyncSession,
+    token: str,
+    *,
+    ttl_seconds: float = DEFAULT_BANK_SOURCE_CACHE_TTL_SECONDS,
+) -> BankEventSourceSnapshot | None:
+    """Return the active source for `token` and its owner, cached per engine for `ttl_seconds`.
+
+    Only active sources are cached, so a new or rotated token works at once. A source
+    deactivated or rotated by another process stops authenticating within the TTL; in
+    this process `invalidate_bank_event_source_cache` drops it immediately.
+    """
+
+    token_hash = hash_bank_event_source_token(token)
+    engine = session.get_bind()
+    now = monotonic()
+    snapshot = _BANK_SOURCE_CACHE.get(engine, token_hash, now=now)
+    if snapshot is not None:
+        return snapshot
+
+    version = _BANK_SOURCE_CACHE.version
+    row = await BankEventRepository(session).get_active_source_with_owner_by_token_hash(token_hash)
+    if row is None:
+        return None
+
+    snapshot = snapshot_bank_event_source(*row)
+    if ttl_seconds > 0:
+        _BANK_SOURCE_CACHE.store(
+            engine,
+            token_hash,
+            snapshot,
+            expires_at=now + ttl_seconds,
+            version=version,
+        )
+    return snapshot
+
+
+def invalidate_bank_event_source_cache(session: AsyncSession | None = None) -> None:
+    """Drop cached source snapshots, again when `session` commits or rolls back."""
+
+    _BANK_SOURCE_CACHE.clear()
+    if session is None:
+        return
+
+    def _clear(*_: Any) -> None:
+        _BANK_SOURCE_CACHE.clear()
+
+    event.listen(session.sync_session, "after_commit", _clear, once=True)
+    event.listen(session.sync_session, "after_soft_rollback", _clear, once=True)
+
+
+class _BankSourceCache:
+    def __init__(self) -> None:
+        self._entries: WeakKeyDictionary[
+            Engine,
+            dict[str, tuple[BankEventSourceSnapshot, float]],
+        ] = WeakKeyDictionary()
+        self.version = 0
+
+    def get(self, engine: Engine, token_hash: str, *, now: float) -> BankEventSourceSnapshot | None:
+        entries = self._entries.get(engine)
+        if entries is None:
+            return None
+        entry = entries.get(token_hash)
+        if entry is None:
+            return None
+        snapshot, expires_at = entry
+        if expires_at <= now:
+            del entries[token_hash]
+            return None
+        return snapshot
+
+    def store(
+        self,
+        engine: Engine,
+        token_hash: str,
+        snapshot: BankEventSourceSnapshot,
+        *,
+        expires_at: float,
+        version: int,
+    ) -> None:
+        # An invalidation that raced with the lookup means the row may already be stale.
+        if version == self.version:
+            self._entries.setdefault(engine, {})[token_hash] = (snapshot, expires_at)
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self.version += 1
+
+
+_BANK_SOURCE_CACHE = _BankSourceCache()
@@ -0,0 +1,95 @@
+import asyncio
+import logging
+from datetime import datetime, timedelta
+from zoneinfo import ZoneInfo
+
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from financial_bot.app.storage.db import session_scope
+from financial_bot.app.storage.repositories.bank_event_repository import BankEventRepository
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_BANK_SOURCE_HEARTBEAT_FLUSH_SECONDS = 10.0
+DEFAULT_BANK_SOURCE_HEARTBEAT_GRANULARITY_SECONDS = 60.0
+
+
+class BankSourceHeartbeat:
+    """Coalesces `bank_event_sources.last_seen_at` updates of the ingestion app.
+
+    `record` only keeps the latest time per source in memory, so an SMS that stores no
+    event (a retried duplicate) does not write to the database. `run_forever` writes the
+    collected times every `flush_interval_seconds` and `close` writes the rest; a source
+    whose stored time is less than `granularity_seconds` older is not updated.
+    """
+
+    def __init__(
+        self,
+        session_factory: async_sessionmaker[AsyncSession],
+        *,
+        timezone: str,
+        flush_interval_seconds: float = DEFAULT_BANK_SOURCE_HEARTBEAT_FLUSH_SECONDS,
+        granularity_seconds: float = DEFAULT_BANK_SOURCE_HEARTBEAT_GRANULARITY_SECONDS,
+    ) -> None:
+        self._session_factory = session_factory
+        self._timezone = ZoneInfo(timezone)
+        self._flush_interval_seconds = flush_interval_seconds
+        self._granularity = timedelta(seconds=granularity_seconds)
+        self._pending: dict[int, datetime] = {}
+        self._flush_lock = asyncio.Lock()
+
+    @property
+    def pending_sources(self) -> int:
+        return len(self._pending)
+
+    def record(self, source_id: int, *, seen_at: datetime) -> None:
+        # SQLite keeps naive wall-clock values, so compare and store local time.
+        if seen_at.tzinfo is not None:
+            seen_at = seen_at.astimezone(self._timezone).replace(tzinfo=None)
+        self._remember(source_id, seen_at)
+
+    async def close(self) -> None:
+        await self.flush()
+
+    async def run_forever(self) -> None:
+        while True:
+            await asyncio.sleep(self._flush_interval_seconds)
+            try:
+                await self.flush()
+            except Exception:
+                logger.exception("Bank source heartbeat flush failed")
+
+    async def flush(self) -> int:
+        """Write pending heartbeats and return the number of updated sources."""
+
+        async with self._flush_lock:
+            pending, self._pending = self._pending, {}
+            if not pending:
+                return 0
+
+            try:
+                async with session_scope(self._session_factory) as session:
+                    bank_events = BankEventRepository(session)
+                    stored = await bank_events.get_sources_last_seen_at(pending)
+                    due = {
+                        source_id: seen_at
+                        for source_id, seen_at in pending.items()
+                        if source_id in stored and self._is_due(stored[source_id], seen_at)
+                    }
+                    for source_id, seen_at in sorted(due.items()):
+                        await bank_events.touch_source(source_id, seen_at=seen_at)
+            except Exception:
+                for source_id, seen_at in pending.items():
+                    self._remember(source_id, seen_at)
+                raise
+            return len(due)
+
+    def _remember(self, source_id: int, seen_at: datetime) -> None:
+        current = self._pending.get(source_id)
+        if current is None or seen_at > current:
+            self._pending[source_id] = seen_at
+
+    def _is_due(self, stored: datetime | None, seen_at: datetime) -> bool:
+        if stored is None:
+            return True
+        return seen_at > stored and seen_at - stored >= self._granularity
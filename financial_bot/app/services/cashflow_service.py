@@ -60,22 +60,13 @@ class CashflowService:
             now=report_now,
             scope=scope,
         )
-        income_total = await self._cashflow.total_income(
+        income = await self._cashflow.income_totals(
             expense_report.period.start_at,
             expense_report.period.end_at,
             scope=scope,
         )
-        income_rows = await self._cashflow.income_by_recipient(
-            expense_report.period.start_at,
-            expense_report.period.end_at,
-            scope=scope,
-        )
-        income_category_rows = await self._cashflow.income_by_category(
-            expense_report.period.start_at,
-            expense_report.period.end_at,
-            scope=scope,
-        )
-        income_amounts = {row.role: row.amount for row in income_rows}
+        income_total = income.total
+        income_amounts = {row.role: row.amount for row in income.by_recipient}
         budget_net_savings = None
         if kind == PeriodKind.MONTH and scope is None:
             budget = await self._limits.build_monthly_report(now=report_now)
@@ -103,7 +94,7 @@ class CashflowService:
                     amount=row.amount,
                     share_percent=_share(row.amount, income_total),
                 )
-                for row in income_category_rows
+                for row in income.by_category
             ),
             budget_net_savings=budget_net_savings,
         )
@@ -3,8 +3,15 @@ from dataclasses import dataclass
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from financial_bot.app.domain.categories import VISIBLE_EXPENSE_SORT_ORDER_MAX
+from financial_bot.app.services.alias_service import invalidate_alias_index
+from financial_bot.app.services.bank_rule_index import invalidate_bank_rule_index
 from financial_bot.app.storage.models import CategoryAliasModel, CategoryModel
+from financial_bot.app.storage.reference_data import invalidate_reference_data
 from financial_bot.app.storage.repositories.category_repository import CategoryRepository
+from financial_bot.app.storage.repositories.data_version_repository import (
+    REPORT_DATA_VERSION_KEY,
+    DataVersionRepository,
+)
 
 MAX_CATEGORY_TITLE_LENGTH = 80
 MAX_CATEGORY_ALIAS_LENGTH = 120
@@ -45,7 +52,9 @@ class CategoryAliasAddResult:
 
 class CategorySettingsService:
     def __init__(self, session: AsyncSession) -> None:
+        self._session = session
         self._categories = CategoryRepository(session)
+        self._data_versions = DataVersionRepository(session)
 
     async def list_categories(self) -> tuple[CategorySettingsLine, ...]:
         categories = await self._list_editable_categories()
@@ -91,6 +100,10 @@ class CategorySettingsService:
 
         old_title = category.title
         category.title = normalized_title
+        await self._data_versions.bump(REPORT_DATA_VERSION_KEY)
+        await invalidate_reference_data(self._session)
+        await invalidate_bank_rule_index(self._session)
+        invalidate_alias_index(self._session)
         return CategoryRenameResult(
             code=category.code,
             old_title=old_title,
@@ -114,6 +127,8 @@ class CategorySettingsService:
         await self._categories.add_alias(
             CategoryAliasModel(alias=normalized_alias, category_id=category.id)
         )
+        await invalidate_reference_data(self._session)
+        invalidate_alias_index(self._session)
         return CategoryAliasAddResult(
             category_code=category.code,
             category_title=category.title,
@@ -0,0 +1,159 @@
+import hashlib
+import logging
+import os
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import date
+from pathlib import Path
+from tempfile import NamedTemporaryFile
+from time import time
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CHART_CACHE_MAX_BYTES = 32 * 1024 * 1024
+CHART_CACHE_MAX_AGE_SECONDS = 7 * 24 * 60 * 60
+CHART_CACHE_FILE_SUFFIX = ".png"
+CHART_CACHE_CAPTION_SUFFIX = ".caption"
+
+
+@dataclass(frozen=True, slots=True)
+class ChartCacheKey:
+    kind: str
+    params: tuple[str, ...]
+    scope: str | None
+    local_date: date
+    timezone: str
+    data_version: int
+
+    def digest(self) -> str:
+        parts = (
+            self.kind,
+            *self.params,
+            self.scope or "",
+            self.local_date.isoformat(),
+            self.timezone,
+            str(self.data_version),
+        )
+        return hashlib.sha256("\x1f".join(parts).encode()).hexdigest()
+
+
+@dataclass(frozen=True, slots=True)
+class CachedChart:
+    png: bytes
+    caption: str
+
+
+@dataclass(frozen=True, slots=True)
+class ChartCacheStats:
+    hits: int
+    misses: int
+    entries: int
+    size_bytes: int
+
+
+class ChartCache:
+    """Size-bounded LRU of rendered chart PNGs.
+
+    Keys carry the report data version, so a change to transactions, categories or spending
+    limits makes old entries unreachable instead of requiring explicit invalidation; they
+    age out of the LRU. With `persist_dir` entries also survive bot restarts.
+    """
+
+    def __init__(
+        self,
+        *,
+        max_bytes: int = DEFAULT_CHART_CACHE_MAX_BYTES,
+        persist_dir: Path | None = None,
+    ) -> None:
+        self._max_bytes = max_bytes
+        self._persist_dir = persist_dir
+        self._entries: OrderedDict[ChartCacheKey, CachedChart] = OrderedDict()
+        self._size_bytes = 0
+        self._hits = 0
+        self._misses = 0
+
+    def get(self, key: ChartCacheKey) -> CachedChart | None:
+        chart = self._entries.get(key)
+        if chart is not None:
+            self._entries.move_to_end(key)
+        elif (chart := self._load(key)) is not None:
+            self._remember(key, chart)
+
+        if chart is None:
+            self._misses += 1
+        else:
+            self._hits += 1
+        return chart
+
+    def put(self, key: ChartCacheKey, chart: CachedChart) -> None:
+        self._remember(key, chart)
+        self._store(key, chart)
+
+    def snapshot(self) -> ChartCacheStats:
+        return ChartCacheStats(
+            hits=self._hits,
+            misses=self._misses,
+            entries=len(self._entries),
+            size_bytes=self._size_bytes,
+        )
+
+    def _remember(self, key: ChartCacheKey, chart: CachedChart) -> None:
+        if len(chart.png) > self._max_bytes:
+            return
+        previous = self._entries.pop(key, None)
+        if previous is not None:
+            self._size_bytes -= len(previous.png)
+        self._entries[key] = chart
+        self._size_bytes += len(chart.png)
+        while self._size_bytes > self._max_bytes:
+            _, evicted = self._entries.popitem(last=False)
+            self._size_bytes -= len(evicted.png)
+
+    def _load(self, key: ChartCacheKey) -> CachedChart | None:
+        if self._persist_dir is None:
+            return None
+        png_path, caption_path = _cache_paths(self._persist_dir, key)
+        try:
+            return CachedChart(
+                png=png_path.read_bytes(),
+                caption=caption_path.read_text(encoding="utf-8"),
+            )
+        except OSError:
+            return None
+
+    def _store(self, key: ChartCacheKey, chart: CachedChart) -> None:
+        if self._persist_dir is None:
+            return
+        png_path, caption_path = _cache_paths(self._persist_dir, key)
+        try:
+            self._persist_dir.mkdir(parents=True, exist_ok=True)
+            _cleanup_old_cache_files(self._persist_dir)
+            # The caption goes first: a PNG without its caption is never read back.
+            _write_atomically(caption_path, chart.caption.encode("utf-8"))
+            _write_atomically(png_path, chart.png)
+        except OSError:
+            logger.warning("Could not persist chart cache entry to %s.", self._persist_dir)
+
+
+def _cache_paths(cache_dir: Path, key: ChartCacheKey) -> tuple[Path, Path]:
+    digest = key.digest()
+    return (
+        cache_dir / f"{digest}{CHART_CACHE_FILE_SUFFIX}",
+        cache_dir / f"{digest}{CHART_CACHE_CAPTION_SUFFIX}",
+    )
+
+
+def _write_atomically(path: Path, payload: bytes) -> None:
+    with NamedTemporaryFile(dir=path.parent, prefix=".tmp-", delete=False) as temporary_file:
+        temporary_file.write(payload)
+    os.replace(temporary_file.name, path)
+
+
+def _cleanup_old_cache_files(cache_dir: Path) -> None:
+    threshold = time() - CHART_CACHE_MAX_AGE_SECONDS
+    for path in cache_dir.iterdir():
+        try:
+            if path.stat().st_mtime < threshold:
+                path.unlink(missing_ok=True)
+        except OSError:
+            continue
@@ -0,0 +1,98 @@
+import asyncio
+import logging
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+from financial_bot.app.services.chart_rendering import (
+    ChartSpec,
+    render_chart_png,
+    warm_up_renderer,
+)
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CHART_RENDER_WORKERS = 2
+DEFAULT_CHART_RENDER_TIMEOUT_SECONDS = 30.0
+
+
+class ChartRenderTimeoutError(TimeoutError):
+    """Raised when a chart is not rendered within the configured timeout."""
+
+
+class ChartRenderPool:
+    """Renders charts in a bounded pool of warmed worker processes.
+
+    Workers are spawned (not forked) so that they do not inherit the bot's event loop,
+    database connections or threads. At most `max_concurrency` charts are in flight; other
+    requests wait on the event loop instead of queueing inside the executor, so a waiting
+    request still honours its own timeout.
+    """
+
+    def __init__(
+        self,
+        *,
+        workers: int = DEFAULT_CHART_RENDER_WORKERS,
+        max_concurrency: int | None = None,
+        timeout_seconds: float = DEFAULT_CHART_RENDER_TIMEOUT_SECONDS,
+    ) -> None:
+        if workers <= 0:
+            msg = "Chart render pool needs at least one worker"
+            raise ValueError(msg)
+        self._workers = workers
+        self._timeout_seconds = timeout_seconds
+        self._semaphore = asyncio.Semaphore(max_concurrency or workers)
+        self._executor: ProcessPoolExecutor | None = None
+
+    async def start(self) -> None:
+        executor = self._ensure_executor()
+        loop = asyncio.get_running_loop()
+        # The initializer already warms each worker; one ping per worker makes the
+        # executor spawn all of them now instead of on the first chart requests.
+        await asyncio.gather(*(loop.run_in_executor(executor, _ping) for _ in range(self._workers)))
+
+    async def render(self, chart: ChartSpec) -> bytes:
+        try:
+            async with asyncio.timeout(self._timeout_seconds), self._semaphore:
+                return await self._render_in_worker(chart)
+        except TimeoutError as exc:
+            msg = f"Chart was not rendered within {self._timeout_seconds:g}s"
+            raise ChartRenderTimeoutError(msg) from exc
+
+    async def close(self) -> None:
+        if self._executor is None:
+            return
+        executor = self._executor
+        self._executor = None
+        await asyncio.to_thread(executor.shutdown, wait=True, cancel_futures=True)
+
+    async def _render_in_worker(self, chart: ChartSpec) -> bytes:
+        executor = self._ensure_executor()
+        try:
+            return await asyncio.get_running_loop().run_in_executor(
+                executor,
+                render_chart_png,
+                chart,
+            )
+        except BrokenProcessPool:
+            logger.warning("Chart render pool is broken; restarting workers.")
+            self._reset_executor(executor)
+            raise
+
+    def _ensure_executor(self) -> ProcessPoolExecutor:
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(
+                max_workers=self._workers,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=warm_up_renderer,
+            )
+        return self._executor
+
+    def _reset_executor(self, executor: ProcessPoolExecutor) -> None:
+        if self._executor is executor:
+            self._executor = None
+        executor.shutdown(wait=False, cancel_futures=True)
+
+
+def _ping() -> None:
+    return None
@@ -0,0 +1,64 @@
+import asyncio
+import logging
+from dataclasses import dataclass
+from time import perf_counter
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MONITOR_INTERVAL_SECONDS = 0.05
+DEFAULT_STALL_THRESHOLD_SECONDS = 0.1
+
+
+@dataclass(frozen=True, slots=True)
+class EventLoopStallStats:
+    samples: int
+    stalled_samples: int
+    max_stall_seconds: float
+    total_stall_seconds: float
+
+
+class EventLoopStallMonitor:
+    """Measures how late the event loop wakes up a periodic sleeper.
+
+    Lateness above `stall_threshold_seconds` is counted as a stall: that is time during
+    which no other update, callback or notification could run.
+    """
+
+    def __init__(
+        self,
+        *,
+        interval_seconds: float = DEFAULT_MONITOR_INTERVAL_SECONDS,
+        stall_threshold_seconds: float = DEFAULT_STALL_THRESHOLD_SECONDS,
+    ) -> None:
+        self._interval_seconds = interval_seconds
+        self._stall_threshold_seconds = stall_threshold_seconds
+        self.reset()
+
+    def reset(self) -> None:
+        self._samples = 0
+        self._stalled_samples = 0
+        self._max_stall_seconds = 0.0
+        self._total_stall_seconds = 0.0
+
+    def snapshot(self) -> EventLoopStallStats:
+        return EventLoopStallStats(
+            samples=self._samples,
+            stalled_samples=self._stalled_samples,
+            max_stall_seconds=self._max_stall_seconds,
+            total_stall_seconds=self._total_stall_seconds,
+        )
+
+    async def run_forever(self) -> None:
+        while True:
+            started = perf_counter()
+            await asyncio.sleep(self._interval_seconds)
+            self.record(perf_counter() - started - self._interval_seconds)
+
+    def record(self, lateness_seconds: float) -> None:
+        self._samples += 1
+        if lateness_seconds < self._stall_threshold_seconds:
+            return
+        self._stalled_samples += 1
+        self._total_stall_seconds += lateness_seconds
+        self._max_stall_seconds = max(self._max_stall_seconds, lateness_seconds)
+        logger.warning("Event loop stalled for %.0f ms.", lateness_seconds * 1000)
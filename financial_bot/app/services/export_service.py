@@ -1,7 +1,14 @@
+import csv
+import os
+from collections.abc import AsyncIterator
 from dataclasses import dataclass
 from pathlib import Path
 from tempfile import NamedTemporaryFile
 
+from openpyxl import Workbook
+from openpyxl.cell import WriteOnlyCell
+from openpyxl.styles import Alignment, Border, Font, Side
+from openpyxl.worksheet._write_only import WriteOnlyWorksheet
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from financial_bot.app.config import Settings
@@ -9,10 +16,38 @@ from financial_bot.app.domain.periods import Period
 from financial_bot.app.domain.types import TransactionType
 from financial_bot.app.services.cashflow_service import CashflowService
 from financial_bot.app.services.report_service import ReportService
-from financial_bot.app.storage.models import TransactionModel
-from financial_bot.app.storage.repositories.category_repository import CategoryRepository
-from financial_bot.app.storage.repositories.transaction_repository import TransactionRepository
-from financial_bot.app.storage.repositories.user_repository import UserRepository
+from financial_bot.app.storage.repositories.transaction_repository import (
+    TransactionExportRow,
+    TransactionRepository,
+)
+
+TRANSACTION_EXPORT_COLUMNS = (
+    "id",
+    "amount_rub",
+    "report_amount_rub",
+    "currency",
+    "occurred_at",
+    "payer_role",
+    "category_code",
+    "category_title",
+    "type",
+    "source",
+    "scope",
+    "included_in_reports",
+    "comment",
+    "raw_text",
+    "created_by_role",
+)
+
+# The header style pandas' `to_excel` used.
+XLSX_HEADER_FONT = Font(bold=True)
+XLSX_HEADER_BORDER = Border(
+    left=Side(style="thin"),
+    right=Side(style="thin"),
+    top=Side(style="thin"),
+    bottom=Side(style="thin"),
+)
+XLSX_HEADER_ALIGNMENT = Alignment(horizontal="center", vertical="top")
 
 
 @dataclass(frozen=True, slots=True)
@@ -37,25 +72,44 @@ class ExportTables:
         return bool(self.transactions or self.income_transactions)
 
 
+@dataclass(frozen=True, slots=True)
+class ExportSummary:
+    by_category: list[dict[str, object]]
+    by_payer: list[dict[str, object]]
+    by_income_recipient: list[dict[str, object]]
+    by_income_category: list[dict[str, object]]
+    cashflow: list[dict[str, object]]
+
+
 class ExportService:
+    """Builds CSV and XLSX exports of a period.
+
+    Transaction rows are streamed from the database in chunks straight into `csv.writer`
+    and openpyxl write-only worksheets, so memory stays flat however long the period is.
+    """
+
     def __init__(self, session: AsyncSession, settings: Settings) -> None:
         self._session = session
         self._settings = settings
         self._transactions = TransactionRepository(session)
-        self._categories = CategoryRepository(session)
-        self._users = UserRepository(session)
         self._reports = ReportService(session, settings)
 
     async def create_csv_export(self, period: Period) -> ExportResult | None:
-        tables = await self.build_tables(period)
-        transaction_rows = [*tables.transactions, *tables.income_transactions]
-        if not transaction_rows:
+        path = _temporary_path(".csv")
+        row_count = 0
+        # The dialect matches the former `DataFrame.to_csv(sep=";")` output byte for byte.
+        with path.open("w", encoding="utf-8-sig", newline="") as csv_file:
+            writer = csv.writer(csv_file, delimiter=";", lineterminator=os.linesep)
+            for rows in (self._iter_transaction_rows(period), self._iter_income_rows(period)):
+                async for chunk in rows:
+                    if row_count == 0:
+                        writer.writerow(TRANSACTION_EXPORT_COLUMNS)
+                    writer.writerows(chunk)
+                    row_count += len(chunk)
+        if row_count == 0:
+            path.unlink(missing_ok=True)
             return None
 
-        pd = _pandas()
-        dataframe = pd.DataFrame(transaction_rows)
-        path = _temporary_path(".csv")
-        dataframe.to_csv(path, index=False, sep=";", encoding="utf-8-sig")
         return ExportResult(
             path=path,
             filename=_filename(period, "csv"),
@@ -63,40 +117,30 @@ class ExportService:
         )
 
     async def create_xlsx_export(self, period: Period) -> ExportResult | None:
-        tables = await self.build_tables(period)
-        if not tables.has_operation_rows:
-            return None
+        summary = await self.build_summary(period)
+        workbook = Workbook(write_only=True)
+        row_count = await _append_xlsx_chunks(
+            workbook.create_sheet("transactions"),
+            self._iter_transaction_rows(period),
+        )
+        _append_xlsx_table(workbook.create_sheet("by_category"), summary.by_category)
+        _append_xlsx_table(workbook.create_sheet("by_payer"), summary.by_payer)
+        row_count += await _append_xlsx_chunks(
+            workbook.create_sheet("income_transactions"),
+            self._iter_income_rows(period),
+        )
+        _append_xlsx_table(
+            workbook.create_sheet("by_income_recipient"),
+            summary.by_income_recipient,
+        )
+        _append_xlsx_table(workbook.create_sheet("by_income_category"), summary.by_income_category)
+        _append_xlsx_table(workbook.create_sheet("cashflow"), summary.cashflow)
 
         path = _temporary_path(".xlsx")
-        pd = _pandas()
-        with pd.ExcelWriter(path, engine="openpyxl") as writer:
-            pd.DataFrame(tables.transactions).to_excel(
-                writer,
-                sheet_name="transactions",
-                index=False,
-            )
-            pd.DataFrame(tables.by_category).to_excel(
-                writer,
-                sheet_name="by_category",
-                index=False,
-            )
-            pd.DataFrame(tables.by_payer).to_excel(writer, sheet_name="by_payer", index=False)
-            pd.DataFrame(tables.income_transactions).to_excel(
-                writer,
-                sheet_name="income_transactions",
-                index=False,
-            )
-            pd.DataFrame(tables.by_income_recipient).to_excel(
-                writer,
-                sheet_name="by_income_recipient",
-                index=False,
-            )
-            pd.DataFrame(tables.by_income_category).to_excel(
-                writer,
-                sheet_name="by_income_category",
-                index=False,
-            )
-            pd.DataFrame(tables.cashflow).to_excel(writer, sheet_name="cashflow", index=False)
+        workbook.save(path)
+        if row_count == 0:
+            path.unlink(missing_ok=True)
+            return None
 
         return ExportResult(
             path=path,
@@ -105,15 +149,36 @@ class ExportService:
         )
 
     async def build_tables(self, period: Period) -> ExportTables:
-        transactions = await self._transaction_rows(period)
-        income_transactions = await self._income_transaction_rows(period)
+        transactions = [
+            dict(zip(TRANSACTION_EXPORT_COLUMNS, row, strict=True))
+            async for chunk in self._iter_transaction_rows(period)
+            for row in chunk
+        ]
+        income_transactions = [
+            dict(zip(TRANSACTION_EXPORT_COLUMNS, row, strict=True))
+            async for chunk in self._iter_income_rows(period)
+            for row in chunk
+        ]
+        summary = await self.build_summary(period)
+        return ExportTables(
+            transactions=transactions,
+            by_category=summary.by_category,
+            by_payer=summary.by_payer,
+            income_transactions=income_transactions,
+            by_income_recipient=summary.by_income_recipient,
+            by_income_category=summary.by_income_category,
+            cashflow=summary.cashflow,
+        )
+
+    async def build_summary(self, period: Period) -> ExportSummary:
+        """Tables of the period other than the transaction rows."""
+
         report = await self._reports.build_period_report(period.kind, now=period.start_at)
         cashflow_report = await CashflowService(self._session, self._settings).build_report(
             period.kind,
             now=period.start_at,
         )
-        return ExportTables(
-            transactions=transactions,
+        return ExportSummary(
             by_category=[
                 {
                     "category_code": line.code,
@@ -131,7 +196,6 @@ class ExportService:
                 }
                 for line in report.by_payer
             ],
-            income_transactions=income_transactions,
             by_income_recipient=[
                 {
                     "recipient_role": line.role,
@@ -164,49 +228,92 @@ class ExportService:
             ],
         )
 
-    async def _transaction_rows(self, period: Period) -> list[dict[str, object]]:
-        transactions = await self._transactions.list_report_effective_for_period(
+    def iter_export_rows(
+        self,
+        period: Period,
+        *,
+        income: bool,
+    ) -> AsyncIterator[list[TransactionExportRow]]:
+        """Stream the income rows, or the expense and correction rows counted in reports."""
+
+        if income:
+            return self._transactions.iter_export_rows(
+                period.start_at,
+                period.end_at,
+                types=(TransactionType.INCOME,),
+                report_only=False,
+            )
+        return self._transactions.iter_export_rows(
             period.start_at,
             period.end_at,
+            types=(TransactionType.EXPENSE, TransactionType.CORRECTION),
+            report_only=True,
         )
-        rows = []
-        for transaction in transactions:
-            rows.append(await self._transaction_row(transaction))
-        return rows
-
-    async def _income_transaction_rows(self, period: Period) -> list[dict[str, object]]:
-        transactions = await self._transactions.list_for_period(period.start_at, period.end_at)
-        rows = []
-        for transaction in transactions:
-            if transaction.type == TransactionType.INCOME.value:
-                rows.append(await self._transaction_row(transaction))
-        return rows
-
-    async def _transaction_row(self, transaction: TransactionModel) -> dict[str, object]:
-        category = await self._categories.get(transaction.category_id)
-        payer = await self._users.get(transaction.payer_user_id)
-        creator = await self._users.get(transaction.created_by_user_id)
-        if category is None or payer is None or creator is None:
-            msg = f"Transaction dependencies are missing: {transaction.id}"
-            raise ValueError(msg)
-
-        return {
-            "id": transaction.id,
-            "amount_rub": _rub(transaction.amount),
-            "report_amount_rub": _rub(_report_amount(transaction)),
-            "currency": transaction.currency,
-            "occurred_at": transaction.occurred_at.isoformat(),
-            "payer_role": payer.role,
-            "category_code": category.code,
-            "category_title": category.title,
-            "type": transaction.type,
-            "source": transaction.source,
-            "scope": transaction.scope,
-            "included_in_reports": transaction.included_in_reports,
-            "comment": transaction.comment,
-            "raw_text": transaction.raw_text,
-            "created_by_role": creator.role,
-        }
+
+    async def _iter_transaction_rows(
+        self,
+        period: Period,
+    ) -> AsyncIterator[list[tuple[object, ...]]]:
+        async for chunk in self.iter_export_rows(period, income=False):
+            yield [transaction_export_values(row) for row in chunk]
+
+    async def _iter_income_rows(self, period: Period) -> AsyncIterator[list[tuple[object, ...]]]:
+        async for chunk in self.iter_export_rows(period, income=True):
+            yield [transaction_export_values(row) for row in chunk]
+
+
+def transaction_export_values(row: TransactionExportRow) -> tuple[object, ...]:
+    return (
+        row.id,
+        _rub(row.amount),
+        _rub(_report_amount(row)),
+        row.currency,
+        row.occurred_at.isoformat(),
+        row.payer_role,
+        row.category_code,
+        row.category_title,
+        row.type,
+        row.source,
+        row.scope,
+        row.included_in_reports,
+        row.comment,
+        row.raw_text,
+        row.created_by_role,
+    )
+
+
+async def _append_xlsx_chunks(
+    worksheet: WriteOnlyWorksheet,
+    chunks: AsyncIterator[list[tuple[object, ...]]],
+) -> int:
+    row_count = 0
+    async for chunk in chunks:
+        if row_count == 0:
+            _append_xlsx_header(worksheet, TRANSACTION_EXPORT_COLUMNS)
+        for row in chunk:
+            worksheet.append(row)
+        row_count += len(chunk)
+    return row_count
+
+
+def _append_xlsx_table(worksheet: WriteOnlyWorksheet, rows: list[dict[str, object]]) -> None:
+    # An empty table stays an empty sheet, without a header, as pandas wrote it.
+    if not rows:
+        return
+    _append_xlsx_header(worksheet, tuple(rows[0]))
+    for row in rows:
+        worksheet.append(tuple(row.values()))
+
+
+def _append_xlsx_header(worksheet: WriteOnlyWorksheet, columns: tuple[str, ...]) -> None:
+    header = []
+    for column in columns:
+        cell = WriteOnlyCell(worksheet, value=column)
+        cell.font = XLSX_HEADER_FONT
+        cell.border = XLSX_HEADER_BORDER
+        cell.alignment = XLSX_HEADER_ALIGNMENT
+        header.append(cell)
+    worksheet.append(header)
 
 
 def _temporary_path(suffix: str) -> Path:
@@ -226,13 +333,7 @@ def _rub(amount_minor: int) -> float:
     return amount_minor / 100
 
 
-def _report_amount(transaction: TransactionModel) -> int:
-    if transaction.type == "correction":
-        return -transaction.amount
-    return transaction.amount
-
-
-def _pandas():
-    import pandas as pd
-
-    return pd
+def _report_amount(row: TransactionExportRow) -> int:
+    if row.type == TransactionType.CORRECTION.value:
+        return -row.amount
+    return row.amount
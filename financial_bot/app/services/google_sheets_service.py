@@ -1,11 +1,24 @@
-from dataclasses import dataclass
+import asyncio
+import copy
+import hashlib
+import json
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass, field
+from datetime import datetime
+from enum import StrEnum
 from typing import Any
 
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from financial_bot.app.config import Settings
 from financial_bot.app.domain.periods import Period
-from financial_bot.app.services.export_service import ExportService, ExportTables
+from financial_bot.app.services.export_service import (
+    TRANSACTION_EXPORT_COLUMNS,
+    ExportService,
+    transaction_export_values,
+)
+from financial_bot.app.storage.repositories.setting_repository import SettingRepository
+from financial_bot.app.storage.repositories.transaction_repository import TransactionRepository
 
 GOOGLE_SHEETS_SCOPES = ("https://www.googleapis.com/auth/spreadsheets",)
 GOOGLE_SHEETS_TABLES = {
@@ -17,6 +30,18 @@ GOOGLE_SHEETS_TABLES = {
     "by_income_category": "by_income_category!A1",
     "cashflow": "cashflow!A1",
 }
+GOOGLE_SHEETS_TRANSACTION_SHEETS = ("transactions", "income_transactions")
+GOOGLE_SHEETS_SUMMARY_SHEETS = (
+    "by_category",
+    "by_payer",
+    "by_income_recipient",
+    "by_income_category",
+    "cashflow",
+)
+GOOGLE_SHEETS_SYNC_SETTINGS_KEY = "google_sheets_sync"
+# Sheets API answers these when a quota is exhausted or the backend is briefly unavailable.
+GOOGLE_SHEETS_RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+GOOGLE_SHEETS_RATE_LIMIT_REASONS = ("rateLimitExceeded", "userRateLimitExceeded")
 
 
 class GoogleSheetsNotConfigured(RuntimeError):
@@ -31,13 +56,53 @@ class GoogleSheetsExportError(RuntimeError):
 class GoogleSheetsExportSummary:
     spreadsheet_id: str
     rows_by_sheet: dict[str, int]
+    # Rows of transactions that were deleted or left the export, cleared in place.
+    blanked_rows: int = 0
 
     @property
     def total_rows(self) -> int:
         return sum(self.rows_by_sheet.values())
 
+    @property
+    def has_changes(self) -> bool:
+        return bool(self.total_rows or self.blanked_rows)
+
+
+class GoogleSheetsExportStage(StrEnum):
+    READING = "reading"
+    PREPARING = "preparing"
+    CLEARING = "clearing"
+    WRITING = "writing"
+    RETRYING = "retrying"
+
+
+@dataclass(frozen=True, slots=True)
+class GoogleSheetsExportProgress:
+    stage: GoogleSheetsExportStage
+    rows: int
+    retry_in_seconds: float | None = None
+
+
+type GoogleSheetsProgressCallback = Callable[[GoogleSheetsExportProgress], Awaitable[None]]
+
 
 class GoogleSheetsService:
+    """Syncs the export tables of a period into a spreadsheet.
+
+    Transaction sheets keep one row per transaction. The `google_sheets_sync` setting maps
+    transaction ids to sheet rows and keeps an `updated_at` watermark per period, so a run
+    sends only new and changed rows and blanks the rows of transactions that left the
+    export. Summary sheets keep a block of rows per period, rewritten only when its values
+    change. All writes of a run go in one `values.batchUpdate`.
+
+    Without sync state, the rows already in the spreadsheet are adopted: transaction rows
+    are matched by their `id` column and new rows go after the last used row. The tabs are
+    cleared only on an explicit resync or when the spreadsheet ID changes.
+
+    The synchronous Sheets client runs in a worker thread, so an export does not block the
+    event loop. Quota and transient server errors are retried with exponential backoff.
+    """
+
     def __init__(
         self,
         session: AsyncSession,
@@ -47,105 +112,253 @@ class GoogleSheetsService:
     ) -> None:
         self._settings = settings
         self._exports = ExportService(session, settings)
+        self._transactions = TransactionRepository(session)
+        self._setting_values = SettingRepository(session)
         self._sheets_client = sheets_client
 
     def is_configured(self) -> bool:
         return bool(self._settings.google_spreadsheet_id)
 
-    async def export_period(self, period: Period) -> GoogleSheetsExportSummary | None:
+    async def export_period(
+        self,
+        period: Period,
+        *,
+        resync: bool = False,
+        on_progress: GoogleSheetsProgressCallback | None = None,
+    ) -> GoogleSheetsExportSummary | None:
         spreadsheet_id = self._settings.google_spreadsheet_id
         if not spreadsheet_id:
             raise GoogleSheetsNotConfigured("Google Sheets spreadsheet ID is not configured")
 
-        tables = await self._exports.build_tables(period)
-        if not tables.has_operation_rows:
-            return None
-
-        client = self._sheets_client or _build_google_sheets_client(self._settings)
-        _ensure_sheets(
-            client=client,
-            spreadsheet_id=spreadsheet_id,
-            sheet_names=tuple(GOOGLE_SHEETS_TABLES),
-        )
-        rows_by_sheet = _append_tables(
-            client=client,
-            spreadsheet_id=spreadsheet_id,
-            tables=tables,
+        progress = _ExportProgress(on_progress)
+        stored = await self._setting_values.get_value(GOOGLE_SHEETS_SYNC_SETTINGS_KEY)
+        client = None
+        full_sync = resync or (
+            stored is not None and stored.get("spreadsheet_id") != spreadsheet_id
         )
-        return GoogleSheetsExportSummary(spreadsheet_id=spreadsheet_id, rows_by_sheet=rows_by_sheet)
+        if full_sync:
+            state: dict[str, Any] = {"spreadsheet_id": spreadsheet_id}
+        elif stored is None:
+            client = await self._client()
+            state = await self._adopt_sheets(client, spreadsheet_id, progress=progress)
+        else:
+            # A copy, so the stored JSON value is replaced rather than mutated in place.
+            state = copy.deepcopy(stored)
+        period_key = _period_key(period)
+        updates = _SheetUpdates()
+        period_ids = await self._transactions.list_ids_for_period(period.start_at, period.end_at)
+        exported_rows = 0
+        for sheet_name in GOOGLE_SHEETS_TRANSACTION_SHEETS:
+            exported_rows += await self._sync_transaction_sheet(
+                sheet_name,
+                period,
+                period_key=period_key,
+                state=state.setdefault(sheet_name, {}),
+                period_ids=period_ids,
+                updates=updates,
+                progress=progress,
+            )
+        if not exported_rows and not updates.blanked_rows:
+            return None
 
+        summary = await self._exports.build_summary(period)
+        for sheet_name in GOOGLE_SHEETS_SUMMARY_SHEETS:
+            _sync_summary_sheet(
+                sheet_name,
+                getattr(summary, sheet_name),
+                period_key=period_key,
+                state=state.setdefault(sheet_name, {}),
+                updates=updates,
+            )
 
-def _append_tables(
-    *,
-    client: Any,
-    spreadsheet_id: str,
-    tables: ExportTables,
-) -> dict[str, int]:
-    rows_by_sheet: dict[str, int] = {}
-    table_rows = {
-        "transactions": tables.transactions,
-        "by_category": tables.by_category,
-        "by_payer": tables.by_payer,
-        "income_transactions": tables.income_transactions,
-        "by_income_recipient": tables.by_income_recipient,
-        "by_income_category": tables.by_income_category,
-        "cashflow": tables.cashflow,
-    }
-    for sheet_name, rows in table_rows.items():
-        include_headers = not _sheet_has_values(
-            client=client,
+        if client is None:
+            client = await self._client()
+        if full_sync:
+            await progress.report(GoogleSheetsExportStage.CLEARING)
+            await self._ensure_sheets(
+                client,
+                spreadsheet_id,
+                tuple(GOOGLE_SHEETS_TABLES),
+                progress=progress,
+            )
+            await self._execute(
+                lambda: (
+                    client.spreadsheets()
+                    .values()
+                    .batchClear(
+                        spreadsheetId=spreadsheet_id,
+                        body={"ranges": list(GOOGLE_SHEETS_TABLES)},
+                    )
+                ),
+                action="clearing spreadsheet tabs",
+                progress=progress,
+            )
+        if updates.data:
+            await progress.report(
+                GoogleSheetsExportStage.WRITING,
+                rows=sum(updates.rows_by_sheet.values()),
+            )
+            await self._execute(
+                lambda: (
+                    client.spreadsheets()
+                    .values()
+                    .batchUpdate(
+                        spreadsheetId=spreadsheet_id,
+                        body={"valueInputOption": "USER_ENTERED", "data": updates.data},
+                    )
+                ),
+                action="writing values",
+                progress=progress,
+            )
+        await self._setting_values.set_value(GOOGLE_SHEETS_SYNC_SETTINGS_KEY, state)
+        return GoogleSheetsExportSummary(
             spreadsheet_id=spreadsheet_id,
-            sheet_name=sheet_name,
+            rows_by_sheet={
+                sheet_name: updates.rows_by_sheet.get(sheet_name, 0)
+                for sheet_name in GOOGLE_SHEETS_TABLES
+            },
+            blanked_rows=updates.blanked_rows,
         )
-        values = _table_values(rows, include_headers=include_headers)
-        if not values:
-            rows_by_sheet[sheet_name] = 0
-            continue
-
-        try:
-            (
-                client.spreadsheets()
-                .values()
-                .append(
-                    spreadsheetId=spreadsheet_id,
-                    range=GOOGLE_SHEETS_TABLES[sheet_name],
-                    valueInputOption="USER_ENTERED",
-                    insertDataOption="INSERT_ROWS",
-                    body={"values": values},
-                )
-                .execute()
-            )
-        except Exception as exc:
-            msg = f"Google Sheets export failed for {sheet_name}"
-            raise GoogleSheetsExportError(msg) from exc
-        rows_by_sheet[sheet_name] = len(rows)
-    return rows_by_sheet
-
 
-def _ensure_sheets(*, client: Any, spreadsheet_id: str, sheet_names: tuple[str, ...]) -> None:
-    try:
-        response = (
-            client.spreadsheets()
-            .get(spreadsheetId=spreadsheet_id, fields="sheets.properties.title")
-            .execute()
+    async def _sync_transaction_sheet(
+        self,
+        sheet_name: str,
+        period: Period,
+        *,
+        period_key: str,
+        state: dict[str, Any],
+        period_ids: set[int],
+        updates: "_SheetUpdates",
+        progress: "_ExportProgress",
+    ) -> int:
+        rows: dict[str, int] = state.setdefault("rows", {})
+        watermarks: dict[str, dict[str, Any]] = state.setdefault("watermarks", {})
+        if "next_row" not in state:
+            updates.write(sheet_name, 1, [list(TRANSACTION_EXPORT_COLUMNS)], data_rows=0)
+            state["next_row"] = 2
+
+        # The watermark is the latest `updated_at` synced for the period, with the ids synced
+        # at that instant: timestamps may have second resolution, so later rows can share it.
+        watermark = watermarks.get(period_key)
+        since = datetime.fromisoformat(watermark["updated_at"]) if watermark else None
+        since_ids = set(watermark["ids"]) if watermark else set()
+        latest, latest_ids = since, set(since_ids)
+        appended: list[list[object]] = []
+        exported_ids: set[int] = set()
+        async for chunk in self._exports.iter_export_rows(
+            period,
+            income=sheet_name == "income_transactions",
+        ):
+            for row in chunk:
+                exported_ids.add(row.id)
+                if latest is None or row.updated_at > latest:
+                    latest, latest_ids = row.updated_at, {row.id}
+                elif row.updated_at == latest:
+                    latest_ids.add(row.id)
+                row_number = rows.get(str(row.id))
+                if row_number is None:
+                    rows[str(row.id)] = state["next_row"] + len(appended)
+                    appended.append(list(transaction_export_values(row)))
+                elif (
+                    since is None
+                    or row.updated_at > since
+                    or (row.updated_at == since and row.id not in since_ids)
+                ):
+                    updates.write(sheet_name, row_number, [list(transaction_export_values(row))])
+            await progress.report(GoogleSheetsExportStage.PREPARING, rows=len(chunk))
+        if appended:
+            updates.write(sheet_name, state["next_row"], appended)
+            state["next_row"] += len(appended)
+
+        for transaction_id in sorted(period_ids - exported_ids):
+            row_number = rows.pop(str(transaction_id), None)
+            if row_number is not None:
+                updates.blank(sheet_name, row_number, width=len(TRANSACTION_EXPORT_COLUMNS))
+        if latest is not None:
+            watermarks[period_key] = {"updated_at": latest.isoformat(), "ids": sorted(latest_ids)}
+        return len(exported_ids)
+
+    async def _client(self) -> Any:
+        return self._sheets_client or await asyncio.to_thread(
+            _build_google_sheets_client,
+            self._settings,
         )
-    except Exception as exc:
-        msg = "Google Sheets export failed while reading spreadsheet tabs"
-        raise GoogleSheetsExportError(msg) from exc
 
-    existing = {
-        sheet.get("properties", {}).get("title")
-        for sheet in response.get("sheets", [])
-        if sheet.get("properties", {}).get("title")
-    }
-    missing = [sheet_name for sheet_name in sheet_names if sheet_name not in existing]
-    if not missing:
-        return
-
-    try:
-        (
-            client.spreadsheets()
-            .batchUpdate(
+    async def _adopt_sheets(
+        self,
+        client: Any,
+        spreadsheet_id: str,
+        *,
+        progress: "_ExportProgress",
+    ) -> dict[str, Any]:
+        """Sync state for the rows a spreadsheet already has, e.g. from appending exports."""
+
+        await progress.report(GoogleSheetsExportStage.READING)
+        await self._ensure_sheets(
+            client,
+            spreadsheet_id,
+            tuple(GOOGLE_SHEETS_TABLES),
+            progress=progress,
+        )
+        # Transaction tabs are matched by id; summary tabs only need their last used row.
+        ranges = [
+            f"{sheet_name}!A:A" if sheet_name in GOOGLE_SHEETS_TRANSACTION_SHEETS else sheet_name
+            for sheet_name in GOOGLE_SHEETS_TABLES
+        ]
+        response = await self._execute(
+            lambda: (
+                client.spreadsheets().values().batchGet(spreadsheetId=spreadsheet_id, ranges=ranges)
+            ),
+            action="reading spreadsheet values",
+            progress=progress,
+        )
+        state: dict[str, Any] = {"spreadsheet_id": spreadsheet_id}
+        for sheet_name, value_range in zip(
+            GOOGLE_SHEETS_TABLES,
+            response.get("valueRanges", []),
+            strict=True,
+        ):
+            values = value_range.get("values", [])
+            if not values:
+                continue
+            # The first row is the header; a repeated id keeps its last row.
+            sheet_state: dict[str, Any] = {"next_row": len(values) + 1}
+            if sheet_name in GOOGLE_SHEETS_TRANSACTION_SHEETS:
+                sheet_state["rows"] = {
+                    str(row[0]).strip(): row_number
+                    for row_number, row in enumerate(values[1:], start=2)
+                    if row and str(row[0]).strip().isdigit()
+                }
+            state[sheet_name] = sheet_state
+        return state
+
+    async def _ensure_sheets(
+        self,
+        client: Any,
+        spreadsheet_id: str,
+        sheet_names: tuple[str, ...],
+        *,
+        progress: "_ExportProgress",
+    ) -> None:
+        response = await self._execute(
+            lambda: client.spreadsheets().get(
+                spreadsheetId=spreadsheet_id,
+                fields="sheets.properties.title",
+            ),
+            action="reading spreadsheet tabs",
+            progress=progress,
+        )
+        existing = {
+            sheet.get("properties", {}).get("title")
+            for sheet in response.get("sheets", [])
+            if sheet.get("properties", {}).get("title")
+        }
+        missing = [sheet_name for sheet_name in sheet_names if sheet_name not in existing]
+        if not missing:
+            return
+
+        await self._execute(
+            lambda: client.spreadsheets().batchUpdate(
                 spreadsheetId=spreadsheet_id,
                 body={
                     "requests": [
@@ -153,26 +366,142 @@ def _ensure_sheets(*, client: Any, spreadsheet_id: str, sheet_names: tuple[str,
                         for sheet_name in missing
                     ]
                 },
-            )
-            .execute()
+            ),
+            action="creating spreadsheet tabs",
+            progress=progress,
         )
-    except Exception as exc:
-        msg = "Google Sheets export failed while creating spreadsheet tabs"
-        raise GoogleSheetsExportError(msg) from exc
 
+    async def _execute(
+        self,
+        build_request: Callable[[], Any],
+        *,
+        action: str,
+        progress: "_ExportProgress",
+    ) -> Any:
+        """Run one Sheets API request in a worker thread, retrying quota and server errors."""
+
+        attempt = 1
+        while True:
+            try:
+                return await asyncio.to_thread(lambda: build_request().execute())
+            except Exception as exc:
+                if attempt >= self._settings.google_sheets_max_attempts or not _is_retryable(exc):
+                    msg = f"Google Sheets export failed while {action}"
+                    raise GoogleSheetsExportError(msg) from exc
+                delay = min(
+                    _retry_after_seconds(exc)
+                    or self._settings.google_sheets_retry_base_seconds * 2 ** (attempt - 1),
+                    self._settings.google_sheets_retry_max_seconds,
+                )
+            await progress.report(GoogleSheetsExportStage.RETRYING, retry_in_seconds=delay)
+            await asyncio.sleep(delay)
+            attempt += 1
 
-def _sheet_has_values(*, client: Any, spreadsheet_id: str, sheet_name: str) -> bool:
-    try:
-        response = (
-            client.spreadsheets()
-            .values()
-            .get(spreadsheetId=spreadsheet_id, range=f"{sheet_name}!A1:Z1")
-            .execute()
+
+class _ExportProgress:
+    def __init__(self, callback: GoogleSheetsProgressCallback | None) -> None:
+        self._callback = callback
+        self._prepared_rows = 0
+
+    async def report(
+        self,
+        stage: GoogleSheetsExportStage,
+        *,
+        rows: int = 0,
+        retry_in_seconds: float | None = None,
+    ) -> None:
+        if stage is GoogleSheetsExportStage.PREPARING:
+            self._prepared_rows += rows
+            rows = self._prepared_rows
+        if self._callback is not None:
+            await self._callback(
+                GoogleSheetsExportProgress(
+                    stage=stage,
+                    rows=rows,
+                    retry_in_seconds=retry_in_seconds,
+                )
+            )
+
+
+@dataclass(slots=True)
+class _SheetUpdates:
+    data: list[dict[str, object]] = field(default_factory=list)
+    rows_by_sheet: dict[str, int] = field(default_factory=dict)
+    blanked_rows: int = 0
+
+    def write(
+        self,
+        sheet_name: str,
+        row_number: int,
+        values: list[list[object]],
+        *,
+        data_rows: int | None = None,
+    ) -> None:
+        self.data.append({"range": f"{sheet_name}!A{row_number}", "values": values})
+        self.rows_by_sheet[sheet_name] = self.rows_by_sheet.get(sheet_name, 0) + (
+            len(values) if data_rows is None else data_rows
         )
-    except Exception as exc:
-        msg = f"Google Sheets export failed while checking {sheet_name}"
-        raise GoogleSheetsExportError(msg) from exc
-    return bool(response.get("values"))
+
+    def blank(self, sheet_name: str, row_number: int, *, width: int) -> None:
+        self.data.append({"range": f"{sheet_name}!A{row_number}", "values": [[""] * width]})
+        self.blanked_rows += 1
+
+
+def _sync_summary_sheet(
+    sheet_name: str,
+    rows: list[dict[str, object]],
+    *,
+    period_key: str,
+    state: dict[str, Any],
+    updates: _SheetUpdates,
+) -> None:
+    """Write the rows of a period to its own block of the sheet, below the other periods."""
+
+    values = _table_values(rows, include_headers=False)
+    digest = hashlib.sha256(json.dumps(values, default=str).encode()).hexdigest()
+    blocks: dict[str, dict[str, Any]] = state.setdefault("blocks", {})
+    block = blocks.get(period_key)
+    if (block is None and not values) or (block is not None and block["digest"] == digest):
+        return
+    if "next_row" not in state:
+        updates.write(sheet_name, 1, [list(rows[0].keys())], data_rows=0)
+        state["next_row"] = 2
+
+    width = max(len(values[0]) if values else 0, block["column_count"] if block else 0)
+    if block is not None and block["row"] + block["row_count"] == state["next_row"]:
+        # The last block grows or shrinks in place.
+        row_number, reserved_rows, row_count = block["row"], block["row_count"], len(values)
+        state["next_row"] = row_number + row_count
+    elif block is not None and len(values) <= block["row_count"]:
+        row_number = block["row"]
+        reserved_rows = row_count = block["row_count"]
+    else:
+        if block is not None and block["row_count"]:
+            # Too long to fit between other periods: the block moves to the end.
+            updates.write(
+                sheet_name,
+                block["row"],
+                [[""] * block["column_count"]] * block["row_count"],
+                data_rows=0,
+            )
+        row_number, reserved_rows, row_count = state["next_row"], 0, len(values)
+        state["next_row"] += row_count
+
+    # Blank what is left of a longer previous block.
+    padded = [[*row, *[""] * (width - len(row))] for row in values]
+    padded.extend([[""] * width] * max(reserved_rows - len(values), 0))
+    if padded:
+        updates.write(sheet_name, row_number, padded, data_rows=len(rows))
+    blocks[period_key] = {
+        "row": row_number,
+        "row_count": row_count,
+        "column_count": width,
+        "digest": digest,
+    }
+
+
+def _period_key(period: Period) -> str:
+    return f"{period.kind.value}:{period.start_at.isoformat()}"
 
 
 def _table_values(
@@ -189,6 +518,30 @@ def _table_values(
     return data_rows
 
 
+def _is_retryable(exc: Exception) -> bool:
+    if isinstance(exc, TimeoutError | ConnectionError):
+        return True
+    # `googleapiclient.errors.HttpError` keeps the HTTP response in `resp`.
+    status = getattr(getattr(exc, "resp", None), "status", None)
+    if status in GOOGLE_SHEETS_RETRY_STATUSES:
+        return True
+    content = getattr(exc, "content", b"")
+    if isinstance(content, bytes):
+        content = content.decode(errors="replace")
+    return status == 403 and any(
+        reason in str(content) for reason in GOOGLE_SHEETS_RATE_LIMIT_REASONS
+    )
+
+
+def _retry_after_seconds(exc: Exception) -> float | None:
+    response = getattr(exc, "resp", None)
+    retry_after = response.get("retry-after") if isinstance(response, dict) else None
+    try:
+        return float(retry_after) if retry_after is not None else None
+    except ValueError:
+        return None
+
+
 def _build_google_sheets_client(settings: Settings):
     try:
         if settings.google_credentials_path:
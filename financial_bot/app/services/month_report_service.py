@@ -103,22 +103,13 @@ class MonthReportService:
             now=report_now,
             scope=scope,
         )
-        income_total = await self._cashflow.total_income(
+        income = await self._cashflow.income_totals(
             period_report.period.start_at,
             period_report.period.end_at,
             scope=scope,
         )
-        income_rows = await self._cashflow.income_by_recipient(
-            period_report.period.start_at,
-            period_report.period.end_at,
-            scope=scope,
-        )
-        income_category_rows = await self._cashflow.income_by_category(
-            period_report.period.start_at,
-            period_report.period.end_at,
-            scope=scope,
-        )
-        income_amounts = {row.role: row.amount for row in income_rows}
+        income_total = income.total
+        income_amounts = {row.role: row.amount for row in income.by_recipient}
         income_by_recipient = tuple(
             IncomeRecipientLine(
                 role=role.value,
@@ -134,7 +125,7 @@ class MonthReportService:
                 amount=row.amount,
                 share_percent=_share(row.amount, income_total),
             )
-            for row in income_category_rows
+            for row in income.by_category
         )
         top_income_categories = income_categories[:top_income_category_limit]
         other_income_categories = income_categories[top_income_category_limit:]
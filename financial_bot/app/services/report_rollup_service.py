@@ -0,0 +1,98 @@
+from dataclasses import dataclass
+from datetime import date
+from zoneinfo import ZoneInfo
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from financial_bot.app.config import Settings
+from financial_bot.app.storage.repositories.transaction_daily_total_repository import (
+    DailyTotalKey,
+    DailyTotalRow,
+    TransactionDailyTotalRepository,
+)
+
+
+@dataclass(frozen=True, slots=True)
+class ReportRollupMismatch:
+    local_date: date
+    category_id: int
+    payer_user_id: int
+    scope: str
+    expected_amount: int
+    actual_amount: int
+    expected_count: int
+    actual_count: int
+
+
+@dataclass(frozen=True, slots=True)
+class ReportRollupCheckResult:
+    checked_rows: int
+    mismatches: tuple[ReportRollupMismatch, ...]
+
+    @property
+    def is_consistent(self) -> bool:
+        return not self.mismatches
+
+
+@dataclass(frozen=True, slots=True)
+class ReportRollupRebuildResult:
+    row_count: int
+    transaction_count: int
+
+
+class ReportRollupService:
+    """Rebuilds and verifies the `transaction_daily_totals` report rollup."""
+
+    def __init__(self, session: AsyncSession, settings: Settings) -> None:
+        self._settings = settings
+        self._daily_totals = TransactionDailyTotalRepository(session)
+
+    async def rebuild(self) -> ReportRollupRebuildResult:
+        rows = await self._daily_totals.aggregate_transactions(ZoneInfo(self._settings.timezone))
+        row_count = await self._daily_totals.replace_all(rows)
+        return ReportRollupRebuildResult(
+            row_count=row_count,
+            transaction_count=sum(row.transaction_count for row in rows),
+        )
+
+    async def check(self) -> ReportRollupCheckResult:
+        expected = _rows_by_key(
+            await self._daily_totals.aggregate_transactions(ZoneInfo(self._settings.timezone))
+        )
+        actual = _rows_by_key(await self._daily_totals.list_all())
+
+        mismatches: list[ReportRollupMismatch] = []
+        for key in sorted(expected.keys() | actual.keys()):
+            expected_row = expected.get(key)
+            actual_row = actual.get(key)
+            expected_amount, expected_count = _amount_and_count(expected_row)
+            actual_amount, actual_count = _amount_and_count(actual_row)
+            if (expected_amount, expected_count) == (actual_amount, actual_count):
+                continue
+            mismatches.append(
+                ReportRollupMismatch(
+                    local_date=key[0],
+                    category_id=key[1],
+                    payer_user_id=key[2],
+                    scope=key[3],
+                    expected_amount=expected_amount,
+                    actual_amount=actual_amount,
+                    expected_count=expected_count,
+                    actual_count=actual_count,
+                )
+            )
+
+        return ReportRollupCheckResult(
+            checked_rows=len(expected.keys() | actual.keys()),
+            mismatches=tuple(mismatches),
+        )
+
+
+def _rows_by_key(rows: list[DailyTotalRow]) -> dict[DailyTotalKey, DailyTotalRow]:
+    return {row.key: row for row in rows}
+
+
+def _amount_and_count(row: DailyTotalRow | None) -> tuple[int, int]:
+    if row is None:
+        return 0, 0
+    return row.amount, row.transaction_count
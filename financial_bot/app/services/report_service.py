@@ -39,7 +39,7 @@ class PeriodReport:
 class ReportService:
     def __init__(self, session: AsyncSession, settings: Settings) -> None:
         self._settings = settings
-        self._reports = ReportRepository(session)
+        self._reports = ReportRepository(session, timezone=settings.timezone)
 
     async def build_period_report(
         self,
@@ -49,23 +49,14 @@ class ReportService:
         scope: TransactionScope | None = None,
     ) -> PeriodReport:
         period = resolve_period(kind, now=now, timezone=self._settings.timezone)
-        total_amount = await self._reports.total_expenses(
-            period.start_at,
-            period.end_at,
-            scope=scope,
-        )
-        payer_rows = await self._reports.totals_by_payer(
-            period.start_at,
-            period.end_at,
-            scope=scope,
-        )
-        category_rows = await self._reports.totals_by_category(
+        totals = await self._reports.period_totals(
             period.start_at,
             period.end_at,
             scope=scope,
         )
+        total_amount = totals.total
 
-        payer_amounts = {row.role: row.amount for row in payer_rows}
+        payer_amounts = {row.role: row.amount for row in totals.by_payer}
         by_payer = tuple(
             PayerReportLine(
                 role=role.value,
@@ -84,7 +75,7 @@ class ReportService:
                 amount=row.amount,
                 share_percent=_share(row.amount, total_amount),
             )
-            for row in category_rows
+            for row in totals.by_category
         )
 
         return PeriodReport(
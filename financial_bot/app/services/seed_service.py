@@ -5,9 +5,16 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from financial_bot.app.config import Settings
 from financial_bot.app.domain.categories import DEFAULT_CATEGORIES, DEFAULT_CATEGORY_ALIASES
 from financial_bot.app.domain.types import CategoryOwnerRole, UserRole
+from financial_bot.app.services.alias_service import invalidate_alias_index
+from financial_bot.app.services.bank_rule_index import invalidate_bank_rule_index
 from financial_bot.app.services.spending_limit_service import SpendingLimitService
 from financial_bot.app.storage.models import CategoryAliasModel, CategoryModel, UserModel
+from financial_bot.app.storage.reference_data import invalidate_reference_data
 from financial_bot.app.storage.repositories.category_repository import CategoryRepository
+from financial_bot.app.storage.repositories.data_version_repository import (
+    REPORT_DATA_VERSION_KEY,
+    DataVersionRepository,
+)
 from financial_bot.app.storage.repositories.user_repository import UserRepository
 
 
@@ -75,7 +82,19 @@ async def seed_initial_data(session: AsyncSession, settings: Settings) -> SeedRe
         alias_result = await _ensure_alias(categories, alias_seed.alias, category.id)
         result = result.merge(alias_result)
 
+    # Existing users, categories and aliases are updated in place above.
+    await invalidate_reference_data(session)
     await SpendingLimitService(session, settings).ensure_default_config()
+    if (
+        result.users_created
+        or result.users_updated
+        or result.categories_created
+        or result.categories_updated
+    ):
+        await DataVersionRepository(session).bump(REPORT_DATA_VERSION_KEY)
+    if result.categories_created or result.categories_updated:
+        await invalidate_bank_rule_index(session)
+    invalidate_alias_index(session)
 
     return result
 
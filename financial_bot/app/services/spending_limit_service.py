@@ -18,6 +18,10 @@ from financial_bot.app.domain.spending_limits import (
 from financial_bot.app.domain.types import TransactionType
 from financial_bot.app.storage.models import SpendingLimitAlertModel
 from financial_bot.app.storage.repositories.category_repository import CategoryRepository
+from financial_bot.app.storage.repositories.data_version_repository import (
+    REPORT_DATA_VERSION_KEY,
+    DataVersionRepository,
+)
 from financial_bot.app.storage.repositories.report_repository import ReportRepository
 from financial_bot.app.storage.repositories.setting_repository import SettingRepository
 from financial_bot.app.storage.repositories.spending_limit_alert_repository import (
@@ -111,7 +115,8 @@ class SpendingLimitService:
         self._settings = settings
         self._alerts = SpendingLimitAlertRepository(session)
         self._categories = CategoryRepository(session)
-        self._reports = ReportRepository(session)
+        self._data_versions = DataVersionRepository(session)
+        self._reports = ReportRepository(session, timezone=settings.timezone)
         self._settings_repository = SettingRepository(session)
         self._transactions = TransactionRepository(session)
         self._users = UserRepository(session)
@@ -133,6 +138,7 @@ class SpendingLimitService:
             SPENDING_LIMITS_SETTINGS_KEY,
             spending_limit_config_to_dict(config),
         )
+        await self._data_versions.bump(REPORT_DATA_VERSION_KEY)
 
     async def ensure_default_config(self) -> bool:
         stored = await self._settings_repository.get_value(SPENDING_LIMITS_SETTINGS_KEY)
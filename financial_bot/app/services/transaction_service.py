@@ -27,6 +27,14 @@ from financial_bot.app.storage.models import (
 )
 from financial_bot.app.storage.repositories.audit_repository import AuditRepository
 from financial_bot.app.storage.repositories.category_repository import CategoryRepository
+from financial_bot.app.storage.repositories.data_version_repository import (
+    REPORT_DATA_VERSION_KEY,
+    DataVersionRepository,
+)
+from financial_bot.app.storage.repositories.transaction_daily_total_repository import (
+    TransactionDailyTotalRepository,
+    daily_total_contribution,
+)
 from financial_bot.app.storage.repositories.transaction_repository import TransactionRepository
 from financial_bot.app.storage.repositories.user_repository import UserRepository
 
@@ -81,6 +89,8 @@ class TransactionService:
         self._categories = CategoryRepository(session)
         self._transactions = TransactionRepository(session)
         self._audit = AuditRepository(session)
+        self._daily_totals = TransactionDailyTotalRepository(session)
+        self._data_versions = DataVersionRepository(session)
 
     async def list_category_options(self) -> list[CategoryOption]:
         categories = await self._categories.list_active()
@@ -359,6 +369,7 @@ class TransactionService:
             raise ValueError(msg)
 
         old_value = _transaction_snapshot(transaction)
+        old_contribution = daily_total_contribution(transaction, self._timezone())
         changed = False
 
         if amount is not None and transaction.amount != amount:
@@ -419,6 +430,11 @@ class TransactionService:
 
         if changed:
             await self._session.flush()
+            new_contribution = daily_total_contribution(transaction, self._timezone())
+            if new_contribution != old_contribution:
+                await self._daily_totals.apply(old_contribution, sign=-1)
+                await self._daily_totals.apply(new_contribution, sign=1)
+            await self._data_versions.bump(REPORT_DATA_VERSION_KEY)
             await self._write_audit(
                 transaction_id=transaction.id,
                 action=AuditAction.UPDATE,
@@ -628,6 +644,11 @@ class TransactionService:
                 created_by_user_id=created_by_user_id,
             )
         )
+        await self._daily_totals.apply(
+            daily_total_contribution(transaction, self._timezone()),
+            sign=1,
+        )
+        await self._data_versions.bump(REPORT_DATA_VERSION_KEY)
         await self._write_audit(
             transaction_id=transaction.id,
             action=AuditAction.CREATE,
@@ -646,7 +667,10 @@ class TransactionService:
         deleted_at: datetime,
     ) -> None:
         old_value = _transaction_snapshot(transaction)
+        contribution = daily_total_contribution(transaction, self._timezone())
         await self._transactions.soft_delete(transaction, deleted_at)
+        await self._daily_totals.apply(contribution, sign=-1)
+        await self._data_versions.bump(REPORT_DATA_VERSION_KEY)
         await self._write_audit(
             transaction_id=transaction.id,
             action=AuditAction.DELETE,
@@ -695,7 +719,10 @@ class TransactionService:
         )
 
     def _now(self) -> datetime:
-        return datetime.now(ZoneInfo(self._settings.timezone))
+        return datetime.now(self._timezone())
+
+    def _timezone(self) -> ZoneInfo:
+        return ZoneInfo(self._settings.timezone)
 
 
 def _to_category_option(category: CategoryModel) -> CategoryOption:
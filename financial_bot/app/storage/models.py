@@ -1,4 +1,4 @@
-from datetime import datetime
+from datetime import date, datetime
 from enum import StrEnum
 from typing import Any
 
@@ -6,6 +6,7 @@ from sqlalchemy import (
     JSON,
     Boolean,
     CheckConstraint,
+    Date,
     DateTime,
     ForeignKey,
     Index,
@@ -25,6 +26,7 @@ from financial_bot.app.domain.types import (
     BankEventOperationKind,
     BankEventParseStatus,
     BankEventSuggestionSource,
+    BankNotificationStatus,
     CategoryOwnerRole,
     TransactionScope,
     TransactionSource,
@@ -236,6 +238,35 @@ class TransactionModel(Base):
     )
 
 
+class TransactionDailyTotalModel(Base):
+    __tablename__ = "transaction_daily_totals"
+    __table_args__ = (
+        CheckConstraint(
+            f"scope in ({_sql_values(TransactionScope)})",
+            name="transaction_daily_totals_scope",
+        ),
+        CheckConstraint(
+            "transaction_count >= 0",
+            name="transaction_daily_totals_transaction_count_non_negative",
+        ),
+        UniqueConstraint("local_date", "category_id", "payer_user_id", "scope"),
+        Index("ix_transaction_daily_totals_local_date", "local_date"),
+    )
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    local_date: Mapped[date] = mapped_column(Date, nullable=False)
+    category_id: Mapped[int] = mapped_column(ForeignKey("categories.id"), nullable=False)
+    payer_user_id: Mapped[int] = mapped_column(ForeignKey("users.id"), nullable=False)
+    scope: Mapped[str] = mapped_column(String(32), nullable=False)
+    amount: Mapped[int] = mapped_column(Integer, nullable=False, default=0, server_default="0")
+    transaction_count: Mapped[int] = mapped_column(
+        Integer,
+        nullable=False,
+        default=0,
+        server_default="0",
+    )
+
+
 class SettingModel(Base):
     __tablename__ = "settings"
     __table_args__ = (UniqueConstraint("key"),)
@@ -251,6 +282,35 @@ class SettingModel(Base):
     )
 
 
+class DataVersionModel(Base):
+    __tablename__ = "data_versions"
+    __table_args__ = (UniqueConstraint("key"),)
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    key: Mapped[str] = mapped_column(String(120), nullable=False)
+    version: Mapped[int] = mapped_column(Integer, nullable=False, default=0, server_default="0")
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        server_default=func.now(),
+        onupdate=func.now(),
+        nullable=False,
+    )
+
+
+class FsmStateModel(Base):
+    __tablename__ = "fsm_states"
+    __table_args__ = (
+        UniqueConstraint("storage_key"),
+        Index("ix_fsm_states_updated_at", "updated_at"),
+    )
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    storage_key: Mapped[str] = mapped_column(String(255), nullable=False)
+    state: Mapped[str | None] = mapped_column(String(255))
+    data: Mapped[dict[str, Any]] = mapped_column(JSON, nullable=False)
+    updated_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
+
+
 class OperationAuditLogModel(Base):
     __tablename__ = "operation_audit_log"
     __table_args__ = (
@@ -451,6 +511,8 @@ class BankEventModel(Base):
         Index("ix_bank_events_source_id", "source_id"),
         Index("ix_bank_events_received_at", "received_at"),
         Index("ix_bank_events_parse_status", "parse_status"),
+        Index("ix_bank_events_source_id_received_at", "source_id", "received_at"),
+        Index("ix_bank_events_parse_status_operation_kind", "parse_status", "operation_kind"),
         Index("ix_bank_events_transaction_id", "transaction_id"),
         Index("ix_bank_events_scope", "scope"),
     )
@@ -499,6 +561,14 @@ class BankEventModel(Base):
         nullable=True,
     )
     suggested_category_source: Mapped[str | None] = mapped_column(String(32), nullable=True)
+    # Shape of `redacted_text`, stored for unknown events only.
+    shape_hash: Mapped[str | None] = mapped_column(String(64), nullable=True)
+    shape_operation_markers: Mapped[str | None] = mapped_column(String(255), nullable=True)
+    shape_amount_count: Mapped[int | None] = mapped_column(Integer, nullable=True)
+    shape_has_balance_marker: Mapped[bool | None] = mapped_column(Boolean, nullable=True)
+    shape_has_instrument_marker: Mapped[bool | None] = mapped_column(Boolean, nullable=True)
+    shape_ignored_reason: Mapped[str | None] = mapped_column(String(64), nullable=True)
+    shape_has_security_marker: Mapped[bool | None] = mapped_column(Boolean, nullable=True)
     transaction_id: Mapped[int | None] = mapped_column(ForeignKey("transactions.id"), nullable=True)
     telegram_notification_sent_at: Mapped[datetime | None] = mapped_column(
         DateTime(timezone=True),
@@ -533,3 +603,50 @@ class BankEventModel(Base):
     source_record: Mapped[BankEventSourceModel] = relationship(back_populates="bank_events")
     suggested_category: Mapped[CategoryModel | None] = relationship()
     transaction: Mapped[TransactionModel | None] = relationship()
+
+
+class BankEventNotificationModel(Base):
+    __tablename__ = "bank_event_notifications"
+    __table_args__ = (
+        CheckConstraint(
+            f"status in ({_sql_values(BankNotificationStatus)})",
+            name="bank_event_notifications_status",
+        ),
+        UniqueConstraint("bank_event_id"),
+        Index("ix_bank_event_notifications_status_next_attempt_at", "status", "next_attempt_at"),
+    )
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    bank_event_id: Mapped[int] = mapped_column(ForeignKey("bank_events.id"), nullable=False)
+    bank_event_ids: Mapped[list[int] | None] = mapped_column(JSON, nullable=True)
+    chat_id: Mapped[int] = mapped_column(Integer, nullable=False)
+    text: Mapped[str] = mapped_column(String(4096), nullable=False)
+    reply_markup: Mapped[dict[str, Any] | None] = mapped_column(JSON, nullable=True)
+    status: Mapped[str] = mapped_column(
+        String(32),
+        nullable=False,
+        default=BankNotificationStatus.PENDING.value,
+        server_default=BankNotificationStatus.PENDING.value,
+    )
+    attempts: Mapped[int] = mapped_column(
+        Integer,
+        nullable=False,
+        default=0,
+        server_default="0",
+    )
+    next_attempt_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
+    last_error: Mapped[str | None] = mapped_column(String(500), nullable=True)
+    sent_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        server_default=func.now(),
+        nullable=False,
+    )
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        server_default=func.now(),
+        onupdate=func.now(),
+        nullable=False,
+    )
+
+    bank_event: Mapped[BankEventModel] = relationship()
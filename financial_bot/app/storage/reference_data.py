@@ -0,0 +1,147 @@
+from collections.abc import Iterable
+from typing import Any
+from weakref import WeakKeyDictionary
+
+from sqlalchemy import Engine, event, inspect, select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+from sqlalchemy.orm import make_transient_to_detached
+
+from financial_bot.app.storage.models import Base, CategoryAliasModel, CategoryModel, UserModel
+from financial_bot.app.storage.repositories.data_version_repository import (
+    REFERENCE_DATA_VERSION_KEY,
+    DataVersionRepository,
+)
+
+_SESSION_REFERENCE_KEY = "reference_data"
+
+
+class ReferenceData:
+    """Detached snapshots of all categories, category aliases and users.
+
+    Repositories answer lookups from these snapshots and attach the result to their session
+    with `attach_reference_row`, so a lookup normally costs no database round trip. Filters
+    such as `is_active` are rechecked on the attached row, which may have been changed in
+    the session.
+    """
+
+    def __init__(
+        self,
+        *,
+        categories: Iterable[CategoryModel],
+        aliases: Iterable[CategoryAliasModel],
+        users: Iterable[UserModel],
+    ) -> None:
+        self.categories = tuple(sorted(categories, key=lambda category: category.id))
+        self.aliases = tuple(sorted(aliases, key=lambda alias: alias.alias))
+        self.users = tuple(sorted(users, key=lambda user: user.id))
+        self.category_by_id = {category.id: category for category in self.categories}
+        self.category_by_code = {category.code: category for category in self.categories}
+        self.active_category_by_sort_order = {
+            category.sort_order: category for category in self.categories if category.is_active
+        }
+        self.alias_by_text = {alias.alias: alias for alias in self.aliases}
+        self.user_by_id = {user.id: user for user in self.users}
+        self.user_by_telegram_id = {user.telegram_id: user for user in self.users}
+        self.user_by_role = {user.role: user for user in self.users}
+
+
+async def load_reference_data(session: AsyncSession) -> ReferenceData:
+    """Return reference data as committed, or as changed by `session`.
+
+    The snapshots are built once per engine and checked against the `reference_data` data
+    version once per session transaction, so a change made by another process is seen by
+    the next transaction. Writers must call `invalidate_reference_data`.
+    """
+
+    transaction = session.sync_session.get_transaction()
+    checked = session.info.get(_SESSION_REFERENCE_KEY)
+    if checked is not None and transaction is not None and checked[0] is transaction:
+        return checked[1]
+
+    engine = session.get_bind()
+    version = _REFERENCE_DATA_CACHE.version
+    data_version = await DataVersionRepository(session).get_in_transaction(
+        REFERENCE_DATA_VERSION_KEY
+    )
+    cached = _REFERENCE_DATA_CACHE.get(engine)
+    if cached is None or cached[0] != data_version:
+        cached = (data_version, await _build_reference_data(session))
+        _REFERENCE_DATA_CACHE.store(engine, cached, version=version)
+    session.info[_SESSION_REFERENCE_KEY] = (session.sync_session.get_transaction(), cached[1])
+    return cached[1]
+
+
+async def preload_reference_data(session_factory: async_sessionmaker[AsyncSession]) -> None:
+    async with session_factory() as session:
+        await load_reference_data(session)
+
+
+async def invalidate_reference_data(session: AsyncSession) -> None:
+    """Publish a category, alias or user change made in `session`.
+
+    Bumps the `reference_data` data version in the session's transaction, so other
+    processes reload once it commits, and drops this process's snapshots now and again
+    when the session commits or rolls back.
+    """
+
+    await DataVersionRepository(session).bump(REFERENCE_DATA_VERSION_KEY)
+    session.info.pop(_SESSION_REFERENCE_KEY, None)
+    _REFERENCE_DATA_CACHE.clear()
+
+    def _clear(*_: Any) -> None:
+        _REFERENCE_DATA_CACHE.clear()
+
+    event.listen(session.sync_session, "after_commit", _clear, once=True)
+    event.listen(session.sync_session, "after_soft_rollback", _clear, once=True)
+
+
+async def attach_reference_row[RowT: Base](session: AsyncSession, snapshot: RowT) -> RowT:
+    """Return the session's instance of a reference row without loading it again."""
+
+    row_type = type(snapshot)
+    identity = inspect(snapshot).identity
+    if session.identity_map.get(inspect(row_type).identity_key_from_primary_key(identity)):
+        # Never copy the snapshot over an instance the session may have changed.
+        return await session.get(row_type, identity)
+    return await session.merge(snapshot, load=False)
+
+
+def snapshot_row[RowT: Base](row: RowT) -> RowT:
+    """Detached copy of `row` that sessions can `merge(..., load=False)`."""
+
+    mapper = inspect(type(row))
+    snapshot = type(row)(**{column.key: getattr(row, column.key) for column in mapper.column_attrs})
+    make_transient_to_detached(snapshot)
+    return snapshot
+
+
+async def _build_reference_data(session: AsyncSession) -> ReferenceData:
+    categories = await session.scalars(select(CategoryModel))
+    aliases = await session.scalars(select(CategoryAliasModel))
+    users = await session.scalars(select(UserModel))
+    return ReferenceData(
+        categories=[snapshot_row(category) for category in categories],
+        aliases=[snapshot_row(alias) for alias in aliases],
+        users=[snapshot_row(user) for user in users],
+    )
+
+
+class _ReferenceDataCache:
+    def __init__(self) -> None:
+        self._data: WeakKeyDictionary[Engine, tuple[int, ReferenceData]] = WeakKeyDictionary()
+        self.version = 0
+
+    def get(self, engine: Engine) -> tuple[int, ReferenceData] | None:
+        return self._data.get(engine)
+
+    def store(self, engine: Engine, data: tuple[int, ReferenceData], *, version: int) -> None:
+        # An invalidation that raced with the build means the data may already be stale.
+        if version == self.version:
+            self._data[engine] = data
+
+    def clear(self) -> None:
+        self._data.clear()
+        self.version += 1
+
+
+_REFERENCE_DATA_CACHE = _ReferenceDataCache()
@@ -1,6 +1,7 @@
+from collections.abc import Mapping
 from datetime import datetime
 
-from sqlalchemy import func, select
+from sqlalchemy import bindparam, func, or_, select, update
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from financial_bot.app.domain.types import BankCategoryRuleMode
@@ -72,22 +73,13 @@ class BankCategoryRuleRepository:
         )
         return list(result.scalars())
 
-    async def get_active_rule(
-        self,
-        *,
-        owner_user_id: int,
-        bank: str,
-        merchant_key: str,
-    ) -> BankCategoryRuleModel | None:
+    async def list_active_rules(self) -> list[BankCategoryRuleModel]:
         result = await self._session.execute(
             select(BankCategoryRuleModel)
-            .where(BankCategoryRuleModel.owner_user_id == owner_user_id)
-            .where(BankCategoryRuleModel.bank == bank)
-            .where(BankCategoryRuleModel.merchant_key == merchant_key)
             .where(BankCategoryRuleModel.is_active.is_(True))
             .where(BankCategoryRuleModel.mode != BankCategoryRuleMode.DISABLED.value)
         )
-        return result.scalar_one_or_none()
+        return list(result.scalars())
 
     async def get_rule(
         self,
@@ -159,12 +151,22 @@ class BankCategoryRuleRepository:
         await self._session.flush()
         return rule
 
-    async def mark_used(
-        self,
-        rule: BankCategoryRuleModel,
-        *,
-        used_at: datetime,
-    ) -> BankCategoryRuleModel:
-        rule.last_used_at = used_at
-        await self._session.flush()
-        return rule
+    async def mark_rules_used(self, used_at_by_rule_id: Mapping[int, datetime]) -> None:
+        """Set `last_used_at` of several rules in one executemany UPDATE.
+
+        A time older than the stored one is ignored, so a late flush does not move it back.
+        """
+
+        if not used_at_by_rule_id:
+            return
+        rules = BankCategoryRuleModel.__table__
+        await self._session.execute(
+            update(rules)
+            .where(rules.c.id == bindparam("rule_id"))
+            .where(or_(rules.c.last_used_at.is_(None), rules.c.last_used_at < bindparam("used_at")))
+            .values(last_used_at=bindparam("used_at")),
+            [
+                {"rule_id": rule_id, "used_at": used_at}
+                for rule_id, used_at in sorted(used_at_by_rule_id.items())
+            ],
+        )
@@ -0,0 +1,146 @@
+from collections.abc import Sequence
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any
+
+from sqlalchemy import case, func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from financial_bot.app.domain.types import BankNotificationStatus
+from financial_bot.app.storage.models import BankEventNotificationModel
+
+LAST_ERROR_MAX_LENGTH = 500
+
+
+@dataclass(frozen=True, slots=True)
+class BankNotificationQueueStats:
+    pending_count: int
+    retrying_count: int
+    failed_count: int
+    sent_count: int
+    oldest_pending_at: datetime | None
+    next_attempt_at: datetime | None
+
+
+class BankEventNotificationRepository:
+    def __init__(self, session: AsyncSession) -> None:
+        self._session = session
+
+    async def get_by_event_id(self, bank_event_id: int) -> BankEventNotificationModel | None:
+        return await self._session.scalar(
+            select(BankEventNotificationModel).where(
+                BankEventNotificationModel.bank_event_id == bank_event_id
+            )
+        )
+
+    async def enqueue(
+        self,
+        *,
+        bank_event_id: int,
+        chat_id: int,
+        text: str,
+        reply_markup: dict[str, Any] | None,
+        now: datetime,
+        bank_event_ids: Sequence[int] = (),
+    ) -> BankEventNotificationModel:
+        """Queue a message about `bank_event_id`, or about all of `bank_event_ids` at once."""
+        covered_event_ids = list(bank_event_ids) or None
+        notification = await self.get_by_event_id(bank_event_id)
+        if notification is None:
+            notification = BankEventNotificationModel(
+                bank_event_id=bank_event_id,
+                bank_event_ids=covered_event_ids,
+                chat_id=chat_id,
+                text=text,
+                reply_markup=reply_markup,
+                status=BankNotificationStatus.PENDING.value,
+                attempts=0,
+                next_attempt_at=now,
+            )
+            self._session.add(notification)
+        elif notification.status != BankNotificationStatus.SENT.value:
+            # A re-submitted event retries right away; a given-up one gets a fresh budget.
+            if notification.status == BankNotificationStatus.FAILED.value:
+                notification.attempts = 0
+            notification.bank_event_ids = covered_event_ids
+            notification.chat_id = chat_id
+            notification.text = text
+            notification.reply_markup = reply_markup
+            notification.status = BankNotificationStatus.PENDING.value
+            notification.next_attempt_at = now
+        await self._session.flush()
+        return notification
+
+    async def list_due(self, *, now: datetime, limit: int) -> list[BankEventNotificationModel]:
+        result = await self._session.scalars(
+            select(BankEventNotificationModel)
+            .where(BankEventNotificationModel.status == BankNotificationStatus.PENDING.value)
+            .where(BankEventNotificationModel.next_attempt_at <= now)
+            .order_by(BankEventNotificationModel.next_attempt_at, BankEventNotificationModel.id)
+            .limit(limit)
+        )
+        return list(result)
+
+    async def get_many(self, notification_ids: list[int]) -> list[BankEventNotificationModel]:
+        if not notification_ids:
+            return []
+        result = await self._session.scalars(
+            select(BankEventNotificationModel).where(
+                BankEventNotificationModel.id.in_(notification_ids)
+            )
+        )
+        return list(result)
+
+    async def mark_sent(
+        self,
+        notification: BankEventNotificationModel,
+        *,
+        sent_at: datetime,
+    ) -> None:
+        notification.status = BankNotificationStatus.SENT.value
+        notification.attempts += 1
+        notification.sent_at = sent_at
+        notification.last_error = None
+        await self._session.flush()
+
+    async def mark_retry(
+        self,
+        notification: BankEventNotificationModel,
+        *,
+        next_attempt_at: datetime,
+        error: str,
+    ) -> None:
+        notification.attempts += 1
+        notification.next_attempt_at = next_attempt_at
+        notification.last_error = error[:LAST_ERROR_MAX_LENGTH]
+        await self._session.flush()
+
+    async def mark_failed(self, notification: BankEventNotificationModel, *, error: str) -> None:
+        notification.status = BankNotificationStatus.FAILED.value
+        notification.attempts += 1
+        notification.last_error = error[:LAST_ERROR_MAX_LENGTH]
+        await self._session.flush()
+
+    async def queue_stats(self) -> BankNotificationQueueStats:
+        status = BankEventNotificationModel.status
+        pending = status == BankNotificationStatus.PENDING.value
+        row = (
+            await self._session.execute(
+                select(
+                    func.count(case((pending, 1))),
+                    func.count(case((pending & (BankEventNotificationModel.attempts > 0), 1))),
+                    func.count(case((status == BankNotificationStatus.FAILED.value, 1))),
+                    func.count(case((status == BankNotificationStatus.SENT.value, 1))),
+                    func.min(case((pending, BankEventNotificationModel.created_at))),
+                    func.min(case((pending, BankEventNotificationModel.next_attempt_at))),
+                )
+            )
+        ).one()
+        return BankNotificationQueueStats(
+            pending_count=row[0],
+            retrying_count=row[1],
+            failed_count=row[2],
+            sent_count=row[3],
+            oldest_pending_at=row[4],
+            next_attempt_at=row[5],
+        )
@@ -1,13 +1,25 @@
+from collections.abc import Collection, Mapping, Sequence
 from dataclasses import dataclass
 from datetime import datetime
 from hashlib import sha256
 
-from sqlalchemy import func, select, update
+from sqlalchemy import ColumnElement, and_, case, func, insert, select, update
 from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from financial_bot.app.domain.bank_sms import BankSmsShape, hash_bank_sms_shape
 from financial_bot.app.domain.types import BankEventParseStatus
-from financial_bot.app.storage.models import BankEventModel, BankEventSourceModel
+from financial_bot.app.storage.models import BankEventModel, BankEventSourceModel, UserModel
+
+BANK_EVENT_SHAPE_COLUMNS = (
+    "shape_hash",
+    "shape_operation_markers",
+    "shape_amount_count",
+    "shape_has_balance_marker",
+    "shape_has_instrument_marker",
+    "shape_ignored_reason",
+    "shape_has_security_marker",
+)
 
 
 @dataclass(frozen=True, slots=True)
@@ -29,6 +41,36 @@ class BankEventSourceStats:
     ignored_event_count: int
 
 
+@dataclass(frozen=True, slots=True)
+class BankEventShapeGroup:
+    source_id: int
+    shape_hash: str
+    count: int
+    last_received_at: datetime
+    operation_markers: tuple[str, ...]
+    amount_count: int
+    has_balance_marker: bool
+    has_instrument_marker: bool
+    ignored_reason: str
+    has_security_marker: bool
+
+
+def bank_event_shape_values(shape: BankSmsShape | None) -> dict[str, object]:
+    """`bank_events.shape_*` column values; all `None` without a shape."""
+
+    if shape is None:
+        return dict.fromkeys(BANK_EVENT_SHAPE_COLUMNS)
+    return {
+        "shape_hash": hash_bank_sms_shape(shape),
+        "shape_operation_markers": ",".join(shape.operation_markers),
+        "shape_amount_count": shape.amount_count,
+        "shape_has_balance_marker": shape.has_balance_marker,
+        "shape_has_instrument_marker": shape.has_instrument_marker,
+        "shape_ignored_reason": shape.ignored_reason,
+        "shape_has_security_marker": shape.has_security_marker,
+    }
+
+
 def hash_bank_event_source_token(token: str) -> str:
     normalized_token = token.strip()
     if not normalized_token:
@@ -81,15 +123,40 @@ class BankEventRepository:
         )
         return result.scalar_one_or_none()
 
-    async def touch_source(
+    async def get_active_source_with_owner_by_token_hash(
         self,
-        source: BankEventSourceModel,
-        *,
-        seen_at: datetime,
-    ) -> BankEventSourceModel:
-        source.last_seen_at = seen_at
-        await self._session.flush()
-        return source
+        token_hash: str,
+    ) -> tuple[BankEventSourceModel, UserModel] | None:
+        result = await self._session.execute(
+            select(BankEventSourceModel, UserModel)
+            .join(UserModel, UserModel.id == BankEventSourceModel.owner_user_id)
+            .where(BankEventSourceModel.token_hash == token_hash)
+            .where(BankEventSourceModel.is_active.is_(True))
+        )
+        row = result.one_or_none()
+        if row is None:
+            return None
+        return row[0], row[1]
+
+    async def get_sources_last_seen_at(
+        self,
+        source_ids: Collection[int],
+    ) -> dict[int, datetime | None]:
+        if not source_ids:
+            return {}
+        result = await self._session.execute(
+            select(BankEventSourceModel.id, BankEventSourceModel.last_seen_at).where(
+                BankEventSourceModel.id.in_(source_ids)
+            )
+        )
+        return {source_id: last_seen_at for source_id, last_seen_at in result.all()}
+
+    async def touch_source(self, source_id: int, *, seen_at: datetime) -> None:
+        await self._session.execute(
+            update(BankEventSourceModel)
+            .where(BankEventSourceModel.id == source_id)
+            .values(last_seen_at=seen_at)
+        )
 
     async def add_event(self, event: BankEventModel) -> BankEventModel:
         self._session.add(event)
@@ -113,15 +180,78 @@ class BankEventRepository:
 
         return event, True
 
+    async def add_events_if_new(
+        self,
+        events: Sequence[BankEventModel],
+    ) -> list[tuple[BankEventModel, bool]]:
+        if not events:
+            return []
+        try:
+            async with self._session.begin_nested():
+                self._session.add_all(events)
+                await self._session.flush()
+        except IntegrityError:
+            # Another request stored one of the events meanwhile; settle them one by one.
+            return [await self.add_event_if_new(event) for event in events]
+        return [(event, True) for event in events]
+
+    async def insert_event_rows_if_new(self, rows: Sequence[Mapping[str, object]]) -> int:
+        """Insert `bank_events` column values without loading ORM objects; return new rows.
+
+        Rows whose `dedupe_key` is already stored are skipped. Meant for bulk imports that
+        have already filtered out known keys, so a conflict is rare and settled row by row.
+        """
+        if not rows:
+            return 0
+        try:
+            async with self._session.begin_nested():
+                await self._session.execute(insert(BankEventModel.__table__), rows)
+        except IntegrityError:
+            created = 0
+            for row in rows:
+                _, is_created = await self.add_event_if_new(BankEventModel(**row))
+                created += is_created
+            return created
+        return len(rows)
+
     async def get_event(self, event_id: int) -> BankEventModel | None:
         return await self._session.get(BankEventModel, event_id)
 
+    async def get_events(self, event_ids: Collection[int]) -> list[BankEventModel]:
+        if not event_ids:
+            return []
+        result = await self._session.scalars(
+            select(BankEventModel)
+            .where(BankEventModel.id.in_(event_ids))
+            .order_by(BankEventModel.id)
+        )
+        return list(result)
+
     async def get_event_by_dedupe_key(self, dedupe_key: str) -> BankEventModel | None:
         result = await self._session.execute(
             select(BankEventModel).where(BankEventModel.dedupe_key == dedupe_key)
         )
         return result.scalar_one_or_none()
 
+    async def get_events_by_dedupe_keys(
+        self,
+        dedupe_keys: Collection[str],
+    ) -> dict[str, BankEventModel]:
+        if not dedupe_keys:
+            return {}
+        result = await self._session.scalars(
+            select(BankEventModel).where(BankEventModel.dedupe_key.in_(dedupe_keys))
+        )
+        return {event.dedupe_key: event for event in result}
+
+    async def get_existing_dedupe_keys(self, dedupe_keys: Collection[str]) -> set[str]:
+        if not dedupe_keys:
+            return set()
+        result = await self._session.scalars(
+            select(BankEventModel.dedupe_key).where(BankEventModel.dedupe_key.in_(dedupe_keys))
+        )
+        return set(result)
+
     async def list_events_by_status(
         self,
         status: BankEventParseStatus | str,
@@ -134,24 +264,71 @@ class BankEventRepository:
         )
         return list(result.scalars())
 
-    async def list_unknown_unlinked_events(
+    async def list_unknown_shape_groups(
         self,
         *,
+        source_ids: Collection[int],
         since: datetime | None = None,
-        limit: int = 100,
-    ) -> list[BankEventModel]:
+        limit: int = 5,
+    ) -> list[BankEventShapeGroup]:
+        """Group unknown unlinked events by source and stored shape, most frequent first."""
+
+        if not source_ids:
+            return []
+        event_count = func.count(BankEventModel.id)
+        last_received_at = func.max(BankEventModel.received_at)
         query = (
-            select(BankEventModel)
+            select(
+                BankEventModel.source_id,
+                BankEventModel.shape_hash,
+                event_count,
+                last_received_at,
+                # Every column of the shape is the same within one shape hash.
+                func.min(BankEventModel.shape_operation_markers),
+                func.min(BankEventModel.shape_amount_count),
+                func.min(BankEventModel.shape_has_balance_marker),
+                func.min(BankEventModel.shape_has_instrument_marker),
+                func.min(BankEventModel.shape_ignored_reason),
+                func.min(BankEventModel.shape_has_security_marker),
+            )
             .where(BankEventModel.operation_kind == "unknown")
             .where(BankEventModel.transaction_id.is_(None))
-            .order_by(BankEventModel.received_at.desc(), BankEventModel.id.desc())
+            .where(BankEventModel.shape_hash.is_not(None))
+            .where(BankEventModel.source_id.in_(source_ids))
+            .group_by(BankEventModel.source_id, BankEventModel.shape_hash)
+            .order_by(event_count.desc(), last_received_at.desc(), BankEventModel.shape_hash)
             .limit(limit)
         )
         if since is not None:
             query = query.where(BankEventModel.received_at >= since)
 
         result = await self._session.execute(query)
-        return list(result.scalars())
+        return [
+            BankEventShapeGroup(
+                source_id=source_id,
+                shape_hash=shape_hash,
+                count=count,
+                last_received_at=last_received,
+                operation_markers=tuple(markers.split(",")) if markers else (),
+                amount_count=amount_count or 0,
+                has_balance_marker=bool(has_balance_marker),
+                has_instrument_marker=bool(has_instrument_marker),
+                ignored_reason=ignored_reason or "",
+                has_security_marker=bool(has_security_marker),
+            )
+            for (
+                source_id,
+                shape_hash,
+                count,
+                last_received,
+                markers,
+                amount_count,
+                has_balance_marker,
+                has_instrument_marker,
+                ignored_reason,
+                has_security_marker,
+            ) in result.all()
+        ]
 
     async def list_pending_confirmation_events_for_owner(
         self,
@@ -176,164 +353,78 @@ class BankEventRepository:
         *,
         since: datetime | None = None,
     ) -> dict[int, BankEventSourceStats]:
-        last_event_rows = await self._session.execute(
+        """Return per-source counters computed in one scan of `bank_events`.
+
+        The last received time covers all events, while counters only include events received
+        at or after `since`, so sources without recent activity are still reported.
+        """
+        window = () if since is None else (BankEventModel.received_at >= since,)
+        is_expense = BankEventModel.operation_kind == "expense_candidate"
+        is_linked = BankEventModel.transaction_id.is_not(None)
+        is_unlinked = BankEventModel.transaction_id.is_(None)
+        is_pending = and_(
+            BankEventModel.parse_status == BankEventParseStatus.NEEDS_CONFIRMATION.value,
+            is_expense,
+            is_unlinked,
+        )
+
+        def count_where(*conditions: ColumnElement[bool]) -> ColumnElement[int]:
+            conditions = (*window, *conditions)
+            if not conditions:
+                return func.count(BankEventModel.id)
+            return func.coalesce(func.sum(case((and_(*conditions), 1), else_=0)), 0)
+
+        result = await self._session.execute(
             select(
                 BankEventModel.source_id,
                 func.max(BankEventModel.received_at),
+                count_where(),
+                count_where(is_expense),
+                count_where(
+                    is_expense,
+                    BankEventModel.parse_status == BankEventParseStatus.AUTOSAVED.value,
+                    is_linked,
+                ),
+                count_where(
+                    is_expense,
+                    BankEventModel.parse_status == BankEventParseStatus.CONFIRMED.value,
+                    is_linked,
+                ),
+                count_where(BankEventModel.operation_kind == "income"),
+                count_where(BankEventModel.operation_kind == "refund"),
+                count_where(BankEventModel.operation_kind == "internal_transfer"),
+                count_where(is_expense, BankEventModel.suggestion_conflict.is_(True)),
+                count_where(is_pending),
+                count_where(
+                    is_pending,
+                    BankEventModel.telegram_notification_failed_at.is_not(None),
+                ),
+                count_where(is_pending, BankEventModel.telegram_notification_sent_at.is_(None)),
+                count_where(BankEventModel.operation_kind == "unknown", is_unlinked),
+                count_where(BankEventModel.parse_status == BankEventParseStatus.IGNORED.value),
             ).group_by(BankEventModel.source_id)
         )
-        last_event_by_source = {
-            source_id: last_event_received_at
-            for source_id, last_event_received_at in last_event_rows.all()
-        }
-
-        total_counts = await self._count_events_by_source(since=since)
-        expense_counts = await self._count_events_by_source(
-            since=since,
-            operation_kind="expense_candidate",
-        )
-        autosaved_counts = await self._count_events_by_source(
-            since=since,
-            operation_kind="expense_candidate",
-            parse_status=BankEventParseStatus.AUTOSAVED.value,
-            linked_to_transaction=True,
-        )
-        confirmed_counts = await self._count_events_by_source(
-            since=since,
-            operation_kind="expense_candidate",
-            parse_status=BankEventParseStatus.CONFIRMED.value,
-            linked_to_transaction=True,
-        )
-        income_counts = await self._count_events_by_source(since=since, operation_kind="income")
-        refund_counts = await self._count_events_by_source(since=since, operation_kind="refund")
-        internal_transfer_counts = await self._count_events_by_source(
-            since=since,
-            operation_kind="internal_transfer",
-        )
-        conflict_counts = await self._count_events_by_source(
-            since=since,
-            operation_kind="expense_candidate",
-            suggestion_conflict=True,
-        )
-        pending_counts = await self._count_pending_events_by_source(since=since)
-        failed_counts = await self._count_pending_events_by_source(
-            since=since, failed_telegram_notification=True
-        )
-        unsent_counts = await self._count_pending_events_by_source(
-            since=since, unsent_telegram_notification=True
-        )
-        unknown_counts = await self._count_unknown_events_by_source(since=since)
-        ignored_counts = await self._count_ignored_events_by_source(since=since)
-
-        source_ids = (
-            set(last_event_by_source)
-            | set(total_counts)
-            | set(expense_counts)
-            | set(autosaved_counts)
-            | set(confirmed_counts)
-            | set(income_counts)
-            | set(refund_counts)
-            | set(internal_transfer_counts)
-            | set(conflict_counts)
-            | set(pending_counts)
-            | set(failed_counts)
-            | set(unsent_counts)
-            | set(unknown_counts)
-            | set(ignored_counts)
-        )
         return {
-            source_id: BankEventSourceStats(
-                source_id=source_id,
-                last_event_received_at=last_event_by_source.get(source_id),
-                total_event_count=total_counts.get(source_id, 0),
-                expense_candidate_count=expense_counts.get(source_id, 0),
-                autosaved_expense_count=autosaved_counts.get(source_id, 0),
-                confirmed_expense_count=confirmed_counts.get(source_id, 0),
-                income_event_count=income_counts.get(source_id, 0),
-                refund_event_count=refund_counts.get(source_id, 0),
-                internal_transfer_event_count=internal_transfer_counts.get(source_id, 0),
-                conflict_event_count=conflict_counts.get(source_id, 0),
-                pending_confirmation_count=pending_counts.get(source_id, 0),
-                failed_telegram_notification_count=failed_counts.get(source_id, 0),
-                unsent_pending_count=unsent_counts.get(source_id, 0),
-                unknown_event_count=unknown_counts.get(source_id, 0),
-                ignored_event_count=ignored_counts.get(source_id, 0),
+            row[0]: BankEventSourceStats(
+                source_id=row[0],
+                last_event_received_at=row[1],
+                total_event_count=int(row[2]),
+                expense_candidate_count=int(row[3]),
+                autosaved_expense_count=int(row[4]),
+                confirmed_expense_count=int(row[5]),
+                income_event_count=int(row[6]),
+                refund_event_count=int(row[7]),
+                internal_transfer_event_count=int(row[8]),
+                conflict_event_count=int(row[9]),
+                pending_confirmation_count=int(row[10]),
+                failed_telegram_notification_count=int(row[11]),
+                unsent_pending_count=int(row[12]),
+                unknown_event_count=int(row[13]),
+                ignored_event_count=int(row[14]),
             )
-            for source_id in source_ids
+            for row in result.all()
         }
 
-    async def _count_pending_events_by_source(
-        self,
-        *,
-        since: datetime | None = None,
-        failed_telegram_notification: bool = False,
-        unsent_telegram_notification: bool = False,
-    ) -> dict[int, int]:
-        query = (
-            select(BankEventModel.source_id, func.count(BankEventModel.id))
-            .where(BankEventModel.parse_status == BankEventParseStatus.NEEDS_CONFIRMATION.value)
-            .where(BankEventModel.operation_kind == "expense_candidate")
-            .where(BankEventModel.transaction_id.is_(None))
-            .group_by(BankEventModel.source_id)
-        )
-        if since is not None:
-            query = query.where(BankEventModel.received_at >= since)
-        if failed_telegram_notification:
-            query = query.where(BankEventModel.telegram_notification_failed_at.is_not(None))
-        if unsent_telegram_notification:
-            query = query.where(BankEventModel.telegram_notification_sent_at.is_(None))
-
-        result = await self._session.execute(query)
-        return {source_id: count for source_id, count in result.all()}
-
-    async def _count_unknown_events_by_source(
-        self,
-        *,
-        since: datetime | None,
-    ) -> dict[int, int]:
-        return await self._count_events_by_source(
-            since=since,
-            operation_kind="unknown",
-            unlinked=True,
-        )
-
-    async def _count_ignored_events_by_source(
-        self,
-        *,
-        since: datetime | None,
-    ) -> dict[int, int]:
-        return await self._count_events_by_source(
-            since=since,
-            parse_status=BankEventParseStatus.IGNORED.value,
-        )
-
-    async def _count_events_by_source(
-        self,
-        *,
-        since: datetime | None,
-        operation_kind: str | None = None,
-        parse_status: str | None = None,
-        linked_to_transaction: bool = False,
-        unlinked: bool = False,
-        suggestion_conflict: bool = False,
-    ) -> dict[int, int]:
-        query = select(BankEventModel.source_id, func.count(BankEventModel.id))
-        if since is not None:
-            query = query.where(BankEventModel.received_at >= since)
-        if operation_kind is not None:
-            query = query.where(BankEventModel.operation_kind == operation_kind)
-        if parse_status is not None:
-            query = query.where(BankEventModel.parse_status == parse_status)
-        if linked_to_transaction:
-            query = query.where(BankEventModel.transaction_id.is_not(None))
-        if unlinked:
-            query = query.where(BankEventModel.transaction_id.is_(None))
-        if suggestion_conflict:
-            query = query.where(BankEventModel.suggestion_conflict.is_(True))
-
-        result = await self._session.execute(query.group_by(BankEventModel.source_id))
-        return {source_id: count for source_id, count in result.all()}
-
     async def set_parse_status(
         self,
         event: BankEventModel,
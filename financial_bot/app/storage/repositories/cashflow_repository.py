@@ -21,10 +21,71 @@ class CashflowCategoryRow:
     amount: int
 
 
+@dataclass(frozen=True, slots=True)
+class IncomeTotals:
+    total: int
+    by_recipient: tuple[CashflowPayerRow, ...]
+    by_category: tuple[CashflowCategoryRow, ...]
+
+
 class CashflowRepository:
     def __init__(self, session: AsyncSession) -> None:
         self._session = session
 
+    async def income_totals(
+        self,
+        start_at: datetime,
+        end_at: datetime,
+        *,
+        scope: TransactionScope | None = None,
+    ) -> IncomeTotals:
+        """Return income total, recipient split and category split from one grouped query."""
+        result = await self._session.execute(
+            select(
+                UserModel.role,
+                CategoryModel.code,
+                CategoryModel.title,
+                CategoryModel.sort_order,
+                func.coalesce(func.sum(TransactionModel.amount), 0),
+            )
+            .join(UserModel, TransactionModel.payer_user_id == UserModel.id)
+            .join(CategoryModel, TransactionModel.category_id == CategoryModel.id)
+            .where(*_income_filters(start_at, end_at, scope=scope))
+            .group_by(
+                UserModel.role,
+                CategoryModel.code,
+                CategoryModel.title,
+                CategoryModel.sort_order,
+            )
+        )
+
+        total = 0
+        recipient_amounts: dict[str, int] = {}
+        category_amounts: dict[tuple[str, str, int], int] = {}
+        for row in result.all():
+            amount = int(row[4])
+            total += amount
+            recipient_amounts[row[0]] = recipient_amounts.get(row[0], 0) + amount
+            category_key = (row[1], row[2], int(row[3]))
+            category_amounts[category_key] = category_amounts.get(category_key, 0) + amount
+
+        return IncomeTotals(
+            total=total,
+            by_recipient=tuple(
+                CashflowPayerRow(role=role, amount=amount)
+                for role, amount in sorted(recipient_amounts.items())
+                if amount != 0
+            ),
+            by_category=tuple(
+                CashflowCategoryRow(code=code, title=title, amount=amount)
+                for (code, title, _sort_order), amount in sorted(
+                    category_amounts.items(),
+                    key=lambda item: (-item[1], item[0][2]),
+                )
+                if amount != 0
+            ),
+        )
+
     async def total_income(
         self,
         start_at: datetime,
@@ -2,9 +2,17 @@ from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from financial_bot.app.storage.models import CategoryAliasModel, CategoryModel
+from financial_bot.app.storage.reference_data import attach_reference_row, load_reference_data
 
 
 class CategoryRepository:
+    """Categories and aliases, read from the process-wide reference data.
+
+    A lookup that misses the reference data falls back to the database, so rows added by
+    this session are found before `invalidate_reference_data` is called; lists only include
+    them after it.
+    """
+
     def __init__(self, session: AsyncSession) -> None:
         self._session = session
 
@@ -19,57 +27,70 @@ class CategoryRepository:
         return alias
 
     async def get(self, category_id: int) -> CategoryModel | None:
-        return await self._session.get(CategoryModel, category_id)
+        reference = await load_reference_data(self._session)
+        snapshot = reference.category_by_id.get(category_id)
+        if snapshot is None:
+            return await self._session.get(CategoryModel, category_id)
+        return await attach_reference_row(self._session, snapshot)
 
     async def get_by_code(self, code: str) -> CategoryModel | None:
-        result = await self._session.execute(
-            select(CategoryModel).where(CategoryModel.code == code)
-        )
-        return result.scalar_one_or_none()
+        reference = await load_reference_data(self._session)
+        snapshot = reference.category_by_code.get(code)
+        if snapshot is None:
+            result = await self._session.execute(
+                select(CategoryModel).where(CategoryModel.code == code)
+            )
+            return result.scalar_one_or_none()
+        return await attach_reference_row(self._session, snapshot)
 
     async def get_by_sort_order(self, sort_order: int) -> CategoryModel | None:
-        result = await self._session.execute(
-            select(CategoryModel)
-            .where(CategoryModel.sort_order == sort_order)
-            .where(CategoryModel.is_active.is_(True))
-        )
-        return result.scalar_one_or_none()
+        reference = await load_reference_data(self._session)
+        snapshot = reference.active_category_by_sort_order.get(sort_order)
+        if snapshot is None:
+            result = await self._session.execute(
+                select(CategoryModel)
+                .where(CategoryModel.sort_order == sort_order)
+                .where(CategoryModel.is_active.is_(True))
+            )
+            return result.scalar_one_or_none()
+        category = await attach_reference_row(self._session, snapshot)
+        if not category.is_active or category.sort_order != sort_order:
+            return None
+        return category
 
     async def get_by_alias(self, alias: str) -> CategoryModel | None:
-        normalized_alias = alias.strip().lower()
-        result = await self._session.execute(
-            select(CategoryModel)
-            .join(CategoryAliasModel)
-            .where(CategoryAliasModel.alias == normalized_alias)
-            .where(CategoryModel.is_active.is_(True))
-        )
-        return result.scalar_one_or_none()
+        alias_row = await self.get_alias(alias)
+        if alias_row is None:
+            return None
+        category = await self.get(alias_row.category_id)
+        if category is None or not category.is_active:
+            return None
+        return category
 
     async def get_alias(self, alias: str) -> CategoryAliasModel | None:
         normalized_alias = alias.strip().lower()
-        result = await self._session.execute(
-            select(CategoryAliasModel).where(CategoryAliasModel.alias == normalized_alias)
-        )
-        return result.scalar_one_or_none()
+        reference = await load_reference_data(self._session)
+        snapshot = reference.alias_by_text.get(normalized_alias)
+        if snapshot is None:
+            result = await self._session.execute(
+                select(CategoryAliasModel).where(CategoryAliasModel.alias == normalized_alias)
+            )
+            return result.scalar_one_or_none()
+        return await attach_reference_row(self._session, snapshot)
 
     async def list_aliases(self) -> list[CategoryAliasModel]:
-        result = await self._session.execute(
-            select(CategoryAliasModel).order_by(CategoryAliasModel.alias)
-        )
-        return list(result.scalars())
+        reference = await load_reference_data(self._session)
+        return [await attach_reference_row(self._session, alias) for alias in reference.aliases]
 
     async def list_aliases_by_category_id(self, category_id: int) -> list[CategoryAliasModel]:
-        result = await self._session.execute(
-            select(CategoryAliasModel)
-            .where(CategoryAliasModel.category_id == category_id)
-            .order_by(CategoryAliasModel.alias)
-        )
-        return list(result.scalars())
+        return [alias for alias in await self.list_aliases() if alias.category_id == category_id]
 
     async def list_active(self) -> list[CategoryModel]:
-        result = await self._session.execute(
-            select(CategoryModel)
-            .where(CategoryModel.is_active.is_(True))
-            .order_by(CategoryModel.sort_order)
-        )
-        return list(result.scalars())
+        categories = [category for category in await self.list_all() if category.is_active]
+        return sorted(categories, key=lambda category: category.sort_order)
+
+    async def list_all(self) -> list[CategoryModel]:
+        reference = await load_reference_data(self._session)
+        return [
+            await attach_reference_row(self._session, category) for category in reference.categories
+        ]
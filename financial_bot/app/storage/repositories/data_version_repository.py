@@ -0,0 +1,55 @@
+from sqlalchemy import func, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from financial_bot.app.storage.models import DataVersionModel
+
+REPORT_DATA_VERSION_KEY = "report_data"
+BANK_CATEGORY_RULES_DATA_VERSION_KEY = "bank_category_rules"
+REFERENCE_DATA_VERSION_KEY = "reference_data"
+
+_SESSION_VERSIONS_KEY = "data_versions"
+
+
+class DataVersionRepository:
+    """Monotonic per-key counters used to invalidate derived caches.
+
+    A writer bumps the counter in the same database transaction as its change, so the new
+    version becomes visible to other processes exactly when the change does.
+    """
+
+    def __init__(self, session: AsyncSession) -> None:
+        self._session = session
+
+    async def get(self, key: str) -> int:
+        version = await self._session.scalar(
+            select(DataVersionModel.version).where(DataVersionModel.key == key)
+        )
+        return int(version or 0)
+
+    async def get_in_transaction(self, key: str) -> int:
+        """`get` that reads all counters once per session transaction.
+
+        Process-wide caches check their version on every lookup; this keeps that at one
+        small query per transaction however many caches a handler touches.
+        """
+
+        transaction = self._session.sync_session.get_transaction()
+        checked = self._session.info.get(_SESSION_VERSIONS_KEY)
+        if checked is None or transaction is None or checked[0] is not transaction:
+            rows = await self._session.execute(
+                select(DataVersionModel.key, DataVersionModel.version)
+            )
+            checked = (self._session.sync_session.get_transaction(), dict(rows.all()))
+            self._session.info[_SESSION_VERSIONS_KEY] = checked
+        return int(checked[1].get(key, 0))
+
+    async def bump(self, key: str) -> None:
+        self._session.info.pop(_SESSION_VERSIONS_KEY, None)
+        result = await self._session.execute(
+            update(DataVersionModel)
+            .where(DataVersionModel.key == key)
+            .values(version=DataVersionModel.version + 1, updated_at=func.now())
+        )
+        if result.rowcount == 0:
+            self._session.add(DataVersionModel(key=key, version=1))
+            await self._session.flush()
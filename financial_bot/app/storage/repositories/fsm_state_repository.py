@@ -0,0 +1,77 @@
+from collections.abc import Iterable, Sequence
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any
+
+from sqlalchemy import delete, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from financial_bot.app.storage.models import FsmStateModel
+
+
+@dataclass(frozen=True, slots=True)
+class FsmStateRow:
+    storage_key: str
+    state: str | None
+    data: dict[str, Any]
+    updated_at: datetime
+
+
+class FsmStateRepository:
+    def __init__(self, session: AsyncSession) -> None:
+        self._session = session
+
+    async def get(self, storage_key: str) -> FsmStateRow | None:
+        row = await self._session.scalar(
+            select(FsmStateModel).where(FsmStateModel.storage_key == storage_key)
+        )
+        if row is None:
+            return None
+        return FsmStateRow(
+            storage_key=row.storage_key,
+            state=row.state,
+            data=dict(row.data),
+            updated_at=row.updated_at,
+        )
+
+    async def save_many(self, rows: Sequence[FsmStateRow]) -> None:
+        if not rows:
+            return
+        existing = {
+            row.storage_key: row
+            for row in await self._session.scalars(
+                select(FsmStateModel).where(
+                    FsmStateModel.storage_key.in_([row.storage_key for row in rows])
+                )
+            )
+        }
+        for row in rows:
+            model = existing.get(row.storage_key)
+            if model is None:
+                self._session.add(
+                    FsmStateModel(
+                        storage_key=row.storage_key,
+                        state=row.state,
+                        data=row.data,
+                        updated_at=row.updated_at,
+                    )
+                )
+            else:
+                model.state = row.state
+                model.data = row.data
+                model.updated_at = row.updated_at
+        await self._session.flush()
+
+    async def delete_many(self, storage_keys: Iterable[str]) -> None:
+        keys = list(storage_keys)
+        if not keys:
+            return
+        await self._session.execute(
+            delete(FsmStateModel).where(FsmStateModel.storage_key.in_(keys))
+        )
+
+    async def delete_updated_before(self, cutoff: datetime) -> int:
+        result = await self._session.execute(
+            delete(FsmStateModel).where(FsmStateModel.updated_at < cutoff)
+        )
+        return result.rowcount
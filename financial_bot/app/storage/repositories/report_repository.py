@@ -1,11 +1,19 @@
+from collections.abc import Sequence
 from dataclasses import dataclass
-from datetime import datetime
+from datetime import date, datetime, time
+from typing import Any
+from zoneinfo import ZoneInfo
 
-from sqlalchemy import case, func, select
+from sqlalchemy import and_, case, extract, func, or_, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from financial_bot.app.domain.types import TransactionScope, TransactionType
-from financial_bot.app.storage.models import CategoryModel, TransactionModel, UserModel
+from financial_bot.app.storage.models import (
+    CategoryModel,
+    TransactionDailyTotalModel,
+    TransactionModel,
+    UserModel,
+)
 
 
 @dataclass(frozen=True, slots=True)
@@ -23,9 +31,105 @@ class CategoryTotalRow:
     amount: int
 
 
+@dataclass(frozen=True, slots=True)
+class PeriodTotals:
+    total: int
+    by_payer: tuple[PayerTotalRow, ...]
+    by_category: tuple[CategoryTotalRow, ...]
+
+
+@dataclass(frozen=True, slots=True)
+class MonthlyTotalRow:
+    year: int
+    month: int
+    scope: str | None
+    category_code: str | None
+    amount: int
+
+
+@dataclass(frozen=True, slots=True)
+class _AggregateSource:
+    table: Any
+    amount: Any
+    payer_user_id: Any
+    category_id: Any
+    filters: tuple[Any, ...]
+
+
 class ReportRepository:
-    def __init__(self, session: AsyncSession) -> None:
+    """Report aggregates over report-effective expenses.
+
+    With a timezone, ranges aligned to local midnights are answered from the
+    `transaction_daily_totals` rollup; other ranges fall back to scanning `transactions`.
+    """
+
+    def __init__(self, session: AsyncSession, *, timezone: str | None = None) -> None:
         self._session = session
+        self._timezone = ZoneInfo(timezone) if timezone is not None else None
+
+    async def period_totals(
+        self,
+        start_at: datetime,
+        end_at: datetime,
+        *,
+        scope: TransactionScope | None = None,
+    ) -> PeriodTotals:
+        """Return total, payer split and category split from one grouped query."""
+        source = self._aggregate_source(start_at, end_at, scope=scope)
+        result = await self._session.execute(
+            select(
+                UserModel.role,
+                CategoryModel.code,
+                CategoryModel.title,
+                CategoryModel.owner_role,
+                CategoryModel.sort_order,
+                func.coalesce(func.sum(source.amount), 0),
+            )
+            .select_from(source.table)
+            .join(UserModel, source.payer_user_id == UserModel.id)
+            .join(CategoryModel, source.category_id == CategoryModel.id)
+            .where(*source.filters)
+            .group_by(
+                UserModel.role,
+                CategoryModel.code,
+                CategoryModel.title,
+                CategoryModel.owner_role,
+                CategoryModel.sort_order,
+            )
+        )
+
+        total = 0
+        payer_amounts: dict[str, int] = {}
+        category_amounts: dict[tuple[str, str, str, int], int] = {}
+        for row in result.all():
+            amount = int(row[5])
+            total += amount
+            payer_amounts[row[0]] = payer_amounts.get(row[0], 0) + amount
+            category_key = (row[1], row[2], row[3], int(row[4]))
+            category_amounts[category_key] = category_amounts.get(category_key, 0) + amount
+
+        return PeriodTotals(
+            total=total,
+            by_payer=tuple(
+                PayerTotalRow(role=role, amount=amount)
+                for role, amount in sorted(payer_amounts.items())
+                if amount != 0
+            ),
+            by_category=tuple(
+                CategoryTotalRow(
+                    code=code,
+                    title=title,
+                    owner_role=owner_role,
+                    sort_order=sort_order,
+                    amount=amount,
+                )
+                for (code, title, owner_role, sort_order), amount in sorted(
+                    category_amounts.items(),
+                    key=lambda item: (-item[1], item[0][3]),
+                )
+                if amount != 0
+            ),
+        )
 
     async def total_expenses(
         self,
@@ -34,10 +138,11 @@ class ReportRepository:
         *,
         scope: TransactionScope | None = None,
     ) -> int:
+        source = self._aggregate_source(start_at, end_at, scope=scope)
         result = await self._session.execute(
-            select(func.coalesce(func.sum(_signed_report_amount()), 0)).where(
-                *_report_effective_filters(start_at, end_at, scope=scope)
-            )
+            select(func.coalesce(func.sum(source.amount), 0))
+            .select_from(source.table)
+            .where(*source.filters)
         )
         return int(result.scalar_one())
 
@@ -48,10 +153,12 @@ class ReportRepository:
         *,
         scope: TransactionScope | None = None,
     ) -> list[PayerTotalRow]:
+        source = self._aggregate_source(start_at, end_at, scope=scope)
         result = await self._session.execute(
-            select(UserModel.role, func.coalesce(func.sum(_signed_report_amount()), 0))
-            .join(UserModel, TransactionModel.payer_user_id == UserModel.id)
-            .where(*_report_effective_filters(start_at, end_at, scope=scope))
+            select(UserModel.role, func.coalesce(func.sum(source.amount), 0))
+            .select_from(source.table)
+            .join(UserModel, source.payer_user_id == UserModel.id)
+            .where(*source.filters)
             .group_by(UserModel.role)
             .order_by(UserModel.role)
         )
@@ -68,23 +175,25 @@ class ReportRepository:
         *,
         scope: TransactionScope | None = None,
     ) -> list[CategoryTotalRow]:
+        source = self._aggregate_source(start_at, end_at, scope=scope)
         result = await self._session.execute(
             select(
                 CategoryModel.code,
                 CategoryModel.title,
                 CategoryModel.owner_role,
                 CategoryModel.sort_order,
-                func.coalesce(func.sum(_signed_report_amount()), 0),
+                func.coalesce(func.sum(source.amount), 0),
             )
-            .join(CategoryModel, TransactionModel.category_id == CategoryModel.id)
-            .where(*_report_effective_filters(start_at, end_at, scope=scope))
+            .select_from(source.table)
+            .join(CategoryModel, source.category_id == CategoryModel.id)
+            .where(*source.filters)
             .group_by(
                 CategoryModel.code,
                 CategoryModel.title,
                 CategoryModel.owner_role,
                 CategoryModel.sort_order,
             )
-            .order_by(func.sum(_signed_report_amount()).desc(), CategoryModel.sort_order)
+            .order_by(func.sum(source.amount).desc(), CategoryModel.sort_order)
         )
         return [
             CategoryTotalRow(
@@ -98,6 +207,118 @@ class ReportRepository:
             if (amount := int(row[4])) != 0
         ]
 
+    async def daily_totals(
+        self,
+        date_ranges: Sequence[tuple[date, date]],
+        *,
+        scope: TransactionScope | None = None,
+    ) -> dict[date, int]:
+        """Return signed totals per local day for half-open date ranges in one query.
+
+        Local days come from the rollup, which assigns each transaction to its day with the
+        configured timezone when it is written, so DST transitions need no SQL date math.
+        Days without report-effective rows are omitted.
+        """
+        if not date_ranges:
+            return {}
+        filters = [
+            or_(
+                *(
+                    and_(
+                        TransactionDailyTotalModel.local_date >= start_date,
+                        TransactionDailyTotalModel.local_date < end_date,
+                    )
+                    for start_date, end_date in date_ranges
+                )
+            )
+        ]
+        if scope is not None:
+            filters.append(TransactionDailyTotalModel.scope == scope.value)
+        result = await self._session.execute(
+            select(
+                TransactionDailyTotalModel.local_date,
+                func.sum(TransactionDailyTotalModel.amount),
+            )
+            .where(*filters)
+            .group_by(TransactionDailyTotalModel.local_date)
+        )
+        return {row[0]: int(row[1]) for row in result.all()}
+
+    async def monthly_totals(
+        self,
+        start_date: date,
+        end_date: date,
+        *,
+        scope: TransactionScope | None = None,
+        by_scope: bool = False,
+        by_category: bool = False,
+    ) -> list[MonthlyTotalRow]:
+        """Return signed totals per local month of `[start_date, end_date)` in one query.
+
+        `scope` and `category_code` are filled only for the requested breakdowns. Months
+        without report-effective rows are omitted.
+        """
+        year = extract("year", TransactionDailyTotalModel.local_date)
+        month = extract("month", TransactionDailyTotalModel.local_date)
+        group_by: list[Any] = [year, month]
+        if by_scope:
+            group_by.append(TransactionDailyTotalModel.scope)
+        if by_category:
+            group_by.append(CategoryModel.code)
+
+        statement = select(*group_by, func.sum(TransactionDailyTotalModel.amount)).where(
+            *_daily_total_filters(start_date, end_date, scope=scope)
+        )
+        if by_category:
+            statement = statement.join(
+                CategoryModel,
+                TransactionDailyTotalModel.category_id == CategoryModel.id,
+            )
+        result = await self._session.execute(statement.group_by(*group_by).order_by(*group_by))
+        return [
+            MonthlyTotalRow(
+                year=int(row[0]),
+                month=int(row[1]),
+                scope=row[2] if by_scope else None,
+                category_code=row[-2] if by_category else None,
+                amount=int(row[-1]),
+            )
+            for row in result.all()
+        ]
+
+    def _aggregate_source(
+        self,
+        start_at: datetime,
+        end_at: datetime,
+        *,
+        scope: TransactionScope | None,
+    ) -> _AggregateSource:
+        date_range = self._local_date_range(start_at, end_at)
+        if date_range is None:
+            return _AggregateSource(
+                table=TransactionModel,
+                amount=_signed_report_amount(),
+                payer_user_id=TransactionModel.payer_user_id,
+                category_id=TransactionModel.category_id,
+                filters=_report_effective_filters(start_at, end_at, scope=scope),
+            )
+        return _AggregateSource(
+            table=TransactionDailyTotalModel,
+            amount=TransactionDailyTotalModel.amount,
+            payer_user_id=TransactionDailyTotalModel.payer_user_id,
+            category_id=TransactionDailyTotalModel.category_id,
+            filters=_daily_total_filters(*date_range, scope=scope),
+        )
+
+    def _local_date_range(self, start_at: datetime, end_at: datetime) -> tuple[date, date] | None:
+        if self._timezone is None:
+            return None
+        local_start = _to_local_datetime(start_at, self._timezone)
+        local_end = _to_local_datetime(end_at, self._timezone)
+        if local_start.time() != time.min or local_end.time() != time.min:
+            return None
+        return local_start.date(), local_end.date()
+
 
 def _report_effective_filters(
     start_at: datetime,
@@ -124,3 +345,24 @@ def _signed_report_amount():
         (TransactionModel.type == TransactionType.CORRECTION.value, -TransactionModel.amount),
         else_=TransactionModel.amount,
     )
+
+
+def _daily_total_filters(
+    start_date: date,
+    end_date: date,
+    *,
+    scope: TransactionScope | None = None,
+):
+    filters = [
+        TransactionDailyTotalModel.local_date >= start_date,
+        TransactionDailyTotalModel.local_date < end_date,
+    ]
+    if scope is not None:
+        filters.append(TransactionDailyTotalModel.scope == scope.value)
+    return tuple(filters)
+
+
+def _to_local_datetime(value: datetime, timezone: ZoneInfo) -> datetime:
+    if value.tzinfo is None:
+        return value.replace(tzinfo=timezone)
+    return value.astimezone(timezone)
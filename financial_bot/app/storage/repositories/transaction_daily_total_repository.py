@@ -0,0 +1,208 @@
+import logging
+from collections.abc import Iterable
+from dataclasses import dataclass
+from datetime import date, datetime
+from zoneinfo import ZoneInfo
+
+from sqlalchemy import delete, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from financial_bot.app.domain.types import TransactionType
+from financial_bot.app.storage.models import TransactionDailyTotalModel, TransactionModel
+
+logger = logging.getLogger(__name__)
+
+REPORT_EFFECTIVE_TYPES = (TransactionType.EXPENSE.value, TransactionType.CORRECTION.value)
+
+type DailyTotalKey = tuple[date, int, int, str]
+
+
+@dataclass(frozen=True, slots=True)
+class DailyTotalContribution:
+    local_date: date
+    category_id: int
+    payer_user_id: int
+    scope: str
+    amount: int
+
+    @property
+    def key(self) -> DailyTotalKey:
+        return (self.local_date, self.category_id, self.payer_user_id, self.scope)
+
+
+@dataclass(frozen=True, slots=True)
+class DailyTotalRow:
+    local_date: date
+    category_id: int
+    payer_user_id: int
+    scope: str
+    amount: int
+    transaction_count: int
+
+    @property
+    def key(self) -> DailyTotalKey:
+        return (self.local_date, self.category_id, self.payer_user_id, self.scope)
+
+
+class TransactionDailyTotalRepository:
+    """Incrementally maintained per-local-day report totals.
+
+    Only report-effective rows contribute: expenses and corrections that are included in
+    reports and not deleted. Corrections are stored with a negative amount so that summing
+    the rollup matches the signed raw aggregation. The rollup is derived data: a decrement
+    of a missing row is logged and skipped rather than failing the user's write, and
+    `family-finance-report-rollup check`/`rebuild` repair the drift.
+    """
+
+    def __init__(self, session: AsyncSession) -> None:
+        self._session = session
+
+    async def apply(self, contribution: DailyTotalContribution | None, *, sign: int) -> None:
+        if contribution is None:
+            return
+
+        result = await self._session.execute(
+            select(TransactionDailyTotalModel)
+            .where(TransactionDailyTotalModel.local_date == contribution.local_date)
+            .where(TransactionDailyTotalModel.category_id == contribution.category_id)
+            .where(TransactionDailyTotalModel.payer_user_id == contribution.payer_user_id)
+            .where(TransactionDailyTotalModel.scope == contribution.scope)
+        )
+        row = result.scalar_one_or_none()
+        if row is None:
+            if sign < 0:
+                logger.warning(
+                    "Daily total row is missing for %s; run report rollup check/rebuild",
+                    contribution.key,
+                )
+                return
+            self._session.add(
+                TransactionDailyTotalModel(
+                    local_date=contribution.local_date,
+                    category_id=contribution.category_id,
+                    payer_user_id=contribution.payer_user_id,
+                    scope=contribution.scope,
+                    amount=contribution.amount,
+                    transaction_count=1,
+                )
+            )
+        else:
+            row.amount += sign * contribution.amount
+            row.transaction_count += sign
+            if row.transaction_count <= 0:
+                await self._session.delete(row)
+        await self._session.flush()
+
+    async def list_all(self) -> list[DailyTotalRow]:
+        result = await self._session.execute(
+            select(
+                TransactionDailyTotalModel.local_date,
+                TransactionDailyTotalModel.category_id,
+                TransactionDailyTotalModel.payer_user_id,
+                TransactionDailyTotalModel.scope,
+                TransactionDailyTotalModel.amount,
+                TransactionDailyTotalModel.transaction_count,
+            ).order_by(
+                TransactionDailyTotalModel.local_date,
+                TransactionDailyTotalModel.category_id,
+                TransactionDailyTotalModel.payer_user_id,
+                TransactionDailyTotalModel.scope,
+            )
+        )
+        return [
+            DailyTotalRow(
+                local_date=row[0],
+                category_id=int(row[1]),
+                payer_user_id=int(row[2]),
+                scope=row[3],
+                amount=int(row[4]),
+                transaction_count=int(row[5]),
+            )
+            for row in result.all()
+        ]
+
+    async def aggregate_transactions(self, timezone: ZoneInfo) -> list[DailyTotalRow]:
+        result = await self._session.stream(
+            select(
+                TransactionModel.occurred_at,
+                TransactionModel.category_id,
+                TransactionModel.payer_user_id,
+                TransactionModel.scope,
+                TransactionModel.type,
+                TransactionModel.amount,
+            )
+            .where(TransactionModel.type.in_(REPORT_EFFECTIVE_TYPES))
+            .where(TransactionModel.included_in_reports.is_(True))
+            .where(TransactionModel.deleted_at.is_(None))
+        )
+        totals: dict[DailyTotalKey, list[int]] = {}
+        async for row in result:
+            contribution = DailyTotalContribution(
+                local_date=_local_date(row[0], timezone),
+                category_id=int(row[1]),
+                payer_user_id=int(row[2]),
+                scope=row[3],
+                amount=_signed_amount(row[4], int(row[5])),
+            )
+            bucket = totals.setdefault(contribution.key, [0, 0])
+            bucket[0] += contribution.amount
+            bucket[1] += 1
+
+        return [
+            DailyTotalRow(
+                local_date=key[0],
+                category_id=key[1],
+                payer_user_id=key[2],
+                scope=key[3],
+                amount=amount,
+                transaction_count=count,
+            )
+            for key, (amount, count) in sorted(totals.items())
+        ]
+
+    async def replace_all(self, rows: Iterable[DailyTotalRow]) -> int:
+        await self._session.execute(delete(TransactionDailyTotalModel))
+        models = [
+            TransactionDailyTotalModel(
+                local_date=row.local_date,
+                category_id=row.category_id,
+                payer_user_id=row.payer_user_id,
+                scope=row.scope,
+                amount=row.amount,
+                transaction_count=row.transaction_count,
+            )
+            for row in rows
+        ]
+        self._session.add_all(models)
+        await self._session.flush()
+        return len(models)
+
+
+def daily_total_contribution(
+    transaction: TransactionModel,
+    timezone: ZoneInfo,
+) -> DailyTotalContribution | None:
+    if (
+        transaction.type not in REPORT_EFFECTIVE_TYPES
+        or not transaction.included_in_reports
+        or transaction.deleted_at is not None
+    ):
+        return None
+
+    return DailyTotalContribution(
+        local_date=_local_date(transaction.occurred_at, timezone),
+        category_id=transaction.category_id,
+        payer_user_id=transaction.payer_user_id,
+        scope=transaction.scope,
+        amount=_signed_amount(transaction.type, transaction.amount),
+    )
+
+
+def _signed_amount(transaction_type: str, amount: int) -> int:
+    return -amount if transaction_type == TransactionType.CORRECTION.value else amount
+
+
+def _local_date(value: datetime, timezone: ZoneInfo) -> date:
+    if value.tzinfo is None:
+        return value.date()
+    return value.astimezone(timezone).date()
@@ -1,10 +1,34 @@
+from collections.abc import AsyncIterator, Iterable
+from dataclasses import dataclass
 from datetime import datetime
 
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import aliased
 
 from financial_bot.app.domain.types import TransactionScope, TransactionType
-from financial_bot.app.storage.models import TransactionModel
+from financial_bot.app.storage.models import CategoryModel, TransactionModel, UserModel
+
+DEFAULT_EXPORT_CHUNK_SIZE = 1000
+
+
+@dataclass(frozen=True, slots=True)
+class TransactionExportRow:
+    id: int
+    amount: int
+    currency: str
+    occurred_at: datetime
+    type: str
+    source: str
+    scope: str
+    included_in_reports: bool
+    comment: str | None
+    raw_text: str | None
+    payer_role: str
+    category_code: str
+    category_title: str
+    created_by_role: str
+    updated_at: datetime
 
 
 class TransactionRepository:
@@ -59,6 +83,16 @@ class TransactionRepository:
         )
         return list(result.scalars())
 
+    async def list_ids_for_period(self, start_at: datetime, end_at: datetime) -> set[int]:
+        """Ids of all transactions of the period, deleted ones included."""
+
+        result = await self._session.scalars(
+            select(TransactionModel.id)
+            .where(TransactionModel.occurred_at >= start_at)
+            .where(TransactionModel.occurred_at < end_at)
+        )
+        return set(result)
+
     async def list_report_expenses_for_period(
         self,
         start_at: datetime,
@@ -107,6 +141,57 @@ class TransactionRepository:
         )
         return list(result.scalars())
 
+    async def iter_export_rows(
+        self,
+        start_at: datetime,
+        end_at: datetime,
+        *,
+        types: Iterable[TransactionType],
+        report_only: bool,
+        chunk_size: int = DEFAULT_EXPORT_CHUNK_SIZE,
+    ) -> AsyncIterator[list[TransactionExportRow]]:
+        """Yield active transactions of `types` with their category and roles, in chunks.
+
+        One joined query streams the rows ordered like `list_for_period`; `report_only`
+        keeps only transactions included in reports.
+        """
+
+        payer = aliased(UserModel)
+        creator = aliased(UserModel)
+        statement = (
+            select(
+                TransactionModel.id,
+                TransactionModel.amount,
+                TransactionModel.currency,
+                TransactionModel.occurred_at,
+                TransactionModel.type,
+                TransactionModel.source,
+                TransactionModel.scope,
+                TransactionModel.included_in_reports,
+                TransactionModel.comment,
+                TransactionModel.raw_text,
+                payer.role,
+                CategoryModel.code,
+                CategoryModel.title,
+                creator.role,
+                TransactionModel.updated_at,
+            )
+            .join(CategoryModel, CategoryModel.id == TransactionModel.category_id)
+            .join(payer, payer.id == TransactionModel.payer_user_id)
+            .join(creator, creator.id == TransactionModel.created_by_user_id)
+            .where(TransactionModel.type.in_([item.value for item in types]))
+            .where(TransactionModel.deleted_at.is_(None))
+            .where(TransactionModel.occurred_at >= start_at)
+            .where(TransactionModel.occurred_at < end_at)
+        )
+        if report_only:
+            statement = statement.where(TransactionModel.included_in_reports.is_(True))
+        result = await self._session.stream(
+            statement.order_by(TransactionModel.occurred_at, TransactionModel.id)
+        )
+        async for partition in result.partitions(chunk_size):
+            yield [TransactionExportRow(*row) for row in partition]
+
     async def get_latest_active_by_creator(
         self,
         created_by_user_id: int,
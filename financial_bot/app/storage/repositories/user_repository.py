@@ -2,9 +2,12 @@ from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from financial_bot.app.storage.models import UserModel
+from financial_bot.app.storage.reference_data import attach_reference_row, load_reference_data
 
 
 class UserRepository:
+    """Users, read from the process-wide reference data like `CategoryRepository`."""
+
     def __init__(self, session: AsyncSession) -> None:
         self._session = session
 
@@ -14,20 +17,31 @@ class UserRepository:
         return user
 
     async def get(self, user_id: int) -> UserModel | None:
-        return await self._session.get(UserModel, user_id)
+        reference = await load_reference_data(self._session)
+        snapshot = reference.user_by_id.get(user_id)
+        if snapshot is None:
+            return await self._session.get(UserModel, user_id)
+        return await attach_reference_row(self._session, snapshot)
 
     async def get_by_telegram_id(self, telegram_id: int) -> UserModel | None:
-        result = await self._session.execute(
-            select(UserModel).where(UserModel.telegram_id == telegram_id)
-        )
-        return result.scalar_one_or_none()
+        reference = await load_reference_data(self._session)
+        snapshot = reference.user_by_telegram_id.get(telegram_id)
+        if snapshot is None:
+            result = await self._session.execute(
+                select(UserModel).where(UserModel.telegram_id == telegram_id)
+            )
+            return result.scalar_one_or_none()
+        return await attach_reference_row(self._session, snapshot)
 
     async def get_by_role(self, role: str) -> UserModel | None:
-        result = await self._session.execute(select(UserModel).where(UserModel.role == role))
-        return result.scalar_one_or_none()
+        reference = await load_reference_data(self._session)
+        snapshot = reference.user_by_role.get(role)
+        if snapshot is None:
+            result = await self._session.execute(select(UserModel).where(UserModel.role == role))
+            return result.scalar_one_or_none()
+        return await attach_reference_row(self._session, snapshot)
 
     async def list_active(self) -> list[UserModel]:
-        result = await self._session.execute(
-            select(UserModel).where(UserModel.is_active.is_(True)).order_by(UserModel.id)
-        )
-        return list(result.scalars())
+        reference = await load_reference_data(self._session)
+        users = [await attach_reference_row(self._session, user) for user in reference.users]
+        return [user for user in users if user.is_active]
@@ -1,18 +1,24 @@
+import asyncio
 import logging
 import re
-from collections.abc import AsyncIterator
-from contextlib import asynccontextmanager
+from collections.abc import AsyncIterator, Sequence
+from contextlib import asynccontextmanager, suppress
 from dataclasses import dataclass
 from datetime import datetime
-from typing import Annotated, Any, Protocol
+from typing import Annotated, Any
+from zoneinfo import ZoneInfo
 
 import uvicorn
 from aiogram import Bot
+from aiogram.types import InlineKeyboardMarkup
 from fastapi import Depends, FastAPI, Header, HTTPException, status
 from pydantic import BaseModel, Field
 from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker
 
-from financial_bot.app.bot.formatters.bank_events import format_bank_import_result
+from financial_bot.app.bot.formatters.bank_events import (
+    format_bank_import_batch_summary,
+    format_bank_import_result,
+)
 from financial_bot.app.bot.keyboards.bank_events import (
     build_bank_autosaved_actions_keyboard,
     build_bank_event_actions_keyboard,
@@ -26,13 +32,26 @@ from financial_bot.app.services.bank_ingestion_service import (
     BankImportResult,
     BankIngestionAuthError,
     BankIngestionService,
+    BankSmsImportItem,
+)
+from financial_bot.app.services.bank_notification_worker import (
+    BankEventNotificationWorker,
+    BankEventNotifier,
+    PendingBankEventNotification,
 )
+from financial_bot.app.services.bank_rule_usage import BankRuleUsageRecorder
+from financial_bot.app.services.bank_source_cache import resolve_bank_event_source
+from financial_bot.app.services.bank_source_heartbeat import BankSourceHeartbeat
 from financial_bot.app.storage.db import create_engine, create_session_factory
-from financial_bot.app.storage.models import UserModel
-from financial_bot.app.storage.repositories.bank_event_repository import BankEventRepository
+from financial_bot.app.storage.reference_data import preload_reference_data
+from financial_bot.app.storage.repositories.bank_event_notification_repository import (
+    BankEventNotificationRepository,
+)
 
 logger = logging.getLogger(__name__)
 
+BANK_EVENT_BATCH_MAX_ITEMS = 200
+
 
 class BankEventIngestRequest(BaseModel):
     text: Any = Field()
@@ -57,62 +76,45 @@ class BankEventIngestResponse(BaseModel):
     suggestion_conflict: bool
     requires_confirmation: bool
     telegram_notification_sent: bool
+    telegram_notification_queued: bool
 
 
-class BankEventNotifier(Protocol):
-    async def notify_new_event(
-        self,
-        *,
-        session: AsyncSession,
-        source_token: str,
-        result: BankImportResult,
-    ) -> bool: ...
+class BankEventBatchIngestRequest(BaseModel):
+    items: list[BankEventIngestRequest] = Field(min_length=1, max_length=BANK_EVENT_BATCH_MAX_ITEMS)
 
-    async def close(self) -> None: ...
 
+class BankEventBatchIngestResponse(BaseModel):
+    results: list[BankEventIngestResponse]
 
-class NullBankEventNotifier:
-    async def notify_new_event(
-        self,
-        *,
-        session: AsyncSession,
-        source_token: str,
-        result: BankImportResult,
-    ) -> bool:
-        return False
 
-    async def close(self) -> None:
-        return None
+class BankNotificationQueueResponse(BaseModel):
+    pending: int
+    retrying: int
+    failed: int
+    sent: int
+    oldest_pending_at: datetime | None
+    next_attempt_at: datetime | None
+    worker_running: bool
+    worker_sent: int
+    worker_retried: int
+    worker_failed: int
+    last_error: str | None
 
 
 class TelegramBankEventNotifier:
     def __init__(self, bot: Bot) -> None:
         self._bot = bot
 
-    async def notify_new_event(
-        self,
-        *,
-        session: AsyncSession,
-        source_token: str,
-        result: BankImportResult,
-    ) -> bool:
-        if not _should_send_bank_event_notification(result):
-            return False
-
-        source = await BankEventRepository(session).get_active_source_by_token(source_token)
-        if source is None:
-            return False
-
-        owner = await session.get(UserModel, source.owner_user_id)
-        if owner is None or not owner.is_active:
-            return False
-
+    async def send(self, notification: PendingBankEventNotification) -> None:
         await self._bot.send_message(
-            chat_id=owner.telegram_id,
-            text=format_bank_import_result(result),
-            reply_markup=_bank_event_notification_keyboard(result),
+            chat_id=notification.chat_id,
+            text=notification.text,
+            reply_markup=(
+                InlineKeyboardMarkup.model_validate(notification.reply_markup)
+                if notification.reply_markup is not None
+                else None
+            ),
         )
-        return True
 
     async def close(self) -> None:
         await self._bot.session.close()
@@ -123,7 +125,9 @@ class WebAppState:
     settings: Settings
     session_factory: async_sessionmaker[AsyncSession]
     engine: AsyncEngine | None
-    notifier: BankEventNotifier
+    notification_worker: BankEventNotificationWorker | None
+    source_heartbeat: BankSourceHeartbeat
+    rule_usage: BankRuleUsageRecorder
 
 
 def create_app(
@@ -141,25 +145,68 @@ def create_app(
         if resolved_session_factory is None:
             engine = create_engine(resolved_settings.database_url)
             resolved_session_factory = create_session_factory(engine)
+        await preload_reference_data(resolved_session_factory)
 
         resolved_notifier = notifier
-        if resolved_notifier is None:
-            resolved_notifier = (
-                TelegramBankEventNotifier(create_telegram_bot(resolved_settings))
-                if send_telegram_notifications
-                else NullBankEventNotifier()
+        if resolved_notifier is None and send_telegram_notifications:
+            resolved_notifier = TelegramBankEventNotifier(create_telegram_bot(resolved_settings))
+
+        worker: BankEventNotificationWorker | None = None
+        worker_task: asyncio.Task[None] | None = None
+        if resolved_notifier is not None:
+            worker = BankEventNotificationWorker(
+                notifier=resolved_notifier,
+                session_factory=resolved_session_factory,
+                settings=resolved_settings,
             )
+            worker_task = asyncio.create_task(worker.run_forever())
+
+        heartbeat = BankSourceHeartbeat(
+            resolved_session_factory,
+            timezone=resolved_settings.timezone,
+            flush_interval_seconds=resolved_settings.bank_source_heartbeat_flush_seconds,
+            granularity_seconds=resolved_settings.bank_source_heartbeat_granularity_seconds,
+        )
+        heartbeat_task = asyncio.create_task(heartbeat.run_forever())
+        rule_usage = BankRuleUsageRecorder(
+            resolved_session_factory,
+            timezone=resolved_settings.timezone,
+            flush_interval_seconds=resolved_settings.bank_rule_usage_flush_seconds,
+        )
+        rule_usage_task = asyncio.create_task(rule_usage.run_forever())
 
         app.state.money_bot = WebAppState(
             settings=resolved_settings,
             session_factory=resolved_session_factory,
             engine=engine,
-            notifier=resolved_notifier,
+            notification_worker=worker,
+            source_heartbeat=heartbeat,
+            rule_usage=rule_usage,
         )
         try:
             yield
         finally:
-            await resolved_notifier.close()
+            heartbeat_task.cancel()
+            with suppress(asyncio.CancelledError):
+                await heartbeat_task
+            try:
+                await heartbeat.close()
+            except Exception:
+                logger.exception("Final bank source heartbeat flush failed")
+            rule_usage_task.cancel()
+            with suppress(asyncio.CancelledError):
+                await rule_usage_task
+            try:
+                await rule_usage.close()
+            except Exception:
+                logger.exception("Final bank rule usage flush failed")
+            if worker is not None and worker_task is not None:
+                worker_task.cancel()
+                with suppress(asyncio.CancelledError):
+                    await worker_task
+                await worker.wait_idle()
+            if resolved_notifier is not None:
+                await resolved_notifier.close()
             if engine is not None:
                 await engine.dispose()
 
@@ -186,6 +233,28 @@ def create_app(
     async def health() -> dict[str, str]:
         return {"status": "ok"}
 
+    @app.get("/health/notifications", response_model=BankNotificationQueueResponse)
+    async def notification_health(
+        session: Annotated[AsyncSession, Depends(get_session)],
+        app_state: Annotated[WebAppState, Depends(get_app_state)],
+    ) -> BankNotificationQueueResponse:
+        stats = await BankEventNotificationRepository(session).queue_stats()
+        worker = app_state.notification_worker
+        worker_stats = worker.snapshot() if worker is not None else None
+        return BankNotificationQueueResponse(
+            pending=stats.pending_count,
+            retrying=stats.retrying_count,
+            failed=stats.failed_count,
+            sent=stats.sent_count,
+            oldest_pending_at=stats.oldest_pending_at,
+            next_attempt_at=stats.next_attempt_at,
+            worker_running=worker is not None,
+            worker_sent=worker_stats.sent if worker_stats is not None else 0,
+            worker_retried=worker_stats.retried if worker_stats is not None else 0,
+            worker_failed=worker_stats.failed if worker_stats is not None else 0,
+            last_error=worker_stats.last_error if worker_stats is not None else None,
+        )
+
     @app.post("/bank-events", response_model=BankEventIngestResponse)
     async def ingest_bank_event(
         payload: BankEventIngestRequest,
@@ -194,7 +263,12 @@ def create_app(
         authorization: Annotated[str | None, Header()] = None,
     ) -> BankEventIngestResponse:
         source_token = _extract_bearer_token(authorization)
-        service = BankIngestionService(session, app_state.settings)
+        service = BankIngestionService(
+            session,
+            app_state.settings,
+            heartbeat=app_state.source_heartbeat,
+            rule_usage=app_state.rule_usage,
+        )
         try:
             sms_text = _extract_text_payload(payload.text, max_length=2000)
             result = await service.import_sms_from_source_token(
@@ -211,28 +285,64 @@ def create_app(
                 detail=str(exc),
             ) from exc
 
+        queued_event_ids = await _enqueue_bank_event_notifications(
+            session,
+            app_state,
+            source_token=source_token,
+            results=[result],
+        )
         await session.commit()
-        notification_sent = False
-        if _should_send_bank_event_notification(result):
-            try:
-                notification_sent = await app_state.notifier.notify_new_event(
-                    session=session,
-                    source_token=source_token,
-                    result=result,
-                )
-            except Exception:
-                logger.warning(
-                    "Bank event %s was stored but Telegram notification failed",
-                    result.event_id,
-                    exc_info=True,
-                )
+        _wake_notification_worker(app_state, queued_event_ids)
+        return _response_from_result(
+            result,
+            notification_queued=result.event_id in queued_event_ids,
+        )
+
+    @app.post("/bank-events/batch", response_model=BankEventBatchIngestResponse)
+    async def ingest_bank_event_batch(
+        payload: BankEventBatchIngestRequest,
+        session: Annotated[AsyncSession, Depends(get_session)],
+        app_state: Annotated[WebAppState, Depends(get_app_state)],
+        authorization: Annotated[str | None, Header()] = None,
+    ) -> BankEventBatchIngestResponse:
+        source_token = _extract_bearer_token(authorization)
+        service = BankIngestionService(
+            session,
+            app_state.settings,
+            heartbeat=app_state.source_heartbeat,
+            rule_usage=app_state.rule_usage,
+        )
+        try:
+            items = [_batch_import_item(index, item) for index, item in enumerate(payload.items)]
+            results = await service.import_sms_batch_from_source_token(
+                items=items,
+                source_token=source_token,
+            )
+        except BankIngestionAuthError as exc:
+            raise _unauthorized() from exc
+        except ValueError as exc:
+            raise HTTPException(
+                status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+                detail=str(exc),
+            ) from exc
 
-            if notification_sent:
-                await service.mark_telegram_notification_sent(event_id=result.event_id)
-            else:
-                await service.mark_telegram_notification_failed(event_id=result.event_id)
-            await session.commit()
-        return _response_from_result(result, notification_sent=notification_sent)
+        queued_event_ids = await _enqueue_bank_event_notifications(
+            session,
+            app_state,
+            source_token=source_token,
+            results=results,
+        )
+        await session.commit()
+        _wake_notification_worker(app_state, queued_event_ids)
+        return BankEventBatchIngestResponse(
+            results=[
+                _response_from_result(
+                    result,
+                    notification_queued=result.event_id in queued_event_ids,
+                )
+                for result in results
+            ]
+        )
 
     return app
 
@@ -377,10 +487,90 @@ def _text_candidate_score(value: str) -> tuple[int, int]:
     return (keyword_score * 10 + amount_score * 5, min(len(value), 2000))
 
 
+def _batch_import_item(index: int, item: BankEventIngestRequest) -> BankSmsImportItem:
+    try:
+        text = _extract_text_payload(item.text, max_length=2000)
+    except ValueError as exc:
+        msg = f"items[{index}]: {exc}"
+        raise ValueError(msg) from exc
+    return BankSmsImportItem(
+        text=text,
+        sender=_extract_sender_payload(item.sender),
+        received_at=item.received_at,
+    )
+
+
+async def _enqueue_bank_event_notifications(
+    session: AsyncSession,
+    app_state: WebAppState,
+    *,
+    source_token: str,
+    results: Sequence[BankImportResult],
+) -> set[int]:
+    """Queue Telegram notifications for `results` in the caller's transaction.
+
+    Several new expense candidates of one owner are coalesced into a single summary
+    message; other events keep their own card because its buttons are the only way to act
+    on them. Returns the ids of the events whose notification was queued.
+    """
+    if app_state.notification_worker is None:
+        return set()
+    notifiable = list(
+        {
+            result.event_id: result
+            for result in results
+            if _should_send_bank_event_notification(result)
+        }.values()
+    )
+    if not notifiable:
+        return set()
+
+    source = await resolve_bank_event_source(
+        session,
+        source_token,
+        ttl_seconds=app_state.settings.bank_source_cache_ttl_seconds,
+    )
+    if source is None or not source.owner_is_active:
+        return set()
+
+    notifications = BankEventNotificationRepository(session)
+    now = datetime.now(ZoneInfo(app_state.settings.timezone))
+    queued_event_ids = {result.event_id for result in notifiable}
+    pending = [result for result in notifiable if _is_coalescable_notification(result)]
+    if len(pending) > 1:
+        await notifications.enqueue(
+            bank_event_id=pending[0].event_id,
+            bank_event_ids=[result.event_id for result in pending],
+            chat_id=source.owner_telegram_id,
+            text=format_bank_import_batch_summary(pending),
+            reply_markup=None,
+            now=now,
+        )
+        notifiable = [result for result in notifiable if not _is_coalescable_notification(result)]
+
+    for result in notifiable:
+        await notifications.enqueue(
+            bank_event_id=result.event_id,
+            chat_id=source.owner_telegram_id,
+            text=format_bank_import_result(result),
+            reply_markup=_bank_event_notification_keyboard(result).model_dump(
+                mode="json",
+                exclude_none=True,
+            ),
+            now=now,
+        )
+    return queued_event_ids
+
+
+def _wake_notification_worker(app_state: WebAppState, queued_event_ids: set[int]) -> None:
+    if queued_event_ids and app_state.notification_worker is not None:
+        app_state.notification_worker.wake()
+
+
 def _response_from_result(
     result: BankImportResult,
     *,
-    notification_sent: bool,
+    notification_queued: bool,
 ) -> BankEventIngestResponse:
     return BankEventIngestResponse(
         event_id=result.event_id,
@@ -398,7 +588,8 @@ def _response_from_result(
         scope=result.scope.value,
         suggestion_conflict=result.suggestion_conflict,
         requires_confirmation=result.requires_confirmation,
-        telegram_notification_sent=notification_sent,
+        telegram_notification_sent=result.telegram_notification_sent_at is not None,
+        telegram_notification_queued=notification_queued,
     )
 
 
@@ -418,6 +609,15 @@ def _should_send_bank_event_notification(result: BankImportResult) -> bool:
     )
 
 
+def _is_coalescable_notification(result: BankImportResult) -> bool:
+    # `/bank_pending` can resend these cards, so a summary loses no buttons.
+    return (
+        not result.is_duplicate
+        and result.creates_expense_candidate
+        and result.parse_status == BankEventParseStatus.NEEDS_CONFIRMATION
+    )
+
+
 def _should_retry_failed_notification(result: BankImportResult) -> bool:
     return (
         result.telegram_notification_sent_at is None
@@ -425,7 +625,7 @@ def _should_retry_failed_notification(result: BankImportResult) -> bool:
     )
 
 
-def _bank_event_notification_keyboard(result: BankImportResult):
+def _bank_event_notification_keyboard(result: BankImportResult) -> InlineKeyboardMarkup:
     if result.parse_status == BankEventParseStatus.AUTOSAVED:
         return build_bank_autosaved_actions_keyboard(result.event_id)
     if result.operation_kind == BankEventOperationKind.INCOME:
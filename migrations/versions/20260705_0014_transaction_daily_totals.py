@@ -0,0 +1,100 @@
+"""Add incrementally maintained daily report totals.
+
+Revision ID: 20260705_0014
+Revises: 20260702_0013
+Create Date: 2026-07-05
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+from alembic import op
+
+revision: str = "20260705_0014"
+down_revision: str | None = "20260702_0013"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+SCOPE_VALUES = "'household', 'salon'"
+
+
+def upgrade() -> None:
+    op.create_table(
+        "transaction_daily_totals",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("local_date", sa.Date(), nullable=False),
+        sa.Column("category_id", sa.Integer(), nullable=False),
+        sa.Column("payer_user_id", sa.Integer(), nullable=False),
+        sa.Column("scope", sa.String(length=32), nullable=False),
+        sa.Column("amount", sa.Integer(), server_default="0", nullable=False),
+        sa.Column("transaction_count", sa.Integer(), server_default="0", nullable=False),
+        sa.CheckConstraint(
+            f"scope in ({SCOPE_VALUES})",
+            name=op.f("ck_transaction_daily_totals_transaction_daily_totals_scope"),
+        ),
+        sa.CheckConstraint(
+            "transaction_count >= 0",
+            name=op.f(
+                "ck_transaction_daily_totals_"
+                "transaction_daily_totals_transaction_count_non_negative"
+            ),
+        ),
+        sa.ForeignKeyConstraint(
+            ["category_id"],
+            ["categories.id"],
+            name=op.f("fk_transaction_daily_totals_category_id_categories"),
+        ),
+        sa.ForeignKeyConstraint(
+            ["payer_user_id"],
+            ["users.id"],
+            name=op.f("fk_transaction_daily_totals_payer_user_id_users"),
+        ),
+        sa.PrimaryKeyConstraint("id", name=op.f("pk_transaction_daily_totals")),
+        sa.UniqueConstraint(
+            "local_date",
+            "category_id",
+            "payer_user_id",
+            "scope",
+            name=op.f("uq_transaction_daily_totals_local_date"),
+        ),
+    )
+    op.create_index(
+        op.f("ix_transaction_daily_totals_local_date"),
+        "transaction_daily_totals",
+        ["local_date"],
+        unique=False,
+    )
+
+    # SQLite keeps the local wall-clock time written by the bot, so date() is the local date.
+    op.execute(
+        """
+        insert into transaction_daily_totals (
+            local_date,
+            category_id,
+            payer_user_id,
+            scope,
+            amount,
+            transaction_count
+        )
+        select
+            date(occurred_at),
+            category_id,
+            payer_user_id,
+            scope,
+            sum(case when type = 'correction' then -amount else amount end),
+            count(*)
+        from transactions
+        where type in ('expense', 'correction')
+          and included_in_reports = 1
+          and deleted_at is null
+        group by date(occurred_at), category_id, payer_user_id, scope
+        """
+    )
+
+
+def downgrade() -> None:
+    op.drop_index(
+        op.f("ix_transaction_daily_totals_local_date"),
+        table_name="transaction_daily_totals",
+    )
+    op.drop_table("transaction_daily_totals")
@@ -0,0 +1,35 @@
+"""Add composite bank event indexes for source stats.
+
+Revision ID: 20260706_0015
+Revises: 20260705_0014
+Create Date: 2026-07-06
+"""
+
+from collections.abc import Sequence
+
+from alembic import op
+
+revision: str = "20260706_0015"
+down_revision: str | None = "20260705_0014"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        "ix_bank_events_source_id_received_at",
+        "bank_events",
+        ["source_id", "received_at"],
+        unique=False,
+    )
+    op.create_index(
+        "ix_bank_events_parse_status_operation_kind",
+        "bank_events",
+        ["parse_status", "operation_kind"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_bank_events_parse_status_operation_kind", table_name="bank_events")
+    op.drop_index("ix_bank_events_source_id_received_at", table_name="bank_events")
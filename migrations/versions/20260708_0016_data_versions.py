@@ -0,0 +1,34 @@
+"""Add data version counters for derived caches.
+
+Revision ID: 20260708_0016
+Revises: 20260706_0015
+Create Date: 2026-07-08
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+from alembic import op
+
+revision: str = "20260708_0016"
+down_revision: str | None = "20260706_0015"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "data_versions",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("key", sa.String(length=120), nullable=False),
+        sa.Column("version", sa.Integer(), server_default="0", nullable=False),
+        sa.Column(
+            "updated_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False
+        ),
+        sa.PrimaryKeyConstraint("id", name=op.f("pk_data_versions")),
+        sa.UniqueConstraint("key", name=op.f("uq_data_versions_key")),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("data_versions")
@@ -0,0 +1,35 @@
+"""Persist aiogram FSM state and data.
+
+Revision ID: 20260709_0017
+Revises: 20260708_0016
+Create Date: 2026-07-09
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+from alembic import op
+
+revision: str = "20260709_0017"
+down_revision: str | None = "20260708_0016"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "fsm_states",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("storage_key", sa.String(length=255), nullable=False),
+        sa.Column("state", sa.String(length=255), nullable=True),
+        sa.Column("data", sa.JSON(), nullable=False),
+        sa.Column("updated_at", sa.DateTime(timezone=True), nullable=False),
+        sa.PrimaryKeyConstraint("id", name=op.f("pk_fsm_states")),
+        sa.UniqueConstraint("storage_key", name=op.f("uq_fsm_states_storage_key")),
+    )
+    op.create_index(op.f("ix_fsm_states_updated_at"), "fsm_states", ["updated_at"])
+
+
+def downgrade() -> None:
+    op.drop_index(op.f("ix_fsm_states_updated_at"), table_name="fsm_states")
+    op.drop_table("fsm_states")
@@ -0,0 +1,66 @@
+"""Queue bank event Telegram notifications in an outbox table.
+
+Revision ID: 20260710_0018
+Revises: 20260709_0017
+Create Date: 2026-07-10
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+from alembic import op
+
+revision: str = "20260710_0018"
+down_revision: str | None = "20260709_0017"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "bank_event_notifications",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("bank_event_id", sa.Integer(), nullable=False),
+        sa.Column("chat_id", sa.Integer(), nullable=False),
+        sa.Column("text", sa.String(length=4096), nullable=False),
+        sa.Column("reply_markup", sa.JSON(), nullable=True),
+        sa.Column("status", sa.String(length=32), server_default="pending", nullable=False),
+        sa.Column("attempts", sa.Integer(), server_default="0", nullable=False),
+        sa.Column("next_attempt_at", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("last_error", sa.String(length=500), nullable=True),
+        sa.Column("sent_at", sa.DateTime(timezone=True), nullable=True),
+        sa.Column(
+            "created_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False
+        ),
+        sa.Column(
+            "updated_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False
+        ),
+        sa.CheckConstraint(
+            "status in ('pending', 'sent', 'failed')",
+            name=op.f("ck_bank_event_notifications_bank_event_notifications_status"),
+        ),
+        sa.ForeignKeyConstraint(
+            ["bank_event_id"],
+            ["bank_events.id"],
+            name=op.f("fk_bank_event_notifications_bank_event_id_bank_events"),
+        ),
+        sa.PrimaryKeyConstraint("id", name=op.f("pk_bank_event_notifications")),
+        sa.UniqueConstraint(
+            "bank_event_id",
+            name=op.f("uq_bank_event_notifications_bank_event_id"),
+        ),
+    )
+    op.create_index(
+        "ix_bank_event_notifications_status_next_attempt_at",
+        "bank_event_notifications",
+        ["status", "next_attempt_at"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index(
+        "ix_bank_event_notifications_status_next_attempt_at",
+        table_name="bank_event_notifications",
+    )
+    op.drop_table("bank_event_notifications")
@@ -0,0 +1,26 @@
+"""Let one queued bank notification cover several bank events.
+
+Revision ID: 20260711_0019
+Revises: 20260710_0018
+Create Date: 2026-07-11
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+from alembic import op
+
+revision: str = "20260711_0019"
+down_revision: str | None = "20260710_0018"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    with op.batch_alter_table("bank_event_notifications") as batch_op:
+        batch_op.add_column(sa.Column("bank_event_ids", sa.JSON(), nullable=True))
+
+
+def downgrade() -> None:
+    with op.batch_alter_table("bank_event_notifications") as batch_op:
+        batch_op.drop_column("bank_event_ids")
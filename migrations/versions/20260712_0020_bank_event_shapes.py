@@ -0,0 +1,144 @@
+"""Store the shape of unknown bank events.
+
+The backfill classifies existing unknown events with a copy of the shape classifier and hash
+as of this revision, so later parser changes do not change what upgrading writes.
+
+Revision ID: 20260712_0020
+Revises: 20260711_0019
+Create Date: 2026-07-12
+"""
+
+import re
+from collections.abc import Sequence
+from hashlib import sha256
+from itertools import batched
+
+import sqlalchemy as sa
+from alembic import op
+
+revision: str = "20260712_0020"
+down_revision: str | None = "20260711_0019"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+SHAPE_COLUMNS: tuple[tuple[str, sa.types.TypeEngine], ...] = (
+    ("shape_hash", sa.String(length=64)),
+    ("shape_operation_markers", sa.String(length=255)),
+    ("shape_amount_count", sa.Integer()),
+    ("shape_has_balance_marker", sa.Boolean()),
+    ("shape_has_instrument_marker", sa.Boolean()),
+    ("shape_ignored_reason", sa.String(length=64)),
+    ("shape_has_security_marker", sa.Boolean()),
+)
+BACKFILL_BATCH_SIZE = 1000
+
+WHITESPACE_RE = re.compile(r"\s+")
+OPERATION_MARKERS = (
+    ("refund", re.compile(r"\bВозврат(?:\s+покупки)?\b", re.IGNORECASE)),
+    ("purchase", re.compile(r"\bПокупка\b", re.IGNORECASE)),
+    ("payment", re.compile(r"\bОплата\b", re.IGNORECASE)),
+    ("debit", re.compile(r"\bСписание\b", re.IGNORECASE)),
+    ("income", re.compile(r"\bПоступление\b", re.IGNORECASE)),
+    ("topup", re.compile(r"\bПополнение\b", re.IGNORECASE)),
+    ("credit", re.compile(r"\bЗачисление\b", re.IGNORECASE)),
+    ("transfer", re.compile(r"\bПеревод\b", re.IGNORECASE)),
+)
+AMOUNT_RE = re.compile(
+    r"(?<!\d)(?:\d+|\d{1,3}(?:[ \u00a0]\d{3})+)(?:[,.]\d+)?\s*(?:₽|руб\.?|р\.?|RUB)",
+    re.IGNORECASE,
+)
+BALANCE_MARKER_RE = re.compile(r"\b(?:Баланс|Доступно)\b", re.IGNORECASE)
+INSTRUMENT_MARKER_RE = re.compile(
+    r"Карта\s*\*(?:\d+|<redacted>)|"
+    r"Сч[её]т\s*\*(?:\d+|<redacted>)|"
+    r"Сч[её]т\s+карты\s+MIR-(?:\d+|<redacted>)|"
+    r"СЧ[ЕЁ]Т(?:\d+|<redacted>)|"
+    r"сч[её]т\s+RUB",
+    re.IGNORECASE,
+)
+SECURITY_MARKER_RE = re.compile(
+    r"\bкод\b|\bпароль\b|\b3d-?s\b|\b3ds\b|подтвердите\s+электронные\s+документы",
+    re.IGNORECASE,
+)
+IGNORE_PATTERNS = (
+    re.compile(r"^(?>.*?никому\s+не\s+сообщайте).*\bкод\b", re.IGNORECASE),
+    re.compile(r"^(?>.*?никому\s+не\s+говорите).*\bкод\b", re.IGNORECASE),
+    re.compile(r"^(?>.*?\b3d-?s\b).*\bкод\b", re.IGNORECASE),
+    re.compile(r"^(?>.*?для\s+оплаты\b).*\bкод\b", re.IGNORECASE),
+    re.compile(r"подтвердите\s+электронные\s+документы", re.IGNORECASE),
+    re.compile(r"подключены\s+уведомления", re.IGNORECASE),
+    re.compile(r"возвращайтесь\s+в\s+втб", re.IGNORECASE),
+    re.compile(r"\bкод\s+подтверждения\b", re.IGNORECASE),
+    re.compile(r"^(?>.*?\bодобрили\b).*\bлимит", re.IGNORECASE),
+    re.compile(r"^(?>.*?\bоткройте\s+счет\b).*\bподар", re.IGNORECASE),
+    re.compile(r"\bвстреча\s+с\s+представителем\b", re.IGNORECASE),
+)
+
+
+def upgrade() -> None:
+    with op.batch_alter_table("bank_events") as batch_op:
+        for name, type_ in SHAPE_COLUMNS:
+            batch_op.add_column(sa.Column(name, type_, nullable=True))
+
+    bind = op.get_bind()
+    bank_events = sa.table(
+        "bank_events",
+        sa.column("id", sa.Integer()),
+        sa.column("operation_kind", sa.String()),
+        sa.column("redacted_text", sa.String()),
+        *(sa.column(name, type_) for name, type_ in SHAPE_COLUMNS),
+    )
+    rows = bind.execute(
+        sa.select(bank_events.c.id, bank_events.c.redacted_text).where(
+            bank_events.c.operation_kind == "unknown"
+        )
+    ).all()
+    # The shape columns are set from the keys of each parameter set.
+    update = bank_events.update().where(bank_events.c.id == sa.bindparam("event_id"))
+    for batch in batched(rows, BACKFILL_BATCH_SIZE):
+        bind.execute(
+            update,
+            [
+                {"event_id": event_id, **_shape_values(redacted_text)}
+                for event_id, redacted_text in batch
+            ],
+        )
+
+
+def downgrade() -> None:
+    with op.batch_alter_table("bank_events") as batch_op:
+        for name, _ in reversed(SHAPE_COLUMNS):
+            batch_op.drop_column(name)
+
+
+def _shape_values(redacted_text: str) -> dict[str, object]:
+    text = WHITESPACE_RE.sub(" ", redacted_text).strip()
+    operation_markers = tuple(code for code, pattern in OPERATION_MARKERS if pattern.search(text))
+    amount_count = len(AMOUNT_RE.findall(text))
+    has_balance_marker = bool(BALANCE_MARKER_RE.search(text))
+    has_instrument_marker = bool(INSTRUMENT_MARKER_RE.search(text))
+    ignored_reason = (
+        "ignored_non_transaction_message"
+        if any(pattern.search(text) for pattern in IGNORE_PATTERNS)
+        else ""
+    )
+    has_security_marker = bool(SECURITY_MARKER_RE.search(text))
+    fingerprint = "|".join(
+        (
+            ",".join(operation_markers),
+            str(amount_count),
+            str(int(has_balance_marker)),
+            str(int(has_instrument_marker)),
+            ignored_reason,
+            str(int(has_security_marker)),
+        )
+    )
+    return {
+        "shape_hash": sha256(fingerprint.encode("utf-8")).hexdigest(),
+        "shape_operation_markers": ",".join(operation_markers),
+        "shape_amount_count": amount_count,
+        "shape_has_balance_marker": has_balance_marker,
+        "shape_has_instrument_marker": has_instrument_marker,
+        "shape_ignored_reason": ignored_reason,
+        "shape_has_security_marker": has_security_marker,
+    }
@@ -0,0 +1,99 @@
+from __future__ import annotations
+
+import argparse
+import random
+import time
+
+from financial_bot.app.domain.bank_sms import (
+    BankSmsShape,
+    hash_redacted_bank_sms,
+    normalize_bank_sms,
+    parse_normalized_bank_sms,
+)
+from financial_bot.app.domain.types import BankEventOperationKind
+
+SELF_ALIASES = ("SELF PERSON", "FAMILY ACCOUNT")
+MERCHANTS = ("APTEKA TEST", "GAZPROMNEFT AZS", "RESTORAN TEST", "SHABBA TEST", "LEMAN PRO")
+PEOPLE = ("EXTERNAL PERSON", "SELF PERSON", "FAMILY ACCOUNT")
+
+# Synthetic message shapes from the parser contract; {amount}, {party} and {time} vary.
+TEMPLATES: tuple[tuple[str, str], ...] = (
+    ("900", "Счёт карты MIR-1111 01.07.26 {time} Покупка {amount}р {party} Баланс: 133 812р"),
+    ("900", "СЧЁТ1111 {time} Покупка {amount}р {party} Баланс: 999р"),
+    ("900", "СЧЁТ1111 01.07.26 {time} Оплата {amount}р {party} Баланс: 999р"),
+    ("900", "Счёт карты MIR-1111 {time} Возврат покупки по СБП {amount}р {party} Баланс: 999р"),
+    ("900", "СЧЁТ1111 {time} Перевод по СБП из Т-Банк +{amount}р от {person} Баланс: 999р"),
+    ("900", "СЧЁТ1111 {time} перевод {amount}р {person} Баланс: 999р"),
+    ("900", "СЧЁТ1111 01.07.26 {time} Зачисление {amount}р Баланс: 999р"),
+    ("VTB", "Оплата {amount}р Карта*1111 {party} Баланс 99999.99р {time}"),
+    ("VTB", "Списание {amount}р Счет *1111 {person} Баланс 999р {time}"),
+    ("VTB", "Поступление {amount}р Счет *1111 от {person} Баланс 999р {time}"),
+    ("T-Bank", "Оплата СБП, счет RUB. {amount} RUB. {party} Доступно 26638,34 RUB"),
+    ("T-Bank", "Пополнение, счет RUB. {amount} RUB. {person} Доступно 4532,34 RUB"),
+    ("T-Bank", "Перевод. Карта *1111. {amount} RUB. {person} Баланс 189,44 RUB"),
+    ("900", "Код 123456. Никому не сообщайте код, даже сотруднику банка."),
+    ("", "Списание по подписке {amount}р, подробности в приложении {time}"),
+)
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description=(
+            "Measure bank SMS parsing throughput: normalize, parse and hash every message, "
+            "and classify the shape of unknown ones as the health screen does."
+        ),
+    )
+    parser.add_argument("--messages", type=int, default=20_000, help="Default: 20000")
+    parser.add_argument("--repeat", type=int, default=5, help="Timed runs. Default: 5")
+    parser.add_argument("--seed", type=int, default=1, help="Random seed. Default: 1")
+    return parser.parse_args()
+
+
+def build_messages(count: int, seed: int) -> list[tuple[str, str]]:
+    rng = random.Random(seed)
+    messages: list[tuple[str, str]] = []
+    for _ in range(count):
+        sender, template = rng.choice(TEMPLATES)
+        text = template.format(
+            amount=f"{rng.randrange(1, 50_000)},{rng.randrange(100):02d}",
+            party=rng.choice(MERCHANTS),
+            person=rng.choice(PEOPLE),
+            time=f"{rng.randrange(24):02d}:{rng.randrange(60):02d}",
+        )
+        messages.append((sender, text))
+    return messages
+
+
+def run_once(messages: list[tuple[str, str]]) -> int:
+    unknown_shapes: list[BankSmsShape] = []
+    for sender, text in messages:
+        sms = normalize_bank_sms(text, sender=sender)
+        parsed = parse_normalized_bank_sms(sms, self_counterparty_aliases=SELF_ALIASES)
+        hash_redacted_bank_sms(parsed.redacted_text)
+        if parsed.operation_kind == BankEventOperationKind.UNKNOWN:
+            unknown_shapes.append(normalize_bank_sms(parsed.redacted_text, sender=sender).shape)
+    return len(unknown_shapes)
+
+
+def main() -> None:
+    args = parse_args()
+    messages = build_messages(args.messages, args.seed)
+    unknown = run_once(messages)
+    timings: list[float] = []
+    for _ in range(args.repeat):
+        started = time.perf_counter()
+        run_once(messages)
+        timings.append(time.perf_counter() - started)
+
+    timings.sort()
+    best = timings[0]
+    median = timings[len(timings) // 2]
+    print(f"messages={len(messages)} unknown={unknown} runs={args.repeat}")
+    print(
+        f"best={best * 1000:.1f}ms median={median * 1000:.1f}ms "
+        f"throughput={len(messages) / best:,.0f} msg/s"
+    )
+
+
+if __name__ == "__main__":
+    main()
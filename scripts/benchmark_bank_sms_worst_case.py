@@ -0,0 +1,181 @@
+from __future__ import annotations
+
+import argparse
+import random
+import re
+import time
+from collections.abc import Callable
+from contextlib import suppress
+from functools import partial
+
+from financial_bot.app.domain import bank_sms, bank_sms_profiles
+from financial_bot.app.domain.bank_sms import classify_bank_sms_shape, parse_bank_sms
+from financial_bot.app.domain.money import AmountParseError
+
+MAX_TEXT_LENGTH = 2000  # /bank-events rejects longer bodies.
+FUZZ_TOKENS = (
+    "Оплата",
+    "Покупка",
+    "Списание",
+    "Перевод",
+    "Поступление",
+    "Пополнение,",
+    "Зачисление",
+    "Возврат",
+    "покупки",
+    "по",
+    "СБП",
+    "из",
+    "от",
+    "Баланс",
+    "Баланс:",
+    "Доступно",
+    "Карта",
+    "*1111",
+    "Счет",
+    "счет",
+    "RUB.",
+    "RUB",
+    "СЧЁТ1111",
+    "MIR-1111",
+    "10:20",
+    "01.07.26",
+    "+100р",
+    "1",
+    "100р",
+    "1 000",
+    "999,99",
+    "код",
+    "никому",
+    "не",
+    "сообщайте",
+    "X",
+)
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description=(
+            "Time every bank SMS regex on adversarial and fuzzed inputs up to the endpoint's "
+            "2000-character limit and report the worst cases."
+        ),
+    )
+    parser.add_argument("--fuzz", type=int, default=300, help="Random inputs. Default: 300")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per input. Default: 3")
+    parser.add_argument("--top", type=int, default=15, help="Patterns to print. Default: 15")
+    parser.add_argument("--seed", type=int, default=1, help="Random seed. Default: 1")
+    return parser.parse_args()
+
+
+def adversarial_inputs() -> dict[str, str]:
+    def fill(prefix: str, unit: str, suffix: str = "") -> str:
+        count = (MAX_TEXT_LENGTH - len(prefix) - len(suffix)) // len(unit)
+        return prefix + unit * count + suffix
+
+    return {
+        "digits": fill("", "1"),
+        "spaced_thousands": fill("Оплата ", "1 000 "),
+        "balance_spam": fill("", "Баланс: 1р "),
+        "counterparty_spam": fill("Поступление 1р Счет *1111 ", "от X "),
+        "sber_sbp_near_miss": fill("СЧЁТ1111 10:20 Перевод по СБП из ", "X +1р от Y "),
+        "sber_purchase_near_miss": fill("Счёт карты MIR-1111 10:20 Покупка 1р ", "X Баланс 1 "),
+        "sber_payment_fee_near_miss": fill(
+            "Счёт карты MIR-1111 10:20 Оплата 1р ",
+            "Комиссия 1р ",
+        ),
+        "vtb_payment_near_miss": fill("Оплата 1р Карта *1111 ", "X Баланс 1р "),
+        "vtb_debit_near_miss": fill("Списание 1р Счет *1111 ", "X Баланс: 1р 10:20 "),
+        "tbank_transfer_near_miss": fill("Перевод. Карта *1111. 1 RUB. ", "X Баланс 1 RUB "),
+        "tbank_topup_near_miss": fill("Пополнение, счет RUB. 1 RUB. ", "X Доступно 1 RUB "),
+        "security_near_miss": fill("", "никому не сообщайте "),
+        "payment_code_near_miss": fill("для оплаты ", "3ds "),
+    }
+
+
+def fuzz_inputs(count: int, seed: int) -> dict[str, str]:
+    rng = random.Random(seed)
+    inputs: dict[str, str] = {}
+    for index in range(count):
+        tokens: list[str] = []
+        length = 0
+        limit = rng.choice((200, 1000, MAX_TEXT_LENGTH))
+        while length < limit:
+            token = rng.choice(FUZZ_TOKENS)
+            tokens.append(token)
+            length += len(token) + 1
+        inputs[f"fuzz_{index}"] = " ".join(tokens)[:limit]
+    return inputs
+
+
+def collect_patterns() -> dict[str, Callable[[str], object]]:
+    """Every module-level bank SMS regex, called the way the parser uses it."""
+
+    rule_patterns = {
+        rule.pattern
+        for rules in (bank_sms.VTB_RULES, bank_sms.SBER_RULES, bank_sms.TBANK_RULES)
+        for rule in rules
+    }
+    prefix_patterns = {bank_sms.LEADING_KEYWORD_RE, bank_sms.SBER_OPERATION_KEYWORD_RE}
+    patterns: dict[str, Callable[[str], object]] = {}
+    for module in (bank_sms, bank_sms_profiles):
+        for name, value in vars(module).items():
+            if not isinstance(value, re.Pattern):
+                continue
+            if value in rule_patterns:
+                patterns[name] = value.fullmatch
+            elif value in prefix_patterns:
+                patterns[name] = value.match
+            else:
+                patterns[name] = value.findall
+    for index, pattern in enumerate(bank_sms.IGNORE_PATTERNS):
+        patterns[f"IGNORE_PATTERNS[{index}]"] = pattern.search
+    for index, (pattern, replacement) in enumerate(bank_sms.REDACTION_RULES):
+        patterns[f"REDACTION_RULES[{index}]"] = partial(pattern.sub, replacement)
+    for marker in bank_sms_profiles.COMMON_OPERATION_MARKERS:
+        patterns[f"COMMON_OPERATION_MARKERS[{marker.code}]"] = marker.pattern.search
+    return patterns
+
+
+def measure(call: Callable[[str], object], text: str, repeat: int) -> float:
+    """Best of `repeat` runs, so that a GC pause is not reported as a slow pattern."""
+
+    timings: list[float] = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        with suppress(AmountParseError):
+            call(text)
+        timings.append(time.perf_counter() - started)
+    return min(timings)
+
+
+def main() -> None:
+    args = parse_args()
+    inputs = adversarial_inputs() | fuzz_inputs(args.fuzz, args.seed)
+    normalized = {name: bank_sms.normalize_bank_sms(text).text for name, text in inputs.items()}
+
+    worst: list[tuple[float, str, str]] = []
+    for pattern_name, call in collect_patterns().items():
+        seconds, input_name = max(
+            (measure(call, text, args.repeat), input_name)
+            for input_name, text in normalized.items()
+        )
+        worst.append((seconds, pattern_name, input_name))
+
+    entry_points = {
+        "parse_bank_sms": lambda text: parse_bank_sms(text, sender="900"),
+        "classify_bank_sms_shape": lambda text: classify_bank_sms_shape(text, sender="900"),
+    }
+    for name, call in entry_points.items():
+        seconds, input_name = max(
+            (measure(call, text, args.repeat), input_name) for input_name, text in inputs.items()
+        )
+        worst.append((seconds, name, input_name))
+
+    worst.sort(reverse=True)
+    print(f"inputs={len(inputs)} max_length={max(len(text) for text in inputs.values())}")
+    for seconds, pattern_name, input_name in worst[: args.top]:
+        print(f"{seconds * 1000:9.3f}ms  {pattern_name:<42} {input_name}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,120 @@
+from __future__ import annotations
+
+import argparse
+import asyncio
+import random
+import tempfile
+import time
+from datetime import UTC, datetime, timedelta
+from pathlib import Path
+
+from financial_bot.app.domain.types import (
+    BankEventBank,
+    BankEventChannel,
+    BankEventOperationKind,
+    BankEventParseStatus,
+    UserRole,
+)
+from financial_bot.app.storage.db import create_engine, create_session_factory
+from financial_bot.app.storage.models import BankEventModel, BankEventSourceModel, Base, UserModel
+from financial_bot.app.storage.repositories.bank_event_repository import BankEventRepository
+from sqlalchemy.ext.asyncio import AsyncSession
+
+SOURCE_COUNT = 6
+INSERT_CHUNK_SIZE = 5_000
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description="Benchmark BankEventRepository.get_source_stats on a synthetic database.",
+    )
+    parser.add_argument("--events", type=int, default=100_000, help="Default: 100000")
+    parser.add_argument("--repeat", type=int, default=5, help="Timed runs. Default: 5")
+    parser.add_argument("--seed", type=int, default=1, help="Random seed. Default: 1")
+    return parser.parse_args()
+
+
+async def run_benchmark(events: int, repeat: int, seed: int) -> None:
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        database_url = f"sqlite+aiosqlite:///{Path(tmp_dir) / 'bench.sqlite3'}"
+        engine = create_engine(database_url)
+        async with engine.begin() as connection:
+            await connection.run_sync(Base.metadata.create_all)
+        session_factory = create_session_factory(engine)
+        try:
+            async with session_factory() as session:
+                await _seed_events(session, events=events, seed=seed)
+                await session.commit()
+
+            now = datetime(2026, 7, 1, tzinfo=UTC)
+            timings: list[float] = []
+            async with session_factory() as session:
+                repository = BankEventRepository(session)
+                for _ in range(repeat):
+                    started = time.perf_counter()
+                    stats = await repository.get_source_stats(since=now - timedelta(days=30))
+                    timings.append(time.perf_counter() - started)
+        finally:
+            await engine.dispose()
+
+    timings.sort()
+    print(f"events={events} sources={len(stats)} runs={repeat}")
+    print(f"best={timings[0] * 1000:.1f}ms median={timings[len(timings) // 2] * 1000:.1f}ms")
+
+
+async def _seed_events(session: AsyncSession, *, events: int, seed: int) -> None:
+    rng = random.Random(seed)
+    owner = UserModel(telegram_id=1001, name="Husband", role=UserRole.HUSBAND.value)
+    session.add(owner)
+    await session.flush()
+    sources = [
+        BankEventSourceModel(
+            code=f"bench-source-{index}",
+            bank=BankEventBank.SBER.value,
+            channel=BankEventChannel.IOS_SHORTCUT.value,
+            owner_user_id=owner.id,
+            token_hash=f"{index:064d}",
+        )
+        for index in range(SOURCE_COUNT)
+    ]
+    session.add_all(sources)
+    await session.flush()
+
+    kinds = [item.value for item in BankEventOperationKind]
+    statuses = [item.value for item in BankEventParseStatus]
+    start = datetime(2026, 1, 1, tzinfo=UTC)
+    rows = []
+    for index in range(events):
+        received_at = start + timedelta(minutes=rng.randrange(0, 60 * 24 * 180))
+        rows.append(
+            {
+                "source_id": sources[index % SOURCE_COUNT].id,
+                "bank": BankEventBank.SBER.value,
+                "channel": BankEventChannel.IOS_SHORTCUT.value,
+                "received_at": received_at,
+                "operation_kind": rng.choice(kinds),
+                "parse_status": rng.choice(statuses),
+                "amount": rng.randrange(100, 1_000_000),
+                "currency": "RUB",
+                "redacted_text": "<redacted>",
+                "normalized_text_hash": f"{index:064x}",
+                "dedupe_key": f"bench:{index}",
+                "suggestion_conflict": rng.random() < 0.05,
+                "telegram_notification_sent_at": received_at if rng.random() < 0.8 else None,
+                "telegram_notification_failed_at": received_at if rng.random() < 0.05 else None,
+            }
+        )
+        if len(rows) >= INSERT_CHUNK_SIZE:
+            await session.execute(BankEventModel.__table__.insert(), rows)
+            rows = []
+    if rows:
+        await session.execute(BankEventModel.__table__.insert(), rows)
+
+
+def main() -> None:
+    args = parse_args()
+    asyncio.run(run_benchmark(args.events, args.repeat, args.seed))
+
+
+if __name__ == "__main__":
+    main()
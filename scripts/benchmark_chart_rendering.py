@@ -0,0 +1,182 @@
+from __future__ import annotations
+
+import argparse
+import asyncio
+import logging
+import random
+import tempfile
+import time
+from contextlib import suppress
+from datetime import datetime, timedelta
+from pathlib import Path
+from zoneinfo import ZoneInfo
+
+from financial_bot.app.config import Settings
+from financial_bot.app.domain.types import TransactionScope, TransactionSource, TransactionType
+from financial_bot.app.services.chart_render_pool import ChartRenderPool
+from financial_bot.app.services.chart_service import ChartService
+from financial_bot.app.services.event_loop_monitor import EventLoopStallMonitor
+from financial_bot.app.services.report_rollup_service import ReportRollupService
+from financial_bot.app.services.seed_service import seed_initial_data
+from financial_bot.app.storage.db import create_engine, create_session_factory
+from financial_bot.app.storage.models import Base, CategoryModel, TransactionModel, UserModel
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+TIMEZONE = "Asia/Barnaul"
+NOW = datetime(2026, 5, 20, 12, tzinfo=ZoneInfo(TIMEZONE))
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description=(
+            "Measure event loop stalls while month dashboards are rendered inline and in the "
+            "chart render pool."
+        ),
+    )
+    parser.add_argument("--requests", type=int, default=8, help="Concurrent charts. Default: 8")
+    parser.add_argument("--workers", type=int, default=2, help="Pool workers. Default: 2")
+    parser.add_argument(
+        "--transactions",
+        type=int,
+        default=500,
+        help="Synthetic May 2026 expenses. Default: 500",
+    )
+    parser.add_argument("--seed", type=int, default=1, help="Random seed. Default: 1")
+    return parser.parse_args()
+
+
+def make_settings(database_url: str) -> Settings:
+    return Settings(
+        _env_file=None,
+        bot_token="123456:benchmark-token",
+        database_url=database_url,
+        allowed_telegram_ids="1001,1002",
+        default_currency="RUB",
+        timezone=TIMEZONE,
+        husband_telegram_id=1001,
+        wife_telegram_id=1002,
+    )
+
+
+async def run_benchmark(requests: int, workers: int, transactions: int, seed: int) -> None:
+    logging.getLogger("financial_bot.app.services.event_loop_monitor").setLevel(logging.ERROR)
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        chart_dir = Path(tmp_dir) / "charts"
+        database_url = f"sqlite+aiosqlite:///{Path(tmp_dir) / 'bench.sqlite3'}"
+        settings = make_settings(database_url)
+        engine = create_engine(database_url)
+        async with engine.begin() as connection:
+            await connection.run_sync(Base.metadata.create_all)
+        session_factory = create_session_factory(engine)
+        try:
+            async with session_factory() as session:
+                await seed_initial_data(session, settings)
+                await _seed_transactions(session, transactions=transactions, seed=seed)
+                await ReportRollupService(session, settings).rebuild()
+                await session.commit()
+
+            await _measure(
+                "inline",
+                session_factory,
+                settings,
+                renderer=None,
+                requests=requests,
+                chart_dir=chart_dir,
+            )
+            renderer = ChartRenderPool(workers=workers, max_concurrency=workers)
+            try:
+                await renderer.start()
+                await _measure(
+                    f"pool({workers})",
+                    session_factory,
+                    settings,
+                    renderer=renderer,
+                    requests=requests,
+                    chart_dir=chart_dir,
+                )
+            finally:
+                await renderer.close()
+        finally:
+            await engine.dispose()
+
+
+async def _measure(
+    label: str,
+    session_factory: async_sessionmaker[AsyncSession],
+    settings: Settings,
+    *,
+    renderer: ChartRenderPool | None,
+    requests: int,
+    chart_dir: Path,
+) -> None:
+    monitor = EventLoopStallMonitor(interval_seconds=0.005, stall_threshold_seconds=0.02)
+    monitor_task = asyncio.create_task(monitor.run_forever())
+    await asyncio.sleep(0.05)
+    monitor.reset()
+
+    async def render_one() -> None:
+        async with session_factory() as session:
+            result = await ChartService(
+                session,
+                settings,
+                chart_temp_dir=chart_dir,
+                renderer=renderer,
+            ).create_month_dashboard_chart(now=NOW)
+        if result is not None:
+            result.path.unlink(missing_ok=True)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(render_one() for _ in range(requests)))
+    elapsed = time.perf_counter() - started
+    monitor_task.cancel()
+    with suppress(asyncio.CancelledError):
+        await monitor_task
+
+    stats = monitor.snapshot()
+    print(
+        f"{label}: requests={requests} wall={elapsed * 1000:.0f}ms "
+        f"max_stall={stats.max_stall_seconds * 1000:.0f}ms "
+        f"total_stall={stats.total_stall_seconds * 1000:.0f}ms "
+        f"stalled_samples={stats.stalled_samples}/{stats.samples}"
+    )
+
+
+async def _seed_transactions(session: AsyncSession, *, transactions: int, seed: int) -> None:
+    rng = random.Random(seed)
+    users = list((await session.scalars(select(UserModel).order_by(UserModel.id))).all())
+    categories = list(
+        (
+            await session.scalars(
+                select(CategoryModel)
+                .where(CategoryModel.is_expense.is_(True))
+                .where(CategoryModel.is_active.is_(True))
+            )
+        ).all()
+    )
+    start = datetime(2026, 5, 1, tzinfo=ZoneInfo(TIMEZONE))
+    payers = [rng.choice(users) for _ in range(transactions)]
+    session.add_all(
+        TransactionModel(
+            amount=rng.randrange(100_00, 20_000_00),
+            currency="RUB",
+            occurred_at=start + timedelta(minutes=rng.randrange(0, 60 * 24 * 19)),
+            payer_user_id=payer.id,
+            created_by_user_id=payer.id,
+            category_id=rng.choice(categories).id,
+            type=TransactionType.EXPENSE.value,
+            source=TransactionSource.CARD.value,
+            scope=TransactionScope.HOUSEHOLD.value,
+        )
+        for payer in payers
+    )
+    await session.flush()
+
+
+def main() -> None:
+    args = parse_args()
+    asyncio.run(run_benchmark(args.requests, args.workers, args.transactions, args.seed))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+from __future__ import annotations
+
+import argparse
+import asyncio
+import tempfile
+import time
+from collections import Counter
+from pathlib import Path
+
+from financial_bot.app.config import Settings
+from financial_bot.app.services.seed_service import seed_initial_data
+from financial_bot.app.services.transaction_service import TransactionService
+from financial_bot.app.storage.db import create_engine, create_session_factory
+from financial_bot.app.storage.models import Base
+from financial_bot.app.storage.reference_data import preload_reference_data
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+EXPENSE_TEXTS = ("350 продукты", "1200 жкх", "90 кофейня", "4500 здоровье")
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description=(
+            "Count database queries of a typical expense handler: add an expense from free "
+            "text and show the latest one, each in its own transaction."
+        ),
+    )
+    parser.add_argument("--handlers", type=int, default=200, help="Default: 200")
+    return parser.parse_args()
+
+
+def make_settings(database_url: str) -> Settings:
+    return Settings(
+        _env_file=None,
+        bot_token="123456:benchmark-token",
+        database_url=database_url,
+        allowed_telegram_ids="1001,1002",
+        default_currency="RUB",
+        timezone="Asia/Barnaul",
+        husband_telegram_id=1001,
+        wife_telegram_id=1002,
+    )
+
+
+async def run_benchmark(handlers: int) -> None:
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        database_url = f"sqlite+aiosqlite:///{Path(tmp_dir) / 'bench.sqlite3'}"
+        settings = make_settings(database_url)
+        engine = create_engine(database_url)
+        async with engine.begin() as connection:
+            await connection.run_sync(Base.metadata.create_all)
+        session_factory = create_session_factory(engine)
+        try:
+            async with session_factory() as session:
+                await seed_initial_data(session, settings)
+                await session.commit()
+            await preload_reference_data(session_factory)
+
+            queries: Counter[str] = Counter()
+
+            def count_query(*args: object) -> None:
+                statement = " ".join(str(args[2]).split())
+                verb = statement.split(maxsplit=1)[0].upper()
+                table = statement.split(" FROM ", 1)[1].split()[0] if " FROM " in statement else ""
+                queries[f"{verb} {table}".strip()] += 1
+
+            event.listen(engine.sync_engine, "before_cursor_execute", count_query)
+            started = time.perf_counter()
+            for index in range(handlers):
+                await _run_handler(
+                    session_factory, settings, EXPENSE_TEXTS[index % len(EXPENSE_TEXTS)]
+                )
+            elapsed = time.perf_counter() - started
+        finally:
+            await engine.dispose()
+
+    print(f"handlers={handlers} queries/handler={sum(queries.values()) / handlers:.1f}")
+    print(f"handler_ms={elapsed / handlers * 1000:.2f}")
+    for query, count in queries.most_common():
+        print(f"  {count / handlers:5.1f}  {query}")
+
+
+async def _run_handler(
+    session_factory: async_sessionmaker[AsyncSession],
+    settings: Settings,
+    text: str,
+) -> None:
+    async with session_factory() as session:
+        service = TransactionService(session, settings)
+        await service.create_from_free_text(text=text, current_payer_telegram_id=1001)
+        await service.get_latest_transaction_for_user(telegram_id=1001)
+        await session.commit()
+
+
+def main() -> None:
+    args = parse_args()
+    asyncio.run(run_benchmark(args.handlers))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,179 @@
+import json
+import threading
+from collections.abc import Callable
+from typing import Any
+
+
+class FakeHttpResponse(dict[str, str]):
+    def __init__(self, status: int, headers: dict[str, str] | None = None) -> None:
+        super().__init__(headers or {})
+        self.status = status
+
+
+class FakeHttpError(Exception):
+    """Shaped like `googleapiclient.errors.HttpError`: the response is in `resp`."""
+
+    def __init__(
+        self, status: int, *, content: bytes = b"", retry_after: str | None = None
+    ) -> None:
+        super().__init__(f"HTTP {status}")
+        headers = {"retry-after": retry_after} if retry_after is not None else {}
+        self.resp = FakeHttpResponse(status, headers)
+        self.content = content
+
+
+class FakeSheetsClient:
+    """In-memory stand-in for the `googleapiclient` Sheets v4 resource.
+
+    Keeps a grid of cell values per sheet and records every executed call with the size of
+    its JSON body, so tests can check both the resulting sheet and what was sent. Errors
+    queued with `fail_next` are raised by the next calls of that operation.
+    """
+
+    def __init__(self, *, existing_sheets: set[str] | None = None) -> None:
+        self.grids: dict[str, list[list[object]]] = {
+            sheet_name: [] for sheet_name in sorted(existing_sheets or set())
+        }
+        self.calls: list[tuple[str, dict[str, Any]]] = []
+        self.created_sheets: list[str] = []
+        self.failed_calls: list[str] = []
+        self.thread_ids: set[int] = set()
+        self._failures: dict[str, list[Exception]] = {}
+
+    def fail_next(self, operation: str, *errors: Exception) -> None:
+        self._failures.setdefault(operation, []).extend(errors)
+
+    def spreadsheets(self) -> "_FakeSpreadsheets":
+        return _FakeSpreadsheets(self)
+
+    def calls_of(self, operation: str) -> list[dict[str, Any]]:
+        return [kwargs for name, kwargs in self.calls if name == operation]
+
+    @property
+    def bytes_sent(self) -> int:
+        return sum(
+            len(json.dumps(kwargs.get("body", {}), default=str).encode())
+            for _name, kwargs in self.calls
+        )
+
+    def values_of(self, sheet_name: str) -> list[list[object]]:
+        """Sheet values without trailing blank cells and rows, like `values.get` returns."""
+
+        rows = [_trim(row) for row in self.grids.get(sheet_name, [])]
+        while rows and not rows[-1]:
+            rows.pop()
+        return rows
+
+    def _record[ResultT](
+        self,
+        operation: str,
+        kwargs: dict[str, Any],
+        run: Callable[[], ResultT],
+    ) -> "_FakeRequest[ResultT]":
+        def execute() -> ResultT:
+            self.thread_ids.add(threading.get_ident())
+            failures = self._failures.get(operation)
+            if failures:
+                self.failed_calls.append(operation)
+                raise failures.pop(0)
+            self.calls.append((operation, kwargs))
+            return run()
+
+        return _FakeRequest(execute)
+
+    def _write(self, cell_range: str, values: list[list[object]]) -> None:
+        sheet_name, cell = cell_range.split("!", maxsplit=1)
+        grid = self.grids[sheet_name]
+        start = int(cell.removeprefix("A")) - 1
+        while len(grid) < start + len(values):
+            grid.append([])
+        for offset, row in enumerate(values):
+            grid[start + offset] = [*row, *grid[start + offset][len(row) :]]
+
+
+class _FakeRequest[ResultT]:
+    def __init__(self, execute: Callable[[], ResultT]) -> None:
+        self.execute = execute
+
+
+class _FakeSpreadsheets:
+    def __init__(self, client: FakeSheetsClient) -> None:
+        self._client = client
+
+    def get(self, **kwargs: Any) -> _FakeRequest[dict[str, Any]]:
+        return self._client._record(
+            "spreadsheets.get",
+            kwargs,
+            lambda: {
+                "sheets": [
+                    {"properties": {"title": sheet_name}} for sheet_name in self._client.grids
+                ]
+            },
+        )
+
+    def batchUpdate(self, **kwargs: Any) -> _FakeRequest[dict[str, Any]]:
+        def run() -> dict[str, Any]:
+            for request in kwargs["body"]["requests"]:
+                sheet_name = request["addSheet"]["properties"]["title"]
+                self._client.grids[sheet_name] = []
+                self._client.created_sheets.append(sheet_name)
+            return {"spreadsheetId": kwargs["spreadsheetId"]}
+
+        return self._client._record("spreadsheets.batchUpdate", kwargs, run)
+
+    def values(self) -> "_FakeValues":
+        return _FakeValues(self._client)
+
+
+class _FakeValues:
+    def __init__(self, client: FakeSheetsClient) -> None:
+        self._client = client
+
+    def get(self, **kwargs: Any) -> _FakeRequest[dict[str, Any]]:
+        sheet_name = kwargs["range"].split("!", maxsplit=1)[0]
+        return self._client._record(
+            "values.get",
+            kwargs,
+            lambda: {"values": self._client.values_of(sheet_name)},
+        )
+
+    def batchGet(self, **kwargs: Any) -> _FakeRequest[dict[str, Any]]:
+        def run() -> dict[str, Any]:
+            value_ranges = []
+            for cell_range in kwargs["ranges"]:
+                sheet_name, _, columns = cell_range.partition("!")
+                values = self._client.values_of(sheet_name)
+                if columns == "A:A":
+                    values = [_trim(row[:1]) for row in values]
+                    while values and not values[-1]:
+                        values.pop()
+                value_range: dict[str, Any] = {"range": cell_range}
+                if values:
+                    value_range["values"] = values
+                value_ranges.append(value_range)
+            return {"valueRanges": value_ranges}
+
+        return self._client._record("values.batchGet", kwargs, run)
+
+    def batchUpdate(self, **kwargs: Any) -> _FakeRequest[dict[str, Any]]:
+        def run() -> dict[str, Any]:
+            for item in kwargs["body"]["data"]:
+                self._client._write(item["range"], item["values"])
+            return {"totalUpdatedRows": sum(len(item["values"]) for item in kwargs["body"]["data"])}
+
+        return self._client._record("values.batchUpdate", kwargs, run)
+
+    def batchClear(self, **kwargs: Any) -> _FakeRequest[dict[str, Any]]:
+        def run() -> dict[str, Any]:
+            for sheet_name in kwargs["body"]["ranges"]:
+                self._client.grids[sheet_name.split("!", maxsplit=1)[0]] = []
+            return {"clearedRanges": kwargs["body"]["ranges"]}
+
+        return self._client._record("values.batchClear", kwargs, run)
+
+
+def _trim(row: list[object]) -> list[object]:
+    row = list(row)
+    while row and row[-1] == "":
+        row.pop()
+    return row
@@ -5,10 +5,12 @@ import pytest
 import pytest_asyncio
 from financial_bot.app.config import Settings
 from financial_bot.app.services.alias_service import AliasService
+from financial_bot.app.services.category_settings_service import CategorySettingsService
 from financial_bot.app.services.seed_service import seed_initial_data
 from financial_bot.app.storage.db import create_engine, create_session_factory
 from financial_bot.app.storage.models import Base, CategoryAliasModel
 from financial_bot.app.storage.repositories.category_repository import CategoryRepository
+from sqlalchemy import event
 from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
 
 
@@ -81,3 +83,80 @@ async def test_alias_service_ignores_dangerously_short_aliases(
 
     assert exact_short is None
     assert embedded_short is None
+
+
+@pytest.mark.asyncio
+async def test_alias_service_resolves_from_compiled_index_without_queries(
+    session_factory: async_sessionmaker[AsyncSession],
+) -> None:
+    settings = make_settings()
+    statements: list[str] = []
+
+    async with session_factory() as session:
+        await seed_initial_data(session, settings)
+        await session.commit()
+        assert await AliasService(session).resolve_category("3500 магнит") is not None
+
+    async with session_factory() as session:
+        engine = session.bind.sync_engine
+
+        def record_statement(*args: object) -> None:
+            statements.append(str(args[2]))
+
+        event.listen(engine, "before_cursor_execute", record_statement)
+        try:
+            groceries = await AliasService(session).resolve_category("3500 продукты магнит")
+            missing = await AliasService(session).resolve_category("500 домик для игрушек")
+        finally:
+            event.remove(engine, "before_cursor_execute", record_statement)
+
+        assert groceries is not None
+        assert groceries.category.code == "groceries"
+        assert groceries.category in session
+        assert missing is None
+
+    assert statements == []
+
+
+@pytest.mark.asyncio
+async def test_alias_index_is_rebuilt_after_alias_and_category_changes(
+    session_factory: async_sessionmaker[AsyncSession],
+) -> None:
+    settings = make_settings()
+
+    async with session_factory() as session:
+        await seed_initial_data(session, settings)
+        await session.commit()
+        assert await AliasService(session).resolve_category("800 bahetle") is None
+
+    async with session_factory() as session:
+        settings_service = CategorySettingsService(session)
+        await settings_service.add_alias(category_code="groceries", alias="bahetle")
+        await settings_service.rename_category(category_code="groceries", new_title="Еда дома")
+        await session.commit()
+
+    async with session_factory() as session:
+        match = await AliasService(session).resolve_category("800 bahetle")
+
+    assert match is not None
+    assert match.category.code == "groceries"
+    assert match.category.title == "Еда дома"
+
+
+@pytest.mark.asyncio
+async def test_alias_index_drops_aliases_from_rolled_back_sessions(
+    session_factory: async_sessionmaker[AsyncSession],
+) -> None:
+    settings = make_settings()
+
+    async with session_factory() as session:
+        await seed_initial_data(session, settings)
+        await session.commit()
+
+    async with session_factory() as session:
+        await CategorySettingsService(session).add_alias(category_code="auto", alias="шиномонтаж")
+        assert await AliasService(session).resolve_category("шиномонтаж") is not None
+        await session.rollback()
+
+    async with session_factory() as session:
+        assert await AliasService(session).resolve_category("шиномонтаж") is None
@@ -5,6 +5,7 @@ from pathlib import Path
 import pytest
 import pytest_asyncio
 from financial_bot.app.config import Settings
+from financial_bot.app.domain.bank_sms import classify_redacted_bank_sms_shape
 from financial_bot.app.domain.types import (
     BankCategoryRuleMode,
     BankEventBank,
@@ -25,6 +26,7 @@ from financial_bot.app.storage.models import (
 )
 from financial_bot.app.storage.repositories.bank_event_repository import (
     BankEventRepository,
+    bank_event_shape_values,
     hash_bank_event_source_token,
 )
 from financial_bot.app.storage.repositories.category_repository import CategoryRepository
@@ -306,6 +308,11 @@ def _event(
     suggestion_conflict: bool = False,
     redacted_text: str = "redacted bank payload",
 ) -> BankEventModel:
+    shape = (
+        classify_redacted_bank_sms_shape(redacted_text, bank=BankEventBank.SBER.value)
+        if operation_kind == BankEventOperationKind.UNKNOWN
+        else None
+    )
     return BankEventModel(
         source_id=source_id,
         bank=BankEventBank.SBER.value,
@@ -322,4 +329,5 @@ def _event(
         suggestion_conflict=suggestion_conflict,
         telegram_notification_failed_at=failed_at,
         transaction_id=transaction_id,
+        **bank_event_shape_values(shape),
     )
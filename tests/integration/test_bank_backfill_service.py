@@ -0,0 +1,241 @@
+import json
+from collections.abc import AsyncIterator
+from datetime import UTC, datetime
+from pathlib import Path
+from zoneinfo import ZoneInfo
+
+import pytest
+import pytest_asyncio
+from financial_bot.app.config import Settings
+from financial_bot.app.domain.types import (
+    BankEventBank,
+    BankEventChannel,
+    BankEventOperationKind,
+    BankEventParseStatus,
+    BankEventSuggestionSource,
+    UserRole,
+)
+from financial_bot.app.services.bank_backfill_service import (
+    BankBackfillProgress,
+    BankBackfillRecord,
+    BankBackfillService,
+    BankSmsDumpFormat,
+    read_bank_sms_dump,
+)
+from financial_bot.app.services.bank_event_source_service import BankEventSourceService
+from financial_bot.app.services.bank_ingestion_service import BankIngestionService
+from financial_bot.app.services.seed_service import seed_initial_data
+from financial_bot.app.storage.db import create_engine, create_session_factory, session_scope
+from financial_bot.app.storage.models import (
+    BankEventModel,
+    BankEventNotificationModel,
+    Base,
+    CategoryModel,
+    TransactionModel,
+)
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+TIMEZONE = "Asia/Barnaul"
+SOURCE_TOKEN = "backfill-source-token"
+
+
+@pytest_asyncio.fixture
+async def session_factory(tmp_path: Path) -> AsyncIterator[async_sessionmaker[AsyncSession]]:
+    pytest.importorskip("aiosqlite")
+    database_url = f"sqlite+aiosqlite:///{tmp_path}/bank-backfill.sqlite3"
+    engine = create_engine(database_url)
+    async with engine.begin() as connection:
+        await connection.run_sync(Base.metadata.create_all)
+
+    try:
+        yield create_session_factory(engine)
+    finally:
+        await engine.dispose()
+
+
+def make_settings() -> Settings:
+    return Settings(
+        _env_file=None,
+        bot_token="123456:secret-token",
+        database_url="sqlite+aiosqlite:///unused.sqlite3",
+        allowed_telegram_ids="1001,1002",
+        default_currency="RUB",
+        timezone=TIMEZONE,
+        husband_telegram_id=1001,
+        wife_telegram_id=1002,
+    )
+
+
+def test_read_bank_sms_dump_reads_jsonl_and_text_lines() -> None:
+    jsonl = [
+        json.dumps(
+            {"text": " Оплата 100р ", "received_at": "2026-07-01T10:20:00", "sender": "VTB"},
+            ensure_ascii=False,
+        ),
+        "",
+        json.dumps({"text": "Оплата 200р", "received_at": "2026-07-01T10:20:00+00:00"}),
+    ]
+
+    records = list(
+        read_bank_sms_dump(jsonl, dump_format=BankSmsDumpFormat.JSONL, timezone=TIMEZONE)
+    )
+
+    assert records == [
+        BankBackfillRecord(
+            text="Оплата 100р",
+            received_at=datetime(2026, 7, 1, 10, 20, tzinfo=ZoneInfo(TIMEZONE)),
+            sender="VTB",
+        ),
+        BankBackfillRecord(
+            text="Оплата 200р", received_at=datetime(2026, 7, 1, 10, 20, tzinfo=UTC)
+        ),
+    ]
+    assert list(
+        read_bank_sms_dump(
+            ["2026-07-01T10:20:00\tОплата\t100р\n"],
+            dump_format=BankSmsDumpFormat.TEXT,
+            timezone=TIMEZONE,
+        )
+    ) == [
+        BankBackfillRecord(
+            text="Оплата\t100р",
+            received_at=datetime(2026, 7, 1, 10, 20, tzinfo=ZoneInfo(TIMEZONE)),
+        )
+    ]
+    with pytest.raises(ValueError, match="Line 2"):
+        list(
+            read_bank_sms_dump(
+                ["2026-07-01T10:20:00\tОплата 100р", "Оплата 100р"],
+                dump_format=BankSmsDumpFormat.TEXT,
+                timezone=TIMEZONE,
+            )
+        )
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("workers", [0, 1])
+async def test_backfill_stores_events_in_chunks_and_skips_known_sms(
+    session_factory: async_sessionmaker[AsyncSession],
+    workers: int,
+) -> None:
+    settings = make_settings()
+    await _seed_source(session_factory, settings)
+    received_at = datetime(2026, 6, 26, 12, 0, tzinfo=UTC)
+    live_text = "Счёт карты MIR-1111 11:09 Покупка 290р APTEKA TEST Баланс: 924.14р"
+    async with session_scope(session_factory) as session:
+        live = await BankIngestionService(session, settings).import_sms_from_source_token(
+            text=live_text,
+            source_token=SOURCE_TOKEN,
+            received_at=received_at,
+        )
+
+    records = [
+        BankBackfillRecord(text=live_text, received_at=received_at),
+        BankBackfillRecord(
+            text="СЧЁТ1111 10:26 Покупка 150р UNKNOWN SHOP Баланс: 999р",
+            received_at=received_at,
+        ),
+        BankBackfillRecord(
+            text="СЧЁТ1111 10:26 Покупка 150р UNKNOWN SHOP Баланс: 999р",
+            received_at=received_at,
+        ),
+        BankBackfillRecord(
+            text="Код 123456. Никому не сообщайте код.",
+            received_at=received_at,
+        ),
+        BankBackfillRecord(
+            text="Оплата 100р Карта*1111 OTHER BANK Баланс 999р 10:20",
+            received_at=received_at,
+        ),
+    ]
+    progress: list[BankBackfillProgress] = []
+    service = BankBackfillService(session_factory, settings, workers=workers, chunk_size=2)
+
+    result = await service.import_records(
+        records,
+        source_code="history-sber",
+        on_progress=progress.append,
+    )
+    repeated = await service.import_records(records, source_code="history-sber")
+
+    assert [item.processed for item in progress] == [2, 4, 5]
+    assert (result.processed, result.created, result.duplicates) == (5, 3, 2)
+    assert (repeated.processed, repeated.created, repeated.duplicates) == (5, 0, 5)
+    async with session_factory() as session:
+        events = list(
+            await session.scalars(
+                select(BankEventModel)
+                .where(BankEventModel.id != live.event_id)
+                .order_by(BankEventModel.id)
+            )
+        )
+        transaction_count = await session.scalar(select(func.count()).select_from(TransactionModel))
+        notification_count = await session.scalar(
+            select(func.count()).select_from(BankEventNotificationModel)
+        )
+
+    assert [(event.operation_kind, event.parse_status) for event in events] == [
+        (
+            BankEventOperationKind.EXPENSE_CANDIDATE.value,
+            BankEventParseStatus.NEEDS_CONFIRMATION.value,
+        ),
+        (BankEventOperationKind.IGNORED.value, BankEventParseStatus.IGNORED.value),
+        (BankEventOperationKind.IGNORED.value, BankEventParseStatus.IGNORED.value),
+    ]
+    assert events[0].amount == 15_000
+    assert events[0].suggested_category_source == BankEventSuggestionSource.NONE.value
+    assert events[0].channel == BankEventChannel.IOS_SHORTCUT.value
+    assert "123456" not in events[1].redacted_text
+    assert events[2].redacted_text == "<source_bank_mismatch:vtb>"
+    assert transaction_count == 0
+    assert notification_count == 0
+
+
+@pytest.mark.asyncio
+async def test_backfill_suggests_parser_hint_category_and_rejects_unknown_source(
+    session_factory: async_sessionmaker[AsyncSession],
+) -> None:
+    # The live ingestion parse budget does not apply to offline backfill.
+    settings = make_settings().model_copy(update={"bank_sms_parse_budget_seconds": 1e-9})
+    await _seed_source(session_factory, settings)
+    service = BankBackfillService(session_factory, settings)
+
+    with pytest.raises(ValueError, match="missing-source"):
+        await service.import_records([], source_code="missing-source")
+    await service.import_records(
+        [
+            BankBackfillRecord(
+                text="Счёт карты MIR-1111 11:09 Покупка 290р APTEKA TEST Баланс: 924.14р",
+                received_at=datetime(2026, 6, 26, 12, 0, tzinfo=UTC),
+            )
+        ],
+        source_code="history-sber",
+    )
+
+    async with session_factory() as session:
+        event = await session.scalar(select(BankEventModel))
+        category = await session.scalar(
+            select(CategoryModel).where(CategoryModel.code == "cosmetology_medicine")
+        )
+
+    assert event is not None
+    assert category is not None
+    assert event.suggested_category_id == category.id
+    assert event.suggested_category_source == BankEventSuggestionSource.PARSER_HINT.value
+    assert event.occurred_at == datetime(2026, 6, 26, 11, 9)
+
+
+async def _seed_source(
+    session_factory: async_sessionmaker[AsyncSession],
+    settings: Settings,
+) -> None:
+    async with session_scope(session_factory) as session:
+        await seed_initial_data(session, settings)
+        await BankEventSourceService(session).provision_source(
+            code="history-sber",
+            bank=BankEventBank.SBER,
+            channel=BankEventChannel.IOS_SHORTCUT,
+            owner_role=UserRole.HUSBAND,
+            token=SOURCE_TOKEN,
+        )
@@ -1,5 +1,5 @@
 from collections.abc import AsyncIterator
-from datetime import UTC, datetime
+from datetime import UTC, datetime, timedelta
 from pathlib import Path
 
 import pytest
@@ -30,6 +30,7 @@ from financial_bot.app.storage.repositories.bank_event_repository import (
 from financial_bot.app.storage.repositories.category_repository import CategoryRepository
 from financial_bot.app.storage.repositories.transaction_repository import TransactionRepository
 from financial_bot.app.storage.repositories.user_repository import UserRepository
+from sqlalchemy import event
 from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
 
 
@@ -102,8 +103,14 @@ async def test_bank_event_repository_sources_dedupe_status_and_transaction_link(
         assert found_source is not None
         assert found_source.id == source.id
         assert found_source.token_hash != token
+        found_row = await bank_events.get_active_source_with_owner_by_token_hash(
+            hash_bank_event_source_token(token)
+        )
+        assert found_row is not None
+        assert found_row[0].id == source.id
+        assert found_row[1].id == husband.id
 
-        await bank_events.touch_source(source, seen_at=received_at)
+        await bank_events.touch_source(source.id, seen_at=received_at)
         assert source.last_seen_at == received_at
 
         event = BankEventModel(
@@ -189,3 +196,186 @@ async def test_bank_event_repository_sources_dedupe_status_and_transaction_link(
 
         assert created_event.transaction_id == transaction.id
         assert created_event.parse_status == BankEventParseStatus.CONFIRMED.value
+
+
+@pytest.mark.asyncio
+async def test_source_stats_are_computed_in_one_query_with_since_window(
+    session_factory: async_sessionmaker[AsyncSession],
+) -> None:
+    since = datetime(2026, 6, 1, tzinfo=UTC)
+    statements: list[str] = []
+
+    async with session_factory() as session:
+        users = UserRepository(session)
+        categories = CategoryRepository(session)
+        transactions = TransactionRepository(session)
+        bank_events = BankEventRepository(session)
+
+        husband = await users.add(
+            UserModel(telegram_id=1001, name="Husband", role=UserRole.HUSBAND.value)
+        )
+        category = await categories.add(
+            CategoryModel(
+                code="groceries",
+                title="Groceries",
+                owner_user_id=None,
+                owner_role=CategoryOwnerRole.SYSTEM.value,
+                sort_order=2,
+            )
+        )
+        transaction = await transactions.add(
+            TransactionModel(
+                amount=10_000,
+                currency="RUB",
+                occurred_at=since,
+                payer_user_id=husband.id,
+                category_id=category.id,
+                type=TransactionType.EXPENSE.value,
+                source=TransactionSource.CARD.value,
+                included_in_reports=True,
+                created_by_user_id=husband.id,
+            )
+        )
+        sber = await bank_events.add_source(
+            BankEventSourceModel(
+                code="husband-sber-ios",
+                bank=BankEventBank.SBER.value,
+                channel=BankEventChannel.IOS_SHORTCUT.value,
+                owner_user_id=husband.id,
+                token_hash=hash_bank_event_source_token("sber-token"),
+            )
+        )
+        vtb = await bank_events.add_source(
+            BankEventSourceModel(
+                code="husband-vtb-ios",
+                bank=BankEventBank.VTB.value,
+                channel=BankEventChannel.IOS_SHORTCUT.value,
+                owner_user_id=husband.id,
+                token_hash=hash_bank_event_source_token("vtb-token"),
+            )
+        )
+
+        rows = (
+            (sber, 2, "expense_candidate", "autosaved", transaction.id, False, None, None),
+            (sber, 3, "expense_candidate", "needs_confirmation", None, True, None, None),
+            (sber, 4, "expense_candidate", "needs_confirmation", None, False, since, None),
+            (sber, 5, "expense_candidate", "needs_confirmation", None, False, None, since),
+            (sber, 6, "income", "parsed", None, False, None, None),
+            (sber, 7, "refund", "parsed", None, False, None, None),
+            (sber, 8, "internal_transfer", "parsed", None, False, None, None),
+            (sber, 9, "unknown", "parsed", None, False, None, None),
+            (sber, 10, "ignored", "ignored", None, False, None, None),
+            (vtb, -20, "unknown", "parsed", None, False, None, None),
+        )
+        for index, row in enumerate(rows):
+            source, day, kind, status, transaction_id, conflict, failed, sent = row
+            received_at = since + timedelta(days=day)
+            await bank_events.add_event(
+                BankEventModel(
+                    source_id=source.id,
+                    bank=source.bank,
+                    channel=source.channel,
+                    received_at=received_at,
+                    operation_kind=kind,
+                    parse_status=status,
+                    amount=10_000,
+                    currency="RUB",
+                    redacted_text=f"event {index}",
+                    normalized_text_hash=f"hash-{index}",
+                    dedupe_key=f"stats:{index}",
+                    transaction_id=transaction_id,
+                    suggestion_conflict=conflict,
+                    telegram_notification_failed_at=failed,
+                    telegram_notification_sent_at=sent,
+                )
+            )
+
+        engine = session.bind.sync_engine
+
+        def record_statement(*args: object) -> None:
+            statements.append(str(args[2]))
+
+        event.listen(engine, "before_cursor_execute", record_statement)
+        try:
+            stats = await bank_events.get_source_stats(since=since)
+        finally:
+            event.remove(engine, "before_cursor_execute", record_statement)
+        all_time_stats = await bank_events.get_source_stats()
+        await session.commit()
+
+    assert len(statements) == 1
+    assert all_time_stats[vtb.id].total_event_count == 1
+    assert all_time_stats[vtb.id].unknown_event_count == 1
+    assert set(stats) == {sber.id, vtb.id}
+    sber_stats = stats[sber.id]
+    assert sber_stats.total_event_count == 9
+    assert sber_stats.expense_candidate_count == 4
+    assert sber_stats.autosaved_expense_count == 1
+    assert sber_stats.confirmed_expense_count == 0
+    assert sber_stats.income_event_count == 1
+    assert sber_stats.refund_event_count == 1
+    assert sber_stats.internal_transfer_event_count == 1
+    assert sber_stats.conflict_event_count == 1
+    assert sber_stats.pending_confirmation_count == 3
+    assert sber_stats.failed_telegram_notification_count == 1
+    assert sber_stats.unsent_pending_count == 2
+    assert sber_stats.unknown_event_count == 1
+    assert sber_stats.ignored_event_count == 1
+    vtb_stats = stats[vtb.id]
+    assert vtb_stats.last_event_received_at is not None
+    assert vtb_stats.total_event_count == 0
+    assert vtb_stats.unknown_event_count == 0
+
+
+@pytest.mark.asyncio
+async def test_add_events_if_new_inserts_batch_and_settles_conflicts_one_by_one(
+    session_factory: async_sessionmaker[AsyncSession],
+) -> None:
+    received_at = datetime(2026, 6, 26, 12, 0, tzinfo=UTC)
+
+    def make_event(source_id: int, dedupe_key: str) -> BankEventModel:
+        return BankEventModel(
+            source_id=source_id,
+            bank=BankEventBank.SBER.value,
+            channel=BankEventChannel.IOS_SHORTCUT.value,
+            received_at=received_at,
+            operation_kind=BankEventOperationKind.EXPENSE_CANDIDATE.value,
+            parse_status=BankEventParseStatus.NEEDS_CONFIRMATION.value,
+            amount=29_000,
+            redacted_text="Покупка 290р",
+            normalized_text_hash="0" * 64,
+            dedupe_key=dedupe_key,
+        )
+
+    async with session_factory() as session:
+        husband = await UserRepository(session).add(
+            UserModel(telegram_id=1001, name="Husband", role=UserRole.HUSBAND.value)
+        )
+        bank_events = BankEventRepository(session)
+        source = await bank_events.add_source(
+            BankEventSourceModel(
+                code="husband-sber-ios",
+                bank=BankEventBank.SBER.value,
+                channel=BankEventChannel.IOS_SHORTCUT.value,
+                owner_user_id=husband.id,
+                token_hash=hash_bank_event_source_token("sber-token"),
+            )
+        )
+
+        first_batch = await bank_events.add_events_if_new(
+            [make_event(source.id, "key-1"), make_event(source.id, "key-2")]
+        )
+        existing = await bank_events.get_events_by_dedupe_keys({"key-1", "key-2", "key-9"})
+        # key-2 is stored by "another request" between the lookup and the insert.
+        second_batch = await bank_events.add_events_if_new(
+            [make_event(source.id, "key-3"), make_event(source.id, "key-2")]
+        )
+        await session.commit()
+
+    assert [created for _, created in first_batch] == [True, True]
+    assert set(existing) == {"key-1", "key-2"}
+    assert [(event.dedupe_key, created) for event, created in second_batch] == [
+        ("key-3", True),
+        ("key-2", False),
+    ]
+    assert second_batch[1][0].id == first_batch[1][0].id
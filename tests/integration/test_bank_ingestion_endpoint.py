@@ -5,6 +5,7 @@ from pathlib import Path
 import httpx
 import pytest
 import pytest_asyncio
+from fastapi import FastAPI
 from financial_bot.app.config import Settings
 from financial_bot.app.domain.types import (
     BankCategoryRuleMode,
@@ -13,12 +14,13 @@ from financial_bot.app.domain.types import (
     BankEventParseStatus,
     TransactionType,
 )
-from financial_bot.app.services.bank_ingestion_service import BankImportResult
+from financial_bot.app.services.bank_notification_worker import PendingBankEventNotification
 from financial_bot.app.services.seed_service import seed_initial_data
 from financial_bot.app.storage.db import create_engine, create_session_factory
 from financial_bot.app.storage.models import (
     BankCategoryRuleModel,
     BankEventModel,
+    BankEventNotificationModel,
     BankEventSourceModel,
     Base,
     CategoryModel,
@@ -29,7 +31,7 @@ from financial_bot.app.storage.repositories.bank_event_repository import (
     hash_bank_event_source_token,
 )
 from financial_bot.app.web.main import create_app
-from sqlalchemy import func, select
+from sqlalchemy import event, func, select
 from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
 
 
@@ -50,19 +52,12 @@ async def session_factory(tmp_path: Path) -> AsyncIterator[async_sessionmaker[As
 class FakeBankEventNotifier:
     def __init__(self) -> None:
         self.sent_event_ids: list[int] = []
+        self.notifications: list[PendingBankEventNotification] = []
         self.closed = False
 
-    async def notify_new_event(
-        self,
-        *,
-        session: AsyncSession,
-        source_token: str,
-        result: BankImportResult,
-    ) -> bool:
-        if result.is_duplicate:
-            return False
-        self.sent_event_ids.append(result.event_id)
-        return True
+    async def send(self, notification: PendingBankEventNotification) -> None:
+        self.sent_event_ids.append(notification.bank_event_id)
+        self.notifications.append(notification)
 
     async def close(self) -> None:
         self.closed = True
@@ -72,13 +67,7 @@ class FailingBankEventNotifier:
     def __init__(self) -> None:
         self.closed = False
 
-    async def notify_new_event(
-        self,
-        *,
-        session: AsyncSession,
-        source_token: str,
-        result: BankImportResult,
-    ) -> bool:
+    async def send(self, notification: PendingBankEventNotification) -> None:
         raise RuntimeError("Telegram timeout")
 
     async def close(self) -> None:
@@ -91,18 +80,11 @@ class FailsThenSucceedsBankEventNotifier:
         self.attempts = 0
         self.closed = False
 
-    async def notify_new_event(
-        self,
-        *,
-        session: AsyncSession,
-        source_token: str,
-        result: BankImportResult,
-    ) -> bool:
+    async def send(self, notification: PendingBankEventNotification) -> None:
         self.attempts += 1
         if self.attempts == 1:
             raise RuntimeError("Telegram timeout")
-        self.sent_event_ids.append(result.event_id)
-        return True
+        self.sent_event_ids.append(notification.bank_event_id)
 
     async def close(self) -> None:
         self.closed = True
@@ -145,6 +127,7 @@ async def test_bank_ingestion_endpoint_rejects_missing_and_invalid_tokens(
             headers={"Authorization": "Bearer wrong-token"},
             json={"text": _purchase_sms()},
         )
+        await _drain_notifications(app)
 
     assert missing.status_code == 401
     assert invalid.status_code == 401
@@ -191,6 +174,7 @@ async def test_bank_ingestion_endpoint_stores_redacted_event_and_deduplicates(
                 "received_at": received_at.isoformat(),
             },
         )
+        await _drain_notifications(app)
 
     assert first.status_code == 200
     assert duplicate.status_code == 200
@@ -205,8 +189,9 @@ async def test_bank_ingestion_endpoint_stores_redacted_event_and_deduplicates(
     assert first_body["scope"] == "household"
     assert first_body["suggested_category_code"] == "cosmetology_medicine"
     assert first_body["suggested_category_source"] == "parser_hint"
-    assert first_body["telegram_notification_sent"] is True
-    assert duplicate_body["telegram_notification_sent"] is False
+    assert first_body["telegram_notification_queued"] is True
+    assert first_body["telegram_notification_sent"] is False
+    assert duplicate_body["telegram_notification_queued"] is False
     assert "text" not in first_body
     assert "redacted_text" not in first_body
     assert notifier.sent_event_ids == [first_body["event_id"]]
@@ -228,6 +213,59 @@ async def test_bank_ingestion_endpoint_stores_redacted_event_and_deduplicates(
     assert event.telegram_notification_attempts == 1
 
 
+@pytest.mark.asyncio
+async def test_bank_ingestion_endpoint_duplicate_does_not_write_and_heartbeat_flushes_on_shutdown(
+    session_factory: async_sessionmaker[AsyncSession],
+) -> None:
+    settings = make_settings()
+    token = "source-token"
+    received_at = datetime(2026, 6, 26, 12, 0, tzinfo=UTC)
+    payload = {"text": _purchase_sms(), "sender": "900", "received_at": received_at.isoformat()}
+    await _seed_source(session_factory, settings, token=token, bank=BankEventBank.SBER)
+    app = create_app(
+        settings=settings,
+        session_factory=session_factory,
+        notifier=FakeBankEventNotifier(),
+    )
+    statements: list[str] = []
+    engine = session_factory.kw["bind"].sync_engine
+
+    def record_statement(*args: object) -> None:
+        statements.append(str(args[2]).lstrip().split(maxsplit=1)[0].upper())
+
+    async with (
+        app.router.lifespan_context(app),
+        httpx.AsyncClient(
+            transport=httpx.ASGITransport(app=app),
+            base_url="http://test",
+        ) as client,
+    ):
+        headers = {"Authorization": f"Bearer {token}"}
+        first = await client.post("/bank-events", headers=headers, json=payload)
+        await _drain_notifications(app)
+        event.listen(engine, "before_cursor_execute", record_statement)
+        try:
+            duplicate = await client.post("/bank-events", headers=headers, json=payload)
+        finally:
+            event.remove(engine, "before_cursor_execute", record_statement)
+
+        async with session_factory() as session:
+            source = await session.scalar(select(BankEventSourceModel))
+        assert source is not None
+        assert source.last_seen_at is None
+
+    assert first.status_code == 200
+    assert duplicate.json()["duplicate"] is True
+    assert statements
+    assert set(statements) == {"SELECT"}
+
+    async with session_factory() as session:
+        source = await session.scalar(select(BankEventSourceModel))
+    assert source is not None
+    # 12:00 UTC is 19:00 in Asia/Barnaul, the wall clock shown on the health screen.
+    assert source.last_seen_at == datetime(2026, 6, 26, 19, 0)
+
+
 @pytest.mark.asyncio
 async def test_bank_ingestion_endpoint_accepts_ios_shortcut_message_object(
     session_factory: async_sessionmaker[AsyncSession],
@@ -258,13 +296,14 @@ async def test_bank_ingestion_endpoint_accepts_ios_shortcut_message_object(
                 "sender": {"value": "9-00"},
             },
         )
+        await _drain_notifications(app)
 
     assert response.status_code == 200
     body = response.json()
     assert body["operation_kind"] == "expense_candidate"
     assert body["parse_status"] == "needs_confirmation"
     assert body["amount_minor"] == 29_000
-    assert body["telegram_notification_sent"] is True
+    assert body["telegram_notification_queued"] is True
 
 
 @pytest.mark.asyncio
@@ -289,22 +328,39 @@ async def test_bank_ingestion_endpoint_stores_event_when_notification_fails(
             headers={"Authorization": f"Bearer {token}"},
             json={"text": _purchase_sms(), "sender": "900"},
         )
+        await _drain_notifications(app)
+        health = await client.get("/health/notifications")
 
     assert response.status_code == 200
     body = response.json()
     assert body["operation_kind"] == "expense_candidate"
     assert body["parse_status"] == "needs_confirmation"
+    assert body["telegram_notification_queued"] is True
     assert body["telegram_notification_sent"] is False
     assert notifier.closed
+    assert health.status_code == 200
+    health_body = health.json()
+    assert health_body["pending"] == 1
+    assert health_body["retrying"] == 1
+    assert health_body["failed"] == 0
+    assert health_body["next_attempt_at"] is not None
+    assert health_body["worker_running"] is True
+    assert health_body["worker_retried"] == 1
+    assert health_body["last_error"] == "Telegram timeout"
 
     async with session_factory() as session:
         event_count = await session.scalar(select(func.count()).select_from(BankEventModel))
         event = (await session.scalars(select(BankEventModel))).one()
+        notification = (await session.scalars(select(BankEventNotificationModel))).one()
 
     assert event_count == 1
     assert event.telegram_notification_sent_at is None
     assert event.telegram_notification_failed_at is not None
     assert event.telegram_notification_attempts == 1
+    assert notification.bank_event_id == event.id
+    assert notification.status == "pending"
+    assert notification.attempts == 1
+    assert notification.last_error == "Telegram timeout"
 
 
 @pytest.mark.asyncio
@@ -330,20 +386,22 @@ async def test_bank_ingestion_endpoint_retries_failed_notification_on_duplicate(
             headers={"Authorization": f"Bearer {token}"},
             json=payload,
         )
+        await _drain_notifications(app)
         retry = await client.post(
             "/bank-events",
             headers={"Authorization": f"Bearer {token}"},
             json=payload,
         )
+        await _drain_notifications(app)
 
     assert first.status_code == 200
     assert retry.status_code == 200
     first_body = first.json()
     retry_body = retry.json()
-    assert first_body["telegram_notification_sent"] is False
+    assert first_body["telegram_notification_queued"] is True
     assert retry_body["duplicate"] is True
     assert retry_body["event_id"] == first_body["event_id"]
-    assert retry_body["telegram_notification_sent"] is True
+    assert retry_body["telegram_notification_queued"] is True
     assert notifier.sent_event_ids == [first_body["event_id"]]
     assert notifier.attempts == 2
 
@@ -383,13 +441,14 @@ async def test_bank_ingestion_endpoint_sends_refund_correction_notification_once
                 "sender": "900",
             },
         )
+        await _drain_notifications(app)
 
     assert response.status_code == 200
     body = response.json()
     assert body["operation_kind"] == "refund"
     assert body["parse_status"] == "parsed"
     assert body["requires_confirmation"] is False
-    assert body["telegram_notification_sent"] is True
+    assert body["telegram_notification_queued"] is True
     assert notifier.sent_event_ids == [body["event_id"]]
 
     async with session_factory() as session:
@@ -433,6 +492,7 @@ async def test_bank_ingestion_endpoint_sends_income_notification_once_without_ra
             headers={"Authorization": f"Bearer {token}"},
             json=payload,
         )
+        await _drain_notifications(app)
 
     assert first.status_code == 200
     assert duplicate.status_code == 200
@@ -441,9 +501,9 @@ async def test_bank_ingestion_endpoint_sends_income_notification_once_without_ra
     assert first_body["operation_kind"] == "income"
     assert first_body["parse_status"] == "parsed"
     assert first_body["requires_confirmation"] is False
-    assert first_body["telegram_notification_sent"] is True
+    assert first_body["telegram_notification_queued"] is True
     assert duplicate_body["duplicate"] is True
-    assert duplicate_body["telegram_notification_sent"] is False
+    assert duplicate_body["telegram_notification_queued"] is False
     assert "text" not in first_body
     assert "redacted_text" not in first_body
     assert "1111" not in str(first_body)
@@ -486,6 +546,7 @@ async def test_bank_ingestion_endpoint_accepts_tbank_expense_candidate(
                 "sender": "T-Bank",
             },
         )
+        await _drain_notifications(app)
 
     assert response.status_code == 200
     body = response.json()
@@ -494,7 +555,7 @@ async def test_bank_ingestion_endpoint_accepts_tbank_expense_candidate(
     assert body["parse_status"] == "needs_confirmation"
     assert body["amount_minor"] == 5_000
     assert body["suggested_category_code"] == "restaurants_cafes"
-    assert body["telegram_notification_sent"] is True
+    assert body["telegram_notification_queued"] is True
     assert notifier.sent_event_ids == [body["event_id"]]
     assert "text" not in body
     assert "redacted_text" not in body
@@ -535,6 +596,7 @@ async def test_bank_ingestion_endpoint_accepts_tbank_income(
                 "sender": "T-Bank",
             },
         )
+        await _drain_notifications(app)
 
     assert response.status_code == 200
     body = response.json()
@@ -542,7 +604,7 @@ async def test_bank_ingestion_endpoint_accepts_tbank_income(
     assert body["operation_kind"] == "income"
     assert body["parse_status"] == "parsed"
     assert body["amount_minor"] == 140_000
-    assert body["telegram_notification_sent"] is True
+    assert body["telegram_notification_queued"] is True
     assert notifier.sent_event_ids == [body["event_id"]]
 
     async with session_factory() as session:
@@ -584,6 +646,7 @@ async def test_bank_ingestion_endpoint_autosaves_learned_expense_and_notifies(
             headers={"Authorization": f"Bearer {token}"},
             json={"text": _unknown_shop_purchase_sms(), "sender": "900"},
         )
+        await _drain_notifications(app)
 
     assert response.status_code == 200
     body = response.json()
@@ -593,7 +656,7 @@ async def test_bank_ingestion_endpoint_autosaves_learned_expense_and_notifies(
     assert body["requires_confirmation"] is False
     assert body["suggested_category_code"] == "groceries"
     assert body["suggested_category_source"] == "learned_rule"
-    assert body["telegram_notification_sent"] is True
+    assert body["telegram_notification_queued"] is True
     assert notifier.sent_event_ids == [body["event_id"]]
 
     async with session_factory() as session:
@@ -643,12 +706,13 @@ async def test_bank_ingestion_endpoint_does_not_resend_duplicate_refund(
             headers={"Authorization": f"Bearer {token}"},
             json=payload,
         )
+        await _drain_notifications(app)
 
     assert first.status_code == 200
     assert duplicate.status_code == 200
-    assert first.json()["telegram_notification_sent"] is True
+    assert first.json()["telegram_notification_queued"] is True
     assert duplicate.json()["duplicate"] is True
-    assert duplicate.json()["telegram_notification_sent"] is False
+    assert duplicate.json()["telegram_notification_queued"] is False
     assert notifier.sent_event_ids == [first.json()["event_id"]]
 
 
@@ -677,13 +741,14 @@ async def test_bank_ingestion_endpoint_ignores_bank_source_mismatch(
                 "sender": "900",
             },
         )
+        await _drain_notifications(app)
 
     assert response.status_code == 200
     body = response.json()
     assert body["bank"] == "vtb"
     assert body["operation_kind"] == "ignored"
     assert body["parse_status"] == "ignored"
-    assert body["telegram_notification_sent"] is False
+    assert body["telegram_notification_queued"] is False
     assert notifier.sent_event_ids == []
 
     async with session_factory() as session:
@@ -718,13 +783,14 @@ async def test_bank_ingestion_endpoint_ignores_tbank_source_mismatch(
                 "sender": "T-Bank",
             },
         )
+        await _drain_notifications(app)
 
     assert response.status_code == 200
     body = response.json()
     assert body["bank"] == "tbank"
     assert body["operation_kind"] == "ignored"
     assert body["parse_status"] == "ignored"
-    assert body["telegram_notification_sent"] is False
+    assert body["telegram_notification_queued"] is False
     assert notifier.sent_event_ids == []
 
 
@@ -750,13 +816,14 @@ async def test_bank_ingestion_endpoint_ignores_other_bank_text_through_tbank_sou
             headers={"Authorization": f"Bearer {token}"},
             json={"text": _purchase_sms()},
         )
+        await _drain_notifications(app)
 
     assert response.status_code == 200
     body = response.json()
     assert body["bank"] == "sber"
     assert body["operation_kind"] == "ignored"
     assert body["parse_status"] == "ignored"
-    assert body["telegram_notification_sent"] is False
+    assert body["telegram_notification_queued"] is False
     assert notifier.sent_event_ids == []
 
     async with session_factory() as session:
@@ -792,12 +859,13 @@ async def test_bank_ingestion_endpoint_ignores_service_messages_without_raw_code
                 "sender": "VTB",
             },
         )
+        await _drain_notifications(app)
 
     assert response.status_code == 200
     body = response.json()
     assert body["operation_kind"] == "ignored"
     assert body["parse_status"] == "ignored"
-    assert body["telegram_notification_sent"] is False
+    assert body["telegram_notification_queued"] is False
     assert notifier.sent_event_ids == []
 
     async with session_factory() as session:
@@ -807,6 +875,146 @@ async def test_bank_ingestion_endpoint_ignores_service_messages_without_raw_code
     assert "123456" not in event.redacted_text
 
 
+@pytest.mark.asyncio
+async def test_bank_ingestion_batch_endpoint_dedupes_and_coalesces_notifications(
+    session_factory: async_sessionmaker[AsyncSession],
+) -> None:
+    settings = make_settings()
+    token = "source-token"
+    received_at = datetime(2026, 6, 26, 12, 0, tzinfo=UTC).isoformat()
+    await _seed_source(session_factory, settings, token=token, bank=BankEventBank.SBER)
+    notifier = FakeBankEventNotifier()
+    app = create_app(settings=settings, session_factory=session_factory, notifier=notifier)
+    cafe_sms = "Счёт карты MIR-1111 12:15 Покупка 450р CAFE TEST Баланс: 474.14р"
+    income_sms = "СЧЁТ1111 05:37 Зачисление 1471.20р Баланс: 999р"
+
+    async with (
+        app.router.lifespan_context(app),
+        httpx.AsyncClient(
+            transport=httpx.ASGITransport(app=app),
+            base_url="http://test",
+        ) as client,
+    ):
+        single = await client.post(
+            "/bank-events",
+            headers={"Authorization": f"Bearer {token}"},
+            json={"text": _purchase_sms(), "sender": "900", "received_at": received_at},
+        )
+        await _drain_notifications(app)
+        batch = await client.post(
+            "/bank-events/batch",
+            headers={"Authorization": f"Bearer {token}"},
+            json={
+                "items": [
+                    {"text": text, "sender": "900", "received_at": received_at}
+                    for text in (
+                        _purchase_sms(),
+                        _unknown_shop_purchase_sms(),
+                        _unknown_shop_purchase_sms(),
+                        cafe_sms,
+                        income_sms,
+                    )
+                ]
+            },
+        )
+        await _drain_notifications(app)
+
+    assert batch.status_code == 200
+    results = batch.json()["results"]
+    existing_id = single.json()["event_id"]
+    unknown_id, cafe_id, income_id = (
+        results[1]["event_id"],
+        results[3]["event_id"],
+        results[4]["event_id"],
+    )
+    assert [item["event_id"] for item in results] == [
+        existing_id,
+        unknown_id,
+        unknown_id,
+        cafe_id,
+        income_id,
+    ]
+    assert [item["duplicate"] for item in results] == [True, False, True, False, False]
+    assert [item["operation_kind"] for item in results] == [
+        "expense_candidate",
+        "expense_candidate",
+        "expense_candidate",
+        "expense_candidate",
+        "income",
+    ]
+    assert [item["telegram_notification_queued"] for item in results] == [
+        False,
+        True,
+        True,
+        True,
+        True,
+    ]
+    assert results[0]["telegram_notification_sent"] is True
+
+    [existing_card, summary, income_card] = notifier.notifications
+    assert existing_card.bank_event_ids == (existing_id,)
+    assert summary.bank_event_ids == (unknown_id, cafe_id)
+    assert summary.reply_markup is None
+    assert "ждут подтверждения: 2" in summary.text
+    assert "/bank_pending" in summary.text
+    assert income_card.bank_event_ids == (income_id,)
+    assert income_card.reply_markup is not None
+
+    async with session_factory() as session:
+        events = list((await session.scalars(select(BankEventModel))).all())
+        notification_count = await session.scalar(
+            select(func.count()).select_from(BankEventNotificationModel)
+        )
+
+    assert len(events) == 4
+    assert all(event.telegram_notification_sent_at is not None for event in events)
+    assert notification_count == 3
+
+
+@pytest.mark.asyncio
+async def test_bank_ingestion_batch_endpoint_rejects_batch_with_invalid_item(
+    session_factory: async_sessionmaker[AsyncSession],
+) -> None:
+    settings = make_settings()
+    token = "source-token"
+    await _seed_source(session_factory, settings, token=token, bank=BankEventBank.SBER)
+    app = create_app(
+        settings=settings,
+        session_factory=session_factory,
+        notifier=FakeBankEventNotifier(),
+    )
+
+    async with (
+        app.router.lifespan_context(app),
+        httpx.AsyncClient(
+            transport=httpx.ASGITransport(app=app),
+            base_url="http://test",
+        ) as client,
+    ):
+        invalid_item = await client.post(
+            "/bank-events/batch",
+            headers={"Authorization": f"Bearer {token}"},
+            json={"items": [{"text": _purchase_sms()}, {"text": "   "}]},
+        )
+        invalid_token = await client.post(
+            "/bank-events/batch",
+            headers={"Authorization": "Bearer wrong-token"},
+            json={"items": [{"text": _purchase_sms()}]},
+        )
+
+    assert invalid_item.status_code == 422
+    assert invalid_item.json()["detail"].startswith("items[1]:")
+    assert invalid_token.status_code == 401
+
+    async with session_factory() as session:
+        event_count = await session.scalar(select(func.count()).select_from(BankEventModel))
+    assert event_count == 0
+
+
+async def _drain_notifications(app: FastAPI) -> None:
+    await app.state.money_bot.notification_worker.run_once()
+
+
 async def _seed_source(
     session_factory: async_sessionmaker[AsyncSession],
     settings: Settings,
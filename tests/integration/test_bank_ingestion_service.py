@@ -107,6 +107,91 @@ async def test_manual_bank_sms_import_stores_redacted_event_and_deduplicates(
         assert sources[0].last_seen_at == received_at.replace(tzinfo=None)
 
 
+@pytest.mark.asyncio
+async def test_bank_sms_over_parse_budget_is_stored_as_unknown_format_without_text(
+    session_factory: async_sessionmaker[AsyncSession],
+) -> None:
+    settings = make_settings().model_copy(update={"bank_sms_parse_budget_seconds": 1e-9})
+
+    async with session_factory() as session:
+        await seed_initial_data(session, settings)
+
+        service = BankIngestionService(session, settings)
+        result = await service.import_manual_sms(
+            text="Счёт карты MIR-1111 11:09 Покупка 290р APTEKA TEST Баланс: 924.14р",
+            telegram_user_id=1001,
+            received_at=datetime(2026, 6, 26, 12, 0, tzinfo=UTC),
+        )
+        other = await service.import_manual_sms(
+            text="Счёт карты MIR-1111 11:30 Покупка 450р KOFEYNYA Баланс: 474.14р",
+            telegram_user_id=1001,
+            received_at=datetime(2026, 6, 26, 12, 30, tzinfo=UTC),
+        )
+        repeated = await service.import_manual_sms(
+            text="Счёт карты MIR-1111 11:30 Покупка 450р KOFEYNYA Баланс: 474.14р",
+            telegram_user_id=1001,
+            received_at=datetime(2026, 6, 26, 12, 31, tzinfo=UTC),
+        )
+        event = await session.get(BankEventModel, result.event_id)
+        other_event = await session.get(BankEventModel, other.event_id)
+
+    assert result.operation_kind == BankEventOperationKind.UNKNOWN
+    assert result.parse_status == BankEventParseStatus.NEEDS_CONFIRMATION
+    assert event is not None
+    assert event.redacted_text == "<unknown_format:sber>"
+    assert event.amount is None
+    # Same placeholder text, but a different SMS: not a duplicate.
+    assert not other.is_duplicate
+    assert other_event is not None
+    assert other_event.id != event.id
+    assert other_event.dedupe_key != event.dedupe_key
+    assert repeated.is_duplicate
+    assert repeated.event_id == other.event_id
+
+
+@pytest.mark.asyncio
+async def test_unknown_bank_sms_stores_its_shape_for_health_grouping(
+    session_factory: async_sessionmaker[AsyncSession],
+) -> None:
+    settings = make_settings()
+
+    async with session_factory() as session:
+        await seed_initial_data(session, settings)
+        service = BankIngestionService(session, settings)
+        results = [
+            await service.import_manual_sms(
+                text=text,
+                telegram_user_id=1001,
+                received_at=datetime(2026, 6, 26, 12, minute, tzinfo=UTC),
+            )
+            for minute, text in enumerate(
+                (
+                    "СЧЁТ1111 10:20 Непонятная операция 120р Баланс: 999р",
+                    "СЧЁТ1111 10:21 Непонятная операция 350р Баланс: 649р",
+                    "СЧЁТ1111 10:22 Покупка 120р APTEKA TEST Баланс: 529р",
+                )
+            )
+        ]
+        events = [await session.get(BankEventModel, result.event_id) for result in results]
+        groups = await BankEventRepository(session).list_unknown_shape_groups(
+            source_ids=[events[0].source_id]
+        )
+
+    assert [result.operation_kind for result in results] == [
+        BankEventOperationKind.UNKNOWN,
+        BankEventOperationKind.UNKNOWN,
+        BankEventOperationKind.EXPENSE_CANDIDATE,
+    ]
+    assert events[0].shape_hash is not None
+    assert events[0].shape_hash == events[1].shape_hash
+    assert events[0].shape_amount_count == 1
+    assert events[0].shape_has_balance_marker
+    assert events[2].shape_hash is None
+    assert [(group.shape_hash, group.count) for group in groups] == [(events[0].shape_hash, 2)]
+    assert groups[0].operation_markers == ()
+    assert groups[0].last_received_at == datetime(2026, 6, 26, 12, 1)
+
+
 @pytest.mark.asyncio
 async def test_manual_bank_sms_import_uses_safe_expense_fallback(
     session_factory: async_sessionmaker[AsyncSession],
@@ -986,6 +1071,44 @@ async def test_suggest_only_learning_rule_requires_confirmation(
         assert transaction_count == 0
 
 
+@pytest.mark.asyncio
+async def test_similar_merchant_rule_is_suggested_but_never_autosaved(
+    session_factory: async_sessionmaker[AsyncSession],
+) -> None:
+    settings = make_settings()
+
+    async with session_factory() as session:
+        await seed_initial_data(session, settings)
+        await _add_learning_rule(
+            session,
+            telegram_id=1001,
+            merchant="PYATEROCHKA 1234",
+            category_code="groceries",
+            mode=BankCategoryRuleMode.AUTOSAVE,
+            hit_count=5,
+        )
+        service = BankIngestionService(session, settings)
+
+        result = await service.import_manual_sms(
+            text="Счёт карты MIR-3333 11:11 Покупка 120р PYATEROCHKA 5678 Баланс: 654.14р",
+            telegram_user_id=1001,
+            received_at=datetime(2026, 6, 26, 12, 4, tzinfo=UTC),
+        )
+        unrelated = await service.import_manual_sms(
+            text="Счёт карты MIR-3333 11:12 Покупка 130р UNKNOWN SHOP Баланс: 524.14р",
+            telegram_user_id=1001,
+            received_at=datetime(2026, 6, 26, 12, 5, tzinfo=UTC),
+        )
+        transaction_count = await session.scalar(select(func.count()).select_from(TransactionModel))
+
+        assert result.suggested_category_code == "groceries"
+        assert result.suggested_category_source == BankEventSuggestionSource.SIMILAR_RULE
+        assert result.parse_status == BankEventParseStatus.NEEDS_CONFIRMATION
+        assert result.requires_confirmation
+        assert unrelated.suggested_category_source == BankEventSuggestionSource.NONE
+        assert transaction_count == 0
+
+
 @pytest.mark.asyncio
 async def test_learning_rule_parser_conflict_requires_confirmation(
     session_factory: async_sessionmaker[AsyncSession],
@@ -0,0 +1,245 @@
+import asyncio
+from collections.abc import AsyncIterator
+from datetime import datetime, timedelta
+from pathlib import Path
+from zoneinfo import ZoneInfo
+
+import pytest
+import pytest_asyncio
+from aiogram.exceptions import TelegramForbiddenError, TelegramRetryAfter
+from aiogram.methods import SendMessage
+from financial_bot.app.config import Settings
+from financial_bot.app.domain.types import (
+    BankEventBank,
+    BankEventChannel,
+    BankEventOperationKind,
+    BankEventParseStatus,
+)
+from financial_bot.app.services.bank_notification_worker import (
+    BankEventNotificationWorker,
+    PendingBankEventNotification,
+)
+from financial_bot.app.services.seed_service import seed_initial_data
+from financial_bot.app.storage.db import create_engine, create_session_factory
+from financial_bot.app.storage.models import (
+    BankEventModel,
+    BankEventNotificationModel,
+    BankEventSourceModel,
+    Base,
+    UserModel,
+)
+from financial_bot.app.storage.repositories.bank_event_notification_repository import (
+    BankEventNotificationRepository,
+)
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+TIMEZONE = "Asia/Barnaul"
+NOW = datetime(2026, 7, 10, 12, 0, tzinfo=ZoneInfo(TIMEZONE))
+
+
+@pytest_asyncio.fixture
+async def session_factory(tmp_path: Path) -> AsyncIterator[async_sessionmaker[AsyncSession]]:
+    pytest.importorskip("aiosqlite")
+    database_url = f"sqlite+aiosqlite:///{tmp_path}/bank-notifications.sqlite3"
+    engine = create_engine(database_url)
+    async with engine.begin() as connection:
+        await connection.run_sync(Base.metadata.create_all)
+
+    try:
+        yield create_session_factory(engine)
+    finally:
+        await engine.dispose()
+
+
+class ScriptedNotifier:
+    def __init__(self, *errors: Exception | None) -> None:
+        self._errors = list(errors)
+        self.sent: list[PendingBankEventNotification] = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    async def send(self, notification: PendingBankEventNotification) -> None:
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            await asyncio.sleep(0.01)
+            error = self._errors.pop(0) if self._errors else None
+            if error is not None:
+                raise error
+            self.sent.append(notification)
+        finally:
+            self.in_flight -= 1
+
+    async def close(self) -> None:
+        return None
+
+
+def make_settings(**overrides: object) -> Settings:
+    return Settings(
+        _env_file=None,
+        bot_token="123456:secret-token",
+        database_url="sqlite+aiosqlite:///unused.sqlite3",
+        allowed_telegram_ids="1001,1002",
+        default_currency="RUB",
+        timezone=TIMEZONE,
+        husband_telegram_id=1001,
+        wife_telegram_id=1002,
+        **overrides,
+    )
+
+
+@pytest.mark.asyncio
+async def test_worker_retries_with_backoff_and_gives_up_after_max_attempts(
+    session_factory: async_sessionmaker[AsyncSession],
+) -> None:
+    settings = make_settings(
+        bank_notification_max_attempts=4,
+        bank_notification_retry_base_seconds=2,
+        bank_notification_retry_max_seconds=5,
+    )
+    [event_id] = await _seed_notifications(session_factory, settings, count=1)
+    method = SendMessage(chat_id=1001, text="test")
+    notifier = ScriptedNotifier(
+        RuntimeError("Telegram timeout"),
+        TelegramRetryAfter(method, "Too Many Requests", retry_after=30),
+        RuntimeError("Telegram timeout"),
+        RuntimeError("Telegram timeout"),
+    )
+    worker = BankEventNotificationWorker(
+        notifier=notifier,
+        session_factory=session_factory,
+        settings=settings,
+    )
+
+    first = await worker.run_once(now=NOW)
+    not_due = await worker.run_once(now=NOW + timedelta(seconds=1))
+    notification = await _notification(session_factory, event_id)
+    assert (first.attempted, first.retried) == (1, 1)
+    assert not_due.attempted == 0
+    assert notification.next_attempt_at == (NOW + timedelta(seconds=2)).replace(tzinfo=None)
+
+    flood = await worker.run_once(now=NOW + timedelta(seconds=2))
+    notification = await _notification(session_factory, event_id)
+    assert flood.retried == 1
+    assert notification.next_attempt_at == (NOW + timedelta(seconds=32)).replace(tzinfo=None)
+
+    await worker.run_once(now=NOW + timedelta(seconds=32))
+    notification = await _notification(session_factory, event_id)
+    assert notification.next_attempt_at == (NOW + timedelta(seconds=37)).replace(tzinfo=None)
+
+    last = await worker.run_once(now=NOW + timedelta(seconds=37))
+    notification = await _notification(session_factory, event_id)
+    assert last.failed == 1
+    assert notification.status == "failed"
+    assert notification.attempts == 4
+    assert notification.last_error == "Telegram timeout"
+    assert notifier.sent == []
+
+    async with session_factory() as session:
+        event = await session.get(BankEventModel, event_id)
+        stats = await BankEventNotificationRepository(session).queue_stats()
+    assert event is not None
+    assert event.telegram_notification_attempts == 4
+    assert event.telegram_notification_sent_at is None
+    assert event.telegram_notification_failed_at is not None
+    assert (stats.pending_count, stats.failed_count) == (0, 1)
+    assert worker.snapshot().failed == 1
+
+
+@pytest.mark.asyncio
+async def test_worker_bounds_concurrency_and_fails_forbidden_chats_at_once(
+    session_factory: async_sessionmaker[AsyncSession],
+) -> None:
+    settings = make_settings(bank_notification_concurrency=2)
+    event_ids = await _seed_notifications(session_factory, settings, count=5)
+    notifier = ScriptedNotifier(
+        TelegramForbiddenError(SendMessage(chat_id=1001, text="test"), "bot was blocked"),
+    )
+    worker = BankEventNotificationWorker(
+        notifier=notifier,
+        session_factory=session_factory,
+        settings=settings,
+    )
+
+    result = await worker.run_once(now=NOW)
+
+    assert (result.attempted, result.sent, result.failed, result.retried) == (5, 4, 1, 0)
+    assert notifier.max_in_flight == 2
+    assert [item.bank_event_id for item in notifier.sent] == event_ids[1:]
+    assert (await worker.run_once(now=NOW + timedelta(days=1))).attempted == 0
+
+    async with session_factory() as session:
+        stats = await BankEventNotificationRepository(session).queue_stats()
+        sent_events = list(
+            (
+                await session.scalars(
+                    select(BankEventModel).where(
+                        BankEventModel.telegram_notification_sent_at.is_not(None)
+                    )
+                )
+            ).all()
+        )
+    assert (stats.pending_count, stats.sent_count, stats.failed_count) == (0, 4, 1)
+    assert len(sent_events) == 4
+
+
+async def _seed_notifications(
+    session_factory: async_sessionmaker[AsyncSession],
+    settings: Settings,
+    *,
+    count: int,
+) -> list[int]:
+    async with session_factory() as session:
+        await seed_initial_data(session, settings)
+        owner = await session.scalar(
+            select(UserModel).where(UserModel.telegram_id == settings.husband_telegram_id)
+        )
+        assert owner is not None
+        source = BankEventSourceModel(
+            code="ios-shortcut:sber:test",
+            bank=BankEventBank.SBER.value,
+            channel=BankEventChannel.IOS_SHORTCUT.value,
+            owner_user_id=owner.id,
+            token_hash="0" * 64,
+        )
+        session.add(source)
+        await session.flush()
+
+        event_ids: list[int] = []
+        notifications = BankEventNotificationRepository(session)
+        for index in range(count):
+            event = BankEventModel(
+                source_id=source.id,
+                bank=BankEventBank.SBER.value,
+                channel=BankEventChannel.IOS_SHORTCUT.value,
+                received_at=NOW - timedelta(minutes=count - index),
+                operation_kind=BankEventOperationKind.EXPENSE_CANDIDATE.value,
+                parse_status=BankEventParseStatus.NEEDS_CONFIRMATION.value,
+                amount=10_000,
+                redacted_text="Покупка 100р",
+                normalized_text_hash=f"{index:064d}",
+                dedupe_key=f"test:{index}",
+            )
+            session.add(event)
+            await session.flush()
+            await notifications.enqueue(
+                bank_event_id=event.id,
+                chat_id=owner.telegram_id,
+                text=f"Покупка {index}",
+                reply_markup=None,
+                now=NOW - timedelta(minutes=count - index),
+            )
+            event_ids.append(event.id)
+        await session.commit()
+    return event_ids
+
+
+async def _notification(
+    session_factory: async_sessionmaker[AsyncSession],
+    event_id: int,
+) -> BankEventNotificationModel:
+    async with session_factory() as session:
+        notification = await BankEventNotificationRepository(session).get_by_event_id(event_id)
+    assert notification is not None
+    return notification
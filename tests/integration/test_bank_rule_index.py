@@ -0,0 +1,214 @@
+from collections.abc import AsyncIterator
+from datetime import datetime, timedelta
+from pathlib import Path
+from zoneinfo import ZoneInfo
+
+import pytest
+import pytest_asyncio
+from financial_bot.app.config import Settings
+from financial_bot.app.domain.types import BankCategoryRuleMode
+from financial_bot.app.services.bank_learning_rule_service import BankLearningRuleService
+from financial_bot.app.services.bank_learning_service import BankLearningService
+from financial_bot.app.services.bank_rule_index import invalidate_bank_rule_index
+from financial_bot.app.services.bank_rule_usage import BankRuleUsageRecorder
+from financial_bot.app.services.seed_service import seed_initial_data
+from financial_bot.app.storage.db import create_engine, create_session_factory
+from financial_bot.app.storage.models import BankCategoryRuleModel, Base, UserModel
+from financial_bot.app.storage.repositories.category_repository import CategoryRepository
+from financial_bot.app.storage.repositories.data_version_repository import (
+    BANK_CATEGORY_RULES_DATA_VERSION_KEY,
+    DataVersionRepository,
+)
+from sqlalchemy import event, select, update
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+TIMEZONE = "Asia/Barnaul"
+NOW = datetime(2026, 7, 11, 12, 0, tzinfo=ZoneInfo(TIMEZONE))
+
+
+@pytest_asyncio.fixture
+async def session_factory(tmp_path: Path) -> AsyncIterator[async_sessionmaker[AsyncSession]]:
+    pytest.importorskip("aiosqlite")
+    database_url = f"sqlite+aiosqlite:///{tmp_path}/bank-rule-index.sqlite3"
+    engine = create_engine(database_url)
+    async with engine.begin() as connection:
+        await connection.run_sync(Base.metadata.create_all)
+
+    try:
+        yield create_session_factory(engine)
+    finally:
+        await engine.dispose()
+
+
+def make_settings() -> Settings:
+    return Settings(
+        _env_file=None,
+        bot_token="123456:secret-token",
+        database_url="sqlite+aiosqlite:///unused.sqlite3",
+        allowed_telegram_ids="1001,1002",
+        default_currency="RUB",
+        timezone=TIMEZONE,
+        husband_telegram_id=1001,
+        wife_telegram_id=1002,
+    )
+
+
+@pytest.mark.asyncio
+async def test_rule_lookup_reads_only_the_data_version_once_per_transaction(
+    session_factory: async_sessionmaker[AsyncSession],
+) -> None:
+    owner_id, rule_id = await _seed_rule(session_factory)
+    usage = BankRuleUsageRecorder(session_factory, timezone=TIMEZONE)
+    async with session_factory() as session:
+        assert await _find(session, owner_id, usage=usage) is not None
+
+    statements: list[str] = []
+    engine = session_factory.kw["bind"].sync_engine
+
+    def record_statement(*args: object) -> None:
+        statements.append(str(args[2]))
+
+    event.listen(engine, "before_cursor_execute", record_statement)
+    try:
+        async with session_factory() as session:
+            suggestion = await _find(session, owner_id, usage=usage)
+            repeated = await _find(session, owner_id, merchant="magnit", usage=usage)
+            category = await CategoryRepository(session).get(suggestion.category_id)
+            assert category is suggestion.category
+    finally:
+        event.remove(engine, "before_cursor_execute", record_statement)
+
+    assert len(statements) == 1
+    assert "data_versions" in statements[0]
+    assert suggestion.rule_id == repeated.rule_id == rule_id
+    assert (suggestion.category_code, suggestion.hit_count) == ("groceries", 2)
+    assert suggestion.mode == BankCategoryRuleMode.AUTOSAVE
+    assert category is not None
+    assert category.title == suggestion.category_title
+    assert usage.pending_rules == 1
+
+
+@pytest.mark.asyncio
+async def test_rule_index_follows_rule_changes_of_this_and_other_processes(
+    session_factory: async_sessionmaker[AsyncSession],
+) -> None:
+    owner_id, rule_id = await _seed_rule(session_factory)
+    async with session_factory() as session:
+        assert (await _find(session, owner_id)).mode == BankCategoryRuleMode.AUTOSAVE
+
+    async with session_factory() as session:
+        await BankLearningRuleService(session).set_rule_mode(
+            rule_id=rule_id,
+            telegram_user_id=1001,
+            mode=BankCategoryRuleMode.SUGGEST,
+        )
+        # An index built from uncommitted changes is not kept after a rollback.
+        assert (await _find(session, owner_id)).mode == BankCategoryRuleMode.SUGGEST
+        await session.rollback()
+    async with session_factory() as session:
+        assert (await _find(session, owner_id)).mode == BankCategoryRuleMode.AUTOSAVE
+
+    # Another process only changes the row and the data version.
+    async with session_factory() as session:
+        await session.execute(
+            update(BankCategoryRuleModel)
+            .where(BankCategoryRuleModel.id == rule_id)
+            .values(mode=BankCategoryRuleMode.DISABLED.value, is_active=False)
+        )
+        await DataVersionRepository(session).bump(BANK_CATEGORY_RULES_DATA_VERSION_KEY)
+        await session.commit()
+    async with session_factory() as session:
+        assert await _find(session, owner_id) is None
+
+    async with session_factory() as session:
+        await BankLearningRuleService(session).set_rule_active(
+            rule_id=rule_id,
+            telegram_user_id=1001,
+            is_active=True,
+        )
+        await session.commit()
+    async with session_factory() as session:
+        assert (await _find(session, owner_id)).mode == BankCategoryRuleMode.AUTOSAVE
+
+
+@pytest.mark.asyncio
+async def test_rule_usage_is_written_in_one_batch_and_never_moves_back(
+    session_factory: async_sessionmaker[AsyncSession],
+) -> None:
+    _, rule_id = await _seed_rule(session_factory)
+    _, other_rule_id = await _seed_rule(session_factory, merchant="PYATEROCHKA")
+    usage = BankRuleUsageRecorder(session_factory, timezone=TIMEZONE)
+
+    usage.record(rule_id, used_at=NOW)
+    usage.record(rule_id, used_at=NOW - timedelta(minutes=5))
+    usage.record(other_rule_id, used_at=NOW.astimezone(ZoneInfo("UTC")))
+    statements: list[tuple[str, bool]] = []
+    engine = session_factory.kw["bind"].sync_engine
+
+    def record_statement(*args: object) -> None:
+        statements.append((str(args[2]).lstrip().split(maxsplit=1)[0].upper(), bool(args[5])))
+
+    event.listen(engine, "before_cursor_execute", record_statement)
+    try:
+        assert await usage.flush() == 2
+    finally:
+        event.remove(engine, "before_cursor_execute", record_statement)
+    assert statements == [("UPDATE", True)]
+
+    usage.record(rule_id, used_at=NOW - timedelta(hours=1))
+    await usage.close()
+    assert usage.pending_rules == 0
+    async with session_factory() as session:
+        used = dict(
+            (
+                await session.execute(
+                    select(BankCategoryRuleModel.id, BankCategoryRuleModel.last_used_at)
+                )
+            ).all()
+        )
+    assert used == {rule_id: NOW.replace(tzinfo=None), other_rule_id: NOW.replace(tzinfo=None)}
+
+
+async def _find(
+    session: AsyncSession,
+    owner_id: int,
+    *,
+    merchant: str = "MAGNIT",
+    usage: BankRuleUsageRecorder | None = None,
+):
+    return await BankLearningService(session, usage=usage).find_suggestion(
+        owner_user_id=owner_id,
+        bank="sber",
+        merchant=merchant,
+        used_at=NOW,
+    )
+
+
+async def _seed_rule(
+    session_factory: async_sessionmaker[AsyncSession],
+    *,
+    merchant: str = "MAGNIT",
+) -> tuple[int, int]:
+    settings = make_settings()
+    async with session_factory() as session:
+        await seed_initial_data(session, settings)
+        owner = await session.scalar(
+            select(UserModel).where(UserModel.telegram_id == settings.husband_telegram_id)
+        )
+        groceries = await CategoryRepository(session).get_by_code("groceries")
+        assert owner is not None
+        assert groceries is not None
+        rule = BankCategoryRuleModel(
+            owner_user_id=owner.id,
+            bank="sber",
+            merchant_key=merchant.lower(),
+            merchant_display=merchant,
+            category_id=groceries.id,
+            hit_count=2,
+            mode=BankCategoryRuleMode.AUTOSAVE.value,
+            is_active=True,
+        )
+        session.add(rule)
+        await invalidate_bank_rule_index(session)
+        await session.commit()
+        return owner.id, rule.id
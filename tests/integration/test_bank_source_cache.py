@@ -0,0 +1,133 @@
+from collections.abc import AsyncIterator
+from pathlib import Path
+
+import pytest
+import pytest_asyncio
+from financial_bot.app.config import Settings
+from financial_bot.app.domain.types import BankEventBank, BankEventChannel, UserRole
+from financial_bot.app.services import bank_source_cache
+from financial_bot.app.services.bank_event_source_service import BankEventSourceService
+from financial_bot.app.services.bank_source_cache import resolve_bank_event_source
+from financial_bot.app.services.seed_service import seed_initial_data
+from financial_bot.app.storage.db import create_engine, create_session_factory
+from financial_bot.app.storage.models import BankEventSourceModel, Base
+from sqlalchemy import event, update
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+
+@pytest_asyncio.fixture
+async def session_factory(tmp_path: Path) -> AsyncIterator[async_sessionmaker[AsyncSession]]:
+    pytest.importorskip("aiosqlite")
+    database_url = f"sqlite+aiosqlite:///{tmp_path}/bank-source-cache.sqlite3"
+    engine = create_engine(database_url)
+    async with engine.begin() as connection:
+        await connection.run_sync(Base.metadata.create_all)
+
+    try:
+        yield create_session_factory(engine)
+    finally:
+        await engine.dispose()
+
+
+def make_settings() -> Settings:
+    return Settings(
+        _env_file=None,
+        bot_token="123456:secret-token",
+        database_url="sqlite+aiosqlite:///unused.sqlite3",
+        allowed_telegram_ids="1001,1002",
+        default_currency="RUB",
+        timezone="Asia/Barnaul",
+        husband_telegram_id=1001,
+        wife_telegram_id=1002,
+    )
+
+
+async def _provision(
+    session_factory: async_sessionmaker[AsyncSession],
+    *,
+    token: str,
+    rotate: bool = False,
+) -> None:
+    async with session_factory() as session:
+        if not rotate:
+            await seed_initial_data(session, make_settings())
+        await BankEventSourceService(session).provision_source(
+            code="husband-sber-ios",
+            bank=BankEventBank.SBER,
+            channel=BankEventChannel.IOS_SHORTCUT,
+            owner_role=UserRole.HUSBAND,
+            token=token,
+            rotate=rotate,
+        )
+        await session.commit()
+
+
+@pytest.mark.asyncio
+async def test_source_snapshot_is_served_from_cache_until_rotation(
+    session_factory: async_sessionmaker[AsyncSession],
+) -> None:
+    await _provision(session_factory, token="first-token")
+    statements: list[str] = []
+    engine = session_factory.kw["bind"].sync_engine
+
+    def record_statement(*args: object) -> None:
+        statements.append(str(args[2]))
+
+    async with session_factory() as session:
+        first = await resolve_bank_event_source(session, "first-token")
+        event.listen(engine, "before_cursor_execute", record_statement)
+        try:
+            cached = await resolve_bank_event_source(session, "first-token")
+        finally:
+            event.remove(engine, "before_cursor_execute", record_statement)
+
+    assert first is not None
+    assert cached == first
+    assert statements == []
+    assert first.code == "husband-sber-ios"
+    assert first.owner_telegram_id == 1001
+    assert first.owner_is_active is True
+
+    await _provision(session_factory, token="second-token", rotate=True)
+
+    async with session_factory() as session:
+        assert await resolve_bank_event_source(session, "first-token") is None
+        rotated = await resolve_bank_event_source(session, "second-token")
+
+    assert rotated is not None
+    assert rotated.id == first.id
+
+
+@pytest.mark.asyncio
+async def test_out_of_process_deactivation_takes_effect_after_ttl(
+    session_factory: async_sessionmaker[AsyncSession],
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    clock = [1000.0]
+    monkeypatch.setattr(bank_source_cache, "monotonic", lambda: clock[0])
+    await _provision(session_factory, token="source-token")
+
+    async with session_factory() as session:
+        assert await resolve_bank_event_source(session, "source-token", ttl_seconds=30) is not None
+        # Simulates the CLI deactivating the source in another process: no invalidation here.
+        await session.execute(update(BankEventSourceModel).values(is_active=False))
+        await session.commit()
+
+        clock[0] += 29
+        assert await resolve_bank_event_source(session, "source-token", ttl_seconds=30) is not None
+        clock[0] += 2
+        assert await resolve_bank_event_source(session, "source-token", ttl_seconds=30) is None
+
+
+@pytest.mark.asyncio
+async def test_zero_ttl_disables_source_cache(
+    session_factory: async_sessionmaker[AsyncSession],
+) -> None:
+    await _provision(session_factory, token="source-token")
+
+    async with session_factory() as session:
+        assert await resolve_bank_event_source(session, "source-token", ttl_seconds=0) is not None
+        await session.execute(update(BankEventSourceModel).values(is_active=False))
+        await session.commit()
+
+        assert await resolve_bank_event_source(session, "source-token", ttl_seconds=0) is None
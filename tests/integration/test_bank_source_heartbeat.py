@@ -0,0 +1,137 @@
+from collections.abc import AsyncIterator
+from datetime import datetime, timedelta
+from pathlib import Path
+from zoneinfo import ZoneInfo
+
+import pytest
+import pytest_asyncio
+from financial_bot.app.config import Settings
+from financial_bot.app.domain.types import BankEventBank, BankEventChannel
+from financial_bot.app.services.bank_source_heartbeat import BankSourceHeartbeat
+from financial_bot.app.services.seed_service import seed_initial_data
+from financial_bot.app.storage.db import create_engine, create_session_factory
+from financial_bot.app.storage.models import BankEventSourceModel, Base, UserModel
+from sqlalchemy import event, select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+TIMEZONE = "Asia/Barnaul"
+NOW = datetime(2026, 7, 11, 12, 0, tzinfo=ZoneInfo(TIMEZONE))
+
+
+@pytest_asyncio.fixture
+async def session_factory(tmp_path: Path) -> AsyncIterator[async_sessionmaker[AsyncSession]]:
+    pytest.importorskip("aiosqlite")
+    database_url = f"sqlite+aiosqlite:///{tmp_path}/bank-source-heartbeat.sqlite3"
+    engine = create_engine(database_url)
+    async with engine.begin() as connection:
+        await connection.run_sync(Base.metadata.create_all)
+
+    try:
+        yield create_session_factory(engine)
+    finally:
+        await engine.dispose()
+
+
+def make_settings() -> Settings:
+    return Settings(
+        _env_file=None,
+        bot_token="123456:secret-token",
+        database_url="sqlite+aiosqlite:///unused.sqlite3",
+        allowed_telegram_ids="1001,1002",
+        default_currency="RUB",
+        timezone=TIMEZONE,
+        husband_telegram_id=1001,
+        wife_telegram_id=1002,
+    )
+
+
+@pytest.mark.asyncio
+async def test_heartbeat_coalesces_and_skips_writes_within_granularity(
+    session_factory: async_sessionmaker[AsyncSession],
+) -> None:
+    source_id = await _seed_source(session_factory)
+    heartbeat = BankSourceHeartbeat(session_factory, timezone=TIMEZONE, granularity_seconds=60)
+
+    heartbeat.record(source_id, seen_at=NOW)
+    heartbeat.record(source_id, seen_at=NOW - timedelta(minutes=5))
+    assert heartbeat.pending_sources == 1
+    assert await heartbeat.flush() == 1
+    assert await _last_seen_at(session_factory, source_id) == NOW.replace(tzinfo=None)
+
+    statements: list[str] = []
+    engine = session_factory.kw["bind"].sync_engine
+
+    def record_statement(*args: object) -> None:
+        statements.append(str(args[2]).lstrip().split(maxsplit=1)[0].upper())
+
+    heartbeat.record(source_id, seen_at=NOW + timedelta(seconds=59))
+    event.listen(engine, "before_cursor_execute", record_statement)
+    try:
+        assert await heartbeat.flush() == 0
+        assert await heartbeat.flush() == 0
+    finally:
+        event.remove(engine, "before_cursor_execute", record_statement)
+    assert statements == ["SELECT"]
+    assert await _last_seen_at(session_factory, source_id) == NOW.replace(tzinfo=None)
+
+    heartbeat.record(source_id, seen_at=NOW + timedelta(minutes=2))
+    await heartbeat.close()
+    assert heartbeat.pending_sources == 0
+    assert await _last_seen_at(session_factory, source_id) == (NOW + timedelta(minutes=2)).replace(
+        tzinfo=None
+    )
+
+
+@pytest.mark.asyncio
+async def test_heartbeat_keeps_pending_times_when_flush_fails(
+    session_factory: async_sessionmaker[AsyncSession],
+) -> None:
+    source_id = await _seed_source(session_factory)
+    heartbeat = BankSourceHeartbeat(session_factory, timezone=TIMEZONE)
+    engine = session_factory.kw["bind"].sync_engine
+
+    def fail_update(*args: object) -> None:
+        if str(args[2]).lstrip().upper().startswith("UPDATE"):
+            raise RuntimeError("database is locked")
+
+    heartbeat.record(source_id, seen_at=NOW)
+    event.listen(engine, "before_cursor_execute", fail_update)
+    try:
+        with pytest.raises(RuntimeError):
+            await heartbeat.flush()
+    finally:
+        event.remove(engine, "before_cursor_execute", fail_update)
+    assert heartbeat.pending_sources == 1
+
+    assert await heartbeat.flush() == 1
+    assert await _last_seen_at(session_factory, source_id) == NOW.replace(tzinfo=None)
+
+
+async def _seed_source(session_factory: async_sessionmaker[AsyncSession]) -> int:
+    settings = make_settings()
+    async with session_factory() as session:
+        await seed_initial_data(session, settings)
+        owner = await session.scalar(
+            select(UserModel).where(UserModel.telegram_id == settings.husband_telegram_id)
+        )
+        assert owner is not None
+        source = BankEventSourceModel(
+            code="ios-shortcut:sber:test",
+            bank=BankEventBank.SBER.value,
+            channel=BankEventChannel.IOS_SHORTCUT.value,
+            owner_user_id=owner.id,
+            token_hash="0" * 64,
+        )
+        session.add(source)
+        await session.commit()
+        return source.id
+
+
+async def _last_seen_at(
+    session_factory: async_sessionmaker[AsyncSession],
+    source_id: int,
+) -> datetime | None:
+    async with session_factory() as session:
+        source = await session.get(BankEventSourceModel, source_id)
+    assert source is not None
+    return source.last_seen_at
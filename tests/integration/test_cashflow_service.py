@@ -6,7 +6,7 @@ from zoneinfo import ZoneInfo
 import pytest
 import pytest_asyncio
 from financial_bot.app.config import Settings
-from financial_bot.app.domain.periods import PeriodKind
+from financial_bot.app.domain.periods import PeriodKind, resolve_month_period
 from financial_bot.app.domain.types import TransactionScope, TransactionSource
 from financial_bot.app.services.cashflow_service import CashflowService
 from financial_bot.app.services.report_service import ReportService
@@ -14,6 +14,7 @@ from financial_bot.app.services.seed_service import seed_initial_data
 from financial_bot.app.services.transaction_service import TransactionService
 from financial_bot.app.storage.db import create_engine, create_session_factory
 from financial_bot.app.storage.models import Base
+from financial_bot.app.storage.repositories.cashflow_repository import CashflowRepository
 from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
 
 
@@ -203,3 +204,58 @@ async def test_cashflow_report_can_be_filtered_by_accounting_scope(
         ("husband", 0, 0.0),
         ("wife", 120_000_00, 100.0),
     ]
+
+
+@pytest.mark.asyncio
+async def test_income_totals_match_per_query_aggregates(
+    session_factory: async_sessionmaker[AsyncSession],
+) -> None:
+    settings = make_settings()
+    timezone = ZoneInfo(settings.timezone)
+
+    async with session_factory() as session:
+        await seed_initial_data(session, settings)
+        transactions = TransactionService(session, settings)
+        rows = (
+            (100_000_00, 1001, "income_salary", TransactionScope.HOUSEHOLD),
+            (15_000_00, 1001, "income_bonus", TransactionScope.HOUSEHOLD),
+            (25_000_00, 1002, "income_bonus", TransactionScope.HOUSEHOLD),
+            (120_000_00, 1002, "income_business", TransactionScope.SALON),
+        )
+        for index, (amount, recipient, category_code, scope) in enumerate(rows, start=1):
+            income = await transactions.create_income(
+                amount=amount,
+                recipient_telegram_id=recipient,
+                raw_text=f"manual_income:{index}",
+                category_code=category_code,
+                scope=scope,
+            )
+            await transactions.update_transaction(
+                transaction_id=income.id,
+                changed_by_telegram_id=recipient,
+                occurred_at=datetime(2026, 6, index, 12, tzinfo=timezone),
+            )
+
+        period = resolve_month_period(year=2026, month=6, timezone=settings.timezone)
+        repository = CashflowRepository(session)
+        for scope in (None, TransactionScope.HOUSEHOLD, TransactionScope.SALON):
+            args = (period.start_at, period.end_at)
+            totals = await repository.income_totals(*args, scope=scope)
+            assert totals.total == await repository.total_income(*args, scope=scope)
+            assert list(totals.by_recipient) == await repository.income_by_recipient(
+                *args, scope=scope
+            )
+            assert list(totals.by_category) == await repository.income_by_category(
+                *args, scope=scope
+            )
+        household = await repository.income_totals(
+            period.start_at,
+            period.end_at,
+            scope=TransactionScope.HOUSEHOLD,
+        )
+        await session.commit()
+
+    assert [(row.code, row.amount) for row in household.by_category] == [
+        ("income_salary", 100_000_00),
+        ("income_bonus", 40_000_00),
+    ]
@@ -10,9 +10,11 @@ import pytest_asyncio
 from financial_bot.app.config import Settings
 from financial_bot.app.domain.periods import PeriodKind
 from financial_bot.app.domain.types import TransactionScope
+from financial_bot.app.services.chart_cache import ChartCache
+from financial_bot.app.services.chart_render_pool import ChartRenderPool, ChartRenderTimeoutError
+from financial_bot.app.services.chart_rendering import DASHBOARD_COLORS, CumulativeChart
 from financial_bot.app.services.chart_service import (
     CHART_FILE_PREFIX,
-    DASHBOARD_COLORS,
     ChartResult,
     ChartService,
 )
@@ -431,3 +433,151 @@ def _hex_to_rgb(value: str) -> tuple[int, int, int]:
         int(normalized[2:4], 16),
         int(normalized[4:6], 16),
     )
+
+
+@pytest.mark.asyncio
+async def test_chart_render_pool_matches_inline_rendering(
+    session_factory: async_sessionmaker[AsyncSession],
+    tmp_path: Path,
+) -> None:
+    settings = make_settings()
+    now = datetime(2026, 5, 20, 12, tzinfo=ZoneInfo(settings.timezone))
+    renderer = ChartRenderPool(workers=1, timeout_seconds=60)
+    try:
+        await renderer.start()
+        async with session_factory() as session:
+            await seed_initial_data(session, settings)
+            await seed_may_2026_transactions(session, settings)
+            inline = await ChartService(
+                session,
+                settings,
+                chart_temp_dir=tmp_path,
+            ).create_month_dashboard_chart(now=now)
+            pooled = await ChartService(
+                session,
+                settings,
+                chart_temp_dir=tmp_path,
+                renderer=renderer,
+            ).create_month_dashboard_chart(now=now)
+            await session.commit()
+    finally:
+        await renderer.close()
+
+    assert inline is not None
+    assert pooled is not None
+    assert pooled.caption == inline.caption
+    assert pooled.path.read_bytes() == inline.path.read_bytes()
+    _assert_png(inline)
+    _assert_png(pooled)
+
+
+@pytest.mark.asyncio
+async def test_chart_render_pool_times_out_queued_charts() -> None:
+    renderer = ChartRenderPool(workers=1, timeout_seconds=0.01)
+    chart = CumulativeChart(period_label="Май 2026", scope=None, cumulative=(100_00, 200_00))
+    try:
+        with pytest.raises(ChartRenderTimeoutError):
+            await renderer.render(chart)
+    finally:
+        await renderer.close()
+
+
+@pytest.mark.asyncio
+async def test_chart_cache_serves_unchanged_charts_until_report_data_changes(
+    session_factory: async_sessionmaker[AsyncSession],
+    tmp_path: Path,
+) -> None:
+    settings = make_settings()
+    now = datetime(2026, 5, 20, 12, tzinfo=ZoneInfo(settings.timezone))
+    cache = ChartCache()
+
+    async with session_factory() as session:
+        await seed_initial_data(session, settings)
+        await seed_may_2026_transactions(session, settings)
+        await session.commit()
+
+    async with session_factory() as session:
+        service = ChartService(session, settings, chart_temp_dir=tmp_path, cache=cache)
+        first = await service.create_month_dashboard_chart(now=now)
+        second = await service.create_month_dashboard_chart(now=now)
+        household = await service.create_month_dashboard_chart(
+            now=now,
+            scope=TransactionScope.HOUSEHOLD,
+        )
+        next_day = await service.create_month_dashboard_chart(
+            now=datetime(2026, 5, 21, 12, tzinfo=ZoneInfo(settings.timezone))
+        )
+
+    assert first is not None
+    assert second is not None
+    assert household is not None
+    assert next_day is not None
+    assert second.path != first.path
+    assert second.caption == first.caption
+    assert second.path.read_bytes() == first.path.read_bytes()
+    assert cache.snapshot().hits == 1
+    assert cache.snapshot().misses == 3
+
+    async with session_factory() as session:
+        transactions = TransactionService(session, settings)
+        groceries = next(
+            category
+            for category in await transactions.list_category_options()
+            if category.code == "groceries"
+        )
+        created = await transactions.create_from_category_selection(
+            amount=100_000,
+            category_id=groceries.id,
+            payer_telegram_id=1001,
+            raw_text="1000",
+        )
+        await transactions.update_transaction(
+            transaction_id=created.id,
+            changed_by_telegram_id=1001,
+            occurred_at=datetime(2026, 5, 5, 12, tzinfo=ZoneInfo(settings.timezone)),
+        )
+        await session.commit()
+
+    async with session_factory() as session:
+        service = ChartService(session, settings, chart_temp_dir=tmp_path, cache=cache)
+        changed = await service.create_month_dashboard_chart(now=now)
+
+    assert changed is not None
+    assert changed.path.read_bytes() != first.path.read_bytes()
+    assert cache.snapshot().hits == 1
+    assert cache.snapshot().misses == 4
+
+
+@pytest.mark.asyncio
+async def test_chart_cache_persists_pngs_across_instances(
+    session_factory: async_sessionmaker[AsyncSession],
+    tmp_path: Path,
+) -> None:
+    settings = make_settings()
+    now = datetime(2026, 5, 20, 12, tzinfo=ZoneInfo(settings.timezone))
+    cache_dir = tmp_path / "cache"
+
+    async with session_factory() as session:
+        await seed_initial_data(session, settings)
+        await seed_may_2026_transactions(session, settings)
+        first = await ChartService(
+            session,
+            settings,
+            chart_temp_dir=tmp_path,
+            cache=ChartCache(persist_dir=cache_dir),
+        ).create_trend_chart(3, now=now)
+        restarted_cache = ChartCache(persist_dir=cache_dir)
+        second = await ChartService(
+            session,
+            settings,
+            chart_temp_dir=tmp_path,
+            cache=restarted_cache,
+        ).create_trend_chart(3, now=now)
+        await session.commit()
+
+    assert first is not None
+    assert second is not None
+    assert second.caption == first.caption
+    assert second.path.read_bytes() == first.path.read_bytes()
+    assert restarted_cache.snapshot().hits == 1
+    assert restarted_cache.snapshot().misses == 0
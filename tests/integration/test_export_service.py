@@ -12,6 +12,7 @@ from financial_bot.app.services.seed_service import seed_initial_data
 from financial_bot.app.services.transaction_service import TransactionService
 from financial_bot.app.storage.db import create_engine, create_session_factory
 from financial_bot.app.storage.models import Base
+from sqlalchemy import event
 from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
 from tests.fixtures.may_2026 import (
     EXPECTED_MAY_REPORT_RUB,
@@ -199,3 +200,106 @@ async def test_export_includes_corrections_with_signed_report_amount(
     assert "budget_net_savings_rub" in tables.cashflow[0]
     assert tables.by_category[0]["amount_rub"] == 700
     assert sum(row["amount_rub"] for row in tables.by_payer) == 700
+
+
+@pytest.mark.asyncio
+async def test_export_rows_take_one_query_per_table_however_many_transactions(
+    session_factory: async_sessionmaker[AsyncSession],
+) -> None:
+    settings = make_settings()
+    period = resolve_period(
+        PeriodKind.YEAR,
+        now=datetime(2026, 6, 1, tzinfo=ZoneInfo(settings.timezone)),
+        timezone=settings.timezone,
+    )
+
+    async with session_factory() as session:
+        await seed_initial_data(session, settings)
+        await seed_may_2026_transactions(session, settings)
+        await session.commit()
+
+    statements: list[str] = []
+    engine = session_factory.kw["bind"].sync_engine
+
+    def record_statement(*args: object) -> None:
+        statements.append(str(args[2]))
+
+    event.listen(engine, "before_cursor_execute", record_statement)
+    try:
+        async with session_factory() as session:
+            tables = await ExportService(session, settings).build_tables(period)
+    finally:
+        event.remove(engine, "before_cursor_execute", record_statement)
+
+    transaction_reads = [
+        statement
+        for statement in statements
+        if "FROM transactions JOIN categories" in " ".join(statement.split())
+    ]
+    assert len(tables.transactions) == len(MAY_2026_TRANSACTION_ROWS)
+    assert len(transaction_reads) == 2
+    assert not any("FROM users" in " ".join(statement.split()) for statement in statements)
+
+
+@pytest.mark.asyncio
+async def test_streamed_exports_keep_the_pandas_layout(
+    session_factory: async_sessionmaker[AsyncSession],
+) -> None:
+    settings = make_settings()
+    timezone = ZoneInfo(settings.timezone)
+    period = resolve_month_period(year=2026, month=5, timezone=settings.timezone)
+
+    async with session_factory() as session:
+        await seed_initial_data(session, settings)
+        await seed_may_2026_transactions(session, settings)
+        transactions = TransactionService(session, settings)
+        income = await transactions.create_income(
+            amount=1_234_567,
+            recipient_telegram_id=1002,
+            raw_text='аванс; "май"\nвторая строка',
+            comment="зарплата",
+        )
+        await transactions.update_transaction(
+            transaction_id=income.id,
+            changed_by_telegram_id=1002,
+            occurred_at=datetime(2026, 5, 10, 9, tzinfo=timezone),
+        )
+        exports = ExportService(session, settings)
+        tables = await exports.build_tables(period)
+        csv_result = await exports.create_csv_export(period)
+        xlsx_result = await exports.create_xlsx_export(period)
+        await session.commit()
+
+    assert csv_result is not None
+    assert xlsx_result is not None
+    expected_csv = pd.DataFrame([*tables.transactions, *tables.income_transactions]).to_csv(
+        index=False,
+        sep=";",
+        encoding="utf-8-sig",
+    )
+    try:
+        assert csv_result.path.read_bytes() == b"\xef\xbb\xbf" + expected_csv.encode()
+        workbook = pd.ExcelFile(xlsx_result.path)
+        assert workbook.sheet_names == [
+            "transactions",
+            "by_category",
+            "by_payer",
+            "income_transactions",
+            "by_income_recipient",
+            "by_income_category",
+            "cashflow",
+        ]
+        for sheet_name in workbook.sheet_names:
+            expected = pd.DataFrame(getattr(tables, sheet_name))
+            actual = pd.read_excel(workbook, sheet_name=sheet_name)
+            if expected.empty:
+                assert actual.empty
+                continue
+            pd.testing.assert_frame_equal(
+                actual,
+                expected.replace({"": None}),
+                check_dtype=False,
+            )
+    finally:
+        csv_result.path.unlink(missing_ok=True)
+        xlsx_result.path.unlink(missing_ok=True)
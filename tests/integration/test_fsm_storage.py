@@ -0,0 +1,142 @@
+from collections.abc import AsyncIterator
+from pathlib import Path
+
+import pytest
+import pytest_asyncio
+from aiogram.fsm.state import State, StatesGroup
+from aiogram.fsm.storage.base import StorageKey
+from financial_bot.app.bot.fsm_storage import DatabaseFsmStorage
+from financial_bot.app.storage.db import create_engine, create_session_factory
+from financial_bot.app.storage.models import Base, FsmStateModel
+from sqlalchemy import event, func, select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+KEY = StorageKey(bot_id=1, chat_id=1001, user_id=1001)
+OTHER_KEY = StorageKey(bot_id=1, chat_id=1002, user_id=1002)
+
+
+class DraftState(StatesGroup):
+    waiting_for_category = State()
+
+
+@pytest_asyncio.fixture
+async def session_factory(tmp_path: Path) -> AsyncIterator[async_sessionmaker[AsyncSession]]:
+    pytest.importorskip("aiosqlite")
+    database_url = f"sqlite+aiosqlite:///{tmp_path}/fsm.sqlite3"
+    engine = create_engine(database_url)
+    async with engine.begin() as connection:
+        await connection.run_sync(Base.metadata.create_all)
+
+    try:
+        yield create_session_factory(engine)
+    finally:
+        await engine.dispose()
+
+
+async def _row_count(session_factory: async_sessionmaker[AsyncSession]) -> int:
+    async with session_factory() as session:
+        return int(await session.scalar(select(func.count()).select_from(FsmStateModel)) or 0)
+
+
+@pytest.mark.asyncio
+async def test_fsm_storage_writes_behind_and_survives_restart(
+    session_factory: async_sessionmaker[AsyncSession],
+) -> None:
+    storage = DatabaseFsmStorage(session_factory)
+    await storage.get_state(KEY)
+    statements: list[str] = []
+    engine = session_factory.kw["bind"].sync_engine
+
+    def record_statement(*args: object) -> None:
+        statements.append(str(args[2]))
+
+    event.listen(engine, "before_cursor_execute", record_statement)
+    try:
+        await storage.set_state(KEY, DraftState.waiting_for_category)
+        await storage.update_data(KEY, {"amount": 350_000, "draft_token": "abc"})
+        await storage.update_data(KEY, {"raw_text": "3500"})
+    finally:
+        event.remove(engine, "before_cursor_execute", record_statement)
+
+    assert statements == []
+    assert storage.pending_writes == 1
+    assert await _row_count(session_factory) == 0
+
+    await storage.close()
+
+    assert storage.pending_writes == 0
+    restarted = DatabaseFsmStorage(session_factory)
+    assert await restarted.get_state(KEY) == DraftState.waiting_for_category.state
+    assert await restarted.get_data(KEY) == {
+        "amount": 350_000,
+        "draft_token": "abc",
+        "raw_text": "3500",
+    }
+    assert await restarted.get_state(OTHER_KEY) is None
+
+    await restarted.set_state(KEY, None)
+    await restarted.set_data(KEY, {})
+    await restarted.flush()
+
+    assert await _row_count(session_factory) == 0
+
+
+@pytest.mark.asyncio
+async def test_fsm_storage_drops_states_after_ttl(
+    session_factory: async_sessionmaker[AsyncSession],
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    clock = [1_000_000.0]
+    monkeypatch.setattr("financial_bot.app.bot.fsm_storage.time", lambda: clock[0])
+    storage = DatabaseFsmStorage(session_factory, ttl_seconds=60)
+    await storage.set_state(KEY, DraftState.waiting_for_category)
+    await storage.set_data(OTHER_KEY, {"edit_transaction_id": 7})
+    await storage.flush()
+    assert await _row_count(session_factory) == 2
+
+    clock[0] += 30
+    await storage.update_data(OTHER_KEY, {"edit_transaction_id": 8})
+    clock[0] += 40
+
+    assert await DatabaseFsmStorage(session_factory, ttl_seconds=60).get_state(KEY) is None
+    assert await storage.get_state(KEY) is None
+    assert await storage.get_data(OTHER_KEY) == {"edit_transaction_id": 8}
+
+    await storage.flush()
+
+    assert await _row_count(session_factory) == 1
+
+
+@pytest.mark.asyncio
+async def test_fsm_storage_idle_flush_does_not_touch_the_database(
+    session_factory: async_sessionmaker[AsyncSession],
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    clock = [1_000_000.0]
+    monkeypatch.setattr("financial_bot.app.bot.fsm_storage.time", lambda: clock[0])
+    storage = DatabaseFsmStorage(session_factory, ttl_seconds=60, purge_interval_seconds=300)
+    await storage.flush()
+    statements: list[str] = []
+    engine = session_factory.kw["bind"].sync_engine
+
+    def record_statement(*args: object) -> None:
+        statements.append(" ".join(str(args[2]).split()))
+
+    event.listen(engine, "before_cursor_execute", record_statement)
+    try:
+        clock[0] += 1
+        await storage.flush()
+        assert statements == []
+
+        await storage.set_state(KEY, DraftState.waiting_for_category)
+        await storage.flush()
+        assert statements
+        assert not any(statement.startswith("DELETE") for statement in statements)
+
+        statements.clear()
+        clock[0] += 300
+        await storage.flush()
+    finally:
+        event.remove(engine, "before_cursor_execute", record_statement)
+
+    assert [statement for statement in statements if statement.startswith("DELETE")] != []
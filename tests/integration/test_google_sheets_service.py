@@ -1,20 +1,31 @@
+import threading
 from collections.abc import AsyncIterator
-from datetime import datetime
+from datetime import UTC, datetime
 from pathlib import Path
 from zoneinfo import ZoneInfo
 
 import pytest
 import pytest_asyncio
 from financial_bot.app.config import Settings
-from financial_bot.app.domain.periods import resolve_month_period
+from financial_bot.app.domain.periods import PeriodKind, resolve_month_period, resolve_period
+from financial_bot.app.services.export_service import TRANSACTION_EXPORT_COLUMNS
 from financial_bot.app.services.google_sheets_service import (
+    GOOGLE_SHEETS_SYNC_SETTINGS_KEY,
+    GOOGLE_SHEETS_TABLES,
+    GoogleSheetsExportError,
+    GoogleSheetsExportProgress,
+    GoogleSheetsExportStage,
     GoogleSheetsNotConfigured,
     GoogleSheetsService,
 )
 from financial_bot.app.services.seed_service import seed_initial_data
+from financial_bot.app.services.transaction_service import TransactionService
 from financial_bot.app.storage.db import create_engine, create_session_factory
-from financial_bot.app.storage.models import Base
+from financial_bot.app.storage.models import Base, TransactionModel
+from financial_bot.app.storage.repositories.setting_repository import SettingRepository
+from sqlalchemy import update
 from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+from tests.fixtures.google_sheets import FakeHttpError, FakeSheetsClient
 from tests.fixtures.may_2026 import MAY_2026_TRANSACTION_ROWS, seed_may_2026_transactions
 
 
@@ -32,7 +43,7 @@ async def session_factory(tmp_path: Path) -> AsyncIterator[async_sessionmaker[As
         await engine.dispose()
 
 
-def make_settings(*, spreadsheet_id: str | None = None) -> Settings:
+def make_settings(*, spreadsheet_id: str | None = None, **overrides: object) -> Settings:
     return Settings(
         _env_file=None,
         bot_token="123456:secret-token",
@@ -43,6 +54,7 @@ def make_settings(*, spreadsheet_id: str | None = None) -> Settings:
         husband_telegram_id=1001,
         wife_telegram_id=1002,
         google_spreadsheet_id=spreadsheet_id,
+        **overrides,
     )
 
 
@@ -59,12 +71,12 @@ async def test_google_sheets_export_disabled_without_spreadsheet_id(
 
 
 @pytest.mark.asyncio
-async def test_google_sheets_export_appends_required_tables(
+async def test_first_google_sheets_sync_writes_all_tables_in_one_batch(
     session_factory: async_sessionmaker[AsyncSession],
 ) -> None:
     settings = make_settings(spreadsheet_id="spreadsheet-123")
     period = resolve_month_period(year=2026, month=5, timezone=settings.timezone)
-    fake_client = FakeSheetsClient()
+    fake_client = FakeSheetsClient(existing_sheets={"transactions", "by_category"})
 
     async with session_factory() as session:
         await seed_initial_data(session, settings)
@@ -79,16 +91,7 @@ async def test_google_sheets_export_appends_required_tables(
     assert summary is not None
     assert summary.spreadsheet_id == "spreadsheet-123"
     assert summary.rows_by_sheet["transactions"] == len(MAY_2026_TRANSACTION_ROWS)
-    assert set(summary.rows_by_sheet) == {
-        "transactions",
-        "by_category",
-        "by_payer",
-        "income_transactions",
-        "by_income_recipient",
-        "by_income_category",
-        "cashflow",
-    }
-    assert len(fake_client.append_calls) == 5
+    assert set(summary.rows_by_sheet) == set(GOOGLE_SHEETS_TABLES)
     assert fake_client.created_sheets == [
         "by_payer",
         "income_transactions",
@@ -96,109 +99,307 @@ async def test_google_sheets_export_appends_required_tables(
         "by_income_category",
         "cashflow",
     ]
-    first_call = fake_client.calls[0]
-    assert first_call["spreadsheetId"] == "spreadsheet-123"
-    assert first_call["range"] == "transactions!A1"
-    assert first_call["valueInputOption"] == "USER_ENTERED"
-    assert first_call["insertDataOption"] == "INSERT_ROWS"
-    assert first_call["body"]["values"][0][0] == "id"
-    assert "scope" in first_call["body"]["values"][0]
-    scope_index = first_call["body"]["values"][0].index("scope")
-    assert first_call["body"]["values"][1][scope_index] == "household"
-    assert len(first_call["body"]["values"]) == len(MAY_2026_TRANSACTION_ROWS) + 1
+    assert fake_client.calls_of("values.batchClear") == []
+    assert len(fake_client.calls_of("values.batchGet")) == 1
+    (batch,) = fake_client.calls_of("values.batchUpdate")
+    assert batch["spreadsheetId"] == "spreadsheet-123"
+    assert batch["body"]["valueInputOption"] == "USER_ENTERED"
+
+    transactions = fake_client.values_of("transactions")
+    assert transactions[0] == list(TRANSACTION_EXPORT_COLUMNS)
+    assert len(transactions) == len(MAY_2026_TRANSACTION_ROWS) + 1
+    scope_index = transactions[0].index("scope")
+    assert transactions[1][scope_index] == "household"
+    assert fake_client.values_of("by_category")[0][0] == "category_code"
 
 
 @pytest.mark.asyncio
-async def test_google_sheets_export_does_not_duplicate_headers_on_second_export(
+async def test_google_sheets_sync_sends_only_changed_rows(
     session_factory: async_sessionmaker[AsyncSession],
 ) -> None:
     settings = make_settings(spreadsheet_id="spreadsheet-123")
     period = resolve_month_period(year=2026, month=5, timezone=settings.timezone)
-    fake_client = FakeSheetsClient(
-        existing_sheets={
-            "transactions",
-            "by_category",
-            "by_payer",
-            "income_transactions",
-            "by_income_recipient",
-            "by_income_category",
-            "cashflow",
-        }
-    )
+    fake_client = FakeSheetsClient()
 
     async with session_factory() as session:
         await seed_initial_data(session, settings)
         await seed_may_2026_transactions(session, settings)
-        service = GoogleSheetsService(session, settings, sheets_client=fake_client)
-        first = await service.export_period(period)
-        second = await service.export_period(period)
+        # Seeded yesterday, so later edits get a newer `updated_at` second.
+        await session.execute(
+            update(TransactionModel).values(updated_at=datetime(2026, 6, 1, tzinfo=UTC))
+        )
+        first = await GoogleSheetsService(
+            session,
+            settings,
+            sheets_client=fake_client,
+        ).export_period(period)
+        await session.commit()
+    full_sync_bytes = fake_client.bytes_sent
+
+    async with session_factory() as session:
+        second = await GoogleSheetsService(
+            session,
+            settings,
+            sheets_client=fake_client,
+        ).export_period(period)
         await session.commit()
 
     assert first is not None
     assert second is not None
-    transaction_appends = [
-        call for call in fake_client.append_calls if call["range"] == "transactions!A1"
+    assert second.total_rows == 0
+    assert not second.has_changes
+    assert fake_client.bytes_sent == full_sync_bytes
+    assert len(fake_client.calls_of("values.batchUpdate")) == 1
+
+    before = fake_client.values_of("transactions")
+    id_index = before[0].index("id")
+    amount_index = before[0].index("amount_rub")
+    edited_id, deleted_id = before[1][id_index], before[2][id_index]
+    async with session_factory() as session:
+        service = TransactionService(session, settings)
+        await service.update_transaction(
+            transaction_id=edited_id,
+            changed_by_telegram_id=1001,
+            amount=100,
+        )
+        await service.delete_transaction(transaction_id=deleted_id, changed_by_telegram_id=1001)
+        added = await service.create_from_category_sort_order(
+            amount=5000,
+            category_sort_order=1,
+            payer_telegram_id=1002,
+            raw_text="50 1",
+        )
+        await service.update_transaction(
+            transaction_id=added.id,
+            changed_by_telegram_id=1002,
+            occurred_at=datetime(2026, 5, 30, 12, tzinfo=ZoneInfo(settings.timezone)),
+        )
+        await session.commit()
+
+    async with session_factory() as session:
+        third = await GoogleSheetsService(
+            session,
+            settings,
+            sheets_client=fake_client,
+        ).export_period(period)
+        await session.commit()
+
+    assert third is not None
+    assert third.rows_by_sheet["transactions"] == 2
+    assert third.blanked_rows == 1
+    assert third.has_changes
+    assert third.rows_by_sheet["income_transactions"] == 0
+    assert third.rows_by_sheet["by_income_category"] == 0
+    assert third.rows_by_sheet["by_category"] > 0
+    last_batch = fake_client.calls_of("values.batchUpdate")[-1]
+    assert {item["range"] for item in last_batch["body"]["data"]} == {
+        "transactions!A2",
+        "transactions!A3",
+        f"transactions!A{len(before) + 1}",
+        "by_category!A2",
+        "by_payer!A2",
+        "cashflow!A2",
+    }
+    assert fake_client.bytes_sent - full_sync_bytes < full_sync_bytes / 2
+
+    after = fake_client.values_of("transactions")
+    assert after[1][id_index] == edited_id
+    assert after[1][amount_index] == 1
+    assert after[2] == []
+    assert after[3:-1] == before[3:]
+    assert after[-1][id_index] == added.id
+
+
+@pytest.mark.asyncio
+async def test_google_sheets_sync_retries_quota_errors_off_the_event_loop(
+    session_factory: async_sessionmaker[AsyncSession],
+) -> None:
+    settings = make_settings(
+        spreadsheet_id="spreadsheet-123",
+        google_sheets_retry_base_seconds=0.01,
+    )
+    period = resolve_month_period(year=2026, month=5, timezone=settings.timezone)
+    fake_client = FakeSheetsClient()
+    fake_client.fail_next(
+        "values.batchUpdate",
+        FakeHttpError(429),
+        FakeHttpError(403, content=b'{"error": {"errors": [{"reason": "rateLimitExceeded"}]}}'),
+        FakeHttpError(503, retry_after="0.02"),
+    )
+    reported: list[GoogleSheetsExportProgress] = []
+
+    async def record_progress(progress: GoogleSheetsExportProgress) -> None:
+        reported.append(progress)
+
+    async with session_factory() as session:
+        await seed_initial_data(session, settings)
+        await seed_may_2026_transactions(session, settings)
+        summary = await GoogleSheetsService(
+            session,
+            settings,
+            sheets_client=fake_client,
+        ).export_period(period, on_progress=record_progress)
+        await session.commit()
+
+    assert summary is not None
+    assert fake_client.failed_calls == ["values.batchUpdate"] * 3
+    assert len(fake_client.calls_of("values.batchUpdate")) == 1
+    assert threading.get_ident() not in fake_client.thread_ids
+    stages = [progress.stage for progress in reported]
+    assert stages[:2] == [GoogleSheetsExportStage.READING, GoogleSheetsExportStage.PREPARING]
+    assert stages[-4:] == [
+        GoogleSheetsExportStage.WRITING,
+        GoogleSheetsExportStage.RETRYING,
+        GoogleSheetsExportStage.RETRYING,
+        GoogleSheetsExportStage.RETRYING,
     ]
-    assert len(transaction_appends) == 2
-    assert transaction_appends[0]["body"]["values"][0][0] == "id"
-    assert transaction_appends[1]["body"]["values"][0][0] != "id"
-
-
-class FakeSheetsClient:
-    def __init__(self, *, existing_sheets: set[str] | None = None) -> None:
-        self.calls: list[dict] = []
-        self.append_calls: list[dict] = self.calls
-        self.existing_sheets = set(existing_sheets or {"transactions", "by_category"})
-        self.sheet_values: dict[str, list[list[object]]] = {}
-        self.created_sheets: list[str] = []
-        self._pending: tuple[str, dict] | None = None
-
-    def spreadsheets(self):
-        return self
-
-    def values(self):
-        return self
-
-    def get(self, **kwargs):
-        if "fields" in kwargs:
-            self._pending = ("spreadsheet_get", kwargs)
-        else:
-            self._pending = ("values_get", kwargs)
-        return self
-
-    def batchUpdate(self, **kwargs):
-        self._pending = ("batch_update", kwargs)
-        return self
-
-    def append(self, **kwargs):
-        self._pending = ("append", kwargs)
-        return self
-
-    def execute(self):
-        if self._pending is None:
-            return {"ok": True, "updated_at": datetime.now(ZoneInfo("UTC")).isoformat()}
-
-        operation, kwargs = self._pending
-        self._pending = None
-        if operation == "spreadsheet_get":
-            return {
-                "sheets": [
-                    {"properties": {"title": sheet_name}}
-                    for sheet_name in sorted(self.existing_sheets)
-                ]
-            }
-        if operation == "batch_update":
-            for request in kwargs["body"]["requests"]:
-                sheet_name = request["addSheet"]["properties"]["title"]
-                self.existing_sheets.add(sheet_name)
-                self.created_sheets.append(sheet_name)
-            return {"ok": True}
-        if operation == "values_get":
-            sheet_name = kwargs["range"].split("!", maxsplit=1)[0]
-            return {"values": self.sheet_values.get(sheet_name, [])}
-        if operation == "append":
-            self.append_calls.append(kwargs)
-            sheet_name = kwargs["range"].split("!", maxsplit=1)[0]
-            self.sheet_values.setdefault(sheet_name, []).extend(kwargs["body"]["values"])
-            return {"ok": True, "updated_at": datetime.now(ZoneInfo("UTC")).isoformat()}
-        return {"ok": True}
+    assert [progress.retry_in_seconds for progress in reported[-3:]] == [0.01, 0.02, 0.02]
+    assert reported[-4].rows == summary.total_rows
+
+
+@pytest.mark.asyncio
+async def test_google_sheets_sync_gives_up_and_keeps_state_on_persistent_errors(
+    session_factory: async_sessionmaker[AsyncSession],
+) -> None:
+    settings = make_settings(
+        spreadsheet_id="spreadsheet-123",
+        google_sheets_max_attempts=2,
+        google_sheets_retry_base_seconds=0.01,
+    )
+    period = resolve_month_period(year=2026, month=5, timezone=settings.timezone)
+    fake_client = FakeSheetsClient()
+    fake_client.fail_next("values.batchGet", FakeHttpError(400))
+    fake_client.fail_next("values.batchUpdate", FakeHttpError(500), FakeHttpError(500))
+
+    async with session_factory() as session:
+        await seed_initial_data(session, settings)
+        await seed_may_2026_transactions(session, settings)
+        service = GoogleSheetsService(session, settings, sheets_client=fake_client)
+        with pytest.raises(GoogleSheetsExportError, match="reading"):
+            await service.export_period(period)
+        with pytest.raises(GoogleSheetsExportError, match="writing"):
+            await service.export_period(period)
+        assert await SettingRepository(session).get_value(GOOGLE_SHEETS_SYNC_SETTINGS_KEY) is None
+
+        summary = await service.export_period(period)
+
+    assert fake_client.failed_calls == [
+        "values.batchGet",
+        "values.batchUpdate",
+        "values.batchUpdate",
+    ]
+    assert summary is not None
+    assert len(fake_client.values_of("transactions")) == len(MAY_2026_TRANSACTION_ROWS) + 1
+
+
+@pytest.mark.asyncio
+async def test_google_sheets_sync_adopts_rows_of_an_existing_spreadsheet(
+    session_factory: async_sessionmaker[AsyncSession],
+) -> None:
+    settings = make_settings(spreadsheet_id="spreadsheet-123")
+    period = resolve_month_period(year=2026, month=5, timezone=settings.timezone)
+    async with session_factory() as session:
+        await seed_initial_data(session, settings)
+        await seed_may_2026_transactions(session, settings)
+        await session.commit()
+
+    # The rows an appending export left in the spreadsheet: an April history row, then May.
+    scratch_client = FakeSheetsClient()
+    async with session_factory() as session:
+        await GoogleSheetsService(
+            session,
+            settings,
+            sheets_client=scratch_client,
+        ).export_period(period)
+    may_rows = scratch_client.values_of("transactions")[1:]
+    april_row = ["900", "2026-04-10T12:00:00+07:00", "food", "Продукты", "1200"]
+    april_cashflow = ["Апрель 2026", "0", "1200", "-1200"]
+    fake_client = FakeSheetsClient(existing_sheets=set(GOOGLE_SHEETS_TABLES))
+    fake_client.grids["transactions"] = [
+        list(TRANSACTION_EXPORT_COLUMNS),
+        april_row,
+        *may_rows,
+    ]
+    fake_client.grids["cashflow"] = [
+        scratch_client.values_of("cashflow")[0],
+        april_cashflow,
+    ]
+
+    async with session_factory() as session:
+        summary = await GoogleSheetsService(
+            session,
+            settings,
+            sheets_client=fake_client,
+        ).export_period(period)
+        await session.commit()
+
+    assert summary is not None
+    assert fake_client.calls_of("values.batchClear") == []
+    assert fake_client.values_of("transactions") == [
+        list(TRANSACTION_EXPORT_COLUMNS),
+        april_row,
+        *may_rows,
+    ]
+    cashflow = fake_client.values_of("cashflow")
+    assert cashflow[1] == april_cashflow
+    assert cashflow[2:] == scratch_client.values_of("cashflow")[1:]
+
+    async with session_factory() as session:
+        again = await GoogleSheetsService(
+            session,
+            settings,
+            sheets_client=fake_client,
+        ).export_period(period)
+        await session.commit()
+
+    assert again is not None
+    assert again.total_rows == 0
+    assert len(fake_client.calls_of("values.batchGet")) == 1
+
+
+@pytest.mark.asyncio
+async def test_google_sheets_sync_keeps_summary_blocks_per_period(
+    session_factory: async_sessionmaker[AsyncSession],
+) -> None:
+    settings = make_settings(spreadsheet_id="spreadsheet-123")
+    timezone = ZoneInfo(settings.timezone)
+    month = resolve_month_period(year=2026, month=5, timezone=settings.timezone)
+    year = resolve_period(
+        PeriodKind.YEAR,
+        now=datetime(2026, 6, 1, tzinfo=timezone),
+        timezone=settings.timezone,
+    )
+    fake_client = FakeSheetsClient()
+
+    async with session_factory() as session:
+        await seed_initial_data(session, settings)
+        await seed_may_2026_transactions(session, settings)
+        service = GoogleSheetsService(session, settings, sheets_client=fake_client)
+        await service.export_period(month)
+        await service.export_period(year)
+        month_cashflow, year_cashflow = fake_client.values_of("cashflow")[1:]
+
+        transaction = await TransactionService(session, settings).create_from_category_sort_order(
+            amount=5000,
+            category_sort_order=1,
+            payer_telegram_id=1002,
+            raw_text="50 1",
+        )
+        await TransactionService(session, settings).update_transaction(
+            transaction_id=transaction.id,
+            changed_by_telegram_id=1002,
+            occurred_at=datetime(2026, 5, 30, 12, tzinfo=timezone),
+        )
+        await service.export_period(month)
+        cashflow = fake_client.values_of("cashflow")
+
+        resynced = await service.export_period(month, resync=True)
+
+    assert [row[0] for row in cashflow[1:]] == [month.label, year.label]
+    assert cashflow[1] != month_cashflow
+    assert cashflow[2] == year_cashflow
+    assert fake_client.values_of("by_category")[0][0] == "category_code"
+
+    assert resynced is not None
+    assert len(fake_client.calls_of("values.batchClear")) == 1
+    assert [row[0] for row in fake_client.values_of("cashflow")[1:]] == [month.label]
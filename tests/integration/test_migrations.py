@@ -3,6 +3,11 @@ from pathlib import Path
 
 from alembic import command
 from alembic.config import Config
+from financial_bot.app.domain.bank_sms import (
+    classify_redacted_bank_sms_shape,
+    hash_bank_sms_shape,
+)
+from financial_bot.app.storage.repositories.bank_event_repository import bank_event_shape_values
 
 
 def test_tbank_migration_allows_tbank_bank_events(tmp_path: Path) -> None:
@@ -239,6 +244,260 @@ def test_transaction_scope_migration_backfills_rows_and_category_aliases(tmp_pat
     assert aliases == {"такси", "транспорт", "канцелярия", "расходники"}
 
 
+def test_transaction_daily_totals_migration_backfills_report_effective_rows(
+    tmp_path: Path,
+) -> None:
+    db_path = tmp_path / "migration-daily-totals.sqlite3"
+    config = _alembic_config(db_path)
+
+    command.upgrade(config, "20260702_0013")
+
+    with sqlite3.connect(db_path) as connection:
+        connection.execute(
+            """
+            insert into users (telegram_id, name, role, is_active)
+            values (1001, 'Husband', 'husband', 1)
+            """
+        )
+        user_id = connection.execute("select id from users where role = 'husband'").fetchone()[0]
+        connection.execute(
+            """
+            insert into categories (code, title, owner_role, sort_order, is_expense, is_active)
+            values ('rollup_groceries', 'Продукты', 'system', 90, 1, 1)
+            """
+        )
+        category_id = connection.execute(
+            "select id from categories where code = 'rollup_groceries'"
+        ).fetchone()[0]
+        connection.executemany(
+            """
+            insert into transactions (
+                amount, currency, occurred_at, payer_user_id, category_id, type, source, scope,
+                included_in_reports, created_by_user_id, deleted_at
+            )
+            values (?, 'RUB', ?, ?, ?, ?, 'card', 'household', ?, ?, ?)
+            """,
+            (
+                (10000, "2026-07-02 09:00:00", user_id, category_id, "expense", 1, user_id, None),
+                (20000, "2026-07-02 21:00:00", user_id, category_id, "expense", 1, user_id, None),
+                (3000, "2026-07-02 22:00:00", user_id, category_id, "correction", 1, user_id, None),
+                (
+                    50000,
+                    "2026-07-02 23:00:00",
+                    user_id,
+                    category_id,
+                    "expense",
+                    1,
+                    user_id,
+                    "2026-07-03 10:00:00",
+                ),
+                (7000, "2026-07-03 10:00:00", user_id, category_id, "income", 0, user_id, None),
+            ),
+        )
+        connection.commit()
+
+    command.upgrade(config, "20260705_0014")
+
+    assert "ix_transaction_daily_totals_local_date" in _index_names(
+        db_path, "transaction_daily_totals"
+    )
+    with sqlite3.connect(db_path) as connection:
+        rows = connection.execute(
+            """
+            select local_date, scope, amount, transaction_count
+            from transaction_daily_totals
+            """
+        ).fetchall()
+
+    assert rows == [("2026-07-02", "household", 27000, 3)]
+
+
+def test_bank_event_stats_indexes_migration_adds_composite_indexes(tmp_path: Path) -> None:
+    db_path = tmp_path / "migration-bank-event-indexes.sqlite3"
+    config = _alembic_config(db_path)
+
+    command.upgrade(config, "20260706_0015")
+
+    index_names = _index_names(db_path, "bank_events")
+    assert "ix_bank_events_source_id_received_at" in index_names
+    assert "ix_bank_events_parse_status_operation_kind" in index_names
+
+    command.downgrade(config, "20260705_0014")
+
+    assert "ix_bank_events_source_id_received_at" not in _index_names(db_path, "bank_events")
+
+
+def test_data_versions_migration_creates_unique_key_table(tmp_path: Path) -> None:
+    db_path = tmp_path / "migration-data-versions.sqlite3"
+    config = _alembic_config(db_path)
+
+    command.upgrade(config, "20260708_0016")
+
+    assert "uq_data_versions_key" in _table_sql(db_path, "data_versions")
+    with sqlite3.connect(db_path) as connection:
+        connection.execute("insert into data_versions (key) values ('report_data')")
+        row = connection.execute(
+            "select version from data_versions where key = 'report_data'"
+        ).fetchone()
+    assert row == (0,)
+
+    command.downgrade(config, "20260706_0015")
+
+    with sqlite3.connect(db_path) as connection:
+        tables = {
+            row[0]
+            for row in connection.execute(
+                "select name from sqlite_master where type = 'table'"
+            ).fetchall()
+        }
+    assert "data_versions" not in tables
+
+
+def test_fsm_states_migration_creates_table_and_index(tmp_path: Path) -> None:
+    db_path = tmp_path / "migration-fsm-states.sqlite3"
+    config = _alembic_config(db_path)
+
+    command.upgrade(config, "20260709_0017")
+
+    assert "uq_fsm_states_storage_key" in _table_sql(db_path, "fsm_states")
+    assert "ix_fsm_states_updated_at" in _index_names(db_path, "fsm_states")
+
+    command.downgrade(config, "20260708_0016")
+
+    with sqlite3.connect(db_path) as connection:
+        tables = {
+            row[0]
+            for row in connection.execute(
+                "select name from sqlite_master where type = 'table'"
+            ).fetchall()
+        }
+    assert "fsm_states" not in tables
+
+
+def test_bank_event_notifications_migration_creates_outbox_table(tmp_path: Path) -> None:
+    db_path = tmp_path / "migration-bank-event-notifications.sqlite3"
+    config = _alembic_config(db_path)
+
+    command.upgrade(config, "20260710_0018")
+
+    table_sql = _table_sql(db_path, "bank_event_notifications")
+    assert "uq_bank_event_notifications_bank_event_id" in table_sql
+    assert "ck_bank_event_notifications_bank_event_notifications_status" in table_sql
+    assert "ix_bank_event_notifications_status_next_attempt_at" in _index_names(
+        db_path,
+        "bank_event_notifications",
+    )
+
+    command.downgrade(config, "20260709_0017")
+
+    with sqlite3.connect(db_path) as connection:
+        tables = {
+            row[0]
+            for row in connection.execute(
+                "select name from sqlite_master where type = 'table'"
+            ).fetchall()
+        }
+    assert "bank_event_notifications" not in tables
+
+
+def test_bank_event_notification_batches_migration_adds_event_ids(tmp_path: Path) -> None:
+    db_path = tmp_path / "migration-bank-event-notification-batches.sqlite3"
+    config = _alembic_config(db_path)
+
+    command.upgrade(config, "20260711_0019")
+
+    assert "bank_event_ids" in _column_names(db_path, "bank_event_notifications")
+
+    command.downgrade(config, "20260710_0018")
+
+    assert "bank_event_ids" not in _column_names(db_path, "bank_event_notifications")
+
+
+def test_bank_event_shapes_migration_backfills_unknown_events(tmp_path: Path) -> None:
+    db_path = tmp_path / "migration-bank-event-shapes.sqlite3"
+    config = _alembic_config(db_path)
+    # The revision keeps its own copy of the classifier; it must agree with the parser.
+    unknown_texts = {
+        "unknown-purchase": "СЧЁТ<redacted> 10:20 Покупка 120р TEST SHOP Баланс: <redacted>",
+        "unknown-transfer": "Перевод  1\u00a0250,50 ₽\nКарта *<redacted> Доступно 3 000 руб.",
+        "unknown-code": "Никому не сообщайте код 1234 для оплаты 3DS",
+        "unknown-empty": "",
+    }
+
+    command.upgrade(config, "20260711_0019")
+    with sqlite3.connect(db_path) as connection:
+        connection.execute(
+            """
+            insert into users (telegram_id, name, role, is_active)
+            values (1001, 'Husband', 'husband', 1)
+            """
+        )
+        owner_id = connection.execute("select id from users").fetchone()[0]
+        connection.execute(
+            """
+            insert into bank_event_sources (code, bank, channel, owner_user_id, token_hash)
+            values ('husband-sber-ios', 'sber', 'ios_shortcut', ?, ?)
+            """,
+            (owner_id, "0" * 64),
+        )
+        source_id = connection.execute("select id from bank_event_sources").fetchone()[0]
+        events = [
+            *((dedupe_key, "unknown", text) for dedupe_key, text in unknown_texts.items()),
+            ("ignored", "ignored", unknown_texts["unknown-purchase"]),
+        ]
+        for dedupe_key, operation_kind, text in events:
+            connection.execute(
+                """
+                insert into bank_events (
+                    source_id, bank, channel, received_at, operation_kind, parse_status,
+                    currency, redacted_text, normalized_text_hash, dedupe_key
+                )
+                values (?, 'sber', 'ios_shortcut', '2026-07-12 12:00:00', ?, 'ignored', 'RUB',
+                    ?, ?, ?)
+                """,
+                (source_id, operation_kind, text, dedupe_key, dedupe_key),
+            )
+
+    command.upgrade(config, "20260712_0020")
+
+    with sqlite3.connect(db_path) as connection:
+        rows = connection.execute(
+            """
+            select dedupe_key, shape_hash, shape_operation_markers, shape_amount_count,
+                shape_has_balance_marker, shape_has_instrument_marker, shape_ignored_reason,
+                shape_has_security_marker
+            from bank_events
+            order by dedupe_key
+            """
+        ).fetchall()
+    expected = [("ignored", None, None, None, None, None, None, None)]
+    for dedupe_key, text in sorted(unknown_texts.items()):
+        values = bank_event_shape_values(classify_redacted_bank_sms_shape(text, bank="sber"))
+        expected.append(
+            (
+                dedupe_key,
+                *(int(value) if isinstance(value, bool) else value for value in values.values()),
+            )
+        )
+    assert rows == expected
+    assert rows[-2] == (
+        "unknown-purchase",
+        hash_bank_sms_shape(
+            classify_redacted_bank_sms_shape(unknown_texts["unknown-purchase"], bank="sber")
+        ),
+        "purchase",
+        1,
+        1,
+        1,
+        "",
+        0,
+    )
+
+    command.downgrade(config, "20260711_0019")
+
+    assert "shape_hash" not in _column_names(db_path, "bank_events")
+
+
 def _alembic_config(db_path: Path) -> Config:
     config = Config("alembic.ini")
     config.set_main_option("script_location", "migrations")
@@ -261,3 +520,10 @@ def _index_names(db_path: Path, table_name: str) -> set[str]:
         return {
             row[1] for row in connection.execute(f"pragma index_list('{table_name}')").fetchall()
         }
+
+
+def _column_names(db_path: Path, table_name: str) -> set[str]:
+    with sqlite3.connect(db_path) as connection:
+        return {
+            row[1] for row in connection.execute(f"pragma table_info('{table_name}')").fetchall()
+        }
@@ -0,0 +1,176 @@
+from collections.abc import AsyncIterator, Iterator
+from contextlib import contextmanager
+from pathlib import Path
+
+import pytest
+import pytest_asyncio
+from financial_bot.app.config import Settings
+from financial_bot.app.services.alias_service import AliasService
+from financial_bot.app.services.category_settings_service import CategorySettingsService
+from financial_bot.app.services.seed_service import seed_initial_data
+from financial_bot.app.services.transaction_service import TransactionService
+from financial_bot.app.storage.db import create_engine, create_session_factory
+from financial_bot.app.storage.models import Base, CategoryModel, UserModel
+from financial_bot.app.storage.reference_data import preload_reference_data
+from financial_bot.app.storage.repositories.category_repository import CategoryRepository
+from financial_bot.app.storage.repositories.data_version_repository import (
+    REFERENCE_DATA_VERSION_KEY,
+    DataVersionRepository,
+)
+from financial_bot.app.storage.repositories.user_repository import UserRepository
+from sqlalchemy import event, update
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+REFERENCE_TABLES = ("categories", "category_aliases", "users")
+
+
+@pytest_asyncio.fixture
+async def session_factory(tmp_path: Path) -> AsyncIterator[async_sessionmaker[AsyncSession]]:
+    pytest.importorskip("aiosqlite")
+    database_url = f"sqlite+aiosqlite:///{tmp_path}/reference-data.sqlite3"
+    engine = create_engine(database_url)
+    async with engine.begin() as connection:
+        await connection.run_sync(Base.metadata.create_all)
+
+    try:
+        yield create_session_factory(engine)
+    finally:
+        await engine.dispose()
+
+
+def make_settings() -> Settings:
+    return Settings(
+        _env_file=None,
+        bot_token="123456:secret-token",
+        database_url="sqlite+aiosqlite:///unused.sqlite3",
+        allowed_telegram_ids="1001,1002",
+        default_currency="RUB",
+        timezone="Asia/Barnaul",
+        husband_telegram_id=1001,
+        wife_telegram_id=1002,
+    )
+
+
+@pytest.mark.asyncio
+async def test_expense_handler_reads_no_reference_rows_after_preload(
+    session_factory: async_sessionmaker[AsyncSession],
+) -> None:
+    settings = make_settings()
+    async with session_factory() as session:
+        await seed_initial_data(session, settings)
+        await session.commit()
+    await preload_reference_data(session_factory)
+
+    with _recorded_statements(session_factory) as statements:
+        async with session_factory() as session:
+            service = TransactionService(session, settings)
+            created = await service.create_from_free_text(
+                text="350 продукты",
+                current_payer_telegram_id=1001,
+            )
+            latest = await service.get_latest_transaction_for_user(telegram_id=1001)
+            await session.commit()
+
+    reference_reads = [
+        statement
+        for statement in statements
+        if statement.startswith("SELECT")
+        and any(f"FROM {table}" in statement for table in REFERENCE_TABLES)
+    ]
+    assert reference_reads == []
+    assert sum("FROM data_versions" in statement for statement in statements) == 1
+    assert created.category_code == "groceries"
+    assert created.payer_role == "husband"
+    assert latest is not None
+    assert latest.id == created.id
+
+
+@pytest.mark.asyncio
+async def test_reference_data_follows_changes_of_this_and_other_processes(
+    session_factory: async_sessionmaker[AsyncSession],
+) -> None:
+    settings = make_settings()
+    async with session_factory() as session:
+        await seed_initial_data(session, settings)
+        await session.commit()
+
+    async with session_factory() as session:
+        await CategorySettingsService(session).rename_category(
+            category_code="groceries",
+            new_title="Еда",
+        )
+        await session.rollback()
+    async with session_factory() as session:
+        groceries = await CategoryRepository(session).get_by_code("groceries")
+        assert groceries is not None
+        assert groceries.title == "Продукты"
+
+    async with session_factory() as session:
+        await CategorySettingsService(session).add_alias(category_code="groceries", alias="еда")
+        await session.commit()
+    async with session_factory() as session:
+        category = await CategoryRepository(session).get_by_alias("Еда")
+        assert category is not None
+        assert category.code == "groceries"
+
+    # Another process only changes the rows and the data version.
+    async with session_factory() as session:
+        await session.execute(
+            update(CategoryModel).where(CategoryModel.code == "groceries").values(title="Еда")
+        )
+        await session.execute(
+            update(UserModel).where(UserModel.telegram_id == 1002).values(is_active=False)
+        )
+        await DataVersionRepository(session).bump(REFERENCE_DATA_VERSION_KEY)
+        await session.commit()
+    async with session_factory() as session:
+        groceries = await CategoryRepository(session).get_by_code("groceries")
+        active_users = await UserRepository(session).list_active()
+        assert groceries is not None
+        assert groceries.title == "Еда"
+        assert [user.telegram_id for user in active_users] == [1001]
+
+
+@pytest.mark.asyncio
+async def test_reference_rows_changed_in_the_session_are_not_overwritten(
+    session_factory: async_sessionmaker[AsyncSession],
+) -> None:
+    settings = make_settings()
+    async with session_factory() as session:
+        await seed_initial_data(session, settings)
+        await session.commit()
+    async with session_factory() as session:
+        # Builds the process-wide alias index before the category changes.
+        assert await AliasService(session).resolve_category("350 продукты") is not None
+
+    async with session_factory() as session:
+        categories = CategoryRepository(session)
+        groceries = await categories.get_by_code("groceries")
+        assert groceries is not None
+        groceries.is_active = False
+        groceries.title = "Старые продукты"
+
+        assert await categories.get(groceries.id) is groceries
+        match = await AliasService(session).resolve_category("350 продукты")
+        assert match is not None
+        assert match.category is groceries
+        assert groceries.title == "Старые продукты"
+        assert await categories.get_by_sort_order(groceries.sort_order) is None
+        assert groceries not in await categories.list_active()
+
+
+@contextmanager
+def _recorded_statements(
+    session_factory: async_sessionmaker[AsyncSession],
+) -> Iterator[list[str]]:
+    statements: list[str] = []
+    engine = session_factory.kw["bind"].sync_engine
+
+    def record_statement(*args: object) -> None:
+        statements.append(" ".join(str(args[2]).split()))
+
+    event.listen(engine, "before_cursor_execute", record_statement)
+    try:
+        yield statements
+    finally:
+        event.remove(engine, "before_cursor_execute", record_statement)
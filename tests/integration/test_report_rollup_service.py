@@ -0,0 +1,348 @@
+from collections.abc import AsyncIterator
+from datetime import date, datetime
+from pathlib import Path
+from zoneinfo import ZoneInfo
+
+import pytest
+import pytest_asyncio
+from financial_bot.app.config import Settings
+from financial_bot.app.domain.periods import resolve_month_period
+from financial_bot.app.domain.types import TransactionScope
+from financial_bot.app.services.report_rollup_service import ReportRollupService
+from financial_bot.app.services.seed_service import seed_initial_data
+from financial_bot.app.services.transaction_service import TransactionService
+from financial_bot.app.storage.db import create_engine, create_session_factory
+from financial_bot.app.storage.models import Base, TransactionDailyTotalModel
+from financial_bot.app.storage.repositories.report_repository import (
+    MonthlyTotalRow,
+    ReportRepository,
+)
+from sqlalchemy import delete, event
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+
+@pytest_asyncio.fixture
+async def session_factory(tmp_path: Path) -> AsyncIterator[async_sessionmaker[AsyncSession]]:
+    pytest.importorskip("aiosqlite")
+    database_url = f"sqlite+aiosqlite:///{tmp_path}/report-rollup.sqlite3"
+    engine = create_engine(database_url)
+    async with engine.begin() as connection:
+        await connection.run_sync(Base.metadata.create_all)
+
+    try:
+        yield create_session_factory(engine)
+    finally:
+        await engine.dispose()
+
+
+def make_settings() -> Settings:
+    return Settings(
+        _env_file=None,
+        bot_token="123456:secret-token",
+        database_url="sqlite+aiosqlite:///unused.sqlite3",
+        allowed_telegram_ids="1001,1002",
+        default_currency="RUB",
+        timezone="Asia/Barnaul",
+        husband_telegram_id=1001,
+        wife_telegram_id=1002,
+    )
+
+
+async def _seed_mixed_transactions(session: AsyncSession, settings: Settings) -> None:
+    timezone = ZoneInfo(settings.timezone)
+    transactions = TransactionService(session, settings)
+    categories = await transactions.list_category_options()
+    groceries = next(category for category in categories if category.code == "groceries")
+    restaurants = next(category for category in categories if category.code == "restaurants_cafes")
+
+    expense = await transactions.create_from_category_selection(
+        amount=100000,
+        category_id=groceries.id,
+        payer_telegram_id=1001,
+        raw_text="1000 продукты",
+    )
+    await transactions.update_transaction(
+        transaction_id=expense.id,
+        changed_by_telegram_id=1001,
+        occurred_at=datetime(2026, 5, 5, 23, 30, tzinfo=timezone),
+    )
+    refund = await transactions.create_correction_from_category_selection(
+        amount=30000,
+        category_id=groceries.id,
+        payer_telegram_id=1001,
+        raw_text="bank_refund_event:1",
+    )
+    await transactions.update_transaction(
+        transaction_id=refund.id,
+        changed_by_telegram_id=1001,
+        occurred_at=datetime(2026, 5, 6, 0, 30, tzinfo=timezone),
+    )
+    moved = await transactions.create_from_category_selection(
+        amount=200000,
+        category_id=groceries.id,
+        payer_telegram_id=1002,
+        raw_text="2000 продукты",
+        scope=TransactionScope.SALON,
+    )
+    await transactions.update_transaction(
+        transaction_id=moved.id,
+        changed_by_telegram_id=1002,
+        category_id=restaurants.id,
+        payer_role="husband",
+        occurred_at=datetime(2026, 6, 1, 0, 0, tzinfo=timezone),
+    )
+    deleted = await transactions.create_from_category_selection(
+        amount=700000,
+        category_id=groceries.id,
+        payer_telegram_id=1001,
+        raw_text="7000 продукты",
+    )
+    await transactions.update_transaction(
+        transaction_id=deleted.id,
+        changed_by_telegram_id=1001,
+        occurred_at=datetime(2026, 5, 8, 12, tzinfo=timezone),
+    )
+    await transactions.delete_transaction(transaction_id=deleted.id, changed_by_telegram_id=1001)
+    internal_transfer = await transactions.create_from_free_text(
+        text="5000 сам себе",
+        current_payer_telegram_id=1001,
+    )
+    await transactions.update_transaction(
+        transaction_id=internal_transfer.id,
+        changed_by_telegram_id=1001,
+        occurred_at=datetime(2026, 5, 9, 12, tzinfo=timezone),
+    )
+    await transactions.create_income(
+        amount=10000000,
+        recipient_telegram_id=1001,
+        raw_text="salary",
+    )
+
+
+@pytest.mark.asyncio
+async def test_transaction_mutations_keep_daily_rollup_consistent(
+    session_factory: async_sessionmaker[AsyncSession],
+) -> None:
+    settings = make_settings()
+
+    async with session_factory() as session:
+        await seed_initial_data(session, settings)
+        await _seed_mixed_transactions(session, settings)
+        check = await ReportRollupService(session, settings).check()
+        await session.commit()
+
+    assert check.is_consistent
+    assert check.checked_rows == 3
+
+
+@pytest.mark.asyncio
+async def test_rollup_reports_match_raw_transaction_scan(
+    session_factory: async_sessionmaker[AsyncSession],
+) -> None:
+    settings = make_settings()
+
+    async with session_factory() as session:
+        await seed_initial_data(session, settings)
+        await _seed_mixed_transactions(session, settings)
+        rollup = ReportRepository(session, timezone=settings.timezone)
+        raw = ReportRepository(session)
+
+        for month in (5, 6):
+            period = resolve_month_period(year=2026, month=month, timezone=settings.timezone)
+            for scope in (None, TransactionScope.HOUSEHOLD, TransactionScope.SALON):
+                args = (period.start_at, period.end_at)
+                assert await rollup.total_expenses(*args, scope=scope) == (
+                    await raw.total_expenses(*args, scope=scope)
+                )
+                assert await rollup.totals_by_payer(*args, scope=scope) == (
+                    await raw.totals_by_payer(*args, scope=scope)
+                )
+                assert await rollup.totals_by_category(*args, scope=scope) == (
+                    await raw.totals_by_category(*args, scope=scope)
+                )
+        may = resolve_month_period(year=2026, month=5, timezone=settings.timezone)
+        may_total = await rollup.total_expenses(may.start_at, may.end_at)
+        await session.commit()
+
+    assert may_total == 70000
+
+
+@pytest.mark.asyncio
+async def test_rollup_check_reports_drift_and_rebuild_repairs_it(
+    session_factory: async_sessionmaker[AsyncSession],
+) -> None:
+    settings = make_settings()
+
+    async with session_factory() as session:
+        await seed_initial_data(session, settings)
+        await _seed_mixed_transactions(session, settings)
+        await session.execute(delete(TransactionDailyTotalModel))
+        service = ReportRollupService(session, settings)
+
+        drifted = await service.check()
+        rebuilt = await service.rebuild()
+        repaired = await service.check()
+        await session.commit()
+
+    assert not drifted.is_consistent
+    assert {mismatch.actual_count for mismatch in drifted.mismatches} == {0}
+    assert rebuilt.row_count == 3
+    assert rebuilt.transaction_count == 3
+    assert repaired.is_consistent
+
+
+@pytest.mark.asyncio
+async def test_transaction_edits_survive_a_missing_rollup_row(
+    session_factory: async_sessionmaker[AsyncSession],
+) -> None:
+    settings = make_settings()
+    async with session_factory() as session:
+        await seed_initial_data(session, settings)
+        transactions = TransactionService(session, settings)
+        created = await transactions.create_from_free_text(
+            text="350 продукты",
+            current_payer_telegram_id=1001,
+        )
+        await session.execute(delete(TransactionDailyTotalModel))
+
+        edited = await transactions.update_transaction(
+            transaction_id=created.id,
+            changed_by_telegram_id=1001,
+            amount=40000,
+        )
+        after_edit = await ReportRollupService(session, settings).check()
+        await transactions.delete_transaction(
+            transaction_id=created.id,
+            changed_by_telegram_id=1001,
+        )
+        after_delete = await ReportRollupService(session, settings).check()
+
+    # The skipped decrement leaves the rollup right: the edit re-adds the new amount.
+    assert edited.amount == 40000
+    assert after_edit.is_consistent
+    assert after_edit.checked_rows == 1
+    assert after_delete.is_consistent
+
+
+@pytest.mark.asyncio
+async def test_daily_totals_bucket_local_days_across_dst_in_one_query(
+    session_factory: async_sessionmaker[AsyncSession],
+) -> None:
+    settings = make_settings().model_copy(update={"timezone": "Europe/Berlin"})
+    timezone = ZoneInfo(settings.timezone)
+    statements: list[str] = []
+
+    async with session_factory() as session:
+        await seed_initial_data(session, settings)
+        transactions = TransactionService(session, settings)
+        groceries = next(
+            category
+            for category in await transactions.list_category_options()
+            if category.code == "groceries"
+        )
+        for amount, occurred_at, scope in (
+            (10000, datetime(2026, 3, 28, 23, 30, tzinfo=timezone), TransactionScope.HOUSEHOLD),
+            (20000, datetime(2026, 3, 29, 23, 30, tzinfo=timezone), TransactionScope.HOUSEHOLD),
+            (40000, datetime(2026, 3, 31, 23, 59, tzinfo=timezone), TransactionScope.SALON),
+            (80000, datetime(2026, 4, 1, 0, 15, tzinfo=timezone), TransactionScope.HOUSEHOLD),
+        ):
+            await transactions.create_from_category_selection(
+                amount=amount,
+                category_id=groceries.id,
+                payer_telegram_id=1001,
+                raw_text=str(amount),
+                scope=scope,
+                occurred_at=occurred_at,
+            )
+        await session.commit()
+
+        march = resolve_month_period(year=2026, month=3, timezone=settings.timezone)
+        april = resolve_month_period(year=2026, month=4, timezone=settings.timezone)
+        reports = ReportRepository(session, timezone=settings.timezone)
+        engine = session.get_bind()
+
+        def record_statement(*args: object) -> None:
+            statements.append(str(args[2]))
+
+        event.listen(engine, "before_cursor_execute", record_statement)
+        try:
+            totals = await reports.daily_totals(
+                [
+                    (march.start_at.date(), march.end_at.date()),
+                    (april.start_at.date(), april.end_at.date()),
+                ]
+            )
+        finally:
+            event.remove(engine, "before_cursor_execute", record_statement)
+        household = await reports.daily_totals(
+            [(march.start_at.date(), april.end_at.date())],
+            scope=TransactionScope.HOUSEHOLD,
+        )
+
+    assert len(statements) == 1
+    assert totals == {
+        date(2026, 3, 28): 10000,
+        date(2026, 3, 29): 20000,
+        date(2026, 3, 31): 40000,
+        date(2026, 4, 1): 80000,
+    }
+    assert household == {
+        date(2026, 3, 28): 10000,
+        date(2026, 3, 29): 20000,
+        date(2026, 4, 1): 80000,
+    }
+
+
+@pytest.mark.asyncio
+async def test_monthly_totals_group_months_with_optional_breakdowns(
+    session_factory: async_sessionmaker[AsyncSession],
+) -> None:
+    settings = make_settings()
+
+    async with session_factory() as session:
+        await seed_initial_data(session, settings)
+        await _seed_mixed_transactions(session, settings)
+        reports = ReportRepository(session, timezone=settings.timezone)
+        raw = ReportRepository(session)
+        april = resolve_month_period(year=2026, month=4, timezone=settings.timezone)
+        june = resolve_month_period(year=2026, month=6, timezone=settings.timezone)
+        start_date, end_date = april.start_at.date(), june.end_at.date()
+
+        totals = await reports.monthly_totals(start_date, end_date)
+        salon = await reports.monthly_totals(start_date, end_date, scope=TransactionScope.SALON)
+        by_scope_and_category = await reports.monthly_totals(
+            start_date,
+            end_date,
+            by_scope=True,
+            by_category=True,
+        )
+        raw_totals = {}
+        for month in (5, 6):
+            period = resolve_month_period(year=2026, month=month, timezone=settings.timezone)
+            raw_totals[month] = await raw.total_expenses(period.start_at, period.end_at)
+        await session.commit()
+
+    assert totals == [
+        MonthlyTotalRow(year=2026, month=5, scope=None, category_code=None, amount=70000),
+        MonthlyTotalRow(year=2026, month=6, scope=None, category_code=None, amount=200000),
+    ]
+    assert {row.month: row.amount for row in totals} == raw_totals
+    assert salon == [
+        MonthlyTotalRow(year=2026, month=6, scope=None, category_code=None, amount=200000)
+    ]
+    assert by_scope_and_category == [
+        MonthlyTotalRow(
+            year=2026,
+            month=5,
+            scope="household",
+            category_code="groceries",
+            amount=70000,
+        ),
+        MonthlyTotalRow(
+            year=2026,
+            month=6,
+            scope="salon",
+            category_code="restaurants_cafes",
+            amount=200000,
+        ),
+    ]
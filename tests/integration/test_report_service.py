@@ -1,19 +1,22 @@
 from collections.abc import AsyncIterator
-from datetime import datetime
+from datetime import datetime, timedelta
 from pathlib import Path
 from zoneinfo import ZoneInfo
 
 import pytest
 import pytest_asyncio
 from financial_bot.app.config import Settings
-from financial_bot.app.domain.periods import PeriodKind
+from financial_bot.app.domain.periods import PeriodKind, resolve_month_period
 from financial_bot.app.domain.types import TransactionScope
 from financial_bot.app.services.report_service import ReportService
 from financial_bot.app.services.seed_service import seed_initial_data
 from financial_bot.app.services.transaction_service import TransactionService
 from financial_bot.app.storage.db import create_engine, create_session_factory
 from financial_bot.app.storage.models import Base
+from financial_bot.app.storage.repositories.report_repository import ReportRepository
+from sqlalchemy import event
 from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+from tests.fixtures.may_2026 import seed_may_2026_transactions
 
 
 @pytest_asyncio.fixture
@@ -282,3 +285,81 @@ async def test_category_totals_are_ordered_by_signed_amount_after_corrections(
         ("restaurants_cafes", 500_000),
         ("groceries", 100_000),
     ]
+
+
+@pytest.mark.asyncio
+async def test_period_totals_match_per_query_aggregates(
+    session_factory: async_sessionmaker[AsyncSession],
+) -> None:
+    settings = make_settings()
+
+    async with session_factory() as session:
+        await seed_initial_data(session, settings)
+        await seed_may_2026_transactions(session, settings)
+        transactions = TransactionService(session, settings)
+        salon = await transactions.create_from_category_sort_order(
+            amount=500000,
+            category_sort_order=6,
+            payer_telegram_id=1002,
+            raw_text="салон 5000 6",
+            scope=TransactionScope.SALON,
+        )
+        await transactions.update_transaction(
+            transaction_id=salon.id,
+            changed_by_telegram_id=1002,
+            occurred_at=datetime(2026, 5, 25, 12, tzinfo=ZoneInfo(settings.timezone)),
+        )
+
+        period = resolve_month_period(year=2026, month=5, timezone=settings.timezone)
+        ranges = (
+            (period.start_at, period.end_at),
+            (period.start_at + timedelta(hours=12), period.end_at),
+        )
+        for repository in (
+            ReportRepository(session, timezone=settings.timezone),
+            ReportRepository(session),
+        ):
+            for start_at, end_at in ranges:
+                for scope in (None, TransactionScope.HOUSEHOLD, TransactionScope.SALON):
+                    totals = await repository.period_totals(start_at, end_at, scope=scope)
+                    assert totals.total == await repository.total_expenses(
+                        start_at, end_at, scope=scope
+                    )
+                    assert list(totals.by_payer) == await repository.totals_by_payer(
+                        start_at, end_at, scope=scope
+                    )
+                    assert list(totals.by_category) == await repository.totals_by_category(
+                        start_at, end_at, scope=scope
+                    )
+        await session.commit()
+
+
+@pytest.mark.asyncio
+async def test_build_period_report_uses_one_aggregate_query(
+    session_factory: async_sessionmaker[AsyncSession],
+) -> None:
+    settings = make_settings()
+    statements: list[str] = []
+
+    async with session_factory() as session:
+        await seed_initial_data(session, settings)
+        await seed_may_2026_transactions(session, settings)
+        await session.flush()
+
+        engine = session.bind.sync_engine
+
+        def record_statement(*args: object) -> None:
+            statements.append(str(args[2]))
+
+        event.listen(engine, "before_cursor_execute", record_statement)
+        try:
+            report = await ReportService(session, settings).build_period_report(
+                PeriodKind.MONTH,
+                now=datetime(2026, 5, 20, 12, tzinfo=ZoneInfo(settings.timezone)),
+            )
+        finally:
+            event.remove(engine, "before_cursor_execute", record_statement)
+        await session.commit()
+
+    assert report.total_amount == 523244_00
+    assert len(statements) == 1
@@ -6,7 +6,11 @@ from financial_bot.app.bot.formatters.bank_learning import (
     format_bank_learning_rule_status_updated,
     format_bank_learning_rules_list,
 )
-from financial_bot.app.domain.bank_learning import normalize_bank_merchant_key
+from financial_bot.app.domain.bank_learning import (
+    BankMerchantTrigramIndex,
+    SimilarBankMerchant,
+    normalize_bank_merchant_key,
+)
 from financial_bot.app.domain.types import BankCategoryRuleMode
 from financial_bot.app.services.bank_learning_rule_service import (
     BankLearningRuleDetails,
@@ -24,6 +28,23 @@ def test_normalize_bank_merchant_key() -> None:
     assert normalize_bank_merchant_key("   ") == ""
 
 
+def test_trigram_index_matches_other_outlets_of_a_merchant() -> None:
+    index = BankMerchantTrigramIndex(
+        ["pyaterochka 1234", "pyaterochka 5678", "apteka rigla", "restoran test", "1234"]
+    )
+
+    assert len(index) == 4
+    assert index.best_match("pyaterochka 9999") == SimilarBankMerchant("pyaterochka 1234", 1.0)
+    assert index.best_match("pyaterochka 1234") == SimilarBankMerchant("pyaterochka 5678", 1.0)
+    assert index.best_match("apteka test") is None
+    assert index.best_match("apteka test", min_score=0.3) == SimilarBankMerchant(
+        "apteka rigla", 7 / 18
+    )
+    assert index.best_match("restoran") == SimilarBankMerchant("restoran test", 9 / 13)
+    assert index.best_match("5678") is None
+    assert BankMerchantTrigramIndex([]).best_match("pyaterochka") is None
+
+
 def test_bank_learning_rules_list_explains_management_path() -> None:
     text = format_bank_learning_rules_list(
         (
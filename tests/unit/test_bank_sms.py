@@ -1,10 +1,26 @@
 from datetime import time
+from hashlib import sha256
 
 import pytest
 from financial_bot.app.domain.bank_sms import (
+    SBER_GENERIC_CREDIT_RE,
+    SBER_RULES,
+    SBER_RULES_BY_KEYWORD,
+    SBER_SAFE_CREDIT_FALLBACK_RE,
+    SBER_SALARY_RE,
+    TBANK_RULES,
+    TBANK_RULES_BY_KEYWORD,
+    VTB_RULES,
+    VTB_RULES_BY_KEYWORD,
     BankSmsBank,
     BankSmsOperationKind,
+    _leading_keyword,
+    _sber_operation_keyword,
+    classify_bank_sms_shape,
+    normalize_bank_sms,
     parse_bank_sms,
+    parse_normalized_bank_sms,
+    redact_bank_sms_text,
 )
 from financial_bot.app.domain.types import TransactionSource
 
@@ -406,3 +422,67 @@ def test_vtb_redacted_text_removes_spaced_account_suffix() -> None:
     assert "EXTERNAL PERSON" not in parsed.redacted_text
     assert "Счет*<redacted>" in parsed.redacted_text
     assert "<counterparty>" in parsed.redacted_text
+
+
+def test_normalized_sms_matches_standalone_helpers_and_keeps_stored_hash() -> None:
+    text = "  СЧЁТ1111 10:26\n перевод 10р   FAMILY ACCOUNT Баланс: 999р "
+    sms = normalize_bank_sms(text, sender="900")
+
+    assert sms.text == "СЧЁТ1111 10:26 перевод 10р FAMILY ACCOUNT Баланс: 999р"
+    assert sms.bank == BankSmsBank.SBER
+    assert sms.ignore_reason == ""
+    assert sms.redacted_text == redact_bank_sms_text(text)
+    assert sms.shape == classify_bank_sms_shape(text, sender="900")
+    assert parse_normalized_bank_sms(sms, self_counterparty_aliases=SELF_ALIASES) == (
+        parse_bank_sms(text, sender="900", self_counterparty_aliases=SELF_ALIASES)
+    )
+    # Existing bank events were hashed with whitespace folding; the normalized text needs none.
+    legacy_hash = sha256(" ".join(sms.redacted_text.lower().split()).encode("utf-8")).hexdigest()
+    assert sms.redacted_text_hash == legacy_hash
+
+
+def test_operation_keyword_selects_only_matching_pattern_family() -> None:
+    keyword = _sber_operation_keyword("СЧЁТ1111 01.07.26 05:37 Зачисление 1471,20р Баланс: 999р")
+
+    assert keyword == "зачисление"
+    assert [rule.pattern for rule in SBER_RULES_BY_KEYWORD[keyword]] == [
+        SBER_SALARY_RE,
+        SBER_GENERIC_CREDIT_RE,
+        SBER_SAFE_CREDIT_FALLBACK_RE,
+    ]
+    assert _leading_keyword("Пополнение, счет RUB. 1400 RUB. X Доступно 1 RUB") == "пополнение"
+    assert _sber_operation_keyword("Списание 500р Счет *1111 X Баланс 999р 20:53") == ""
+    for rules, rules_by_keyword in (
+        (VTB_RULES, VTB_RULES_BY_KEYWORD),
+        (SBER_RULES, SBER_RULES_BY_KEYWORD),
+        (TBANK_RULES, TBANK_RULES_BY_KEYWORD),
+    ):
+        dispatched = {rule for family in rules_by_keyword.values() for rule in family}
+        assert dispatched == set(rules)
+        assert max(len(family) for family in rules_by_keyword.values()) <= 5
+
+
+def test_parse_budget_exceeded_falls_back_to_unknown_format_without_text() -> None:
+    text = "Счёт карты MIR-1111 11:09 Покупка 290р APTEKA TEST Баланс: 924.14р"
+
+    parsed = parse_bank_sms(text, sender="900", budget_seconds=0)
+
+    assert parsed.bank == BankSmsBank.SBER
+    assert parsed.operation_kind == BankSmsOperationKind.UNKNOWN
+    assert parsed.ignore_reason == "unknown_format"
+    assert parsed.redacted_text == "<unknown_format:sber>"
+    assert parsed.normalized_text_hash
+    other = parse_bank_sms(text.replace("290р", "390р"), sender="900", budget_seconds=0)
+    assert other.normalized_text_hash != parsed.normalized_text_hash
+    assert parse_bank_sms(text, sender="900", budget_seconds=1).amount == 29_000
+    assert parse_bank_sms(text, sender="900", budget_seconds=1).normalized_text_hash == ""
+
+
+def test_repeated_markers_keep_ignore_and_amount_semantics() -> None:
+    # These inputs used to cost one full scan per repeated marker.
+    assert parse_bank_sms("3ds " * 400 + "код 1234").ignore_reason == (
+        "ignored_non_transaction_message"
+    )
+    assert parse_bank_sms("3ds " * 400).ignore_reason != "ignored_non_transaction_message"
+    assert classify_bank_sms_shape("1" * 1990 + " 15р 1.5р").amount_count == 2
+    assert classify_bank_sms_shape("1" * 1990 + "5р").amount_count == 1
@@ -6,6 +6,7 @@ import pytest
 pytest.importorskip("aiogram")
 
 from aiogram import Dispatcher
+from financial_bot.app.bot.fsm_storage import DatabaseFsmStorage
 from financial_bot.app.bot.keyboards.auto_accounting_menu import (
     AUTO_ACCOUNTING_MENU_ROWS,
     build_auto_accounting_menu,
@@ -63,7 +64,12 @@ from financial_bot.app.bot.keyboards.spending_limits import (
     build_limit_category_keyboard,
     build_limit_confirm_keyboard,
 )
-from financial_bot.app.bot.main import create_bot, create_dispatcher
+from financial_bot.app.bot.main import (
+    create_bot,
+    create_chart_cache,
+    create_chart_renderer,
+    create_dispatcher,
+)
 from financial_bot.app.bot.routers.auto_accounting_health import (
     AUTO_ACCOUNTING_HEALTH_ALIASES,
     AUTO_ACCOUNTING_RETRY_ALIASES,
@@ -112,6 +118,8 @@ from financial_bot.app.domain.spending_limits import LimitRuleKind
 from financial_bot.app.domain.types import BankCategoryRuleMode, TransactionScope
 from financial_bot.app.services.bank_learning_rule_service import BankLearningRuleLine
 from financial_bot.app.services.category_settings_service import CategorySettingsLine
+from financial_bot.app.services.chart_cache import ChartCache
+from financial_bot.app.services.chart_render_pool import ChartRenderPool
 from financial_bot.app.services.spending_limit_service import LimitOverviewLine
 from financial_bot.app.services.transaction_service import CategoryOption
 
@@ -622,6 +630,22 @@ def test_create_dispatcher_registers_message_updates() -> None:
     assert "message" in dispatcher.resolve_used_update_types()
     assert "db_engine" in dispatcher.workflow_data
     assert "db_session_factory" in dispatcher.workflow_data
+    assert isinstance(dispatcher.storage, DatabaseFsmStorage)
+    assert dispatcher.workflow_data["fsm_storage"] is dispatcher.storage
+    assert isinstance(dispatcher.workflow_data["chart_renderer"], ChartRenderPool)
+    assert isinstance(dispatcher.workflow_data["chart_cache"], ChartCache)
+
+
+def test_chart_renderer_is_disabled_without_workers() -> None:
+    settings = make_settings().model_copy(update={"chart_render_workers": 0})
+
+    assert create_chart_renderer(settings) is None
+
+
+def test_chart_cache_is_disabled_without_memory_budget() -> None:
+    settings = make_settings().model_copy(update={"chart_cache_max_bytes": 0})
+
+    assert create_chart_cache(settings) is None
 
 
 def test_bank_command_payload_parses_multiline_text() -> None:
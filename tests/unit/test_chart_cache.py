@@ -0,0 +1,53 @@
+from datetime import date
+from pathlib import Path
+
+from financial_bot.app.services.chart_cache import CachedChart, ChartCache, ChartCacheKey
+
+
+def make_key(kind: str, *, data_version: int = 1) -> ChartCacheKey:
+    return ChartCacheKey(
+        kind=kind,
+        params=("month",),
+        scope=None,
+        local_date=date(2026, 5, 20),
+        timezone="Asia/Barnaul",
+        data_version=data_version,
+    )
+
+
+def test_chart_cache_evicts_least_recently_used_entries_over_budget() -> None:
+    cache = ChartCache(max_bytes=10)
+    cache.put(make_key("a"), CachedChart(png=b"aaaa", caption="A"))
+    cache.put(make_key("b"), CachedChart(png=b"bbbb", caption="B"))
+    assert cache.get(make_key("a")) is not None
+
+    cache.put(make_key("c"), CachedChart(png=b"cccc", caption="C"))
+
+    assert cache.get(make_key("b")) is None
+    assert cache.get(make_key("a")) == CachedChart(png=b"aaaa", caption="A")
+    assert cache.get(make_key("c")) == CachedChart(png=b"cccc", caption="C")
+    stats = cache.snapshot()
+    assert stats.hits == 3
+    assert stats.misses == 1
+    assert stats.entries == 2
+    assert stats.size_bytes == 8
+
+
+def test_chart_cache_skips_entries_larger_than_budget() -> None:
+    cache = ChartCache(max_bytes=3)
+    cache.put(make_key("a"), CachedChart(png=b"aaaa", caption="A"))
+
+    assert cache.get(make_key("a")) is None
+    assert cache.snapshot().size_bytes == 0
+
+
+def test_chart_cache_keys_include_data_version(tmp_path: Path) -> None:
+    cache = ChartCache(persist_dir=tmp_path)
+    cache.put(make_key("a", data_version=1), CachedChart(png=b"png", caption="A"))
+
+    assert cache.get(make_key("a", data_version=2)) is None
+    assert make_key("a", data_version=1).digest() != make_key("a", data_version=2).digest()
+    assert ChartCache(persist_dir=tmp_path).get(make_key("a", data_version=1)) == CachedChart(
+        png=b"png",
+        caption="A",
+    )
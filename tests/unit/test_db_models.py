@@ -21,11 +21,15 @@ def test_metadata_contains_required_tables() -> None:
         "categories",
         "category_aliases",
         "transactions",
+        "transaction_daily_totals",
+        "data_versions",
+        "fsm_states",
         "settings",
         "operation_audit_log",
         "spending_limit_alerts",
         "bank_event_sources",
         "bank_events",
+        "bank_event_notifications",
         "bank_category_rules",
     }
 
@@ -109,6 +113,7 @@ def test_domain_enum_values_match_database_contract() -> None:
     assert {item.value for item in BankEventSuggestionSource} == {
         "parser_hint",
         "learned_rule",
+        "similar_rule",
         "manual",
         "none",
     }
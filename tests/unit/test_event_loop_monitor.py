@@ -0,0 +1,36 @@
+import asyncio
+from time import sleep
+
+import pytest
+from financial_bot.app.services.event_loop_monitor import EventLoopStallMonitor
+
+
+def test_event_loop_monitor_counts_only_stalls_above_threshold() -> None:
+    monitor = EventLoopStallMonitor(stall_threshold_seconds=0.1)
+
+    monitor.record(0.01)
+    monitor.record(0.25)
+    monitor.record(0.15)
+    stats = monitor.snapshot()
+
+    assert stats.samples == 3
+    assert stats.stalled_samples == 2
+    assert stats.max_stall_seconds == 0.25
+    assert stats.total_stall_seconds == pytest.approx(0.4)
+
+
+@pytest.mark.asyncio
+async def test_event_loop_monitor_measures_blocking_calls() -> None:
+    monitor = EventLoopStallMonitor(interval_seconds=0.01, stall_threshold_seconds=0.1)
+    task = asyncio.create_task(monitor.run_forever())
+    await asyncio.sleep(0.05)
+
+    sleep(0.3)
+    await asyncio.sleep(0.05)
+    task.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await task
+
+    stats = monitor.snapshot()
+    assert stats.stalled_samples >= 1
+    assert stats.max_stall_seconds >= 0.2
@@ -0,0 +1,39 @@
+import pytest
+from aiogram.exceptions import TelegramNetworkError, TelegramRetryAfter
+from aiogram.methods import EditMessageText
+from financial_bot.app.bot.routers.google_sheets import _ProgressMessage
+from financial_bot.app.services.google_sheets_service import (
+    GoogleSheetsExportProgress,
+    GoogleSheetsExportStage,
+)
+
+
+class _FailingEditMessage:
+    text = "Выгружаю в Google Sheets за Май 2026…"
+
+    def __init__(self, *errors: Exception) -> None:
+        self._errors = list(errors)
+        self.answers: list[str] = []
+
+    async def edit_text(self, text: str) -> None:
+        raise self._errors.pop(0)
+
+    async def answer(self, text: str) -> None:
+        self.answers.append(text)
+
+
+@pytest.mark.asyncio
+async def test_progress_message_survives_flood_control_and_network_errors() -> None:
+    method = EditMessageText(text="…")
+    message = _FailingEditMessage(
+        TelegramRetryAfter(method=method, message="Flood control exceeded", retry_after=5),
+        TelegramNetworkError(method=method, message="Connection reset"),
+    )
+    progress = _ProgressMessage(message)  # type: ignore[arg-type]
+
+    await progress.update(
+        GoogleSheetsExportProgress(stage=GoogleSheetsExportStage.WRITING, rows=10)
+    )
+    await progress.finish("Выгрузил в Google Sheets: 10 строк за Май 2026.")
+
+    assert message.answers == ["Выгрузил в Google Sheets: 10 строк за Май 2026."]